@@ -18,5 +18,23 @@ class NoCacheAdapter:  # pragma: no cover
     ) -> None:  # noqa: D102
         pass
 
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:  # noqa: D102
+        return [None] * len(keys)
+
+    async def set_many(
+        self,
+        items: list[tuple[str, bytes]],
+        ttl: Optional[timedelta] = None,
+    ) -> None:  # noqa: D102
+        pass
+
+    async def set_if_absent(
+        self,
+        key: str,
+        value: bytes,
+        ttl: timedelta,
+    ) -> bool:  # noqa: D102
+        return True
+
     async def close(self) -> None:  # noqa: D102
         pass
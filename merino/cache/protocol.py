@@ -28,6 +28,44 @@ class CacheAdapter(Protocol):
         """
         ...
 
+    async def get_many(
+        self, keys: list[str]
+    ) -> list[Optional[bytes]]:  # pragma: no cover
+        """Get the values associated with the keys, in the same order. The value of a key
+        that isn't in the cache is `None`.
+
+        Raises:
+            - `CacheAdapterError` for cache backend errors.
+        """
+        ...
+
+    async def set_many(
+        self,
+        items: list[tuple[str, bytes]],
+        ttl: Optional[timedelta] = None,
+    ) -> None:  # pragma: no cover
+        """Store key-value pairs in the cache, with an optional time-to-live.
+
+        Raises:
+            - `CacheAdapterError` for cache backend errors.
+        """
+        ...
+
+    async def set_if_absent(
+        self,
+        key: str,
+        value: bytes,
+        ttl: timedelta,
+    ) -> bool:  # pragma: no cover
+        """Store a key-value pair in the cache with a time-to-live, unless the key is
+        already in the cache. Returns whether the pair was stored. This can be used
+        as a short-lived lock shared by all the instances using the cache.
+
+        Raises:
+            - `CacheAdapterError` for cache backend errors.
+        """
+        ...
+
     async def close(self) -> None:  # pragma: no cover
         """Close the adapter and release any underlying resources."""
         ...
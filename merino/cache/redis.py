@@ -1,20 +1,254 @@
 """Redis cache adapter."""
 
+import asyncio
+import time
 from datetime import timedelta
-from typing import Optional
+from functools import partial
+from typing import Any, Awaitable, Callable, Optional, TypeVar, cast
 
-from redis.asyncio import Redis, RedisError
+import aiodogstatsd
+from redis.asyncio import BlockingConnectionPool, Redis, RedisError
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.connection import AbstractConnection
+from redis.asyncio.retry import Retry
+from redis.asyncio.sentinel import Sentinel
+from redis.backoff import NoBackoff
+from redis.exceptions import ConnectionError, TimeoutError
 
+from merino.config import settings
 from merino.exceptions import CacheAdapterError
+from merino.utils.circuit_breaker import CircuitBreaker, CircuitState
+
+T = TypeVar("T")
+
+
+# The minimum interval (in seconds) between two reports of the utilization of a
+# connection pool, which is sampled rather than reported upon each command.
+POOL_METRICS_INTERVAL_SEC: float = 1.0
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """A Redis connection pool that reports its utilization.
+
+    Upon each command, it records the time spent acquiring a connection from the
+    pool. At most once every `POOL_METRICS_INTERVAL_SEC`, upon the release of a
+    connection, it records the number of in-use and idle connections of the pool,
+    which it counts itself.
+    """
+
+    name: str
+    metrics_client: aiodogstatsd.Client
+    connections_made: int
+    in_use: set[AbstractConnection]
+    next_report_at: float
+
+    def __init__(
+        self, name: str, metrics_client: aiodogstatsd.Client, **kwargs: Any
+    ) -> None:
+        """Initialize the pool. Extra keyword arguments are passed to
+        `BlockingConnectionPool`.
+        """
+        super().__init__(**kwargs)
+        self.name = name
+        self.metrics_client = metrics_client
+        self.next_report_at = 0.0
+
+    def reset(self) -> None:
+        """Reset the pool, e.g. in a forked process, along with its counts."""
+        super().reset()
+        self.connections_made = 0
+        self.in_use = set()
+
+    def make_connection(self) -> AbstractConnection:
+        """Make a new connection and count it."""
+        connection: AbstractConnection = super().make_connection()
+        self.connections_made += 1
+        return connection
+
+    async def get_connection(
+        self, command_name: Any, *keys: Any, **options: Any
+    ) -> AbstractConnection:
+        """Acquire a connection and record the pool wait time."""
+        started_at: float = time.perf_counter()
+        try:
+            connection: AbstractConnection = await super().get_connection(
+                command_name, *keys, **options
+            )
+        finally:
+            self.metrics_client.timing(
+                f"redis.{self.name}.pool.wait",
+                value=(time.perf_counter() - started_at) * 1000,
+            )
+        # A set rather than a counter, as the pool also releases the connections it
+        # fails to connect before handing them out.
+        self.in_use.add(connection)
+        return connection
+
+    async def release(self, connection: AbstractConnection) -> None:
+        """Release a connection and record the pool utilization, if it's time to."""
+        self.in_use.discard(connection)
+        await super().release(connection)
+        now: float = time.monotonic()
+        if now < self.next_report_at:
+            return
+        self.next_report_at = now + POOL_METRICS_INTERVAL_SEC
+        in_use, idle = self.pool_utilization()
+        self.metrics_client.gauge(f"redis.{self.name}.pool.in_use", value=in_use)
+        self.metrics_client.gauge(f"redis.{self.name}.pool.idle", value=idle)
+
+    def pool_utilization(self) -> tuple[int, int]:
+        """Return the number of in-use and idle connections of the pool."""
+        in_use: int = len(self.in_use)
+        return in_use, self.connections_made - in_use
+
+
+def create_redis_client(name: str, metrics_client: aiodogstatsd.Client) -> Redis:
+    """Create a Redis client configured by the `redis` settings, for either a
+    standalone server, a cluster, or a server monitored by Sentinel.
+
+    Only the connection pool of a standalone server reports its utilization, as the
+    cluster and Sentinel clients manage their own pools.
+
+    Args:
+      - `name`: The name of the client used in the metrics
+      - `metrics_client`: The metrics client
+    """
+    connection_kwargs: dict[str, Any] = {
+        "socket_timeout": settings.redis.socket_timeout_sec,
+        "socket_connect_timeout": settings.redis.socket_connect_timeout_sec,
+        "retry": Retry(NoBackoff(), settings.redis.retries),
+        "retry_on_error": [TimeoutError] if settings.redis.retry_on_timeout else [],
+    }
+    match settings.redis.mode:
+        case "cluster":
+            # `RedisCluster` isn't a subclass of `Redis`, but implements the same
+            # commands used by the adapters.
+            return cast(
+                Redis,
+                RedisCluster.from_url(
+                    settings.redis.server,
+                    max_connections=settings.redis.max_connections,
+                    **connection_kwargs,
+                ),
+            )
+        case "sentinel":
+            sentinels: list[tuple[str, int]] = [
+                (host, int(port))
+                for host, port in (
+                    node.strip().removeprefix("redis://").split(":")
+                    for node in settings.redis.server.split(",")
+                )
+            ]
+            return Sentinel(sentinels, **connection_kwargs).master_for(
+                settings.redis.sentinel_service_name,
+                max_connections=settings.redis.max_connections,
+            )
+        case _:
+            return Redis(
+                connection_pool=InstrumentedConnectionPool.from_url(
+                    settings.redis.server,
+                    name=name,
+                    metrics_client=metrics_client,
+                    max_connections=settings.redis.max_connections,
+                    timeout=settings.redis.pool_timeout_sec,
+                    **connection_kwargs,
+                )
+            )
 
 
 class RedisAdapter:
-    """A cache adapter that stores key-value pairs in Redis."""
+    """A cache adapter that stores key-value pairs in Redis.
+
+    If `batch_gets` is set, the `get()` calls made within an iteration of the event
+    loop, e.g. by concurrent requests, are merged into a single `MGET` command sent on
+    the next iteration. This trades a fraction of an iteration of latency for fewer
+    round trips to Redis under load.
+
+    If a `circuit_breaker` is given, connection errors and timeouts are reported to
+    it, and commands fail right away with `CacheAdapterError` while it's open, instead
+    of waiting on a Redis server that's down.
+    """
 
     redis: Redis
+    name: str
+    metrics_client: Optional[aiodogstatsd.Client]
+    batch_gets: bool
+    circuit_breaker: Optional[CircuitBreaker]
+    # The futures of the `get()` calls waiting for the next batch, keyed by key.
+    _pending_gets: dict[str, list[asyncio.Future[Optional[bytes]]]]
+    # References to the tasks sending the batches, so that they don't get garbage
+    # collected before they are done.
+    _batch_tasks: set[asyncio.Task[None]]
 
-    def __init__(self, redis: Redis):
+    def __init__(
+        self,
+        redis: Redis,
+        batch_gets: bool = False,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        name: str = "redis",
+        metrics_client: Optional[aiodogstatsd.Client] = None,
+    ):
         self.redis = redis
+        self.name = name
+        self.metrics_client = metrics_client
+        self.batch_gets = batch_gets
+        self.circuit_breaker = circuit_breaker
+        if circuit_breaker is not None:
+            circuit_breaker.on_state_change = self._circuit_state_changed
+        self._pending_gets = {}
+        self._batch_tasks = set()
+
+    def _circuit_state_changed(self, state: CircuitState) -> None:
+        """Record the opening of the circuit breaker."""
+        if state is CircuitState.OPEN and self.metrics_client is not None:
+            self.metrics_client.increment(f"redis.{self.name}.circuit_breaker.open")
+
+    async def _execute(
+        self, command: Callable[[], Awaitable[T]], description: str
+    ) -> T:
+        """Execute a Redis command through the circuit breaker, if any.
+
+        Raises:
+            - `CacheAdapterError` if Redis returns an error or the circuit breaker is
+              open.
+        """
+        if (
+            self.circuit_breaker is not None
+            and not self.circuit_breaker.allow_request()
+        ):
+            if self.metrics_client is not None:
+                self.metrics_client.increment(
+                    f"redis.{self.name}.circuit_breaker.rejected"
+                )
+            raise CacheAdapterError(
+                f"Failed to {description} with error: `Circuit breaker is open`"
+            )
+
+        try:
+            result: T = await command()
+        except RedisError as exc:
+            if self.metrics_client is not None:
+                self.metrics_client.increment(f"redis.{self.name}.error")
+            if self.circuit_breaker is not None:
+                # Only outages trip the breaker, not errors of individual commands.
+                if isinstance(exc, (ConnectionError, TimeoutError)):
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+            raise CacheAdapterError(
+                f"Failed to {description} with error: `{exc}`"
+            ) from exc
+        except BaseException:
+            # Cancellations, e.g. by request deadlines, and other errors don't tell
+            # whether Redis is down, but a half-open breaker must not wait for the
+            # outcome of its trial forever.
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.release_trial()
+            raise
+
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+        return result
 
     async def get(self, key: str) -> Optional[bytes]:
         """Get the value associated with the key from Redis. Returns `None` if the key isn't in
@@ -23,12 +257,79 @@ class RedisAdapter:
         Raises:
             - `CacheAdapterError` if Redis returns an error.
         """
+        if self.batch_gets:
+            return await self._get_batched(key)
+
+        return await self._execute(lambda: self.redis.get(key), f"get `{repr(key)}`")
+
+    async def _get_batched(self, key: str) -> Optional[bytes]:
+        """Add the key to the next batch of gets and wait for its value."""
+        loop = asyncio.get_running_loop()
+        if not self._pending_gets:
+            loop.call_soon(self._send_batch)
+
+        future: asyncio.Future[Optional[bytes]] = loop.create_future()
+        self._pending_gets.setdefault(key, []).append(future)
+        return await future
+
+    def _send_batch(self) -> None:
+        """Send the pending gets as a single `MGET` command."""
+        pending, self._pending_gets = self._pending_gets, {}
+        task = asyncio.create_task(self._get_batch(pending))
+        self._batch_tasks.add(task)
+        task.add_done_callback(partial(self._batch_done, pending))
+
+    def _batch_done(
+        self,
+        pending: dict[str, list[asyncio.Future[Optional[bytes]]]],
+        task: asyncio.Task[None],
+    ) -> None:
+        """Discard the task of a batch, and cancel the futures it left waiting, i.e.
+        if it was cancelled, possibly before it started, so that no `get()` call
+        waits forever.
+        """
+        self._batch_tasks.discard(task)
+        for futures in pending.values():
+            for future in futures:
+                future.cancel()
+
+    async def _get_batch(
+        self, pending: dict[str, list[asyncio.Future[Optional[bytes]]]]
+    ) -> None:
+        """Get the values of a batch and pass them, or the error, to the waiting
+        futures. Futures of cancelled `get()` calls are skipped.
+        """
         try:
-            return await self.redis.get(key)
-        except RedisError as exc:
-            raise CacheAdapterError(
-                f"Failed to get `{repr(key)}` with error: `{exc}`"
-            ) from exc
+            values = await self.get_many(list(pending))
+        except Exception as exc:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        for futures, value in zip(pending.values(), values):
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        """Get the values associated with the keys from Redis with a single `MGET`
+        command, or one per hash slot for a cluster. The value of a key that isn't in
+        Redis is `None`.
+
+        Raises:
+            - `CacheAdapterError` if Redis returns an error.
+        """
+        if not keys:
+            return []
+
+        # Keys of a single `MGET` must be in the same hash slot of a cluster, so the
+        # cluster client splits them into a command per slot.
+        mget: Callable[[list[str]], Awaitable[list[Optional[bytes]]]] = getattr(
+            self.redis, "mget_nonatomic", self.redis.mget
+        )
+        return await self._execute(lambda: mget(keys), f"get {len(keys)} keys")
 
     async def set(
         self,
@@ -37,17 +338,64 @@ class RedisAdapter:
         ttl: Optional[timedelta] = None,
     ) -> None:
         """Store a key-value pair in Redis, overwriting the previous value if set, and optionally
-        expiring after the time-to-live.
+        expiring after the time-to-live, with a millisecond precision.
 
         Raises:
             - `CacheAdapterError` if Redis returns an error.
         """
-        try:
-            await self.redis.set(key, value, ex=ttl.seconds if ttl else None)
-        except RedisError as exc:
-            raise CacheAdapterError(
-                f"Failed to set `{repr(key)}` with error: `{exc}`"
-            ) from exc
+        await self._execute(
+            lambda: self.redis.set(key, value, px=self._ttl_ms(ttl)),
+            f"set `{repr(key)}`",
+        )
+
+    async def set_many(
+        self,
+        items: list[tuple[str, bytes]],
+        ttl: Optional[timedelta] = None,
+    ) -> None:
+        """Store key-value pairs in Redis, overwriting the previous values if set, and
+        optionally expiring after the time-to-live. The `SET` commands are pipelined in a
+        single round trip.
+
+        Raises:
+            - `CacheAdapterError` if Redis returns an error.
+        """
+        if not items:
+            return
+
+        async def execute_pipeline() -> None:
+            pipeline = self.redis.pipeline(transaction=False)
+            for key, value in items:
+                pipeline.set(key, value, px=self._ttl_ms(ttl))
+            await pipeline.execute()
+
+        await self._execute(execute_pipeline, f"set {len(items)} keys")
+
+    async def set_if_absent(
+        self,
+        key: str,
+        value: bytes,
+        ttl: timedelta,
+    ) -> bool:
+        """Store a key-value pair in Redis with a time-to-live, unless the key already
+        exists. Returns whether the pair was stored.
+
+        Raises:
+            - `CacheAdapterError` if Redis returns an error.
+        """
+        return bool(
+            await self._execute(
+                lambda: self.redis.set(key, value, px=self._ttl_ms(ttl), nx=True),
+                f"set `{repr(key)}`",
+            )
+        )
+
+    @staticmethod
+    def _ttl_ms(ttl: Optional[timedelta]) -> Optional[int]:
+        """Convert a time-to-live to whole milliseconds, as `timedelta.seconds` drops
+        the days and the fraction of a second.
+        """
+        return int(ttl.total_seconds() * 1000) if ttl else None
 
     async def close(self) -> None:
         """Close the Redis connection."""
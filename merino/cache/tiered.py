@@ -0,0 +1,196 @@
+"""Two-tier cache adapter with an in-process LRU cache in front of another adapter."""
+
+from datetime import timedelta
+from typing import Optional
+
+import aiodogstatsd
+
+from merino.cache.protocol import CacheAdapter
+from merino.exceptions import CacheAdapterError
+from merino.utils.lru_cache import LRUCache
+
+
+class TieredCacheAdapter:
+    """A cache adapter that keeps recently used key-value pairs of another adapter
+    (e.g. `RedisAdapter`) in an in-process LRU cache, so that hot keys don't make a
+    round trip to the shared cache on every lookup.
+
+    The local cache (L1) is bounded by the total size of its keys and values. Local
+    entries expire with the time-to-live they were stored with, capped at
+    `max_ttl_sec`. Values fetched from the shared cache (L2) are kept locally for
+    `max_ttl_sec`, since their remaining time-to-live isn't known. Thus, a local entry
+    may outlive the shared one by up to `max_ttl_sec`.
+
+    `set_if_absent()` always goes to the shared cache, as its result must be
+    consistent across all the instances.
+    """
+
+    backend: CacheAdapter
+    name: str
+    metrics_client: aiodogstatsd.Client
+    max_ttl_sec: float
+    local_cache: LRUCache[str, bytes]
+
+    def __init__(
+        self,
+        backend: CacheAdapter,
+        name: str,
+        metrics_client: aiodogstatsd.Client,
+        max_bytes: int,
+        max_ttl_sec: float,
+    ) -> None:
+        """Initialize the adapter.
+
+        Args:
+          - `backend`: The shared cache adapter
+          - `name`: The name of the cache used in the metrics
+          - `metrics_client`: The metrics client
+          - `max_bytes`: The maximum total size of the keys and values in the local cache
+          - `max_ttl_sec`: The maximum time-to-live of the local entries
+        """
+        self.backend = backend
+        self.name = name
+        self.metrics_client = metrics_client
+        self.max_ttl_sec = max_ttl_sec
+        # Every entry is at least a byte long, so the entry count never binds before
+        # the byte size does.
+        self.local_cache = LRUCache(
+            max_size=max_bytes,
+            max_bytes=max_bytes,
+            sizeof=lambda key, value: len(key) + len(value),
+        )
+
+    def store_locally(self, key: str, value: bytes, ttl_sec: float) -> None:
+        """Store a key-value pair in the local cache and record its utilization."""
+        if evicted := self.local_cache.set(key, value, ttl_sec=ttl_sec):
+            self.metrics_client.increment(
+                f"cache.{self.name}.l1.eviction", value=evicted
+            )
+        self.metrics_client.gauge(
+            f"cache.{self.name}.l1.bytes", value=self.local_cache.size_bytes
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get the value associated with the key from the local cache, or from the
+        shared cache if it's missing locally. Returns `None` if the key isn't in either
+        cache.
+
+        Raises:
+            - `CacheAdapterError` if the shared cache returns an error.
+        """
+        if (value := self.local_cache.get(key)) is not None:
+            self.metrics_client.increment(f"cache.{self.name}.l1.hit")
+            return value
+        self.metrics_client.increment(f"cache.{self.name}.l1.miss")
+
+        value = await self.backend.get(key)
+        if value is None:
+            self.metrics_client.increment(f"cache.{self.name}.l2.miss")
+            return None
+        self.metrics_client.increment(f"cache.{self.name}.l2.hit")
+
+        self.store_locally(key, value, self.max_ttl_sec)
+        return value
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        """Get the values associated with the keys, in the same order, from the local
+        cache, or from the shared cache for the keys missing locally. The value of a key
+        that isn't in either cache is `None`.
+
+        Raises:
+            - `CacheAdapterError` if the shared cache returns an error.
+        """
+        values: list[Optional[bytes]] = [self.local_cache.get(key) for key in keys]
+        misses: list[int] = [
+            index for index, value in enumerate(values) if value is None
+        ]
+        if hits := len(keys) - len(misses):
+            self.metrics_client.increment(f"cache.{self.name}.l1.hit", value=hits)
+        if not misses:
+            return values
+        self.metrics_client.increment(f"cache.{self.name}.l1.miss", value=len(misses))
+
+        shared_values = await self.backend.get_many([keys[index] for index in misses])
+        shared_hits: int = 0
+        for index, value in zip(misses, shared_values):
+            if value is not None:
+                shared_hits += 1
+                values[index] = value
+                self.store_locally(keys[index], value, self.max_ttl_sec)
+        if shared_hits:
+            self.metrics_client.increment(
+                f"cache.{self.name}.l2.hit", value=shared_hits
+            )
+        if shared_misses := len(misses) - shared_hits:
+            self.metrics_client.increment(
+                f"cache.{self.name}.l2.miss", value=shared_misses
+            )
+        return values
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: Optional[timedelta] = None,
+    ) -> None:
+        """Store a key-value pair in the shared cache and in the local cache, optionally
+        expiring after the time-to-live.
+
+        Raises:
+            - `CacheAdapterError` if the shared cache returns an error. The key is
+              removed from the local cache in that case.
+        """
+        try:
+            await self.backend.set(key, value, ttl=ttl)
+        except CacheAdapterError:
+            self.local_cache.pop(key)
+            raise
+
+        ttl_sec: float = (
+            min(ttl.total_seconds(), self.max_ttl_sec) if ttl else self.max_ttl_sec
+        )
+        self.store_locally(key, value, ttl_sec)
+
+    async def set_many(
+        self,
+        items: list[tuple[str, bytes]],
+        ttl: Optional[timedelta] = None,
+    ) -> None:
+        """Store key-value pairs in the shared cache and in the local cache, optionally
+        expiring after the time-to-live.
+
+        Raises:
+            - `CacheAdapterError` if the shared cache returns an error. The keys are
+              removed from the local cache in that case.
+        """
+        try:
+            await self.backend.set_many(items, ttl=ttl)
+        except CacheAdapterError:
+            for key, _ in items:
+                self.local_cache.pop(key)
+            raise
+
+        ttl_sec: float = (
+            min(ttl.total_seconds(), self.max_ttl_sec) if ttl else self.max_ttl_sec
+        )
+        for key, value in items:
+            self.store_locally(key, value, ttl_sec)
+
+    async def set_if_absent(
+        self,
+        key: str,
+        value: bytes,
+        ttl: timedelta,
+    ) -> bool:
+        """Store a key-value pair in the shared cache with a time-to-live, unless the key
+        already exists. Returns whether the pair was stored.
+
+        Raises:
+            - `CacheAdapterError` if the shared cache returns an error.
+        """
+        return await self.backend.set_if_absent(key, value, ttl=ttl)
+
+    async def close(self) -> None:
+        """Clear the local cache and close the shared cache adapter."""
+        self.local_cache.clear()
+        await self.backend.close()
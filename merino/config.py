@@ -4,11 +4,46 @@ from dynaconf import Dynaconf, Validator
 # Validators for Merino settings.
 _validators = [
     Validator("deployment.canary", is_type_of=bool),
+    Validator("runtime.adaptive_deadline.enabled", is_type_of=bool),
+    Validator("runtime.adaptive_deadline.percentile", gt=0, lte=1),
+    Validator("runtime.adaptive_deadline.multiplier", gte=1),
+    Validator("runtime.adaptive_deadline.min_deadline_sec", gt=0),
+    Validator("runtime.adaptive_deadline.window_size", is_type_of=int, gt=0),
+    Validator("runtime.adaptive_deadline.min_samples", is_type_of=int, gt=0),
+    Validator("runtime.adaptive_deadline.refresh_interval", is_type_of=int, gt=0),
+    Validator("runtime.prefork.host", is_type_of=str),
+    Validator("runtime.prefork.port", is_type_of=int, gte=0),
+    Validator("runtime.prefork.workers", is_type_of=int, gt=0),
+    Validator("runtime.prefork.reload_interval_sec", gt=0),
+    Validator("runtime.prefork.graceful_timeout_sec", gte=0),
     Validator("logging.format", is_in=["mozlog", "pretty"]),
     Validator("logging.level", is_in=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]),
+    Validator("logging.queue.enabled", is_type_of=bool),
+    Validator("logging.queue.max_size", is_type_of=int, gt=0),
+    Validator("logging.suggest.mode", is_in=["request", "rollup"]),
+    Validator("logging.suggest.sample_rate", gte=0, lte=1),
+    Validator("logging.suggest.rollup_interval_sec", gt=0),
+    Validator("web.middleware.composite", is_type_of=bool),
+    Validator("web.middleware.stage_timing", is_type_of=bool),
     Validator("metrics.dev_logger", is_type_of=bool),
     Validator("metrics.host", is_type_of=str),
     Validator("metrics.port", gte=0, is_type_of=int),
+    Validator(
+        "location.maxmind_mode", is_in=["auto", "mmap_ext", "mmap", "file", "memory"]
+    ),
+    Validator("location.cache_max_entries", is_type_of=int, gte=0),
+    Validator("location.cache_by_network", is_type_of=bool),
+    Validator("user_agent.cache_max_entries", is_type_of=int, gte=0),
+    Validator("http_client.max_connections", is_type_of=int, gt=0),
+    Validator("http_client.max_keepalive_connections", is_type_of=int, gte=0),
+    Validator("http_client.keepalive_expiry_sec", gte=0),
+    Validator("http_client.http2", is_type_of=bool),
+    Validator("http_client.connect_timeout_sec", gt=0),
+    Validator("http_client.timeout_sec", gt=0),
+    Validator("accuweather.http_timeout_sec", gt=0),
+    Validator("accuweather.cached_location_key_ttl_sec", is_type_of=int, gte=0),
+    Validator("amo.dynamic.http_timeout_sec", gt=0),
+    Validator("remote_settings.http_timeout_sec", gt=0),
     Validator(
         "accuweather.url_param_partner_code",
         is_type_of=str,
@@ -23,19 +58,60 @@ _validators = [
         "redis.server",
         is_type_of=str,
         must_exist=True,
-        when=Validator("providers.accuweather.cache", must_exist=True, eq="redis"),
+        when=Validator(
+            "providers.accuweather.cache", must_exist=True, is_in=["redis", "tiered"]
+        ),
+    ),
+    Validator("redis.batch_gets", is_type_of=bool),
+    Validator("redis.mode", is_in=["standalone", "cluster", "sentinel"]),
+    Validator(
+        "redis.sentinel_service_name",
+        is_type_of=str,
+        len_min=1,
+        when=Validator("redis.mode", eq="sentinel"),
     ),
+    Validator("redis.max_connections", is_type_of=int, gt=0),
+    Validator("redis.pool_timeout_sec", gt=0),
+    Validator("redis.socket_timeout_sec", gt=0),
+    Validator("redis.socket_connect_timeout_sec", gt=0),
+    Validator("redis.retry_on_timeout", is_type_of=bool),
+    Validator("redis.retries", is_type_of=int, gte=0),
+    Validator("redis.circuit_breaker_failure_threshold", is_type_of=int, gte=0),
+    Validator("redis.circuit_breaker_recovery_timeout_sec", gte=0),
     # Set the upper bound of query timeout to 5 seconds as we don't want Merino
     # to wait for responses from Accuweather indefinitely.
     Validator(
         "providers.accuweather.query_timeout_sec", is_type_of=float, gte=0, lte=5.0
     ),
     Validator("providers.accuweather.type", is_type_of=str, must_exist=True),
-    Validator("providers.accuweather.cache", is_in=["redis", "none"]),
+    Validator("providers.accuweather.cache", is_in=["redis", "tiered", "none"]),
+    Validator("providers.accuweather.local_cache_max_bytes", is_type_of=int, gt=0),
+    Validator("providers.accuweather.local_cache_max_ttl_sec", gt=0),
     Validator("providers.accuweather.cached_report_ttl_sec", is_type_of=int, gte=0),
+    Validator(
+        "providers.accuweather.cached_report_stale_ttl_sec", is_type_of=int, gte=0
+    ),
+    Validator(
+        "providers.accuweather.cached_report_format",
+        is_in=["json", "compact", "compact_zlib"],
+    ),
+    # The provider checks that the lock TTL doesn't exceed its query timeout.
+    Validator("providers.accuweather.refresh_lock_ttl_sec", gte=0),
+    Validator("providers.accuweather.circuit_breaker.enabled", is_type_of=bool),
+    Validator(
+        "providers.accuweather.circuit_breaker.failure_rate_threshold", gt=0, lte=1
+    ),
+    Validator(
+        "providers.accuweather.circuit_breaker.window_size", is_type_of=int, gt=0
+    ),
+    Validator("providers.accuweather.circuit_breaker.min_calls", is_type_of=int, gt=0),
+    Validator("providers.accuweather.circuit_breaker.slow_call_threshold_sec", gte=0),
+    Validator("providers.accuweather.circuit_breaker.recovery_timeout_sec", gte=0),
     Validator("providers.adm.backend", is_in=["remote-settings", "test"]),
     Validator("providers.adm.cron_interval_sec", gt=0),
     Validator("providers.adm.enabled_by_default", is_type_of=bool),
+    Validator("providers.adm.keyword_index", is_in=["dict", "compact", "mmap"]),
+    Validator("providers.adm.mmap_index_dir", is_type_of=str),
     Validator("providers.adm.resync_interval_sec", gt=0),
     Validator("providers.adm.score", gte=0, lte=1),
     Validator("providers.adm.score_wikipedia", gte=0, lte=1),
@@ -48,6 +124,8 @@ _validators = [
     Validator("providers.top_picks.score", is_type_of=float, gte=0, lte=1),
     Validator("providers.top_picks.query_char_limit", is_type_of=int, gte=1),
     Validator("providers.top_picks.firefox_char_limit", is_type_of=int, gte=1),
+    Validator("providers.top_picks.index", is_in=["dict", "mmap"]),
+    Validator("providers.top_picks.mmap_index_dir", is_type_of=str),
     Validator(
         "providers.top_picks.top_picks_file_path",
         is_type_of=str,
@@ -58,17 +136,31 @@ _validators = [
         ],
     ),
     Validator("providers.wiki_fruit.enabled_by_default", is_type_of=bool),
-    Validator("providers.wikipedia.backend", is_in=["elasticsearch", "test"]),
+    Validator("providers.wikipedia.backend", is_in=["elasticsearch", "local", "test"]),
     Validator("providers.wikipedia.enabled_by_default", is_type_of=bool),
     Validator("providers.wikipedia.es_url", is_type_of=str),
+    Validator("providers.wikipedia.local_index_path", is_type_of=str),
+    Validator("providers.wikipedia.local_index_reload_interval_sec", gte=0),
     Validator("providers.wikipedia.es_api_key", is_type_of=str),
     Validator("providers.wikipedia.es_index", is_type_of=str),
     Validator("providers.wikipedia.es_max_suggestions", is_type_of=int, gte=1),
     Validator("providers.wikipedia.es_password", is_type_of=str),
     Validator("providers.wikipedia.es_request_timeout_ms", is_type_of=int, gte=1),
     Validator("providers.wikipedia.es_user", is_type_of=str),
+    Validator("providers.wikipedia.es_hedge_enabled", is_type_of=bool),
+    Validator("providers.wikipedia.es_hedge_percentile", gt=0, lte=1),
+    Validator("providers.wikipedia.es_hedge_min_delay_ms", is_type_of=int, gte=0),
+    Validator("providers.wikipedia.es_hedge_max_rate", gte=0, lte=1),
     Validator("providers.wikipedia.score", gte=0, lte=1),
     Validator("providers.wikipedia.type", is_type_of=str, must_exist=True),
+    Validator("providers.wikipedia.circuit_breaker.enabled", is_type_of=bool),
+    Validator(
+        "providers.wikipedia.circuit_breaker.failure_rate_threshold", gt=0, lte=1
+    ),
+    Validator("providers.wikipedia.circuit_breaker.window_size", is_type_of=int, gt=0),
+    Validator("providers.wikipedia.circuit_breaker.min_calls", is_type_of=int, gt=0),
+    Validator("providers.wikipedia.circuit_breaker.slow_call_threshold_sec", gte=0),
+    Validator("providers.wikipedia.circuit_breaker.recovery_timeout_sec", gte=0),
     # Since Firefox will time out the request to Merino if it takes longer than 200ms,
     # the default query timeout of Merino should not be greater than that 200ms.
     Validator(
@@ -82,6 +174,9 @@ _validators = [
     # Max set that is passed into FastAPI Query constuctor param 'max_length'.
     Validator("web.api.v1.query_character_max", is_type_of=int, gt=5, lte=500),
     Validator("web.api.v1.client_variant_character_max", is_type_of=int, gt=0, lte=100),
+    Validator("web.api.v1.response_cache.enabled", is_type_of=bool),
+    Validator("web.api.v1.response_cache.max_entries", is_type_of=int, gt=0),
+    Validator("web.api.v1.response_cache.ttl_sec", is_type_of=int, gte=0),
     # Allow a longer timeout for testing & development
     Validator(
         "runtime.query_timeout_sec",
@@ -1,8 +1,58 @@
 """Logging configuration"""
+import logging
 import sys
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+from typing import Optional
 
 from merino.config import settings
+from merino.metrics import get_metrics_client
+
+# The listener emitting the queued suggest request logs, if `logging.queue.enabled`.
+_listener: Optional[QueueListener] = None
+# The logger whose handlers the listener emits the records of.
+_queued_logger: Optional[logging.Logger] = None
+
+
+class BoundedQueueHandler(QueueHandler):
+    """A `QueueHandler` that drops records, rather than blocking the caller, when
+    its bounded queue is full, and counts them.
+    """
+
+    dropped: int
+
+    def __init__(self, queue: Queue) -> None:
+        """Initialize the handler with a bounded queue."""
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return the record as is. The queue doesn't leave the process, so the
+        message, its arguments and the exception info are formatted by the handlers
+        of the listener rather than on the calling thread.
+        """
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Enqueue a record, or drop it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+            get_metrics_client().increment(
+                "logging.queue.dropped", tags={"logger": record.name}
+            )
+
+
+class BoundedQueueListener(QueueListener):
+    """A `QueueListener` of a bounded queue."""
+
+    def enqueue_sentinel(self) -> None:
+        """Enqueue the sentinel stopping the listener, waiting for room in the queue
+        if it's full.
+        """
+        self.queue.put(self._sentinel)  # type: ignore [attr-defined]
 
 
 def configure_logging() -> None:
@@ -21,6 +71,9 @@ def configure_logging() -> None:
     if settings.current_env.lower() == "production" and handler != ["console-mozlog"]:
         raise ValueError("Log format must be 'mozlog' in production")
 
+    # Emit the logs queued so far before their handlers get replaced.
+    stop_queue_logging()
+
     dictConfig(
         {
             "version": 1,
@@ -65,6 +118,10 @@ def configure_logging() -> None:
                     "handlers": handler,
                     "level": settings.logging.level,
                 },
+                "web.suggest.rollup": {
+                    "handlers": handler,
+                    "level": settings.logging.level,
+                },
                 "uvicorn.error": {
                     "handlers": ["uvicorn-error-handler"],
                     "level": "ERROR",
@@ -73,3 +130,49 @@ def configure_logging() -> None:
             },
         }
     )
+
+    if settings.logging.queue.enabled:
+        start_queue_logging(
+            logging.getLogger("web.suggest.request"), settings.logging.queue.max_size
+        )
+
+
+def start_queue_logging(logger: logging.Logger, max_size: int) -> QueueListener:
+    """Move the handlers of a logger to a background thread, fed with the records of
+    the logger through a queue of up to `max_size` records.
+
+    Only the capture of the records runs on the calling thread, i.e. the event loop,
+    while their formatting, JSON encoding and writing run on the background thread.
+    Records are dropped when the queue is full, so that bursts of logs can't stall
+    the handling of requests.
+    """
+    global _listener, _queued_logger
+    stop_queue_logging()
+
+    queue: Queue = Queue(maxsize=max_size)
+    _listener = BoundedQueueListener(
+        queue, *logger.handlers, respect_handler_level=True
+    )
+    _queued_logger = logger
+    logger.handlers = [BoundedQueueHandler(queue)]
+    _listener.start()
+    return _listener
+
+
+def stop_queue_logging() -> None:
+    """Stop the background thread emitting the queued logs, if any, after it emits
+    the logs queued so far, then give its handlers back to the logger.
+    """
+    global _listener, _queued_logger
+    if _listener is not None:
+        _listener.stop()
+        # Unless the logger was reconfigured since, e.g. by `configure_logging()`,
+        # its later records would be queued with no listener to emit them.
+        if _queued_logger is not None and [
+            handler.queue
+            for handler in _queued_logger.handlers
+            if isinstance(handler, BoundedQueueHandler)
+        ] == [_listener.queue]:
+            _queued_logger.handlers = list(_listener.handlers)
+        _listener = None
+        _queued_logger = None
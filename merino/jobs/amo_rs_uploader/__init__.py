@@ -110,7 +110,10 @@ async def _upload(
 ):
     logger.info("Fetching addons data from AMO")
     backend = DynamicAmoBackend(config.amo.dynamic.api_url)
-    await backend.fetch_and_cache_addons_info()
+    try:
+        await backend.fetch_and_cache_addons_info()
+    finally:
+        await backend.shutdown()
 
     with ChunkedRemoteSettingsUploader(
         auth=auth,
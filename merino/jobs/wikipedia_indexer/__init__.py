@@ -6,6 +6,7 @@ import typer
 from merino.config import settings as config
 from merino.jobs.wikipedia_indexer.filemanager import FileManager
 from merino.jobs.wikipedia_indexer.indexer import Indexer
+from merino.jobs.wikipedia_indexer.local_indexer import LocalIndexer
 from merino.jobs.wikipedia_indexer.utils import (
     create_blocklist,
     create_elasticsearch_client,
@@ -70,6 +71,24 @@ def index(
     indexer.index_from_export(total_docs, elasticsearch_alias)
 
 
+@indexer_cmd.command()
+def build_local_index(
+    output_path: str = job_settings.local_index_path,
+    suggestions_per_prefix: int = config.providers.wikipedia.es_max_suggestions,
+    blocklist_file_url: str = job_settings.blocklist_file_url,
+    total_docs: int = job_settings.total_docs,
+    gcs_path: str = gcs_path_option,
+    gcp_project: str = gcp_project_option,
+):
+    """Build the local prefix index of the titles from the latest export on GCS"""
+    file_manager = FileManager(gcs_path, gcp_project, "")
+
+    blocklist = create_blocklist(blocklist_file_url)
+
+    local_indexer = LocalIndexer(blocklist, TITLE_BLOCKLIST, file_manager)
+    local_indexer.build_from_export(total_docs, output_path, suggestions_per_prefix)
+
+
 @indexer_cmd.command()
 def copy_export(
     export_base_url: str = job_settings.export_base_url,
@@ -16,6 +16,22 @@ from merino.jobs.wikipedia_indexer.utils import ProgressReporter
 logger = logging.getLogger(__name__)
 
 
+def should_filter(
+    doc: Dict[str, Any], category_blocklist: set[str], title_blocklist: set[str]
+) -> bool:
+    """Return True if we want to filter out this document and not index it.
+    Checks for existence of matching categories or title in both title and category blocklists.
+    The title blocklist is expected to be lowercased.
+    """
+    categories: set[str] = set(doc.get("category", []))
+    title: str = doc.get("title", "")
+    should_filter_category: bool = not category_blocklist.isdisjoint(categories)
+    should_filter_title: bool = (
+        title.lower() in title_blocklist if title != "" else True
+    )
+    return should_filter_category or should_filter_title
+
+
 class Indexer:
     """Index documents from wikimedia search exports into Elasticsearch"""
 
@@ -106,18 +122,8 @@ class Indexer:
             raise Exception("Could not create the index")
 
     def _should_filter(self, doc: Dict[str, Any]) -> bool:
-        """Return True if we want to filter out this document and not index it.
-        Checks for existence of matching categories or title in both title and category blocklists.
-        """
-        categories: set[str] = set(doc.get("category", []))
-        title: str = doc.get("title", "")
-        should_filter_category: bool = not self.category_blocklist.isdisjoint(
-            categories
-        )
-        should_filter_title: bool = (
-            title.lower() in self.title_blocklist if title != "" else True
-        )
-        return should_filter_category or should_filter_title
+        """Return True if we want to filter out this document and not index it."""
+        return should_filter(doc, self.category_blocklist, self.title_blocklist)
 
     def _enqueue(self, index_name: str, tpl: tuple[Mapping[str, Any], ...]):
         op, doc = self._parse_tuple(index_name, tpl)
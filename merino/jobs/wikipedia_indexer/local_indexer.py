@@ -0,0 +1,83 @@
+"""Builds the local prefix index of the Wikipedia titles from the export file"""
+import json
+import logging
+from itertools import islice
+from typing import Iterator
+
+from merino.jobs.wikipedia_indexer.filemanager import FileManager
+from merino.jobs.wikipedia_indexer.indexer import should_filter
+from merino.jobs.wikipedia_indexer.suggestion import Scorer
+from merino.jobs.wikipedia_indexer.utils import ProgressReporter
+from merino.providers.wikipedia.backends.local import write_index
+
+logger = logging.getLogger(__name__)
+
+
+class LocalIndexer:
+    """Build a local prefix index of the titles of the documents from wikimedia search
+    exports, for the `local` backend of the Wikipedia provider.
+    """
+
+    file_manager: FileManager
+    category_blocklist: set[str]
+    title_blocklist: set[str]
+    scorer: Scorer
+
+    def __init__(
+        self,
+        category_blocklist: set[str],
+        title_blocklist: set[str],
+        file_manager: FileManager,
+        max_docs: int = 6_500_000,
+    ):
+        self.file_manager = file_manager
+        self.category_blocklist = category_blocklist
+        self.title_blocklist = {entry.lower() for entry in title_blocklist}
+        self.scorer = Scorer(max_docs)
+
+    def build_from_export(
+        self, total_docs: int, output_path: str, suggestions_per_prefix: int
+    ) -> int:
+        """Read the latest export file directly from GCS, and write the local index of
+        its titles to `output_path`, replacing the previous index atomically. Returns
+        the number of indexed titles.
+        """
+        latest = self.file_manager.get_latest_gcs()
+        if not latest.name:
+            raise RuntimeError("No exports available on GCS")
+
+        logger.info(
+            "Start building the local index",
+            extra={"latest_name": latest.name, "output_path": output_path},
+        )
+        reporter = ProgressReporter(
+            logger, "Building local index", latest.name, output_path, total_docs
+        )
+        indexed = write_index(
+            self._scored_titles(self.file_manager.stream_from_gcs(latest), reporter),
+            output_path,
+            suggestions_per_prefix,
+        )
+        logger.info(
+            "Completed building the local index",
+            extra={"latest_name": latest.name, "indexed": indexed},
+        )
+        return indexed
+
+    def _scored_titles(
+        self, gcs_stream: Iterator[str], reporter: ProgressReporter
+    ) -> Iterator[tuple[str, int]]:
+        """Yield the titles and weights of the documents that aren't filtered out.
+        The export alternates operation lines and document lines.
+        """
+        scored = 0
+        blocked = 0
+        while pair := tuple(islice(gcs_stream, 2)):
+            _, document = pair
+            doc = json.loads(document)
+            if should_filter(doc, self.category_blocklist, self.title_blocklist):
+                blocked += 1
+            else:
+                scored += 1
+                yield doc["title"], int(self.scorer.score(doc))
+            reporter.report(scored, blocked)
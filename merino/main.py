@@ -6,11 +6,12 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from merino import providers
-from merino.config_logging import configure_logging
+from merino import prefork, providers
+from merino.config import settings
+from merino.config_logging import configure_logging, stop_queue_logging
 from merino.config_sentry import configure_sentry
 from merino.metrics import configure_metrics, get_metrics_client
-from merino.middleware import featureflags, geolocation, logging, metrics, user_agent
+from merino.middleware import composite, featureflags, logging, metrics
 from merino.web import api_v1, dockerflow
 
 app = FastAPI()
@@ -26,8 +27,11 @@ async def startup_configuration() -> None:
 
 @app.on_event("startup")
 async def startup_providers() -> None:
-    """Run tasks at application startup."""
-    await providers.init_providers()
+    """Run tasks at application startup. The workers of the pre-fork server skip
+    it, as they inherit the providers initialized by the master process.
+    """
+    if not prefork.is_worker():
+        await providers.init_providers()
 
 
 @app.on_event("shutdown")
@@ -39,6 +43,8 @@ async def shutdown_providers() -> None:
 @app.on_event("shutdown")
 async def shutdown() -> None:
     """Clean up for the application shutdown."""
+    logging.suggest_log_rollup.flush()
+    stop_queue_logging()
     await get_metrics_client().close()
 
 
@@ -52,20 +58,31 @@ async def validation_exception_handler(_, exc) -> JSONResponse:
 
 
 # Note: the order of the following middleware registration matters.
-# Specifically, `LoggingMiddleware` should be added after `CorrelationIdMiddleware` and
-# `GeolocationMiddleware`.
+# Specifically, `LoggingMiddleware` should be added after `CorrelationIdMiddleware`.
+# `CompositeMiddleware` performs the steps of that chain in the same order.
+# Geolocation and user agents aren't middleware, they're looked up lazily with
+# `get_geolocation()` and `get_user_agent()`.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=False,
     allow_methods=["GET", "OPTIONS", "HEAD"],
 )
-app.add_middleware(metrics.MetricsMiddleware)
-app.add_middleware(CorrelationIdMiddleware)
-app.add_middleware(featureflags.FeatureFlagsMiddleware)
-app.add_middleware(geolocation.GeolocationMiddleware)
-app.add_middleware(user_agent.UserAgentMiddleware)
-app.add_middleware(logging.LoggingMiddleware)
+if settings.web.middleware.composite:
+    # A single pass equivalent to the chain below.
+    app.add_middleware(
+        composite.CompositeMiddleware,
+        stage_hook=(
+            composite.record_stage_timing
+            if settings.web.middleware.stage_timing
+            else None
+        ),
+    )
+else:
+    app.add_middleware(metrics.MetricsMiddleware)
+    app.add_middleware(CorrelationIdMiddleware)
+    app.add_middleware(featureflags.FeatureFlagsMiddleware)
+    app.add_middleware(logging.LoggingMiddleware)
 
 app.include_router(dockerflow.router)
 app.include_router(api_v1.router, prefix="/api/v1")
@@ -0,0 +1,149 @@
+"""A composite middleware that performs the steps of the Merino middleware chain in
+one pass.
+
+The chain registered in `merino.main` nests a middleware per step, each of which
+wraps `send` and builds its own `Request` to parse the headers and the query params
+of the scope. `CompositeMiddleware` performs the same steps, in the same order, with
+a single `Request` and a single `send` wrapper:
+
+  - On the request: set the session ID of the feature flags, set the correlation ID,
+    then set up the metrics client.
+  - On the start of the response: record the response metrics, append the
+    correlation ID headers, then log the request.
+
+The duration of each stage can be reported to a `StageHook`, e.g.
+`record_stage_timing()`, which is enabled by `web.middleware.stage_timing`.
+"""
+import logging
+import time
+from asyncio import get_event_loop
+from http import HTTPStatus
+from typing import Callable, Final, Optional
+from uuid import uuid4
+
+from asgi_correlation_id.context import correlation_id
+from asgi_correlation_id.extensions.sentry import get_sentry_extension
+from asgi_correlation_id.middleware import FAILED_VALIDATION_MESSAGE, is_valid_uuid4
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from merino.featureflags import FeatureFlags, session_id_context
+from merino.metrics import Client, get_metrics_client
+from merino.middleware import ScopeKey
+from merino.middleware.logging import log_request
+from merino.middleware.metrics import record_response_metrics
+
+# The header and the logger of `asgi_correlation_id.CorrelationIdMiddleware`.
+CORRELATION_ID_HEADER: Final[str] = "X-Request-ID"
+correlation_id_logger = logging.getLogger("asgi_correlation_id")
+
+# A callable receiving the scope of a request, the name of a stage of the composite
+# middleware, and the duration (in ms) of that stage for the request.
+StageHook = Callable[[Scope, str, float], None]
+
+
+def record_stage_timing(scope: Scope, stage: str, duration: float) -> None:
+    """Record the duration of a middleware stage as the `middleware.<stage>` metric."""
+    client: Optional[Client] = scope.get(ScopeKey.METRICS_CLIENT)
+    (client or get_metrics_client()).timing(f"middleware.{stage}", value=duration)
+
+
+class CompositeMiddleware:
+    """Middleware equivalent to the chain of the feature flags, correlation ID,
+    metrics and logging middleware, in a single pass over the scope.
+    """
+
+    app: ASGIApp
+    stage_hook: Optional[StageHook]
+
+    def __init__(self, app: ASGIApp, stage_hook: Optional[StageHook] = None) -> None:
+        """Initialize the composite middleware, which reports the duration of its
+        stages to `stage_hook`, if any.
+        """
+        self.app = app
+        self.stage_hook = stage_hook
+        self.sentry_extension = get_sentry_extension()
+
+    def _end_stage(self, scope: Scope, stage: str, started_at: float) -> float:
+        """Report the duration of a stage to the stage hook, if any, and return the
+        start time of the next stage.
+        """
+        if self.stage_hook is None:
+            return 0.0
+        now: float = time.perf_counter()
+        self.stage_hook(scope, stage, (now - started_at) * 1000)
+        return now
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Wrap the request with feature flags, a correlation ID, metrics and logs."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stage_started_at: float = (
+            0.0 if self.stage_hook is None else time.perf_counter()
+        )
+        request = Request(scope=scope)
+
+        # Feature flags: bucket the flags within a search session.
+        session_id_context.set(request.query_params.get("sid"))
+        stage_started_at = self._end_stage(scope, "feature_flags", stage_started_at)
+
+        # Correlation ID: reuse the valid request ID of the client, or generate one.
+        header_value: Optional[str] = request.headers.get(CORRELATION_ID_HEADER)
+        if not header_value:
+            id_value = uuid4().hex
+        elif not is_valid_uuid4(header_value):
+            id_value = uuid4().hex
+            correlation_id_logger.warning(FAILED_VALIDATION_MESSAGE, header_value)
+        else:
+            id_value = header_value
+        correlation_id.set(id_value)
+        self.sentry_extension(id_value)
+        stage_started_at = self._end_stage(scope, "correlation_id", stage_started_at)
+
+        # Metrics: the metrics client adds the feature flags as tags.
+        feature_flags = FeatureFlags()
+        client = Client(statsd_client=get_metrics_client(), feature_flags=feature_flags)
+        scope[ScopeKey.FEATURE_FLAGS] = feature_flags
+        scope[ScopeKey.METRICS_CLIENT] = client
+        self._end_stage(scope, "metrics", stage_started_at)
+
+        loop = get_event_loop()
+        started_at = loop.time()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                stage_started_at: float = (
+                    0.0 if self.stage_hook is None else time.perf_counter()
+                )
+                duration = (loop.time() - started_at) * 1000
+                record_response_metrics(client, request, message["status"], duration)
+                stage_started_at = self._end_stage(
+                    scope, "response.metrics", stage_started_at
+                )
+
+                if request_id := correlation_id.get():
+                    headers = MutableHeaders(scope=message)
+                    headers.append(CORRELATION_ID_HEADER, request_id)
+                    headers.append(
+                        "Access-Control-Expose-Headers", CORRELATION_ID_HEADER
+                    )
+                stage_started_at = self._end_stage(
+                    scope, "response.correlation_id", stage_started_at
+                )
+
+                log_request(request, message)
+                self._end_stage(scope, "response.logging", stage_started_at)
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            duration = (loop.time() - started_at) * 1000
+            record_response_metrics(
+                client, request, HTTPStatus.INTERNAL_SERVER_ERROR.value, duration
+            )
+            raise
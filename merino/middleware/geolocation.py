@@ -1,19 +1,42 @@
-"""The middleware that parses geolocation from the client IP address."""
+"""Geolocation of the client IP address of requests.
+
+The geolocation of a request is looked up upon its first access with
+`get_geolocation()`, rather than for every request, since only the suggest endpoint
+uses it. Lookups are cached in-process by IP address, or optionally by network.
+"""
+import ipaddress
 import logging
-from typing import Optional
+from typing import Final, Optional
 
+import aiodogstatsd
 import geoip2.database
 from geoip2.errors import AddressNotFoundError
+from maxminddb import const as maxminddb_const
 from pydantic import BaseModel
 from starlette.requests import Request
-from starlette.types import ASGIApp, Receive, Scope, Send
 
 from merino.config import settings
+from merino.metrics import Client, get_metrics_client
 from merino.middleware import ScopeKey
+from merino.utils.lru_cache import LRUCache
 
 CLIENT_IP_OVERRIDE: str = settings.location.client_ip_override
-
-reader = geoip2.database.Reader(settings.location.maxmind_database)
+MAXMIND_MODES: Final[dict[str, int]] = {
+    "auto": maxminddb_const.MODE_AUTO,
+    "mmap_ext": maxminddb_const.MODE_MMAP_EXT,
+    "mmap": maxminddb_const.MODE_MMAP,
+    "file": maxminddb_const.MODE_FILE,
+    "memory": maxminddb_const.MODE_MEMORY,
+}
+# The prefix lengths of the networks that lookups are cached by, if
+# `location.cache_by_network` is set.
+IPV4_NETWORK_PREFIX: Final[int] = 24
+IPV6_NETWORK_PREFIX: Final[int] = 48
+
+reader = geoip2.database.Reader(
+    settings.location.maxmind_database,
+    mode=MAXMIND_MODES[settings.location.maxmind_mode],
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,49 +51,92 @@ class Location(BaseModel):
     postal_code: Optional[str] = None
 
 
-class GeolocationMiddleware:
-    """An ASGI middleware to parse and populate geolocation from client's IP
-    address.
+# Cached locations are shared by requests, so they must not be modified.
+cache: Optional[LRUCache[str, Location]] = (
+    LRUCache(max_size=settings.location.cache_max_entries)
+    if settings.location.cache_max_entries > 0
+    else None
+)
+CACHE_BY_NETWORK: bool = settings.location.cache_by_network
+
+
+def cache_key(ip_address: str) -> str:
+    """Return the cache key of an IP address, which is its normalized form, or its
+    network if `CACHE_BY_NETWORK` is set.
+
+    Raises:
+        ValueError: If the IP address is invalid.
+    """
+    address = ipaddress.ip_address(ip_address)
+    if not CACHE_BY_NETWORK:
+        return str(address)
+    prefix = IPV4_NETWORK_PREFIX if address.version == 4 else IPV6_NETWORK_PREFIX
+    return str(ipaddress.ip_network((address, prefix), strict=False))
+
+
+def lookup_location(ip_address: str) -> Location:
+    """Look up the geolocation of an IP address in the MaxMind database. Returns an
+    empty location if the address is invalid or unknown.
+    """
+    record = None
+    try:
+        record = reader.city(ip_address)
+    except ValueError:
+        logger.warning("Invalid IP address for geolocation parsing")
+    except AddressNotFoundError:
+        pass
+
+    return (
+        Location(
+            country=record.country.iso_code,
+            region=record.subdivisions[0].iso_code if record.subdivisions else None,
+            city=record.city.names.get("en"),
+            dma=record.location.metro_code,
+            postal_code=record.postal.code if record.postal else None,
+        )
+        if record
+        else Location()
+    )
 
-    The geolocation result `Location` (if any) is stored in
-    `scope[ScopeKey.GEOLOCATION]`.
+
+def cached_lookup_location(
+    ip_address: str, metrics_client: Client | aiodogstatsd.Client
+) -> Location:
+    """Look up the geolocation of an IP address in the cache, then in the MaxMind
+    database. Invalid addresses aren't cached.
     """
+    if cache is None:
+        return lookup_location(ip_address)
+
+    try:
+        key = cache_key(ip_address)
+    except ValueError:
+        return lookup_location(ip_address)
 
-    def __init__(self, app: ASGIApp) -> None:
-        """Initialize."""
-        self.app = app
+    if (location := cache.get(key)) is not None:
+        metrics_client.increment("geolocation.cache.hit")
+        return location
 
-    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        """Parse geolocation through client's IP address and store the result
-        to `scope`.
-        """
-        if scope["type"] != "http":
-            await self.app(scope, receive, send)
-            return
+    metrics_client.increment("geolocation.cache.miss")
+    location = lookup_location(ip_address)
+    cache.set(key, location)
+    return location
 
-        request = Request(scope=scope)
-        record = None
+
+def get_geolocation(request: Request) -> Location:
+    """Return the geolocation of the client IP address of a request.
+
+    It's looked up upon the first access and stored in
+    `request.scope[ScopeKey.GEOLOCATION]` for the next ones. Metrics are recorded with
+    the metrics client of the request, if any.
+    """
+    location: Optional[Location] = request.scope.get(ScopeKey.GEOLOCATION)
+    if location is None:
         ip_address = CLIENT_IP_OVERRIDE or (
             request.client.host or "" if request.client else ""
         )
-        try:
-            record = reader.city(ip_address)
-        except ValueError:
-            logger.warning("Invalid IP address for geolocation parsing")
-        except AddressNotFoundError:
-            pass
-
-        scope[ScopeKey.GEOLOCATION] = (
-            Location(
-                country=record.country.iso_code,
-                region=record.subdivisions[0].iso_code if record.subdivisions else None,
-                city=record.city.names.get("en"),
-                dma=record.location.metro_code,
-                postal_code=record.postal.code if record.postal else None,
-            )
-            if record
-            else Location()
+        location = request.scope[ScopeKey.GEOLOCATION] = cached_lookup_location(
+            ip_address,
+            request.scope.get(ScopeKey.METRICS_CLIENT) or get_metrics_client(),
         )
-
-        await self.app(scope, receive, send)
-        return
+    return location
@@ -1,28 +1,155 @@
-"""The middleware that records various access logs for Merino."""
+"""The middleware that records various access logs for Merino.
+
+Depending on `logging.suggest.mode`, suggest requests are either logged one by one,
+for a sample of the search sessions, or counted and logged as periodic rollups.
+"""
+import hashlib
 import logging
 import re
 import time
+from collections import Counter
 from datetime import datetime
-from typing import Pattern
+from typing import Final, Pattern
 
+from asgi_correlation_id.context import correlation_id
 from starlette.requests import Request
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from merino.config import settings
+from merino.middleware.geolocation import get_geolocation
+from merino.middleware.user_agent import get_user_agent
 from merino.utils.log_data_creators import (
     RequestSummaryLogDataModel,
     SuggestLogDataModel,
+    SuggestRollupLogDataModel,
     create_request_summary_log_data,
     create_suggest_log_data,
 )
 
 # web.suggest.request is used for logs coming from the /suggest endpoint
 suggest_request_logger = logging.getLogger("web.suggest.request")
+# web.suggest.rollup is used for the rollups of the /suggest endpoint requests
+suggest_rollup_logger = logging.getLogger("web.suggest.rollup")
 # all other requests will be logged to request.summary
 logger = logging.getLogger("request.summary")
 
 # The path pattern for the suggest API
 PATTERN: Pattern = re.compile(r"/api/v[1-9]\d*/suggest$")
 
+SUGGEST_LOG_MODE: str = settings.logging.suggest.mode
+SUGGEST_LOG_SAMPLE_RATE: float = settings.logging.suggest.sample_rate
+# Salts the sampling keys, so that the sampled sessions don't correlate with the
+# buckets of the session feature flags, which hash the session IDs too.
+SAMPLING_SALT: Final[bytes] = b"web.suggest.request:"
+# The values that the rollups count as is. Other values of the request paths, methods
+# and `providers` query parameters are counted as "other", so that arbitrary values
+# don't add rollup keys.
+KNOWN_SUGGEST_PATHS: Final[frozenset[str]] = frozenset({"/api/v1/suggest"})
+KNOWN_METHODS: Final[frozenset[str]] = frozenset({"GET", "HEAD"})
+KNOWN_PROVIDERS: Final[frozenset[str]] = frozenset(settings.providers.keys())
+OTHER: Final[str] = "other"
+
+
+def is_sampled(key: str, sample_rate: float) -> bool:
+    """Return whether to log the requests of a sampling key, which is kept for a
+    `sample_rate` fraction of the keys. The decision is the same for a key in all
+    processes.
+    """
+    if sample_rate >= 1.0:
+        return True
+    if sample_rate <= 0.0:
+        return False
+    digest: bytes = hashlib.sha256(SAMPLING_SALT + key.encode()).digest()
+    return int.from_bytes(digest[:8], "big") < sample_rate * (1 << 64)
+
+
+def normalize_requested_providers(providers: str) -> str:
+    """Return the requested providers as a sorted, comma-separated list of the
+    distinct known providers, followed by "other" if any unknown provider is
+    requested.
+    """
+    requested: set[str] = set(providers.split(",")) - {""}
+    normalized: list[str] = sorted(requested & KNOWN_PROVIDERS)
+    if requested - KNOWN_PROVIDERS:
+        normalized.append(OTHER)
+    return ",".join(normalized)
+
+
+def bucket(value: str, known: frozenset[str]) -> str:
+    """Return the value if it's known, else "other"."""
+    return value if value in known else OTHER
+
+
+class SuggestLogRollup:
+    """Counts of the suggest requests by requested providers, country, form factor
+    and status code, logged to `web.suggest.rollup` once per interval.
+
+    The counts are logged upon the first request after the end of an interval, and
+    upon `flush()`, so that no log is emitted while there are no requests.
+    """
+
+    interval_sec: float
+    counts: Counter[tuple[str, str, str, str | None, str, int]]
+    started_at: datetime
+    next_flush_at: float
+
+    def __init__(self, interval_sec: float) -> None:
+        """Initialize an empty rollup."""
+        self.interval_sec = interval_sec
+        self.counts = Counter()
+        self.started_at = datetime.fromtimestamp(time.time())
+        self.next_flush_at = time.monotonic() + interval_sec
+
+    def add(self, request: Request, message: Message) -> None:
+        """Count a suggest request upon the start of its response."""
+        if time.monotonic() >= self.next_flush_at:
+            self.flush()
+        self.counts[
+            (
+                bucket(request.url.path, KNOWN_SUGGEST_PATHS),
+                bucket(request.method, KNOWN_METHODS),
+                normalize_requested_providers(
+                    request.query_params.get("providers", "")
+                ),
+                get_geolocation(request).country,
+                get_user_agent(request).form_factor,
+                message["status"],
+            )
+        ] += 1
+
+    def flush(self) -> None:
+        """Log the counts of the current interval, then start the next one."""
+        dt: datetime = datetime.fromtimestamp(time.time())
+        for (
+            path,
+            method,
+            requested_providers,
+            country,
+            form_factor,
+            code,
+        ), count in self.counts.items():
+            rollup_log_data: SuggestRollupLogDataModel = SuggestRollupLogDataModel(
+                errno=0,
+                time=dt,
+                interval_start=self.started_at,
+                path=path,
+                method=method,
+                requested_providers=requested_providers,
+                country=country,
+                form_factor=form_factor,
+                code=code,
+                count=count,
+            )
+            suggest_rollup_logger.info("", extra=rollup_log_data.dict())
+        self.counts.clear()
+        self.started_at = dt
+        self.next_flush_at = time.monotonic() + self.interval_sec
+
+
+suggest_log_rollup: SuggestLogRollup = SuggestLogRollup(
+    settings.logging.suggest.rollup_interval_sec
+)
+
 
 class LoggingMiddleware:
     """An ASGI middleware for logging."""
@@ -39,20 +166,37 @@ class LoggingMiddleware:
 
         async def send_wrapper(message: Message) -> None:
             if message["type"] == "http.response.start":
-                request = Request(scope=scope)
-                dt: datetime = datetime.fromtimestamp(time.time())
-                if PATTERN.match(request.url.path):
-                    suggest_log_data: SuggestLogDataModel = create_suggest_log_data(
-                        request, message, dt
-                    )
-                    suggest_request_logger.info("", extra=suggest_log_data.dict())
-                else:
-                    request_log_data: RequestSummaryLogDataModel = (
-                        create_request_summary_log_data(request, message, dt)
-                    )
-                    logger.info("", extra=request_log_data.dict())
+                log_request(Request(scope=scope), message)
 
             await send(message)
 
         await self.app(scope, receive, send_wrapper)
         return
+
+
+def log_request(request: Request, message: Message) -> None:
+    """Log a request upon the start of its response, to the suggest request logger
+    (or rollup) for the suggest API or to the request summary logger otherwise.
+    """
+    if PATTERN.match(request.url.path):
+        if SUGGEST_LOG_MODE == "rollup":
+            suggest_log_rollup.add(request, message)
+            return
+        # Sample by search session, so that sessions are logged entirely or not at
+        # all. Requests without a session are sampled by request ID, if any.
+        if SUGGEST_LOG_SAMPLE_RATE < 1.0 and not is_sampled(
+            request.query_params.get("sid") or correlation_id.get() or "",
+            SUGGEST_LOG_SAMPLE_RATE,
+        ):
+            return
+        dt: datetime = datetime.fromtimestamp(time.time())
+        suggest_log_data: SuggestLogDataModel = create_suggest_log_data(
+            request, message, dt
+        )
+        suggest_request_logger.info("", extra=suggest_log_data.dict())
+    else:
+        dt = datetime.fromtimestamp(time.time())
+        request_log_data: RequestSummaryLogDataModel = create_request_summary_log_data(
+            request, message, dt
+        )
+        logger.info("", extra=request_log_data.dict())
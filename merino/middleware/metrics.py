@@ -54,39 +54,41 @@ class MetricsMiddleware:
             if message["type"] == "http.response.start":
                 duration = (loop.time() - started_at) * 1000
 
-                status_code = message["status"]
-                # don't track NOT_FOUND statuses by path.
-                # Instead we will track those within a general `response.status_codes` metric.
-                if status_code != HTTPStatus.NOT_FOUND.value:
-                    metric_name = self._build_metric_name(
-                        request.method, request.url.path
-                    )
-                    client.timing(
-                        f"{metric_name}.timing",
-                        value=duration,
-                    )
-                    client.increment(
-                        f"{metric_name}.status_codes.{status_code}",
-                    )
-
-                # track all status codes here.
-                client.increment(f"response.status_codes.{status_code}")
+                record_response_metrics(client, request, message["status"], duration)
 
             await send(message)
 
         try:
             await self.app(scope, receive, send_wrapper)
         except Exception:
-            status_code = HTTPStatus.INTERNAL_SERVER_ERROR.value
             duration = (loop.time() - started_at) * 1000
-            metric_name = self._build_metric_name(request.method, request.url.path)
-            client.timing(f"{metric_name}.timing", value=duration)
-            client.increment(f"{metric_name}.status_codes.{status_code}")
-            client.increment(f"response.status_codes.{status_code}")
+            record_response_metrics(
+                client, request, HTTPStatus.INTERNAL_SERVER_ERROR.value, duration
+            )
             raise
 
-    @cache
-    def _build_metric_name(self, method: str, path: str) -> str:
-        return "{}.{}".format(
-            method, path.lower().lstrip("/").replace("/", ".")
-        ).lower()
+
+@cache
+def build_metric_name(method: str, path: str) -> str:
+    """Return the name of the metrics of an HTTP method for a URL path."""
+    return "{}.{}".format(method, path.lower().lstrip("/").replace("/", ".")).lower()
+
+
+def record_response_metrics(
+    client: Client, request: Request, status_code: int, duration: float
+) -> None:
+    """Record the status code and the duration (in ms) of the response to a request."""
+    # don't track NOT_FOUND statuses by path.
+    # Instead we will track those within a general `response.status_codes` metric.
+    if status_code != HTTPStatus.NOT_FOUND.value:
+        metric_name = build_metric_name(request.method, request.url.path)
+        client.timing(
+            f"{metric_name}.timing",
+            value=duration,
+        )
+        client.increment(
+            f"{metric_name}.status_codes.{status_code}",
+        )
+
+    # track all status codes here.
+    client.increment(f"response.status_codes.{status_code}")
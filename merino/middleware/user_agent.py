@@ -1,15 +1,29 @@
-"""The middleware that parses the "User-Agent" from the HTTP request header.
+"""Parsing of the "User-Agent" header of requests.
 
-Note that Merino is a service made for Firefox users, this middleware only
-focuses on Firefox related user agents.
+The user agent of a request is parsed upon its first access with `get_user_agent()`,
+rather than for every request, since only the suggest log uses it. As the distinct
+"User-Agent" strings are relatively few, parsed user agents are cached in-process.
+
+Note that Merino is a service made for Firefox users, the parsing only focuses on
+Firefox related user agents.
 """
+import time
+from typing import Final, Optional
+
+import aiodogstatsd
 from pydantic import BaseModel
-from starlette.datastructures import Headers
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.requests import Request
 
+from merino.config import settings
+from merino.metrics import Client, get_metrics_client
 from merino.middleware import ScopeKey
+from merino.utils.lru_cache import LRUCache
 from merino.utils.user_agent_parsing import parse
 
+# "User-Agent" strings longer than this aren't cached, as they aren't sent by
+# browsers, and would let a client fill up the cache with large keys.
+MAX_CACHED_LENGTH: Final[int] = 512
+
 
 class UserAgent(BaseModel):
     """Data model for user agent information.
@@ -26,29 +40,56 @@ class UserAgent(BaseModel):
     form_factor: str
 
 
-class UserAgentMiddleware:
-    """An ASGI middleware to parse and populate user agent information from
-    `User-Agent` header.
+# Cached user agents are shared by requests, so they must not be modified.
+cache: Optional[LRUCache[str, UserAgent]] = (
+    LRUCache(max_size=settings.user_agent.cache_max_entries)
+    if settings.user_agent.cache_max_entries > 0
+    else None
+)
+
 
-    The user agent result `UserAgent` (if any) is stored in
-    `scope[ScopeKey.USER_AGENT]`.
+def parse_user_agent(
+    ua_str: str, metrics_client: Client | aiodogstatsd.Client
+) -> UserAgent:
+    """Parse a "User-Agent" string, recording the parse time."""
+    started_at: float = time.perf_counter()
+    user_agent = UserAgent(**parse(ua_str))
+    metrics_client.timing(
+        "user_agent.parse", value=(time.perf_counter() - started_at) * 1000
+    )
+    return user_agent
+
+
+def cached_parse_user_agent(
+    ua_str: str, metrics_client: Client | aiodogstatsd.Client
+) -> UserAgent:
+    """Parse a "User-Agent" string, or return it from the cache if it was parsed
+    already.
     """
+    if cache is None or len(ua_str) > MAX_CACHED_LENGTH:
+        return parse_user_agent(ua_str, metrics_client)
 
-    def __init__(self, app: ASGIApp) -> None:
-        """Initialize."""
-        self.app = app
+    if (user_agent := cache.get(ua_str)) is not None:
+        metrics_client.increment("user_agent.cache.hit")
+        return user_agent
 
-    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        """Parse user agent information through "User-Agent" and store the result
-        to `scope`.
-        """
-        if scope["type"] != "http":
-            await self.app(scope, receive, send)
-            return
+    metrics_client.increment("user_agent.cache.miss")
+    user_agent = parse_user_agent(ua_str, metrics_client)
+    cache.set(ua_str, user_agent)
+    return user_agent
 
-        ua = parse(Headers(scope=scope).get("User-Agent", ""))
 
-        scope[ScopeKey.USER_AGENT] = UserAgent(**ua)
+def get_user_agent(request: Request) -> UserAgent:
+    """Return the user agent of a request, parsed from its "User-Agent" header.
 
-        await self.app(scope, receive, send)
-        return
+    It's parsed upon the first access and stored in `request.scope[ScopeKey.USER_AGENT]`
+    for the next ones. Metrics are recorded with the metrics client of the request,
+    if any.
+    """
+    user_agent: Optional[UserAgent] = request.scope.get(ScopeKey.USER_AGENT)
+    if user_agent is None:
+        user_agent = request.scope[ScopeKey.USER_AGENT] = cached_parse_user_agent(
+            request.headers.get("User-Agent", ""),
+            request.scope.get(ScopeKey.METRICS_CLIENT) or get_metrics_client(),
+        )
+    return user_agent
@@ -0,0 +1,301 @@
+"""A pre-fork server for Merino.
+
+Serving Merino with several Uvicorn workers makes each worker initialize the
+providers on its own, i.e. parse the Top Picks file, download the Remote Settings
+attachments and build the keyword indices once per worker. The pre-fork server
+initializes the providers once in the master process instead, then forks the workers,
+which inherit the provider data copy-on-write. The garbage collector is frozen before
+forking, so that collections in the workers don't write to, hence copy, the pages of
+the inherited objects.
+
+The workers don't resync the provider data on their own. Every
+`runtime.prefork.reload_interval_sec`, or upon a SIGHUP, the master reinitializes the
+providers and replaces the workers one at a time, so that the workers all serve the
+same data and Remote Settings gets fetched once per host, whatever the number of
+workers.
+
+Usage:
+    $ python -m merino.prefork
+"""
+import asyncio
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from types import FrameType
+from typing import Any, Coroutine, Optional
+
+import uvicorn
+
+from merino import providers
+from merino.config import settings
+from merino.config_logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# The interval (in seconds) at which the master checks on its workers.
+POLL_INTERVAL_SEC: float = 0.5
+
+_is_worker: bool = False
+
+
+def is_worker() -> bool:
+    """Return whether this is a worker process of the pre-fork server, which
+    inherited the providers initialized by the master process.
+    """
+    return _is_worker
+
+
+class PreforkServer:
+    """The master process of the pre-fork server."""
+
+    host: str
+    port: int
+    workers: int
+    reload_interval_sec: float
+    graceful_timeout_sec: float
+    pids: set[int]
+    _socket: Optional[socket.socket]
+    _loop: Optional[asyncio.AbstractEventLoop]
+    _stopping: bool
+    _reload_requested: bool
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        workers: int,
+        reload_interval_sec: float,
+        graceful_timeout_sec: float,
+    ) -> None:
+        """Initialize the server.
+
+        Raises:
+            ValueError: If `workers` or `reload_interval_sec` is not positive, or
+            `graceful_timeout_sec` is negative.
+        """
+        if workers <= 0:
+            raise ValueError("The pre-fork server `workers` must be positive")
+        if reload_interval_sec <= 0:
+            raise ValueError(
+                "The pre-fork server `reload_interval_sec` must be positive"
+            )
+        if graceful_timeout_sec < 0:
+            raise ValueError(
+                "The pre-fork server `graceful_timeout_sec` must not be negative"
+            )
+
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.reload_interval_sec = reload_interval_sec
+        self.graceful_timeout_sec = graceful_timeout_sec
+        self.pids = set()
+        self._socket = None
+        self._loop = None
+        self._stopping = False
+        self._reload_requested = False
+
+    def run(self) -> None:
+        """Initialize the providers, fork the workers and supervise them until a
+        SIGINT or a SIGTERM is received.
+        """
+        # Postpone the collections until the providers are frozen, so that they don't
+        # leave holes in the pages that the workers inherit, as recommended by the
+        # `gc.freeze()` documentation.
+        gc.disable()
+        # Import the app before forking, so that the workers share its modules too.
+        from merino.main import app
+
+        config = uvicorn.Config(app, host=self.host, port=self.port, proxy_headers=True)
+        sock: socket.socket = config.bind_socket()
+        self._socket = sock
+        self.init_providers()
+
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        for _ in range(self.workers):
+            self.spawn_worker(config)
+        next_reload_at: float = time.monotonic() + self.reload_interval_sec
+
+        while not self._stopping:
+            time.sleep(POLL_INTERVAL_SEC)
+            for pid in self.reap_workers():
+                if not self._stopping:
+                    logger.warning(
+                        "Pre-fork worker exited unexpectedly", extra={"pid": pid}
+                    )
+                    self.spawn_worker(config)
+            if self._reload_requested or time.monotonic() >= next_reload_at:
+                self._reload_requested = False
+                next_reload_at = time.monotonic() + self.reload_interval_sec
+                if self.init_providers():
+                    self.replace_workers(config)
+
+        for pid in list(self.pids):
+            self.stop_worker(pid)
+        sock.close()
+        self.close()
+        logger.info("Pre-fork server stopped")
+
+    def init_providers(self) -> bool:
+        """(Re)initialize the providers in the master process, then freeze them.
+
+        The providers are initialized on the event loop of the master, which only runs
+        meanwhile. They don't resync their data in the background, and close the
+        connections they only needed to fetch it, so that the workers don't inherit
+        them. The previous providers, if replaced, are shut down on the same loop. If
+        the initialization fails, the previous providers, if any, are kept.
+
+        Returns:
+            Whether the providers were initialized.
+        """
+        gc.unfreeze()
+        previous_providers, previous_default_providers = (
+            dict(providers.providers),
+            list(providers.default_providers),
+        )
+        providers.providers.clear()
+        providers.default_providers.clear()
+        try:
+            self._run(providers.init_providers(resync_in_background=False))
+        except Exception as exc:
+            if not previous_providers:
+                raise
+            logger.warning(
+                "Failed to reload the providers, keeping the previous ones",
+                extra={"error message": f"{exc}"},
+            )
+            replaced_providers = dict(providers.providers)
+            providers.providers.clear()
+            providers.providers.update(previous_providers)
+            providers.default_providers.clear()
+            providers.default_providers.extend(previous_default_providers)
+            initialized = False
+        else:
+            replaced_providers = previous_providers
+            initialized = True
+
+        if replaced_providers:
+            self._run(providers.shutdown_providers(replaced_providers))
+        # Collect the replaced providers and the garbage of the initialization before
+        # moving everything allocated so far, including the providers, to the
+        # permanent generation, which collections ignore.
+        del previous_providers, previous_default_providers, replaced_providers
+        gc.collect()
+        gc.freeze()
+        return initialized
+
+    def close(self) -> None:
+        """Shut down the providers and close the event loop of the master."""
+        if self._loop is None:
+            return
+        self._run(providers.shutdown_providers())
+        self._loop.close()
+        self._loop = None
+
+    def _run(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        """Run a coroutine on the event loop of the master, which is kept across the
+        reloads so that the providers can be shut down on the loop that opened their
+        connections.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(coroutine)
+
+    def spawn_worker(self, config: uvicorn.Config) -> int:
+        """Fork a worker that serves the app on the shared socket."""
+        pid: int = os.fork()
+        if pid == 0:  # pragma: no cover
+            # The worker process, which never returns.
+            global _is_worker
+            _is_worker = True
+            exit_code: int = 0
+            try:
+                # Uvicorn handles SIGINT and SIGTERM once it's started.
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+                gc.enable()
+                uvicorn.Server(config).run(sockets=[self._socket])
+            except BaseException:
+                logger.exception("Pre-fork worker failed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        self.pids.add(pid)
+        logger.info("Pre-fork worker started", extra={"pid": pid})
+        return pid
+
+    def stop_worker(self, pid: int) -> None:
+        """Stop a worker gracefully, killing it if it doesn't exit within
+        `graceful_timeout_sec`.
+        """
+        try:
+            os.kill(pid, signal.SIGTERM)
+            deadline: float = time.monotonic() + self.graceful_timeout_sec
+            while os.waitpid(pid, os.WNOHANG) == (0, 0):
+                if time.monotonic() >= deadline:
+                    logger.warning("Killing pre-fork worker", extra={"pid": pid})
+                    os.kill(pid, signal.SIGKILL)
+                    os.waitpid(pid, 0)
+                    break
+                time.sleep(POLL_INTERVAL_SEC / 10)
+        except ChildProcessError:
+            # It was reaped already.
+            pass
+        self.pids.discard(pid)
+        logger.info("Pre-fork worker stopped", extra={"pid": pid})
+
+    def replace_workers(self, config: uvicorn.Config) -> None:
+        """Replace the workers one at a time with workers forked from the reloaded
+        providers. A new worker starts before an old one stops, so that the socket is
+        always served.
+        """
+        for pid in list(self.pids):
+            self.spawn_worker(config)
+            self.stop_worker(pid)
+        logger.info("Pre-fork workers replaced", extra={"workers": len(self.pids)})
+
+    def reap_workers(self) -> list[int]:
+        """Reap the workers that exited and return their IDs."""
+        exited: list[int] = []
+        for pid in list(self.pids):
+            if os.waitpid(pid, os.WNOHANG) != (0, 0):
+                self.pids.discard(pid)
+                exited.append(pid)
+        return exited
+
+    def _handle_stop(self, signum: int, frame: Optional[FrameType]) -> None:
+        """Stop the server upon a SIGINT or a SIGTERM."""
+        self._stopping = True
+
+    def _handle_reload(self, signum: int, frame: Optional[FrameType]) -> None:
+        """Reload the providers and replace the workers upon a SIGHUP."""
+        self._reload_requested = True
+
+
+def main() -> None:
+    """Run the pre-fork server with the `runtime.prefork` settings."""
+    configure_logging()
+    PreforkServer(
+        host=settings.runtime.prefork.host,
+        port=settings.runtime.prefork.port,
+        workers=settings.runtime.prefork.workers,
+        reload_interval_sec=settings.runtime.prefork.reload_interval_sec,
+        graceful_timeout_sec=settings.runtime.prefork.graceful_timeout_sec,
+    ).run()
+
+
+if __name__ == "__main__":
+    # Run the server from the `merino.prefork` module rather than from `__main__`,
+    # so that the app sees the worker state it sets.
+    from merino import prefork
+
+    prefork.main()
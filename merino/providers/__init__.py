@@ -2,6 +2,7 @@
 import asyncio
 import logging
 from timeit import default_timer as timer
+from typing import Optional
 
 from merino import metrics
 from merino.providers.base import BaseProvider
@@ -13,15 +14,19 @@ default_providers: list[BaseProvider] = []
 logger = logging.getLogger(__name__)
 
 
-async def init_providers() -> None:
+async def init_providers(resync_in_background: bool = True) -> None:
     """Initialize all suggestion providers.
 
-    This should only be called once at the startup of application.
+    This should only be called once at the startup of application, or by the master
+    process of the pre-fork server, which passes `resync_in_background=False` as it
+    reloads the providers itself.
     """
     start = timer()
 
     # register providers
     providers.update(load_providers())
+    for provider in providers.values():
+        provider.resync_in_background = resync_in_background
 
     # initialize providers and record time
     init_metric = "providers.initialize"
@@ -41,18 +46,26 @@ async def init_providers() -> None:
         )
 
 
-async def shutdown_providers() -> None:
-    """Shut down all suggestion providers.
+async def shutdown_providers(
+    providers_to_shut_down: Optional[dict[str, BaseProvider]] = None
+) -> None:
+    """Shut down all suggestion providers, or the given ones.
 
-    This should only be called once at the shutdown of application.
+    This should only be called once at the shutdown of application, or by the master
+    process of the pre-fork server, which shuts down the providers it replaces.
     """
     start = timer()
+    if providers_to_shut_down is None:
+        providers_to_shut_down = providers
 
-    for provider in providers.values():
+    for provider in providers_to_shut_down.values():
         await provider.shutdown()
     logger.info(
         "Provider shutdown completed",
-        extra={"providers": [*providers.keys()], "elapsed": timer() - start},
+        extra={
+            "providers": [*providers_to_shut_down.keys()],
+            "elapsed": timer() - start,
+        },
     )
 
 
@@ -9,3 +9,7 @@ class FakeAdmBackend:  # pragma: no cover
     async def fetch(self) -> SuggestionContent:
         """Get fake Content from partner."""
         return SuggestionContent()
+
+    async def shutdown(self) -> None:
+        """Nothing to shut down."""
+        return None
@@ -3,13 +3,17 @@ from typing import Any, Protocol
 
 from pydantic import BaseModel
 
+from merino.utils.keyword_index import KeywordIndex
+
 
 class SuggestionContent(BaseModel):
     """Class that holds the result from a fetch operation."""
 
-    # A dictionary keyed on suggestion keywords, each value stores an index
-    # (pointer) to one entry of the suggestion result list.
-    suggestions: dict[str, tuple[int, int]]
+    # A mapping keyed on suggestion keywords, each value stores an index
+    # (pointer) to one entry of the suggestion result list and an index to one
+    # entry of the full keyword list. It's either a dictionary or, for a smaller
+    # memory footprint, a compact `KeywordIndex`.
+    suggestions: KeywordIndex | dict[str, tuple[int, int]]
 
     # A list of full keywords
     full_keywords: list[str]
@@ -20,6 +24,11 @@ class SuggestionContent(BaseModel):
     # A dictionary of icon IDs to icon URLs.
     icons: dict[int, str]
 
+    class Config:
+        """Allow the `KeywordIndex` type, which is validated by an instance check."""
+
+        arbitrary_types_allowed = True
+
 
 class AdmBackend(Protocol):
     """Protocol for an AdM backend that this provider depends on.
@@ -30,5 +39,13 @@ class AdmBackend(Protocol):
     """
 
     async def fetch(self) -> SuggestionContent:  # pragma: no cover
-        """Get suggestion content from partner."""
+        """Get suggestion content from partner.
+
+        Backends may return the very same `SuggestionContent` object as the
+        previous call to signal that the content hasn't changed since.
+        """
+        ...
+
+    async def shutdown(self) -> None:  # pragma: no cover
+        """Shut down connections to the backend."""
         ...
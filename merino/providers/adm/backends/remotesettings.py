@@ -10,8 +10,11 @@ from pydantic import BaseModel
 
 from merino.exceptions import BackendError
 from merino.providers.adm.backends.protocol import SuggestionContent
+from merino.utils.http_client import create_http_client
+from merino.utils.keyword_index import KeywordIndex
 
 RecordType = Literal["data", "icon", "offline-expansion-data"]
+KeywordIndexType = Literal["dict", "compact", "mmap"]
 
 
 class KintoSuggestion(BaseModel):
@@ -37,31 +40,75 @@ class RemoteSettingsBackend:
     """Backend that connects to a live Remote Settings server."""
 
     kinto_http_client: kinto_http.AsyncClient
-
-    def __init__(self, server: str, collection: str, bucket: str) -> None:
-        """Init the Remote Settings backend and create a new client.
+    http_client: httpx.AsyncClient
+    keyword_index: KeywordIndexType
+    mmap_index_dir: str
+    # The content of the last fetch and the version of the records it was built
+    # from, i.e. the collection timestamp (the latest `last_modified` of the
+    # records) and the number of records, which changes upon record deletions.
+    suggestion_content: SuggestionContent | None
+    records_version: tuple[int, int] | None
+    # Parsed attachments of the last fetch keyed by record ID, along with the
+    # attachment hash they were downloaded for.
+    attachments: dict[str, tuple[str, list[KintoSuggestion]]]
+
+    def __init__(
+        self,
+        server: str,
+        collection: str,
+        bucket: str,
+        keyword_index: KeywordIndexType = "dict",
+        http_timeout_sec: float | None = None,
+        mmap_index_dir: str = "",
+    ) -> None:
+        """Init the Remote Settings backend and create new clients.
 
         Args:
             server: the server address
             collection: the collection name
             bucket: the bucket name
+            keyword_index: the representation of the fetched suggestion keywords,
+                either "dict", "compact" or "mmap" (see `KeywordIndex`)
+            http_timeout_sec: the timeout of attachment downloads, which defaults
+                to the `http_client.timeout_sec` setting
+            mmap_index_dir: the directory of the keyword index files shared by the
+                workers of the host, for the "mmap" keyword index
         Raises:
             ValueError: If 'server', 'collection' or 'bucket' parameters are None or
-                        empty.
+                        empty, or if 'mmap_index_dir' isn't specified for the "mmap"
+                        keyword index.
         """
         if not server or not collection or not bucket:
             raise ValueError(
                 "The Remote Settings 'server', 'collection' or 'bucket' parameters "
                 "are not specified"
             )
+        if keyword_index == "mmap" and not mmap_index_dir:
+            raise ValueError(
+                "The 'mmap_index_dir' parameter is not specified for the mmap keyword "
+                "index"
+            )
 
         self.kinto_http_client = kinto_http.AsyncClient(
             server_url=server, bucket=bucket, collection=collection
         )
+        self.http_client = create_http_client(
+            name="remote_settings", timeout_sec=http_timeout_sec
+        )
+        self.keyword_index = keyword_index
+        self.mmap_index_dir = mmap_index_dir
+        self.suggestion_content = None
+        self.records_version = None
+        self.attachments = {}
 
     async def fetch(self) -> SuggestionContent:
         """Fetch suggestions, keywords, and icons from Remote Settings.
 
+        The fetch is incremental: if the records haven't changed since the last
+        fetch, the previous content (the same object) is returned as is. Otherwise,
+        only attachments whose hash changed are downloaded, and the content is
+        rebuilt from those and the attachments of the previous fetch.
+
         Raises:
             RemoteSettingsError: Failed request to Remote Settings.
         """
@@ -72,6 +119,13 @@ class RemoteSettingsBackend:
 
         records: list[dict[str, Any]] = await self.get_records()
 
+        records_version: tuple[int, int] = self.get_records_version(records)
+        if (
+            self.suggestion_content is not None
+            and records_version == self.records_version
+        ):
+            return self.suggestion_content
+
         attachment_host: str = await self.get_attachment_host()
 
         rs_suggestions: list[KintoSuggestion] = await self.get_suggestions(
@@ -100,12 +154,56 @@ class RemoteSettingsBackend:
                 base=attachment_host, url=icon["attachment"]["location"]
             )
 
-        return SuggestionContent(
-            suggestions=suggestions,
-            full_keywords=full_keywords,
-            results=results,
-            icons=icons,
+        if self.keyword_index == "compact":
+            # Sorting and packing the full adM dataset is CPU-bound, hence it's
+            # done in a separate thread.
+            suggestion_content = SuggestionContent(
+                suggestions=await asyncio.to_thread(KeywordIndex, suggestions.items()),
+                full_keywords=full_keywords,
+                results=results,
+                icons=icons,
+            )
+        elif self.keyword_index == "mmap":
+            # The first worker of the host to fetch these suggestions builds and
+            # saves the index, the other workers map the same file.
+            suggestion_content = SuggestionContent(
+                suggestions=await asyncio.to_thread(
+                    KeywordIndex.load_or_create,
+                    self.mmap_index_dir,
+                    "adm-keywords",
+                    suggestions.items(),
+                ),
+                full_keywords=full_keywords,
+                results=results,
+                icons=icons,
+            )
+        else:
+            suggestion_content = SuggestionContent(
+                suggestions=suggestions,
+                full_keywords=full_keywords,
+                results=results,
+                icons=icons,
+            )
+
+        self.suggestion_content = suggestion_content
+        self.records_version = records_version
+        return suggestion_content
+
+    @staticmethod
+    def get_records_version(records: list[dict[str, Any]]) -> tuple[int, int]:
+        """Get the version of the records, i.e. the collection timestamp and the
+        number of records. Any record creation or update bumps the timestamp, and
+        any deletion changes the number of records.
+
+        Args:
+            records: List of Remote Settings records
+        Returns:
+            tuple[int, int]: The collection timestamp and the number of records
+        """
+        timestamp: int = max(
+            (record.get("last_modified", 0) for record in records), default=0
         )
+        return timestamp, len(records)
 
     async def get_records(self) -> list[dict[str, Any]]:
         """Get records from the Remote Settings server.
@@ -140,6 +238,10 @@ class RemoteSettingsBackend:
     ) -> list[KintoSuggestion]:
         """Get suggestion data from all data records.
 
+        Attachments are only downloaded if their hash differs from the one of
+        the previous call, otherwise the previously downloaded suggestions are
+        reused.
+
         Args:
             attachment_host: The attachment base URL
             records: List of Remote Settings records
@@ -153,26 +255,39 @@ class RemoteSettingsBackend:
             "offline-expansion-data", records
         ) or self.filter_records("data", records)
 
-        tasks: list[Task] = []
+        tasks: dict[str, Task] = {}
         try:
             async with asyncio.TaskGroup() as task_group:
                 for record in data_records:
-                    tasks.append(
-                        task_group.create_task(
-                            self.get_attachment(
-                                url=urljoin(
-                                    base=attachment_host,
-                                    url=record["attachment"]["location"],
-                                )
+                    if (
+                        cached := self.attachments.get(record["id"])
+                    ) is not None and cached[0] == record["attachment"]["hash"]:
+                        continue
+                    tasks[record["id"]] = task_group.create_task(
+                        self.get_attachment(
+                            url=urljoin(
+                                base=attachment_host,
+                                url=record["attachment"]["location"],
                             )
                         )
                     )
         except ExceptionGroup as error_group:
             raise RemoteSettingsError(error_group.exceptions)
 
+        attachments: dict[str, tuple[str, list[KintoSuggestion]]] = {
+            record["id"]: (
+                (record["attachment"]["hash"], await tasks[record["id"]])
+                if record["id"] in tasks
+                else self.attachments[record["id"]]
+            )
+            for record in data_records
+        }
+        # Only keep the attachments of the current records.
+        self.attachments = attachments
+
         suggestions: list[KintoSuggestion] = []
-        for task in tasks:
-            suggestions.extend(await task)
+        for _, attachment in attachments.values():
+            suggestions.extend(attachment)
         return suggestions
 
     async def get_attachment(self, url: str) -> list[KintoSuggestion]:
@@ -185,13 +300,16 @@ class RemoteSettingsBackend:
         Raises:
             RemoteSettingsError: Failed request to Remote Settings.
         """
-        async with httpx.AsyncClient() as httpx_client:
-            try:
-                response: httpx.Response = await httpx_client.get(url)
-                response.raise_for_status()
-            except httpx.HTTPError as error:
-                raise RemoteSettingsError("Failed to get attachment") from error
-            return [KintoSuggestion(**data) for data in response.json()]
+        try:
+            response: httpx.Response = await self.http_client.get(url)
+            response.raise_for_status()
+        except httpx.HTTPError as error:
+            raise RemoteSettingsError("Failed to get attachment") from error
+        return [KintoSuggestion(**data) for data in response.json()]
+
+    async def shutdown(self) -> None:
+        """Close the HTTP client and its connections."""
+        await self.http_client.aclose()
 
     def filter_records(
         self, record_type: RecordType, records: list[dict[str, Any]]
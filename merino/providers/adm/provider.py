@@ -5,11 +5,11 @@ import time
 from enum import Enum, unique
 from typing import Any, Final, Optional
 
-from pydantic import HttpUrl
+from pydantic import HttpUrl, ValidationError
 
 from merino import cron
 from merino.providers.adm.backends.protocol import AdmBackend, SuggestionContent
-from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
+from merino.providers.base import BaseSuggestion, NonBlockingProvider, SuggestionRequest
 
 logger = logging.getLogger(__name__)
 
@@ -54,10 +54,16 @@ class NonsponsoredSuggestion(BaseSuggestion):
     click_url: Optional[HttpUrl] = None
 
 
-class Provider(BaseProvider):
+class Provider(NonBlockingProvider):
     """Suggestion provider for adMarketplace through Remote Settings."""
 
+    _cacheable = True
+
     suggestion_content: SuggestionContent
+    # Suggestions built from `suggestion_content` upon each fetch, keyed by the
+    # full keyword ID. This saves the model construction and URL validation from
+    # the hot path of `query()`.
+    suggestions: dict[int, BaseSuggestion]
     # Store the value to avoid fetching it from settings every time as that'd
     # require a three-way dict lookup.
     score: float
@@ -85,6 +91,7 @@ class Provider(BaseProvider):
         self.suggestion_content = SuggestionContent(
             suggestions={}, full_keywords=[], results=[], icons={}
         )
+        self.suggestions = {}
         self._name = name
         self._enabled_by_default = enabled_by_default
         super().__init__(**kwargs)
@@ -102,6 +109,12 @@ class Provider(BaseProvider):
             # the fetch upon the next tick.
             self.last_fetch_at = 0
 
+        if not self.resync_in_background:
+            # The backend is only used to fetch once, so close its connections
+            # rather than leave them to the workers of the pre-fork server.
+            await self.backend.shutdown()
+            return
+
         # Run a cron job that resyncs data from Remote Settings in the background.
         cron_job = cron.Job(
             name="resync_rs_data",
@@ -120,8 +133,25 @@ class Provider(BaseProvider):
 
     async def _fetch(self) -> None:
         """Fetch suggestions, keywords, and icons from Remote Settings."""
-        self.suggestion_content = await self.backend.fetch()
+        suggestion_content = await self.backend.fetch()
+        if suggestion_content is self.suggestion_content:
+            # The backend returns the same content if nothing has changed since the
+            # last fetch, there's nothing to rebuild nor to invalidate.
+            self.last_fetch_at = time.time()
+            return
+
+        # Build suggestions in a separate thread, like the Top Picks backend builds
+        # its indices, as it's CPU-bound for the full adM dataset.
+        suggestions = await asyncio.to_thread(
+            self.build_suggestions, suggestion_content
+        )
+        self.suggestion_content, self.suggestions = suggestion_content, suggestions
         self.last_fetch_at = time.time()
+        self.invalidate_cached_results()
+
+    async def shutdown(self) -> None:
+        """Shut down the provider."""
+        await self.backend.shutdown()
 
     def hidden(self) -> bool:  # noqa: D102
         return False
@@ -130,36 +160,72 @@ class Provider(BaseProvider):
         """Convert a query string to lowercase and remove trailing spaces."""
         return query.strip().lower()
 
-    async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
-        """Provide suggestion for a given query."""
-        q: str = srequest.query
-        if (suggest_look_ups := self.suggestion_content.suggestions.get(q)) is not None:
-            results_id, fkw_id = suggest_look_ups
-            res = self.suggestion_content.results[results_id]
-            is_sponsored = res.get("iab_category") == IABCategory.SHOPPING
-            score = (
-                self.score_wikipedia
-                if (advertiser := res.get("advertiser")) == "Wikipedia"
-                else self.score
-            )
-            suggestion_dict = {
-                "block_id": res.get("id"),
-                "full_keyword": self.suggestion_content.full_keywords[fkw_id],
-                "title": res.get("title"),
-                "url": res.get("url"),
-                "impression_url": res.get("impression_url"),
-                "click_url": res.get("click_url"),
-                "provider": self.name,
-                "advertiser": advertiser,
-                "is_sponsored": is_sponsored,
-                "icon": self.suggestion_content.icons.get(
-                    int(res.get("icon", MISSING_ICON_ID))
-                ),
-                "score": score,
-            }
-            return [
-                SponsoredSuggestion(**suggestion_dict)
-                if is_sponsored
-                else NonsponsoredSuggestion(**suggestion_dict)
-            ]
+    def build_suggestions(
+        self, suggestion_content: SuggestionContent
+    ) -> dict[int, BaseSuggestion]:
+        """Build the suggestion for each full keyword of the suggestion content.
+        Results that fail the validation are skipped with a warning.
+
+        Note that each full keyword belongs to a single result, hence the returned
+        suggestions can be keyed by the full keyword ID.
+        """
+        result_ids: dict[int, int] = {
+            fkw_id: result_id
+            for result_id, fkw_id in suggestion_content.suggestions.values()
+        }
+
+        suggestions: dict[int, BaseSuggestion] = {}
+        for fkw_id, result_id in result_ids.items():
+            res = suggestion_content.results[result_id]
+            try:
+                suggestions[fkw_id] = self.build_suggestion(
+                    suggestion_content, res, fkw_id
+                )
+            except ValidationError as e:
+                logger.warning(
+                    "Skipped invalid adM suggestion",
+                    extra={"block_id": res.get("id"), "error message": f"{e}"},
+                )
+        return suggestions
+
+    def build_suggestion(
+        self,
+        suggestion_content: SuggestionContent,
+        res: dict[str, Any],
+        fkw_id: int,
+    ) -> BaseSuggestion:
+        """Build the suggestion for a result and one of its full keywords."""
+        is_sponsored = res.get("iab_category") == IABCategory.SHOPPING
+        score = (
+            self.score_wikipedia
+            if (advertiser := res.get("advertiser")) == "Wikipedia"
+            else self.score
+        )
+        suggestion_dict = {
+            "block_id": res.get("id"),
+            "full_keyword": suggestion_content.full_keywords[fkw_id],
+            "title": res.get("title"),
+            "url": res.get("url"),
+            "impression_url": res.get("impression_url"),
+            "click_url": res.get("click_url"),
+            "provider": self.name,
+            "advertiser": advertiser,
+            "is_sponsored": is_sponsored,
+            "icon": suggestion_content.icons.get(int(res.get("icon", MISSING_ICON_ID))),
+            "score": score,
+        }
+        return (
+            SponsoredSuggestion(**suggestion_dict)
+            if is_sponsored
+            else NonsponsoredSuggestion(**suggestion_dict)
+        )
+
+    def query_sync(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
+        """Provide suggestion for a given query from the in-memory suggestions."""
+        if (
+            suggest_look_ups := self.suggestion_content.suggestions.get(srequest.query)
+        ) is not None:
+            _, fkw_id = suggest_look_ups
+            if (suggestion := self.suggestions.get(fkw_id)) is not None:
+                return [suggestion]
         return []
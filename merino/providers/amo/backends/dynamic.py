@@ -9,6 +9,7 @@ from httpx import AsyncClient
 
 from merino.providers.amo.addons_data import ADDON_DATA, SupportedAddon
 from merino.providers.amo.backends.protocol import Addon, AmoBackendError
+from merino.utils.http_client import create_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -33,11 +34,13 @@ class DynamicAmoBackend:
 
     api_url: str
     dynamic_data: dict[SupportedAddon, dict[str, str]]
+    http_client: AsyncClient
 
-    def __init__(self, api_url: str):
-        """Initialize Backend"""
+    def __init__(self, api_url: str, http_timeout_sec: float | None = None):
+        """Initialize Backend and create its HTTP client."""
         self.api_url = api_url
         self.dynamic_data = {}
+        self.http_client = create_http_client(name="amo", timeout_sec=http_timeout_sec)
 
     async def _fetch_addon(
         self, client: AsyncClient, addon_key: SupportedAddon
@@ -72,11 +75,12 @@ class DynamicAmoBackend:
         tasks: list[Task] = []
 
         try:
-            async with (AsyncClient() as client, TaskGroup() as group):
+            async with TaskGroup() as group:
                 for addon_key in SupportedAddon:
                     tasks.append(
                         group.create_task(
-                            self._fetch_addon(client, addon_key), name=addon_key
+                            self._fetch_addon(self.http_client, addon_key),
+                            name=addon_key,
                         )
                     )
 
@@ -90,7 +94,11 @@ class DynamicAmoBackend:
         except ExceptionGroup as e:
             raise AmoBackendError(e.exceptions)
 
-    async def get_addon(self, addon_key: SupportedAddon) -> Addon:
+    async def shutdown(self) -> None:
+        """Close the HTTP client and its connections."""
+        await self.http_client.aclose()
+
+    def get_addon(self, addon_key: SupportedAddon) -> Addon:
         """Get an Addon based on the addon_key"""
         static_info: dict[str, str] = ADDON_DATA[addon_key]
         try:
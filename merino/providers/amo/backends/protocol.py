@@ -28,10 +28,16 @@ class Addon(BaseModel):
 class AmoBackend(Protocol):
     """Addon Protocol."""
 
-    async def get_addon(self, addon_key: SupportedAddon) -> Addon:  # pragma: no cover
+    def get_addon(self, addon_key: SupportedAddon) -> Addon:  # pragma: no cover
         """Get an Addon based on the addon_key.
         Raise a `BackendError` if the addon key is missing.
+
+        This is synchronous as the addons are looked up in memory, either from static
+        data or from the data fetched by `fetch_and_cache_addons_info()`.
         """
 
     async def fetch_and_cache_addons_info(self) -> None:
         """Initialize addons to be stored."""
+
+    async def shutdown(self) -> None:  # pragma: no cover
+        """Shut down connections to the backend."""
@@ -57,7 +57,11 @@ class StaticAmoBackend:
         """Get extra addons information. Pass for static Addons."""
         pass
 
-    async def get_addon(self, addon_key: SupportedAddon) -> Addon:
+    async def shutdown(self) -> None:
+        """Nothing to shut down."""
+        pass
+
+    def get_addon(self, addon_key: SupportedAddon) -> Addon:
         """Get an Addon based on the addon_key"""
         static_info: dict[str, str] = ADDON_DATA[addon_key]
         icon_and_rating: dict[str, Any] = STATIC_RATING_AND_ICONS[addon_key]
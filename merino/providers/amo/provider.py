@@ -10,8 +10,9 @@ from merino import cron
 from merino.config import settings
 from merino.providers.amo.addons_data import SupportedAddon
 from merino.providers.amo.backends.protocol import Addon, AmoBackend, AmoBackendError
-from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
+from merino.providers.base import BaseSuggestion, NonBlockingProvider, SuggestionRequest
 from merino.providers.custom_details import AmoDetails, CustomDetails
+from merino.providers.degraded import mark_degraded
 
 logger = logging.getLogger(__name__)
 
@@ -45,9 +46,11 @@ def invert_and_expand_index_keywords(
     return inverted_index
 
 
-class Provider(BaseProvider):
+class Provider(NonBlockingProvider):
     """Provider for Amo"""
 
+    _cacheable = True
+
     score: float
     backend: AmoBackend
     addon_keywords: dict[str, SupportedAddon]
@@ -83,16 +86,25 @@ class Provider(BaseProvider):
         super().__init__(**kwargs)
 
     async def initialize(self) -> None:
-        """Initialize by setting up a cron to fetch it every 24 hours."""
-        cron_job = cron.Job(
-            name="addon_sync",
-            interval=self.cron_interval_sec,
-            # We don't have any strict conditions for not updating AMO.
-            # So, always return True so that the fetch is run.
-            condition=self._should_fetch,
-            task=self._fetch_addon_info,
-        )
-        self.cron_task = asyncio.create_task(cron_job())
+        """Initialize by setting up a cron to fetch it every 24 hours, or by fetching
+        it once and shutting down the backend if the provider doesn't resync in the
+        background.
+        """
+        if self.resync_in_background:
+            cron_job = cron.Job(
+                name="addon_sync",
+                interval=self.cron_interval_sec,
+                # We don't have any strict conditions for not updating AMO.
+                # So, always return True so that the fetch is run.
+                condition=self._should_fetch,
+                task=self._fetch_addon_info,
+            )
+            self.cron_task = asyncio.create_task(cron_job())
+        else:
+            await self._fetch_addon_info()
+            # The backend is only used to fetch once, so close its connections
+            # rather than leave them to the workers of the pre-fork server.
+            await self.backend.shutdown()
 
         self.addon_keywords = invert_and_expand_index_keywords(
             self.keywords, self.min_chars
@@ -102,17 +114,24 @@ class Provider(BaseProvider):
         try:
             await self.backend.fetch_and_cache_addons_info()
             self.last_fetch_at = time.time()
+            self.invalidate_cached_results()
         except AmoBackendError as e:
             # Do not propagate the error as it can be recovered later by retrying.
             logger.warning(f"Failed to fetch addon information: {e}")
 
+    async def shutdown(self) -> None:
+        """Shut down the provider."""
+        await self.backend.shutdown()
+
     def _should_fetch(self) -> bool:
         if self.last_fetch_at:
             return (time.time() - self.last_fetch_at) >= self.resync_interval_sec
         return True  # Fetch AMO data if it's unclear if it's been synced yet.
 
-    async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
-        """Given the query string, get the Addon that matches the keyword."""
+    def query_sync(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
+        """Given the query string, get the Addon that matches the keyword from the
+        in-memory addons.
+        """
         q: str = srequest.query
         if len(q) < self.min_chars:
             return []
@@ -123,9 +142,10 @@ class Provider(BaseProvider):
             return []
 
         try:
-            addon: Addon = await self.backend.get_addon(matched_addon)
+            addon: Addon = self.backend.get_addon(matched_addon)
         except AmoBackendError as ex:
             logger.error(f"Error getting AMO suggestion: {ex}")
+            mark_degraded(self.name)
             return []
 
         return [
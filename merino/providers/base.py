@@ -1,12 +1,20 @@
 """Abstract class for Providers"""
+import itertools
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from pydantic import BaseModel, HttpUrl
 
 from merino.config import settings
 from merino.middleware.geolocation import Location
+from merino.providers.circuit_breaker import ProviderCircuitBreaker
 from merino.providers.custom_details import CustomDetails
 
+# A process-wide counter that hands out cache generations to providers. Using a
+# global counter ensures that generations are never reused, even across provider
+# instances sharing the same name.
+_cache_generations = itertools.count(1)
+
 
 class SuggestionRequest(BaseModel):
     """A request for suggestions."""
@@ -36,6 +44,11 @@ class BaseProvider(ABC):
     _name: str
     _enabled_by_default: bool
     _query_timeout_sec: float = settings.runtime.query_timeout_sec
+    _cacheable: bool = False
+    _cache_vary_fields: tuple[str, ...] = ()
+    _cache_generation: int = 0
+    _circuit_breaker: Optional[ProviderCircuitBreaker] = None
+    _resync_in_background: bool = True
 
     @abstractmethod
     async def initialize(self) -> None:  # pragma: no cover
@@ -98,3 +111,85 @@ class BaseProvider(ABC):
     def query_timeout_sec(self) -> float:
         """Return the query timeout for this provider."""
         return self._query_timeout_sec
+
+    @property
+    def circuit_breaker(self) -> Optional[ProviderCircuitBreaker]:
+        """Return the circuit breaker the queries of this provider go through, if any."""
+        return self._circuit_breaker
+
+    @circuit_breaker.setter
+    def circuit_breaker(
+        self, circuit_breaker: Optional[ProviderCircuitBreaker]
+    ) -> None:
+        """Set the circuit breaker the queries of this provider go through."""
+        self._circuit_breaker = circuit_breaker
+
+    @property
+    def resync_in_background(self) -> bool:
+        """Return whether this provider resyncs its data in the background, e.g. with
+        a cron job started upon its initialization. Providers initialized by the
+        master process of the pre-fork server don't, as the master reloads them.
+        """
+        return self._resync_in_background
+
+    @resync_in_background.setter
+    def resync_in_background(self, resync_in_background: bool) -> None:
+        """Set whether this provider resyncs its data in the background."""
+        self._resync_in_background = resync_in_background
+
+    @property
+    def cacheable(self) -> bool:
+        """Return whether the suggestions of this provider can be cached in-process.
+
+        A provider is cacheable if its suggestions only depend on the normalized
+        query and the geolocation fields listed in `cache_vary_fields`, and only
+        change when its data gets reloaded.
+        """
+        return self._cacheable
+
+    @property
+    def cache_vary_fields(self) -> tuple[str, ...]:
+        """Return the `Location` fields that the suggestions of this provider vary on."""
+        return self._cache_vary_fields
+
+    @property
+    def cache_generation(self) -> int:
+        """Return the generation of the data this provider serves suggestions from.
+        It's part of the cache key for cached suggestions.
+        """
+        return self._cache_generation
+
+    def invalidate_cached_results(self) -> None:
+        """Invalidate all the cached suggestions of this provider by moving on to
+        a new cache generation. Providers should call this whenever their
+        underlying data gets reloaded.
+        """
+        self._cache_generation = next(_cache_generations)
+
+
+class NonBlockingProvider(BaseProvider):
+    """Abstract class for non-blocking suggestion providers, which look up their
+    suggestions in memory without any I/O.
+
+    The suggest endpoint queries them inline with `query_sync()`, rather than
+    scheduling a task for each query.
+    """
+
+    @abstractmethod
+    def query_sync(
+        self, srequest: SuggestionRequest
+    ) -> list[BaseSuggestion]:  # pragma: no cover
+        """Query against this provider synchronously.
+
+        Args:
+          - `srequest`: the suggestion request.
+        """
+        ...
+
+    async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
+        """Query against this provider with `query_sync()`.
+
+        Args:
+          - `srequest`: the suggestion request.
+        """
+        return self.query_sync(srequest)
@@ -0,0 +1,95 @@
+"""A circuit breaker around the queries of a provider."""
+import asyncio
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import aiodogstatsd
+
+from merino.providers.degraded import mark_degraded
+from merino.utils.circuit_breaker import CircuitState, FailureRateCircuitBreaker
+
+T = TypeVar("T")
+
+
+class ProviderCircuitBreaker:
+    """A circuit breaker that stops querying a provider whose backend is failing or
+    slow, e.g. an Elasticsearch cluster or AccuWeather that's degraded.
+
+    A query counts as failed if it raises an exception, takes longer than
+    `slow_call_threshold_sec` (unless it's 0), or gets cancelled, which happens when
+    it times out in the suggest endpoint. The breaker opens once the rate of failed queries among
+    the last `window_size` queries reaches `failure_rate_threshold`. While open,
+    queries return no suggestions right away. After `recovery_timeout_sec`, a single
+    trial query is let through to probe whether the backend recovered.
+    """
+
+    provider_name: str
+    metrics_client: aiodogstatsd.Client
+    slow_call_threshold_sec: float
+    breaker: FailureRateCircuitBreaker
+
+    def __init__(
+        self,
+        provider_name: str,
+        metrics_client: aiodogstatsd.Client,
+        failure_rate_threshold: float,
+        window_size: int,
+        min_calls: int,
+        slow_call_threshold_sec: float,
+        recovery_timeout_sec: float,
+    ) -> None:
+        """Initialize the circuit breaker in the closed state.
+
+        Raises:
+            ValueError: If the parameters of the breaker are invalid.
+        """
+        self.provider_name = provider_name
+        self.metrics_client = metrics_client
+        self.slow_call_threshold_sec = slow_call_threshold_sec
+        self.breaker = FailureRateCircuitBreaker(
+            failure_rate_threshold=failure_rate_threshold,
+            window_size=window_size,
+            min_calls=min_calls,
+            recovery_timeout_sec=recovery_timeout_sec,
+            on_state_change=self._state_changed,
+        )
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the state of the circuit breaker."""
+        return self.breaker.state
+
+    def _state_changed(self, state: CircuitState) -> None:
+        """Record a state transition of the circuit breaker."""
+        self.metrics_client.increment(
+            f"providers.{self.provider_name}.circuit_breaker.{state.value}"
+        )
+
+    async def call(self, query: Callable[[], Awaitable[list[T]]]) -> list[T]:
+        """Run a query through the circuit breaker. Returns an empty list right away,
+        marked as degraded, if the circuit breaker is open.
+
+        Exceptions raised by the query are recorded and re-raised.
+        """
+        if not self.breaker.allow_request():
+            self.metrics_client.increment(
+                f"providers.{self.provider_name}.circuit_breaker.rejected"
+            )
+            mark_degraded(self.provider_name)
+            return []
+
+        started_at: float = time.perf_counter()
+        try:
+            suggestions: list[T] = await query()
+        except (Exception, asyncio.CancelledError):
+            self.breaker.record_failure()
+            raise
+
+        if (
+            self.slow_call_threshold_sec
+            and time.perf_counter() - started_at > self.slow_call_threshold_sec
+        ):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return suggestions
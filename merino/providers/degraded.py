@@ -0,0 +1,33 @@
+"""Tracking of the providers whose suggestions for a request are degraded.
+
+A provider's suggestions are degraded when a transient error, e.g. a backend error
+or an open circuit breaker, made it return fewer suggestions than it would have
+otherwise. Such suggestions must not be cached as the answer to the request.
+
+The suggest endpoint calls `track_degraded_providers()` before querying the
+providers. The query tasks it creates afterwards copy its context, hence share the
+returned set, which providers add themselves to with `mark_degraded()`.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+_degraded_providers: ContextVar[Optional[set[str]]] = ContextVar(
+    "degraded_providers", default=None
+)
+
+
+def track_degraded_providers() -> set[str]:
+    """Start tracking the degraded providers of the current request, and return the
+    set of their names.
+    """
+    degraded_providers: set[str] = set()
+    _degraded_providers.set(degraded_providers)
+    return degraded_providers
+
+
+def mark_degraded(provider_name: str) -> None:
+    """Mark the suggestions of a provider for the current request as degraded. It's a
+    no-op outside of a tracked request.
+    """
+    if (degraded_providers := _degraded_providers.get()) is not None:
+        degraded_providers.add(provider_name)
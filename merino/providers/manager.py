@@ -1,12 +1,14 @@
 """Merino provider manager."""
 
 from enum import Enum, unique
+from typing import Optional
 
 from dynaconf.base import Settings
-from redis.asyncio import Redis
 
 from merino.cache.none import NoCacheAdapter
-from merino.cache.redis import RedisAdapter
+from merino.cache.protocol import CacheAdapter
+from merino.cache.redis import RedisAdapter, create_redis_client
+from merino.cache.tiered import TieredCacheAdapter
 from merino.config import settings
 from merino.exceptions import InvalidProviderError
 from merino.metrics import get_metrics_client
@@ -18,6 +20,7 @@ from merino.providers.amo.backends.dynamic import DynamicAmoBackend
 from merino.providers.amo.backends.static import StaticAmoBackend
 from merino.providers.amo.provider import Provider as AmoProvider
 from merino.providers.base import BaseProvider
+from merino.providers.circuit_breaker import ProviderCircuitBreaker
 from merino.providers.top_picks.backends.top_picks import TopPicksBackend
 from merino.providers.top_picks.provider import Provider as TopPicksProvider
 from merino.providers.weather.backends.accuweather import AccuweatherBackend
@@ -26,8 +29,11 @@ from merino.providers.weather.provider import Provider as WeatherProvider
 from merino.providers.wiki_fruit import WikiFruitProvider
 from merino.providers.wikipedia.backends.elastic import ElasticBackend
 from merino.providers.wikipedia.backends.fake_backends import FakeWikipediaBackend
+from merino.providers.wikipedia.backends.local import LocalBackend
+from merino.providers.wikipedia.backends.protocol import WikipediaBackend
 from merino.providers.wikipedia.provider import Provider as WikipediaProvider
 from merino.utils.blocklist import TITLE_BLOCKLIST
+from merino.utils.circuit_breaker import CircuitBreaker
 
 
 @unique
@@ -42,6 +48,63 @@ class ProviderType(str, Enum):
     WIKIPEDIA = "wikipedia"
 
 
+def _create_redis_adapter(provider_id: str) -> RedisAdapter:
+    """Create a Redis cache adapter for a given provider, with a connection pool and
+    a circuit breaker of its own.
+    """
+    metrics_client = get_metrics_client()
+    circuit_breaker = (
+        CircuitBreaker(
+            failure_threshold=settings.redis.circuit_breaker_failure_threshold,
+            recovery_timeout_sec=settings.redis.circuit_breaker_recovery_timeout_sec,
+        )
+        if settings.redis.circuit_breaker_failure_threshold > 0
+        else None
+    )
+    return RedisAdapter(
+        create_redis_client(provider_id, metrics_client),
+        batch_gets=settings.redis.batch_gets,
+        circuit_breaker=circuit_breaker,
+        name=provider_id,
+        metrics_client=metrics_client,
+    )
+
+
+def _create_cache(provider_id: str, setting: Settings) -> CacheAdapter:
+    """Create a cache adapter for a given provider."""
+    match setting.cache:
+        case "redis":
+            return _create_redis_adapter(provider_id)
+        case "tiered":
+            return TieredCacheAdapter(
+                backend=_create_redis_adapter(provider_id),
+                name=provider_id,
+                metrics_client=get_metrics_client(),
+                max_bytes=setting.local_cache_max_bytes,
+                max_ttl_sec=setting.local_cache_max_ttl_sec,
+            )
+        case _:
+            return NoCacheAdapter()
+
+
+def _create_circuit_breaker(
+    provider_id: str, setting: Settings
+) -> Optional[ProviderCircuitBreaker]:
+    """Create a circuit breaker for a given provider, if it's enabled."""
+    breaker_setting: Optional[Settings] = setting.get("circuit_breaker")
+    if not breaker_setting or not breaker_setting.enabled:
+        return None
+    return ProviderCircuitBreaker(
+        provider_name=provider_id,
+        metrics_client=get_metrics_client(),
+        failure_rate_threshold=breaker_setting.failure_rate_threshold,
+        window_size=breaker_setting.window_size,
+        min_calls=breaker_setting.min_calls,
+        slow_call_threshold_sec=breaker_setting.slow_call_threshold_sec,
+        recovery_timeout_sec=breaker_setting.recovery_timeout_sec,
+    )
+
+
 def _create_provider(provider_id: str, setting: Settings) -> BaseProvider:
     """Create a provider for a given type and settings.
 
@@ -50,6 +113,9 @@ def _create_provider(provider_id: str, setting: Settings) -> BaseProvider:
     """
     match setting.type:
         case ProviderType.ACCUWEATHER:
+            # The cache is shared by the provider for weather reports and by the
+            # backend for location keys.
+            cache: CacheAdapter = _create_cache(provider_id, setting)
             return WeatherProvider(
                 backend=AccuweatherBackend(
                     api_key=settings.accuweather.api_key,
@@ -63,25 +129,29 @@ def _create_provider(provider_id: str, setting: Settings) -> BaseProvider:
                         "url_param_partner_code"
                     ),
                     partner_code=settings.accuweather.get("partner_code"),
+                    http_timeout_sec=settings.accuweather.http_timeout_sec,
+                    cache=cache,
+                    cached_location_key_ttl_sec=settings.accuweather.cached_location_key_ttl_sec,
+                    metrics_client=get_metrics_client(),
                 )  # type: ignore [arg-type]
                 if setting.backend == "accuweather"
                 else FakeWeatherBackend(),
-                cache=RedisAdapter(
-                    Redis.from_url(settings.redis.server)
-                )  # type: ignore [arg-type]
-                if setting.cache == "redis"
-                else NoCacheAdapter(),
+                cache=cache,
                 metrics_client=get_metrics_client(),
                 score=setting.score,
                 name=provider_id,
                 query_timeout_sec=setting.query_timeout_sec,
                 cached_report_ttl_sec=setting.cached_report_ttl_sec,
+                cached_report_stale_ttl_sec=setting.cached_report_stale_ttl_sec,
+                cached_report_format=setting.cached_report_format,
+                refresh_lock_ttl_sec=setting.refresh_lock_ttl_sec,
                 enabled_by_default=setting.enabled_by_default,
             )
         case ProviderType.AMO:
             return AmoProvider(
                 backend=DynamicAmoBackend(
-                    api_url=settings.amo.dynamic.api_url
+                    api_url=settings.amo.dynamic.api_url,
+                    http_timeout_sec=settings.amo.dynamic.http_timeout_sec,
                 )  # type: ignore [arg-type]
                 if setting.backend == "dynamic"
                 else StaticAmoBackend(),
@@ -98,6 +168,9 @@ def _create_provider(provider_id: str, setting: Settings) -> BaseProvider:
                         server=settings.remote_settings.server,
                         collection=settings.remote_settings.collection,
                         bucket=settings.remote_settings.bucket,
+                        keyword_index=setting.keyword_index,
+                        http_timeout_sec=settings.remote_settings.http_timeout_sec,
+                        mmap_index_dir=setting.mmap_index_dir,
                     )  # type: ignore [arg-type]
                     if setting.backend == "remote-settings"
                     else FakeAdmBackend()
@@ -114,6 +187,8 @@ def _create_provider(provider_id: str, setting: Settings) -> BaseProvider:
                     top_picks_file_path=setting.top_picks_file_path,
                     query_char_limit=setting.query_char_limit,
                     firefox_char_limit=setting.firefox_char_limit,
+                    index=setting.index,
+                    mmap_index_dir=setting.mmap_index_dir,
                 ),
                 score=setting.score,
                 name=provider_id,
@@ -124,15 +199,27 @@ def _create_provider(provider_id: str, setting: Settings) -> BaseProvider:
                 name=provider_id, enabled_by_default=setting.enabled_by_default
             )
         case ProviderType.WIKIPEDIA:
-            return WikipediaProvider(
-                backend=(
-                    ElasticBackend(
+            wikipedia_backend: WikipediaBackend
+            match setting.backend:
+                case "elasticsearch":
+                    wikipedia_backend = ElasticBackend(
                         api_key=setting.es_api_key,
                         url=setting.es_url,
+                        hedge_enabled=setting.es_hedge_enabled,
+                        hedge_percentile=setting.es_hedge_percentile,
+                        hedge_min_delay_ms=setting.es_hedge_min_delay_ms,
+                        hedge_max_rate=setting.es_hedge_max_rate,
                     )
-                )  # type: ignore [arg-type]
-                if setting.backend == "elasticsearch"
-                else FakeWikipediaBackend(),
+                case "local":
+                    wikipedia_backend = LocalBackend(
+                        index_path=setting.local_index_path,
+                        max_suggestions=setting.es_max_suggestions,
+                        reload_interval_sec=setting.local_index_reload_interval_sec,
+                    )
+                case _:
+                    wikipedia_backend = FakeWikipediaBackend()
+            return WikipediaProvider(
+                backend=wikipedia_backend,
                 title_block_list=TITLE_BLOCKLIST,
                 name=provider_id,
                 query_timeout_sec=setting.query_timeout_sec,
@@ -151,6 +238,8 @@ def load_providers() -> dict[str, BaseProvider]:
     providers: dict[str, BaseProvider] = {}
 
     for provider_id, setting in settings.providers.items():
-        providers[provider_id] = _create_provider(provider_id, setting)
+        provider = _create_provider(provider_id, setting)
+        provider.circuit_breaker = _create_circuit_breaker(provider_id, setting)
+        providers[provider_id] = provider
 
     return providers
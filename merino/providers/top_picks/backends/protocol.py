@@ -4,19 +4,31 @@ from typing import Protocol
 
 from pydantic import BaseModel
 
+from merino.utils.keyword_index import KeywordIndex
+
 
 class TopPicksData(BaseModel):
-    """Class that holds Top Pick Suggestion Content."""
+    """Class that holds Top Pick Suggestion Content.
+
+    The indices map keys to the indices of the matching results. A memory-mapped
+    `KeywordIndex` only holds the first matching result and the number of matching
+    results, as `(index, count)` pairs.
+    """
 
-    primary_index: defaultdict[str, list[int]]
-    secondary_index: defaultdict[str, list[int]]
-    short_domain_index: defaultdict[str, list[int]]
+    primary_index: KeywordIndex | defaultdict[str, list[int]]
+    secondary_index: KeywordIndex | defaultdict[str, list[int]]
+    short_domain_index: KeywordIndex | defaultdict[str, list[int]]
     results: list[dict]
     query_min: int
     query_max: int
     query_char_limit: int
     firefox_char_limit: int
 
+    class Config:
+        """Allow the `KeywordIndex` type, which is validated by an instance check."""
+
+        arbitrary_types_allowed = True
+
 
 class TopPicksBackend(Protocol):
     """Protocol for Top Picks backend that the provider depends on."""
@@ -3,10 +3,13 @@ import asyncio
 import json
 from collections import defaultdict
 from json import JSONDecodeError
-from typing import Any
+from typing import Any, Literal
 
 from merino.exceptions import BackendError
 from merino.providers.top_picks.backends.protocol import TopPicksData
+from merino.utils.keyword_index import KeywordIndex
+
+TopPicksIndexType = Literal["dict", "mmap"]
 
 
 class TopPicksError(BackendError):
@@ -21,18 +24,28 @@ class TopPicksBackend:
         top_picks_file_path: str,
         query_char_limit: int,
         firefox_char_limit: int,
+        index: TopPicksIndexType = "dict",
+        mmap_index_dir: str = "",
     ) -> None:
         """Initialize Top Picks backend.
 
+        With the "mmap" `index`, the indices are saved to files in `mmap_index_dir`
+        that the workers of the host share (see `KeywordIndex.load_or_create()`).
+
         Raises:
-            ValueError: If the top picks file path is not specified.
+            ValueError: If the top picks file path is not specified, or if the mmap
+            index directory is not specified for the "mmap" index.
         """
         if not top_picks_file_path:
             raise ValueError("Top Picks domain file not specified.")
+        if index == "mmap" and not mmap_index_dir:
+            raise ValueError("Top Picks mmap index directory not specified.")
 
         self.top_picks_file_path = top_picks_file_path
         self.query_char_limit = query_char_limit
         self.firefox_char_limit = firefox_char_limit
+        self.index = index
+        self.mmap_index_dir = mmap_index_dir
 
     async def fetch(self) -> TopPicksData:
         """Fetch Top Picks suggestions from domain list.
@@ -119,6 +132,22 @@ class TopPicksBackend:
 
             results.append(suggestion)
 
+        if self.index == "mmap":
+            return TopPicksData(
+                primary_index=self.share_index("top-picks-primary", primary_index),
+                secondary_index=self.share_index(
+                    "top-picks-secondary", secondary_index
+                ),
+                short_domain_index=self.share_index(
+                    "top-picks-short-domain", short_domain_index
+                ),
+                results=results,
+                query_min=query_min,
+                query_max=query_max,
+                query_char_limit=self.query_char_limit,
+                firefox_char_limit=self.firefox_char_limit,
+            )
+
         return TopPicksData(
             primary_index=primary_index,
             secondary_index=secondary_index,
@@ -130,6 +159,16 @@ class TopPicksBackend:
             firefox_char_limit=self.firefox_char_limit,
         )
 
+    def share_index(self, name: str, index: dict[str, list[int]]) -> KeywordIndex:
+        """Return a memory-mapped copy of an index shared by the workers of the
+        host, which maps each key to its first result and its number of results.
+        """
+        return KeywordIndex.load_or_create(
+            self.mmap_index_dir,
+            name,
+            ((key, (ids[0], len(ids))) for key, ids in index.items()),
+        )
+
     def build_indices(self) -> TopPicksData:
         """Read domain file, create indices and suggestions"""
         domains: dict[str, Any] = self.read_domain_list(self.top_picks_file_path)
@@ -4,10 +4,10 @@
 
 """Top Pick Navigational Queries Provider"""
 import logging
-from typing import Optional
+from typing import Optional, Sequence
 
 from merino.exceptions import BackendError
-from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
+from merino.providers.base import BaseSuggestion, NonBlockingProvider, SuggestionRequest
 from merino.providers.top_picks.backends.protocol import TopPicksBackend, TopPicksData
 
 logger = logging.getLogger(__name__)
@@ -20,9 +20,11 @@ class Suggestion(BaseSuggestion):
     is_top_pick: bool
 
 
-class Provider(BaseProvider):
+class Provider(NonBlockingProvider):
     """Top Pick Suggestion Provider."""
 
+    _cacheable = True
+
     top_picks_data: TopPicksData
 
     def __init__(
@@ -42,6 +44,7 @@ class Provider(BaseProvider):
         try:
             # Fetch Top Picks suggestions from domain list.
             self.top_picks_data: TopPicksData = await self.backend.fetch()
+            self.invalidate_cached_results()
         except BackendError as backend_error:
             logger.warning(
                 "Failed to fetch data from Top Picks Backend.",
@@ -56,15 +59,15 @@ class Provider(BaseProvider):
         """Convert a query string to lowercase and remove trailing spaces."""
         return query.strip().lower()
 
-    async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
-        """Query Top Pick data and return suggestions."""
+    def query_sync(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
+        """Query the in-memory Top Pick data and return suggestions."""
         # Ignore https:// and http://
         if srequest.query.startswith("http"):
             return []
 
         qlen: int = len(srequest.query)
         query: str = srequest.query
-        ids: Optional[list[int]]
+        ids: Optional[Sequence[int]]
 
         match qlen:
             case qlen if (
@@ -1,11 +1,18 @@
 """A wrapper for AccuWeather API interactions."""
 import asyncio
+import hashlib
+import json
+import logging
+from datetime import timedelta
 from typing import Optional
 
+import aiodogstatsd
 from httpx import URL, AsyncClient, HTTPError, InvalidURL, Response
 from pydantic import BaseModel
 
-from merino.exceptions import BackendError
+from merino.cache.protocol import CacheAdapter
+from merino.exceptions import BackendError, CacheAdapterError
+from merino.metrics import get_metrics_client
 from merino.middleware.geolocation import Location
 from merino.providers.weather.backends.protocol import (
     CurrentConditions,
@@ -13,6 +20,9 @@ from merino.providers.weather.backends.protocol import (
     Temperature,
     WeatherReport,
 )
+from merino.utils.http_client import create_http_client
+
+logger = logging.getLogger(__name__)
 
 
 class AccuweatherLocation(BaseModel):
@@ -42,6 +52,12 @@ class AccuweatherBackend:
     url_forecasts_path: str
     url_param_partner_code: Optional[str]
     partner_code: Optional[str]
+    http_client: AsyncClient
+    # The cache of location keys, which rarely change for a postal code. No location
+    # keys are cached if it's `None`.
+    cache: Optional[CacheAdapter]
+    cached_location_key_ttl_sec: int
+    metrics_client: aiodogstatsd.Client
 
     def __init__(
         self,
@@ -54,8 +70,12 @@ class AccuweatherBackend:
         url_forecasts_path: str,
         url_param_partner_code: Optional[str] = None,
         partner_code: Optional[str] = None,
+        http_timeout_sec: Optional[float] = None,
+        cache: Optional[CacheAdapter] = None,
+        cached_location_key_ttl_sec: int = 0,
+        metrics_client: Optional[aiodogstatsd.Client] = None,
     ) -> None:
-        """Initialize the AccuWeather backend.
+        """Initialize the AccuWeather backend and create its HTTP client.
 
         Raises:
             ValueError: If API key or URL parameters are None or empty.
@@ -82,6 +102,12 @@ class AccuweatherBackend:
         self.url_forecasts_path = url_forecasts_path
         self.url_param_partner_code = url_param_partner_code
         self.partner_code = partner_code
+        self.http_client = create_http_client(
+            name="accuweather", base_url=url_base, timeout_sec=http_timeout_sec
+        )
+        self.cache = cache
+        self.cached_location_key_ttl_sec = cached_location_key_ttl_sec
+        self.metrics_client = metrics_client or get_metrics_client()
 
     def cache_inputs_for_weather_report(self, geolocation: Location) -> Optional[bytes]:
         """Return the inputs used to form the cache key for looking up and storing the current
@@ -105,31 +131,78 @@ class AccuweatherBackend:
         if not country or not postal_code:
             raise AccuweatherError("Country and/or postal code unknown")
 
-        async with AsyncClient(base_url=self.url_base) as client:
-            if not (location := await self.get_location(client, country, postal_code)):
-                return None
-            try:
-                async with asyncio.TaskGroup() as tg:
-                    task_current = tg.create_task(
-                        self.get_current_conditions(client, location.key)
-                    )
-                    task_forecast = tg.create_task(
-                        self.get_forecast(client, location.key)
-                    )
-            except ExceptionGroup as e:
-                raise AccuweatherError(
-                    f"Failed to fetch weather report: {e.exceptions}"
+        client: AsyncClient = self.http_client
+        if not (
+            location := await self.get_cached_location(client, country, postal_code)
+        ):
+            return None
+        try:
+            async with asyncio.TaskGroup() as tg:
+                task_current = tg.create_task(
+                    self.get_current_conditions(client, location.key)
                 )
+                task_forecast = tg.create_task(self.get_forecast(client, location.key))
+        except ExceptionGroup as e:
+            raise AccuweatherError(f"Failed to fetch weather report: {e.exceptions}")
+
+        return (
+            WeatherReport(
+                city_name=location.localized_name,
+                current_conditions=current,
+                forecast=forecast,
+            )
+            if (current := await task_current) and (forecast := await task_forecast)
+            else None
+        )
 
-            return (
-                WeatherReport(
-                    city_name=location.localized_name,
-                    current_conditions=current,
-                    forecast=forecast,
-                )
-                if (current := await task_current) and (forecast := await task_forecast)
-                else None
+    def cache_key_for_location(self, country: str, postal_code: str) -> str:
+        """Compute a key used to look up and store the cached location of a country and
+        postal code.
+        """
+        cache_inputs: bytes = (country + postal_code).encode("utf-8")
+        return f"accuweather:v1:location:{hashlib.blake2s(cache_inputs).hexdigest()}"
+
+    async def get_cached_location(
+        self, client: AsyncClient, country: str, postal_code: str
+    ) -> Optional[AccuweatherLocation]:
+        """Return location data for a specific country and postal code from the cache,
+        or from AccuWeather if it isn't cached. Locations from AccuWeather, or the
+        absence of one, are cached for `cached_location_key_ttl_sec`. Cache errors are
+        logged and treated as misses.
+
+        Raises:
+            AccuweatherError: Failed request or 4xx and 5xx response from AccuWeather.
+        """
+        if self.cache is None or self.cached_location_key_ttl_sec <= 0:
+            return await self.get_location(client, country, postal_code)
+
+        cache_key: str = self.cache_key_for_location(country, postal_code)
+        try:
+            if cache_value := await self.cache.get(cache_key):
+                location_dict = json.loads(cache_value)
+                self.metrics_client.increment("accuweather.location_key.cache.hit")
+                # An empty entry marks a postal code without a location.
+                if not location_dict:
+                    return None
+                return AccuweatherLocation.parse_obj(location_dict)
+        except (CacheAdapterError, ValueError) as exc:
+            # `ValueError` is the common superclass of `json.JSONDecodeError` and
+            # `pydantic.ValidationError`.
+            self.metrics_client.increment("accuweather.location_key.cache.error")
+            logger.warning(f"Failed to load cached location: {exc}")
+
+        self.metrics_client.increment("accuweather.location_key.cache.miss")
+        location = await self.get_location(client, country, postal_code)
+        try:
+            await self.cache.set(
+                cache_key,
+                location.json().encode("utf-8") if location else b"{}",
+                ttl=timedelta(seconds=self.cached_location_key_ttl_sec),
             )
+        except CacheAdapterError as exc:
+            self.metrics_client.increment("accuweather.location_key.cache.error")
+            logger.warning(f"Failed to store cached location: {exc}")
+        return location
 
     async def get_location(
         self, client: AsyncClient, country: str, postal_code: str
@@ -290,6 +363,10 @@ class AccuweatherBackend:
             case _:
                 return None
 
+    async def shutdown(self) -> None:
+        """Close the HTTP client and its connections."""
+        await self.http_client.aclose()
+
     def _add_partner_code(self, url: str) -> str:
         if not self.url_param_partner_code or not self.partner_code:
             return url
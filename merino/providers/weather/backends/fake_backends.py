@@ -17,3 +17,7 @@ class FakeWeatherBackend:  # pragma: no cover
     ) -> Optional[WeatherReport]:
         """Fake Backend return nothing"""
         return None
+
+    async def shutdown(self) -> None:
+        """Nothing to shut down."""
+        return None
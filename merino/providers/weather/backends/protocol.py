@@ -75,3 +75,7 @@ class WeatherBackend(Protocol):
             BackendError: Category of error specific to provider backends.
         """
         ...
+
+    async def shutdown(self) -> None:  # pragma: no cover
+        """Shut down connections to the backend."""
+        ...
@@ -0,0 +1,168 @@
+"""Encoding of the weather reports stored in the cache.
+
+Two formats are supported:
+
+  - The JSON format, i.e. the JSON serialization of the `WeatherReport` model (or
+    `{}` for the absence of a report). If the report has a soft expiry, it's wrapped
+    as `{"soft_expires_at": ..., "report": ...}`.
+  - The compact format, which is a header byte followed by a JSON array of the field
+    values of the report, in a fixed order, without their names. The lower 7 bits of
+    the header byte are the version of the array layout, and the upper bit marks a
+    zlib compressed array.
+
+Entries in either format can always be decoded, so that the format can be switched
+without dropping the cached reports.
+"""
+import json
+import zlib
+from enum import Enum
+from typing import Any, Final, Optional
+
+from merino.providers.weather.backends.protocol import (
+    CurrentConditions,
+    Forecast,
+    Temperature,
+    WeatherReport,
+)
+
+COMPACT_FORMAT_VERSION: Final[int] = 1
+COMPRESSED_FLAG: Final[int] = 0x80
+# The compression level, which favors speed as the entries are small.
+COMPRESSION_LEVEL: Final[int] = 1
+
+
+class CacheFormat(str, Enum):
+    """The format used to store weather reports in the cache."""
+
+    JSON = "json"
+    COMPACT = "compact"
+    COMPACT_ZLIB = "compact_zlib"
+
+
+def encode_weather_report(
+    weather_report: Optional[WeatherReport],
+    soft_expires_at: Optional[float] = None,
+    cache_format: CacheFormat = CacheFormat.JSON,
+) -> bytes:
+    """Encode a weather report, or the absence of one, along with its optional soft
+    expiry.
+    """
+    if cache_format is CacheFormat.JSON:
+        if soft_expires_at is not None:
+            return json.dumps(
+                {
+                    "soft_expires_at": soft_expires_at,
+                    "report": weather_report.dict() if weather_report else None,
+                }
+            ).encode("utf-8")
+        return weather_report.json().encode("utf-8") if weather_report else b"{}"
+
+    values: list[Any] = [soft_expires_at]
+    if weather_report:
+        current_conditions = weather_report.current_conditions
+        forecast = weather_report.forecast
+        values += [
+            weather_report.city_name,
+            current_conditions.url,
+            current_conditions.summary,
+            current_conditions.icon_id,
+            current_conditions.temperature.c,
+            current_conditions.temperature.f,
+            forecast.url,
+            forecast.summary,
+            forecast.high.c,
+            forecast.high.f,
+            forecast.low.c,
+            forecast.low.f,
+        ]
+    payload: bytes = json.dumps(
+        values, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+    if cache_format is CacheFormat.COMPACT_ZLIB:
+        return bytes([COMPACT_FORMAT_VERSION | COMPRESSED_FLAG]) + zlib.compress(
+            payload, COMPRESSION_LEVEL
+        )
+    return bytes([COMPACT_FORMAT_VERSION]) + payload
+
+
+def decode_weather_report(
+    cache_value: bytes,
+) -> tuple[Optional[WeatherReport], Optional[float]]:
+    """Decode a weather report, or the absence of one, and its soft expiry, if any,
+    from either format.
+
+    Reports in the compact format are only written by Merino from validated models,
+    so they are trusted and constructed without validation.
+
+    Raises:
+        ValueError: If the entry can't be decoded.
+    """
+    if cache_value[:1] == b"{":
+        return _decode_json(cache_value)
+
+    header: int = cache_value[0] if cache_value else 0
+    if header & ~COMPRESSED_FLAG != COMPACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported cache entry format: {header}")
+
+    try:
+        payload: bytes = cache_value[1:]
+        if header & COMPRESSED_FLAG:
+            payload = zlib.decompress(payload)
+        match json.loads(payload):
+            case [soft_expires_at]:
+                # `type: ignore` is necessary because mypy gets confused when
+                # matching structures of type `Any` and reports the following
+                # lines as unreachable. See
+                # https://github.com/python/mypy/issues/12770
+                return None, soft_expires_at  # type: ignore
+            case [
+                soft_expires_at,
+                city_name,
+                current_url,
+                current_summary,
+                icon_id,
+                current_c,
+                current_f,
+                forecast_url,
+                forecast_summary,
+                high_c,
+                high_f,
+                low_c,
+                low_f,
+            ]:
+                weather_report = WeatherReport.construct(  # type: ignore
+                    city_name=city_name,
+                    current_conditions=CurrentConditions.construct(
+                        url=current_url,
+                        summary=current_summary,
+                        icon_id=icon_id,
+                        temperature=Temperature.construct(c=current_c, f=current_f),
+                    ),
+                    forecast=Forecast.construct(
+                        url=forecast_url,
+                        summary=forecast_summary,
+                        high=Temperature.construct(c=high_c, f=high_f),
+                        low=Temperature.construct(c=low_c, f=low_f),
+                    ),
+                )
+                return weather_report, soft_expires_at
+            case _:
+                raise ValueError("Unexpected cache entry layout")
+    except zlib.error as exc:
+        raise ValueError("Failed to decompress cache entry") from exc
+
+
+def _decode_json(
+    cache_value: bytes,
+) -> tuple[Optional[WeatherReport], Optional[float]]:
+    """Decode an entry in the JSON format, validating the report."""
+    weather_report_dict = json.loads(cache_value)
+    soft_expires_at: Optional[float] = None
+    # Entries stored with a soft expiry wrap the report.
+    if "soft_expires_at" in weather_report_dict:
+        soft_expires_at = weather_report_dict["soft_expires_at"]
+        weather_report_dict = weather_report_dict.get("report")
+    if not weather_report_dict:
+        return None, soft_expires_at
+    return WeatherReport.parse_obj(weather_report_dict), soft_expires_at
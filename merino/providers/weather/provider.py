@@ -1,9 +1,10 @@
 """Weather integration."""
+import asyncio
 import hashlib
-import json
 import logging
+import time
 from datetime import timedelta
-from typing import Any, Optional
+from typing import Any, Final, Optional
 
 import aiodogstatsd
 
@@ -16,15 +17,26 @@ from merino.exceptions import (
 )
 from merino.middleware.geolocation import Location
 from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
+from merino.providers.degraded import mark_degraded
 from merino.providers.weather.backends.protocol import (
     CurrentConditions,
     Forecast,
     WeatherBackend,
     WeatherReport,
 )
+from merino.providers.weather.cache_format import (
+    CacheFormat,
+    decode_weather_report,
+    encode_weather_report,
+)
+from merino.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# How often to look up the cache while waiting for another instance that holds the
+# refresh lock of a weather report.
+REFRESH_LOCK_POLL_INTERVAL_SEC: Final[float] = 0.05
+
 
 class Suggestion(BaseSuggestion):
     """Model for weather suggestions."""
@@ -37,11 +49,24 @@ class Suggestion(BaseSuggestion):
 class Provider(BaseProvider):
     """Suggestion provider for weather."""
 
+    # Weather reports are looked up by the country and postal code of the client.
+    _cacheable = True
+    _cache_vary_fields = ("country", "postal_code")
+
     backend: WeatherBackend
     cache: CacheAdapter
     metrics_client: aiodogstatsd.Client
     score: float
     cached_report_ttl_sec: int
+    cached_report_stale_ttl_sec: int
+    cached_report_format: CacheFormat
+    refresh_lock_ttl_sec: float
+    # In-flight backend requests for weather reports, keyed by the cache key.
+    in_flight_reports: SingleFlight[str, Optional[WeatherReport]]
+    # Pending refreshes of stale weather reports, keyed by the cache key. References
+    # to the tasks are kept here so that they don't get garbage collected before they
+    # are done.
+    background_refreshes: dict[str, asyncio.Task[None]]
 
     def __init__(
         self,
@@ -52,9 +77,19 @@ class Provider(BaseProvider):
         name: str,
         query_timeout_sec: float,
         cached_report_ttl_sec: int,
+        cached_report_stale_ttl_sec: int = 0,
+        cached_report_format: str = CacheFormat.JSON,
+        refresh_lock_ttl_sec: float = 0,
         enabled_by_default: bool = False,
         **kwargs: Any,
     ) -> None:
+        # The lock shouldn't be held longer than the query timeout, or the other
+        # instances would wait for a report past the point their queries time out.
+        if refresh_lock_ttl_sec > query_timeout_sec:
+            raise ValueError(
+                f"The refresh lock TTL ({refresh_lock_ttl_sec}s) of the {name} provider "
+                f"exceeds its query timeout ({query_timeout_sec}s)."
+            )
         self.backend = backend
         self.cache = cache
         self.metrics_client = metrics_client
@@ -62,12 +97,19 @@ class Provider(BaseProvider):
         self._name = name
         self._query_timeout_sec = query_timeout_sec
         self.cached_report_ttl_sec = cached_report_ttl_sec
+        self.cached_report_stale_ttl_sec = cached_report_stale_ttl_sec
+        self.cached_report_format = CacheFormat(cached_report_format)
+        self.refresh_lock_ttl_sec = refresh_lock_ttl_sec
+        self.in_flight_reports = SingleFlight()
+        self.background_refreshes = {}
         self._enabled_by_default = enabled_by_default
         super().__init__(**kwargs)
 
     async def initialize(self) -> None:
         """Initialize the provider."""
-        ...
+        # Start with a fresh cache generation so that suggestions cached for other
+        # provider instances are never served.
+        self.invalidate_cached_results()
 
     def hidden(self) -> bool:  # noqa: D102
         return False
@@ -84,8 +126,9 @@ class Provider(BaseProvider):
 
     async def fetch_cached_weather_report(
         self, geolocation: Location
-    ) -> Optional[WeatherReport]:
-        """Fetch a cached weather report, if available, for a location.
+    ) -> tuple[Optional[WeatherReport], bool]:
+        """Fetch a cached weather report, if available, for a location, along with
+        whether it's stale, i.e. past its soft expiry.
 
         Raises:
             - `CacheMissError` if there's no entry in the cache for this location.
@@ -101,14 +144,16 @@ class Provider(BaseProvider):
                 raise CacheMissError
 
             try:
-                weather_report_dict = json.loads(cache_value)
-                if not weather_report_dict:
-                    return None
-                return WeatherReport.parse_obj(weather_report_dict)
-            except ValueError as exc:
+                weather_report, soft_expires_at = decode_weather_report(cache_value)
+            except (TypeError, ValueError) as exc:
                 # `ValueError` is the common superclass of `json.JSONDecodeError` and
                 # `pydantic.ValidationError`.
                 raise CacheEntryError("Failed to parse cache entry") from exc
+            # Entries stored without a soft expiry never go stale.
+            is_stale: bool = (
+                soft_expires_at is not None and soft_expires_at <= time.time()
+            )
+            return weather_report, is_stale
 
     async def store_cached_weather_report(
         self, geolocation: Location, weather_report: Optional[WeatherReport]
@@ -123,14 +168,123 @@ class Provider(BaseProvider):
             # negatively cache an empty value, so that subsequent requests for that location won't
             # make additional backend calls every time. This case is separate from a transient
             # backend error, which isn't negatively cached.
-            cache_value = (
-                weather_report.json().encode("utf-8") if weather_report else b"{}"
+            ttl_sec: int = self.cached_report_ttl_sec
+            soft_expires_at: Optional[float] = None
+            if self.cached_report_stale_ttl_sec > 0:
+                # Keep the entry around past its soft expiry, so that it can be served
+                # while it's refreshed.
+                soft_expires_at = time.time() + ttl_sec
+                ttl_sec += self.cached_report_stale_ttl_sec
+            cache_value: bytes = encode_weather_report(
+                weather_report, soft_expires_at, self.cached_report_format
+            )
+            await self.cache.set(cache_key, cache_value, ttl=timedelta(seconds=ttl_sec))
+
+    async def fetch_weather_report(
+        self, geolocation: Location
+    ) -> Optional[WeatherReport]:
+        """Fetch a weather report for a location from the backend and cache it.
+
+        Concurrent calls for the same location are coalesced into a single backend
+        request.
+
+        Raises:
+            - `BackendError` if the backend request fails.
+        """
+        cache_key: Optional[str] = self.cache_key_for_weather_report(geolocation)
+        if not cache_key:
+            return await self.fetch_and_store_weather_report(geolocation, cache_key)
+
+        weather_report, coalesced = await self.in_flight_reports.run(
+            cache_key,
+            lambda: self.fetch_and_store_weather_report(geolocation, cache_key),
+        )
+        if coalesced:
+            self.metrics_client.increment(f"providers.{self.name}.query.coalesced")
+        return weather_report
+
+    async def fetch_and_store_weather_report(
+        self, geolocation: Location, cache_key: Optional[str]
+    ) -> Optional[WeatherReport]:
+        """Fetch a weather report for a location from the backend and cache it.
+
+        If `refresh_lock_ttl_sec` is set, the backend request is guarded by a lock in
+        the cache, so that only one instance fetches the report of a location at a
+        time. The other instances wait for the report to be cached, up to the lock
+        TTL, before falling back to their own backend request.
+
+        Raises:
+            - `BackendError` if the backend request fails.
+        """
+        if (
+            cache_key
+            and self.refresh_lock_ttl_sec > 0
+            and not await self.acquire_refresh_lock(cache_key)
+        ):
+            self.metrics_client.increment(
+                f"providers.{self.name}.query.cache.lock.contended"
             )
-            await self.cache.set(
-                cache_key,
-                cache_value,
-                ttl=timedelta(seconds=self.cached_report_ttl_sec),
+            deadline: float = time.monotonic() + self.refresh_lock_ttl_sec
+            while time.monotonic() < deadline:
+                await asyncio.sleep(REFRESH_LOCK_POLL_INTERVAL_SEC)
+                try:
+                    weather_report, _ = await self.fetch_cached_weather_report(
+                        geolocation
+                    )
+                    return weather_report
+                except CacheMissError:
+                    continue
+                except (CacheAdapterError, CacheEntryError):
+                    break
+
+        with self.metrics_client.timeit(f"providers.{self.name}.query.backend.get"):
+            weather_report = await self.backend.get_weather_report(geolocation)
+        try:
+            await self.store_cached_weather_report(geolocation, weather_report)
+        except CacheAdapterError as exc:
+            self.metrics_client.increment(f"providers.{self.name}.query.cache.error")
+            logger.warning(f"Failed to store cached weather report: {exc}")
+        return weather_report
+
+    def refresh_in_background(self, geolocation: Location) -> None:
+        """Refresh the stale cached weather report for a location in a background
+        task, unless a backend request for it is already in flight.
+        """
+        cache_key: str = self.cache_key_for_weather_report(geolocation) or ""
+        if (
+            not cache_key
+            or cache_key in self.background_refreshes
+            or cache_key in self.in_flight_reports
+        ):
+            return
+
+        task = asyncio.create_task(self.refresh_weather_report(geolocation))
+        self.background_refreshes[cache_key] = task
+        task.add_done_callback(lambda _: self.background_refreshes.pop(cache_key))
+
+    async def refresh_weather_report(self, geolocation: Location) -> None:
+        """Fetch a weather report for a location from the backend and cache it,
+        logging backend errors as there's no caller to raise them to.
+        """
+        try:
+            await self.fetch_weather_report(geolocation)
+        except BackendError as backend_error:
+            logger.warning(f"Failed to refresh stale weather report: {backend_error}")
+
+    async def acquire_refresh_lock(self, cache_key: str) -> bool:
+        """Try to acquire the lock to refresh the cached weather report for a cache
+        key. Cache errors are treated as if the lock was acquired.
+        """
+        try:
+            return await self.cache.set_if_absent(
+                f"{cache_key}:lock",
+                b"1",
+                ttl=timedelta(seconds=self.refresh_lock_ttl_sec),
             )
+        except CacheAdapterError as exc:
+            self.metrics_client.increment(f"providers.{self.name}.query.cache.error")
+            logger.warning(f"Failed to acquire refresh lock: {exc}")
+            return True
 
     async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
         """Provide weather suggestions."""
@@ -138,8 +292,17 @@ class Provider(BaseProvider):
         weather_report: Optional[WeatherReport] = None
 
         try:
-            weather_report = await self.fetch_cached_weather_report(geolocation)
+            weather_report, is_stale = await self.fetch_cached_weather_report(
+                geolocation
+            )
             self.metrics_client.increment(f"providers.{self.name}.query.cache.hit")
+            if is_stale:
+                # Serve the stale report right away. Subsequent requests get the
+                # refreshed one.
+                self.metrics_client.increment(
+                    f"providers.{self.name}.query.cache.stale"
+                )
+                self.refresh_in_background(geolocation)
         except (CacheAdapterError, CacheEntryError, CacheMissError) as exc:
             if isinstance(exc, CacheMissError):
                 self.metrics_client.increment(f"providers.{self.name}.query.cache.miss")
@@ -149,19 +312,10 @@ class Provider(BaseProvider):
                 )
                 logger.warning(f"Failed to load cached weather report: {exc}")
             try:
-                with self.metrics_client.timeit(
-                    f"providers.{self.name}.query.backend.get"
-                ):
-                    weather_report = await self.backend.get_weather_report(geolocation)
-                try:
-                    await self.store_cached_weather_report(geolocation, weather_report)
-                except CacheAdapterError as exc:
-                    self.metrics_client.increment(
-                        f"providers.{self.name}.query.cache.error"
-                    )
-                    logger.warning(f"Failed to store cached weather report: {exc}")
+                weather_report = await self.fetch_weather_report(geolocation)
             except BackendError as backend_error:
                 logger.warning(backend_error)
+                mark_degraded(self.name)
 
         if weather_report is None:
             return []
@@ -181,4 +335,9 @@ class Provider(BaseProvider):
 
     async def shutdown(self) -> None:
         """Shut down the provider."""
+        tasks: list[asyncio.Task[None]] = list(self.background_refreshes.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.backend.shutdown()
         await self.cache.close()
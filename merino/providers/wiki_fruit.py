@@ -1,7 +1,7 @@
 """A Suggestion provider that provides toy responses, meant for development and testing purposes"""
 from pydantic import HttpUrl
 
-from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
+from merino.providers.base import BaseSuggestion, NonBlockingProvider, SuggestionRequest
 
 
 class Suggestion(BaseSuggestion):
@@ -14,12 +14,14 @@ class Suggestion(BaseSuggestion):
     click_url: HttpUrl
 
 
-class WikiFruitProvider(BaseProvider):
+class WikiFruitProvider(NonBlockingProvider):
     """A test provider for Wikipedia.
 
     Shouldn't be used in production.
     """
 
+    _cacheable = True
+
     def __init__(self, name: str, enabled_by_default: bool):
         """Init for WikiFruitProvider."""
         self._enabled_by_default = enabled_by_default
@@ -27,9 +29,9 @@ class WikiFruitProvider(BaseProvider):
 
     async def initialize(self) -> None:
         """Initialize wiki fruit"""
-        pass
+        self.invalidate_cached_results()
 
-    async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
+    def query_sync(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
         """Provide wiki_fruit suggestions based on query."""
         query = srequest.query
         if query not in ["apple", "banana", "cherry"]:
@@ -1,53 +1,95 @@
 """The Elasticsearch backend for Dynamic Wikipedia."""
+import asyncio
 import logging
-from typing import Any, Final
-from urllib.parse import quote
+import time
+from typing import Any, Final, Optional
 
+import aiodogstatsd
 from elasticsearch import AsyncElasticsearch
 
 from merino.config import settings
 from merino.exceptions import BackendError
+from merino.metrics import get_metrics_client
+from merino.providers.wikipedia.backends.utils import build_article_from_title
+from merino.utils.latency_tracker import LatencyTracker
 
 # The Index ID in Elasticsearch cluster.
 INDEX_ID: Final[str] = settings.providers.wikipedia.es_index
 SUGGEST_ID: Final[str] = "suggest-on-title"
 TIMEOUT_MS: Final[str] = f"{settings.providers.wikipedia.es_request_timeout_ms}ms"
 MAX_SUGGESTIONS: Final[int] = settings.providers.wikipedia.es_max_suggestions
+# The number of recent request latencies the hedging delay is computed from.
+HEDGE_LATENCY_WINDOW_SIZE: Final[int] = 1000
+HEDGE_LATENCY_MIN_SAMPLES: Final[int] = 100
+HEDGE_LATENCY_REFRESH_INTERVAL: Final[int] = 50
+# The maximum number of hedges that can be sent in a burst after a quiet period.
+HEDGE_MAX_BURST: Final[float] = 10.0
 
 
 class ElasticBackendError(BackendError):
     """Error with Elastic Backend"""
 
 
-def get_best_keyword(q: str, title: str):
-    """Try to get the best autocomplete keyword match from the title. If there are no matches,
-    then return the full title as a match. Lowercase everything.
-    """
-    title = title.lower()
-    q = q.strip().lower()
-    start_index = title.find(q)
-    if start_index < 0:
-        return title
-
-    end_index = title.find(" ", start_index + len(q) - 1)
-    if end_index < start_index:
-        return title[start_index:]
-
-    return title[start_index:end_index]
-
-
 class ElasticBackend:
-    """The client that works with the Elasticsearch backend."""
+    """The client that works with the Elasticsearch backend.
+
+    If `hedge_enabled` is set, a search that hasn't completed after a delay, the
+    `hedge_percentile` of the recent search latencies (but at least
+    `hedge_min_delay_ms`), is duplicated, and whichever request returns first is used
+    while the other is cancelled. Elasticsearch routes the duplicate through the next
+    node of the client, and its adaptive replica selection steers it away from the
+    shard copy still busy with the first request.
+
+    To not amplify an overload of the cluster, hedges are limited to `hedge_max_rate`
+    of the searches: each search earns a fraction of a hedge, and a hedge is only
+    sent if a whole one was earned.
+    """
 
     client: AsyncElasticsearch
-
-    def __init__(self, *, api_key: str, url: str) -> None:
+    metrics_client: aiodogstatsd.Client
+    hedge_enabled: bool
+    hedge_min_delay_sec: float
+    hedge_max_rate: float
+    latency_tracker: LatencyTracker
+    # The number of hedges that can be sent, earned by the searches.
+    hedge_budget: float
+
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        url: str,
+        hedge_enabled: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_delay_ms: int = 50,
+        hedge_max_rate: float = 0.05,
+        metrics_client: Optional[aiodogstatsd.Client] = None,
+    ) -> None:
         """Initialize the ElasticBackend.
-        Raises a ValueError if URL is incorrectly formatted.
+        Raises a ValueError if URL is incorrectly formatted, or if the hedging
+        parameters are invalid.
         """
+        if not 0 <= hedge_max_rate <= 1:
+            raise ValueError("The hedge `max_rate` must be in [0, 1]")
+
         self.client = AsyncElasticsearch(url, api_key=api_key)
+        self.metrics_client = metrics_client or get_metrics_client()
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay_sec = hedge_min_delay_ms / 1000
+        self.hedge_max_rate = hedge_max_rate
+        self.latency_tracker = LatencyTracker(
+            percentile=hedge_percentile,
+            window_size=HEDGE_LATENCY_WINDOW_SIZE,
+            min_samples=HEDGE_LATENCY_MIN_SAMPLES,
+            refresh_interval=HEDGE_LATENCY_REFRESH_INTERVAL,
+        )
+        self.hedge_budget = 0.0
         logging.info("Initialized Elasticsearch with URL")
 
+    async def initialize(self) -> None:
+        """Nothing to initialize, the client connects upon the first request."""
+        return None
+
     async def shutdown(self) -> None:
         """Shut down the connection to the ES cluster."""
         await self.client.close()
@@ -64,8 +106,27 @@ class ElasticBackend:
             }
         }
 
+        if self.hedge_enabled:
+            res = await self._hedged_search(suggest)
+        else:
+            res = await self._search(suggest)
+
+        if "suggest" in res:
+            return [
+                self.build_article(q, doc)
+                for doc in res["suggest"][SUGGEST_ID][0]["options"]
+            ]
+        else:
+            return []
+
+    async def _search(self, suggest: dict[str, Any]) -> Any:
+        """Send a search request to the ES cluster.
+
+        Raises:
+            - `BackendError` if the request fails.
+        """
         try:
-            res = await self.client.search(
+            return await self.client.search(
                 index=INDEX_ID,
                 suggest=suggest,
                 timeout=TIMEOUT_MS,
@@ -74,21 +135,66 @@ class ElasticBackend:
         except Exception as e:
             raise BackendError(f"Failed to search from Elasticsearch: {e}") from e
 
-        if "suggest" in res:
-            return [
-                self.build_article(q, doc)
-                for doc in res["suggest"][SUGGEST_ID][0]["options"]
-            ]
-        else:
-            return []
+    def hedge_delay_sec(self) -> float:
+        """Return how long to wait for a search before hedging it."""
+        percentile_sec: Optional[float] = self.latency_tracker.percentile_sec()
+        if percentile_sec is None:
+            return self.hedge_min_delay_sec
+        return max(percentile_sec, self.hedge_min_delay_sec)
+
+    async def _hedged_search(self, suggest: dict[str, Any]) -> Any:
+        """Send a search request to the ES cluster, and a duplicate if it's slower
+        than the hedging delay. Returns the first successful response.
+
+        Raises:
+            - `BackendError` if the requests fail.
+        """
+        self.hedge_budget = min(
+            self.hedge_budget + self.hedge_max_rate, HEDGE_MAX_BURST
+        )
+        started_at: float = time.perf_counter()
+        first: asyncio.Task[Any] = asyncio.create_task(self._search(suggest))
+        tasks: set[asyncio.Task[Any]] = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay_sec())
+            if not done:
+                if self.hedge_budget >= 1:
+                    self.hedge_budget -= 1
+                    self.metrics_client.increment("wikipedia.es.hedge.fired")
+                    tasks.add(asyncio.create_task(self._search(suggest)))
+                else:
+                    self.metrics_client.increment("wikipedia.es.hedge.throttled")
+
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer a successful response, the first request's if both complete
+                # at once, and only raise the error of the last request to complete.
+                winner: Optional[asyncio.Task[Any]] = next(
+                    (
+                        task
+                        for task in sorted(done, key=lambda task: task is not first)
+                        if task.exception() is None
+                    ),
+                    None,
+                )
+                if winner is not None or done == tasks:
+                    break
+                tasks -= done
+
+            if winner is None:
+                return done.pop().result()
+            if winner is not first:
+                self.metrics_client.increment("wikipedia.es.hedge.won")
+            return winner.result()
+        finally:
+            # Cancel the losing request, or both if the search itself was cancelled,
+            # and record the latency of the first request, which is at least the
+            # time waited for it if it's cancelled.
+            for task in tasks:
+                task.cancel()
+            self.latency_tracker.record(time.perf_counter() - started_at)
 
     @staticmethod
     def build_article(q: str, doc: dict[str, Any]) -> dict[str, Any]:
         """Build a Wikipedia article based on the ES result."""
-        title = str(doc["_source"]["title"])
-        quoted_title = quote(title.replace(" ", "_"))
-        return {
-            "full_keyword": get_best_keyword(q, title),
-            "title": f"Wikipedia - {title}",
-            "url": f"https://en.wikipedia.org/wiki/{quoted_title}",
-        }
+        return build_article_from_title(q, str(doc["_source"]["title"]))
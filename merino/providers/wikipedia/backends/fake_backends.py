@@ -8,6 +8,10 @@ from merino.exceptions import BackendError
 class FakeWikipediaBackend:  # pragma: no cover
     """A fake backend that always returns empty results."""
 
+    async def initialize(self) -> None:
+        """Nothing to initialize."""
+        return None
+
     async def shutdown(self) -> None:
         """Nothing to shut down."""
         return None
@@ -20,6 +24,10 @@ class FakeWikipediaBackend:  # pragma: no cover
 class FakeEchoWikipediaBackend:
     """A fake backend that returns the exact same query as the search result."""
 
+    async def initialize(self) -> None:
+        """Nothing to initialize."""
+        return None
+
     async def shutdown(self) -> None:
         """Nothing to shut down."""
         return None
@@ -38,6 +46,10 @@ class FakeEchoWikipediaBackend:
 class FakeExceptionWikipediaBackend:  # pragma: no cover
     """A fake backend that raises a `BackendError` for any given query."""
 
+    async def initialize(self) -> None:
+        """Nothing to initialize."""
+        return None
+
     async def shutdown(self) -> None:
         """Nothing to shut down."""
         return None
@@ -0,0 +1,432 @@
+"""The local prefix index backend for Dynamic Wikipedia.
+
+The index is a file built offline by the `wikipedia-indexer build-local-index` job,
+which is memory-mapped and queried in-process, so that completing a query doesn't
+need a round trip to Elasticsearch.
+
+The file holds the normalized titles in sorted order, so that the titles completing
+a prefix are a contiguous range found with a binary search, along with the original
+titles and their weights. A prefix matched by few titles is completed by picking the
+highest weighted titles of its range. For the prefixes matched by more than
+`heavy_prefix_threshold` titles, e.g. "a" or "the", the highest weighted titles are
+precomputed at build time, so that a lookup never scans more than that many titles.
+
+All the sections of the file are arrays of little-endian 32-bit unsigned integers,
+or UTF-8 strings padded to a multiple of 4 bytes, in the following order:
+
+  - The header: magic, format version, number of titles, number of heavy prefixes,
+    number of titles precomputed per heavy prefix and `heavy_prefix_threshold`
+  - The offsets (one per title, plus the end) and the blob of the normalized titles
+  - The offsets and the blob of the original titles
+  - The weights of the titles
+  - The offsets and the blob of the heavy prefixes
+  - The indices of the titles precomputed per heavy prefix, padded with `NO_TITLE`
+"""
+import asyncio
+import heapq
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import unicodedata
+from array import array
+from bisect import bisect_left
+from os.path import commonprefix
+from typing import Any, Final, Iterable, Optional, Sequence
+
+from merino import cron
+from merino.config import settings
+from merino.exceptions import BackendError
+from merino.providers.wikipedia.backends.utils import build_article_from_title
+
+MAGIC: Final[bytes] = b"MWPI"
+FORMAT_VERSION: Final[int] = 1
+HEADER: Final[struct.Struct] = struct.Struct("<4sIIIII")
+# The padding of the titles precomputed for a heavy prefix matched by fewer titles.
+NO_TITLE: Final[int] = 0xFFFFFFFF
+MAX_SUGGESTIONS: Final[int] = settings.providers.wikipedia.es_max_suggestions
+DEFAULT_HEAVY_PREFIX_THRESHOLD: Final[int] = 64
+
+logger = logging.getLogger(__name__)
+
+
+class LocalIndexError(BackendError):
+    """Error with the local Wikipedia index."""
+
+
+def normalize_title(title: str) -> str:
+    """Normalize a title or a query for prefix matching. This approximates the
+    `nfkc_cf` normalization of the Elasticsearch completion field.
+    """
+    return unicodedata.normalize("NFKC", title).casefold()
+
+
+def _u32_array(values: Iterable[int]) -> bytes:
+    """Serialize integers as little-endian 32-bit unsigned integers."""
+    integers = array("I", values)
+    if sys.byteorder != "little":  # pragma: no cover
+        integers.byteswap()
+    return integers.tobytes()
+
+
+def _string_section(strings: list[str]) -> bytes:
+    """Serialize strings as their offsets followed by their padded UTF-8 blob."""
+    encoded: list[bytes] = [string.encode() for string in strings]
+    offsets: list[int] = [0]
+    for string in encoded:
+        offsets.append(offsets[-1] + len(string))
+    blob: bytes = b"".join(encoded)
+    return _u32_array(offsets) + blob + b"\0" * (-len(blob) % 4)
+
+
+def write_index(
+    entries: Iterable[tuple[str, int]],
+    path: str,
+    suggestions_per_prefix: int = MAX_SUGGESTIONS,
+    heavy_prefix_threshold: int = DEFAULT_HEAVY_PREFIX_THRESHOLD,
+) -> int:
+    """Write a local index of the given `(title, weight)` entries to `path`, replacing
+    the previous index atomically. Returns the number of indexed titles.
+
+    Titles that normalize to an empty string are skipped. Weights must fit in 32-bit
+    unsigned integers.
+    """
+    if suggestions_per_prefix <= 0 or heavy_prefix_threshold <= 0:
+        raise ValueError(
+            "The local index `suggestions_per_prefix` and `heavy_prefix_threshold` "
+            "must be positive"
+        )
+
+    # Python compares strings by code point, which matches the byte order of their
+    # UTF-8 encoding that the lookups binary search in.
+    sorted_entries: list[tuple[str, str, int]] = sorted(
+        (key, title, weight)
+        for title, weight in entries
+        if (key := normalize_title(title))
+    )
+    heavy_prefixes: list[tuple[str, list[int]]] = []
+    # For each prefix of the current key, starting with the empty prefix, the number
+    # of titles it matches so far and its top titles, as `(-weight, index)` pairs.
+    counts: list[int] = [0]
+    tops: list[list[tuple[int, int]]] = [[]]
+    previous_key: str = ""
+
+    def pop_prefix() -> None:
+        """Merge the titles of the longest prefix into its parent, recording it if
+        it's a heavy prefix.
+        """
+        count, top = counts.pop(), tops.pop()
+        if count > heavy_prefix_threshold:
+            heavy_prefixes.append(
+                (previous_key[: len(counts)], [index for _, index in top])
+            )
+        counts[-1] += count
+        tops[-1] = heapq.nsmallest(suggestions_per_prefix, tops[-1] + top)
+
+    for index, (key, _, weight) in enumerate(sorted_entries):
+        while len(counts) - 1 > len(commonprefix([previous_key, key])):
+            pop_prefix()
+        for _ in range(len(counts) - 1, len(key)):
+            counts.append(0)
+            tops.append([])
+        previous_key = key
+        counts[-1] += 1
+        tops[-1] = heapq.nsmallest(
+            suggestions_per_prefix, tops[-1] + [(-weight, index)]
+        )
+    while len(counts) > 1:
+        pop_prefix()
+    heavy_prefixes.sort()
+
+    sections: list[bytes] = [
+        HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            len(sorted_entries),
+            len(heavy_prefixes),
+            suggestions_per_prefix,
+            heavy_prefix_threshold,
+        ),
+        _string_section([key for key, _, _ in sorted_entries]),
+        _string_section([title for _, title, _ in sorted_entries]),
+        _u32_array(weight for _, _, weight in sorted_entries),
+        _string_section([prefix for prefix, _ in heavy_prefixes]),
+        _u32_array(
+            index
+            for _, top in heavy_prefixes
+            for index in top + [NO_TITLE] * (suggestions_per_prefix - len(top))
+        ),
+    ]
+
+    # Write to a temporary file renamed over the index, so that a worker opening the
+    # index never sees a partially written file.
+    directory: str = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+        try:
+            file.writelines(sections)
+            os.chmod(file.name, 0o644)
+        except BaseException:
+            os.unlink(file.name)
+            raise
+    os.replace(file.name, path)
+    return len(sorted_entries)
+
+
+class _Strings(Sequence[bytes]):
+    """A read-only sequence of the strings of a string section, as UTF-8 bytes."""
+
+    offsets: memoryview
+    blob: memoryview
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:  # type: ignore [override]
+        return bytes(self.blob[self.offsets[index] : self.offsets[index + 1]])
+
+
+class LocalIndex:
+    """A memory-mapped local index of Wikipedia titles.
+
+    Pages of the file are loaded lazily by the OS, and shared by the processes that
+    map the same file.
+    """
+
+    path: str
+    suggestions_per_prefix: int
+    heavy_prefix_threshold: int
+    keys: _Strings
+    titles: _Strings
+    weights: memoryview
+    heavy_prefixes: _Strings
+    heavy_top: memoryview
+    _mmap: mmap.mmap
+    _views: list[memoryview]
+
+    def __init__(self, path: str) -> None:
+        """Map the index file at `path`.
+
+        Raises:
+            LocalIndexError: If the file can't be read or isn't a valid index.
+        """
+        if sys.byteorder != "little":  # pragma: no cover
+            raise LocalIndexError("The local index requires a little-endian host")
+        try:
+            with open(path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            raise LocalIndexError(f"Failed to open the local index: {exc}") from exc
+
+        self.path = path
+        self._views = []
+        try:
+            self._parse()
+        except (struct.error, TypeError, ValueError, IndexError) as exc:
+            self.close()
+            raise LocalIndexError(f"Invalid local index {path}: {exc}") from exc
+
+    def _parse(self) -> None:
+        """Locate the sections of the index."""
+        (
+            magic,
+            version,
+            title_count,
+            heavy_count,
+            self.suggestions_per_prefix,
+            self.heavy_prefix_threshold,
+        ) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"unsupported format {magic!r} version {version}")
+
+        data: memoryview = memoryview(self._mmap)
+        self._views.append(data)
+        position: int = HEADER.size
+
+        def u32_section(length: int) -> memoryview:
+            nonlocal position
+            view = data[position : position + length * 4].cast("I")
+            self._views.append(view)
+            if len(view) != length:
+                raise ValueError("truncated file")
+            position += length * 4
+            return view
+
+        def string_section(length: int) -> _Strings:
+            nonlocal position
+            offsets = u32_section(length + 1)
+            blob = data[position : position + offsets[-1]]
+            self._views.append(blob)
+            position += offsets[-1] + (-offsets[-1] % 4)
+            return _Strings(offsets, blob)
+
+        self.keys = string_section(title_count)
+        self.titles = string_section(title_count)
+        self.weights = u32_section(title_count)
+        self.heavy_prefixes = string_section(heavy_count)
+        self.heavy_top = u32_section(heavy_count * self.suggestions_per_prefix)
+        if position != len(self._mmap):
+            raise ValueError("unexpected trailing data")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def complete(self, prefix: str, limit: int) -> list[str]:
+        """Return up to `limit` titles completing the prefix, ordered by descending
+        weight.
+        """
+        key: bytes = normalize_title(prefix).encode()
+        if not key or limit <= 0:
+            return []
+
+        # No UTF-8 encoded string contains the 0xFF byte, so this bounds the range
+        # of the keys starting with the prefix.
+        start: int = bisect_left(self.keys, key)
+        end: int = bisect_left(self.keys, key + b"\xff", start)
+        indices: list[int]
+        heavy: int = bisect_left(self.heavy_prefixes, key)
+        if end - start > self.heavy_prefix_threshold and (
+            heavy < len(self.heavy_prefixes) and self.heavy_prefixes[heavy] == key
+        ):
+            offset: int = heavy * self.suggestions_per_prefix
+            indices = [
+                index
+                for index in self.heavy_top[
+                    offset : offset + self.suggestions_per_prefix
+                ]
+                if index != NO_TITLE
+            ]
+        else:
+            weights = self.weights
+            indices = heapq.nsmallest(
+                limit, range(start, end), key=lambda index: (-weights[index], index)
+            )
+        return [self.titles[index].decode() for index in indices[:limit]]
+
+    def close(self) -> None:
+        """Release the views and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+
+class LocalBackend:
+    """A backend that completes queries in-process with a local prefix index of the
+    Wikipedia titles, built by the `wikipedia-indexer build-local-index` job.
+
+    It returns the same articles as the Elasticsearch backend, ranked by the same
+    precomputed weights.
+
+    The index is mapped upon initialization. If `reload_interval_sec` is positive, a
+    cron job checks the index file at that interval, and maps it anew once it's
+    replaced, e.g. by a new run of the indexer job.
+    """
+
+    index_path: str
+    max_suggestions: int
+    reload_interval_sec: float
+    index: Optional[LocalIndex]
+    # The inode and the modification time of the mapped index file.
+    index_version: Optional[tuple[int, int]]
+    cron_task: Optional[asyncio.Task]
+
+    def __init__(
+        self,
+        *,
+        index_path: str,
+        max_suggestions: int = MAX_SUGGESTIONS,
+        reload_interval_sec: float = 0,
+    ) -> None:
+        self.index_path = index_path
+        self.max_suggestions = max_suggestions
+        self.reload_interval_sec = reload_interval_sec
+        self.index = None
+        self.index_version = None
+        self.cron_task = None
+
+    async def initialize(self) -> None:
+        """Map the local index, and start the cron job reloading it if enabled.
+
+        Raises:
+            LocalIndexError: If the index can't be read.
+        """
+        self._load_index()
+        if self.reload_interval_sec > 0:
+            cron_job = cron.Job(
+                name="reload_wikipedia_local_index",
+                interval=self.reload_interval_sec,
+                condition=self._index_replaced,
+                task=self._reload_index,
+            )
+            # Store the created task on the instance variable. Otherwise it will get
+            # garbage collected because asyncio's runtime only holds a weak
+            # reference to it.
+            self.cron_task = asyncio.create_task(cron_job())
+
+    def _stat_index(self) -> tuple[int, int]:
+        """Return the inode and the modification time of the index file."""
+        stat = os.stat(self.index_path)
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _load_index(self) -> None:
+        """Map the index file, and unmap the previously mapped index, if any.
+
+        Raises:
+            LocalIndexError: If the index can't be read.
+        """
+        # Stat the file before mapping it, so that a file replaced in between is
+        # reloaded on the next check rather than missed.
+        try:
+            index_version: Optional[tuple[int, int]] = self._stat_index()
+        except OSError:
+            index_version = None
+        index = LocalIndex(self.index_path)
+        previous_index, self.index = self.index, index
+        self.index_version = index_version
+        if previous_index is not None:
+            previous_index.close()
+
+    def _index_replaced(self) -> bool:
+        """Check if the index file was replaced since it was mapped."""
+        try:
+            return self._stat_index() != self.index_version
+        except OSError as exc:
+            logger.warning(
+                "Failed to check the local Wikipedia index",
+                extra={"error message": f"{exc}"},
+            )
+            return False
+
+    async def _reload_index(self) -> None:
+        """Map the replaced index file."""
+        self._load_index()
+        logger.info(
+            "Reloaded the local Wikipedia index", extra={"path": self.index_path}
+        )
+
+    async def shutdown(self) -> None:
+        """Stop reloading and unmap the local index."""
+        if self.cron_task is not None:
+            self.cron_task.cancel()
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+    async def search(self, q: str) -> list[dict[str, Any]]:
+        """Search Wikipedia articles from the local index.
+
+        Raises:
+            LocalIndexError: If the index isn't mapped.
+        """
+        if self.index is None:
+            raise LocalIndexError("The local index isn't initialized")
+        return [
+            build_article_from_title(q, title)
+            for title in self.index.complete(q, self.max_suggestions)
+        ]
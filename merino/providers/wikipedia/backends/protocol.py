@@ -11,6 +11,14 @@ class WikipediaBackend(Protocol):
     directly depend on.
     """
 
+    async def initialize(self) -> None:  # pragma: no cover
+        """Initialize the backend, e.g. load its data.
+
+        Raises:
+            BackendError: Category of error specific to provider backends.
+        """
+        ...
+
     async def shutdown(self) -> None:  # pragma: no cover
         """Shut down connection to the backend"""
         ...
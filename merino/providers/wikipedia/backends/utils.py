@@ -0,0 +1,30 @@
+"""Utilities shared by the Dynamic Wikipedia backends."""
+from typing import Any
+from urllib.parse import quote
+
+
+def get_best_keyword(q: str, title: str):
+    """Try to get the best autocomplete keyword match from the title. If there are no matches,
+    then return the full title as a match. Lowercase everything.
+    """
+    title = title.lower()
+    q = q.strip().lower()
+    start_index = title.find(q)
+    if start_index < 0:
+        return title
+
+    end_index = title.find(" ", start_index + len(q) - 1)
+    if end_index < start_index:
+        return title[start_index:]
+
+    return title[start_index:end_index]
+
+
+def build_article_from_title(q: str, title: str) -> dict[str, Any]:
+    """Build a Wikipedia article from the title of a suggestion matching the query."""
+    quoted_title = quote(title.replace(" ", "_"))
+    return {
+        "full_keyword": get_best_keyword(q, title),
+        "title": f"Wikipedia - {title}",
+        "url": f"https://en.wikipedia.org/wiki/{quoted_title}",
+    }
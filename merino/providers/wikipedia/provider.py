@@ -62,7 +62,7 @@ class Provider(BaseProvider):
 
     async def initialize(self) -> None:
         """Initialize Wikipedia provider."""
-        return
+        await self.backend.initialize()
 
     def hidden(self) -> bool:  # noqa: D102
         """Whether this provider is hidden or not."""
@@ -0,0 +1,223 @@
+"""A circuit breaker to stop calling a failing dependency for a while."""
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Optional
+
+
+class CircuitState(str, Enum):
+    """The state of a circuit breaker."""
+
+    # Calls are allowed.
+    CLOSED = "closed"
+    # Calls are rejected until the recovery timeout elapses.
+    OPEN = "open"
+    # A single trial call is allowed to probe whether the dependency recovered.
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """A circuit breaker that opens after `failure_threshold` consecutive failures.
+
+    While open, calls are rejected, so that callers fail fast instead of waiting on a
+    dependency that's down. After `recovery_timeout_sec`, the breaker is half-open
+    and lets a single trial call through: it closes if the call succeeds and opens
+    again if it fails.
+
+    Callers check `allow_request()` before each call, then report the outcome of
+    the call with `record_success()` or `record_failure()`, or `release_trial()` if
+    the call ended without an outcome, e.g. it was cancelled.
+
+    Note that this is not thread-safe. It's meant to be used from the event loop
+    thread only.
+    """
+
+    failure_threshold: int
+    recovery_timeout_sec: float
+    timer: Callable[[], float]
+    on_state_change: Optional[Callable[[CircuitState], None]]
+    state: CircuitState
+    failures: int
+    opened_at: float
+    _trial_in_flight: bool
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        recovery_timeout_sec: float,
+        timer: Callable[[], float] = time.monotonic,
+        on_state_change: Optional[Callable[[CircuitState], None]] = None,
+    ) -> None:
+        """Initialize the circuit breaker in the closed state.
+
+        Raises:
+            ValueError: If `failure_threshold` is not positive or
+            `recovery_timeout_sec` is negative.
+        """
+        if failure_threshold <= 0:
+            raise ValueError("The circuit breaker `failure_threshold` must be positive")
+        if recovery_timeout_sec < 0:
+            raise ValueError(
+                "The circuit breaker `recovery_timeout_sec` must not be negative"
+            )
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout_sec = recovery_timeout_sec
+        self.timer = timer
+        self.on_state_change = on_state_change
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def _transition(self, state: CircuitState) -> None:
+        """Change the state and notify the listener, if any."""
+        if state is self.state:
+            return
+        self.state = state
+        if self.on_state_change is not None:
+            self.on_state_change(state)
+
+    def allow_request(self) -> bool:
+        """Return whether a call is allowed in the current state."""
+        match self.state:
+            case CircuitState.CLOSED:
+                return True
+            case CircuitState.OPEN:
+                if self.timer() - self.opened_at < self.recovery_timeout_sec:
+                    return False
+                self._transition(CircuitState.HALF_OPEN)
+                self._trial_in_flight = True
+                return True
+            case _:
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+                return True
+
+    def record_success(self) -> None:
+        """Record a successful call, which closes a half-open breaker."""
+        self._trial_in_flight = False
+        if self.state is CircuitState.HALF_OPEN:
+            self._reset()
+            self._transition(CircuitState.CLOSED)
+        else:
+            self._on_success()
+
+    def record_failure(self) -> None:
+        """Record a failed call, which opens the breaker once its failure condition
+        is met, or right away if it's half-open.
+        """
+        self._trial_in_flight = False
+        self._on_failure()
+        if self.state is CircuitState.HALF_OPEN or (
+            self.state is CircuitState.CLOSED and self._should_open()
+        ):
+            self._reset()
+            self.opened_at = self.timer()
+            self._transition(CircuitState.OPEN)
+
+    def release_trial(self) -> None:
+        """Record a call that ended without telling whether the dependency is
+        healthy, which lets the next call through as the trial of a half-open breaker.
+        """
+        self._trial_in_flight = False
+
+    def _on_success(self) -> None:
+        """Account for a successful call of the closed breaker."""
+        self.failures = 0
+
+    def _on_failure(self) -> None:
+        """Account for a failed call."""
+        self.failures += 1
+
+    def _should_open(self) -> bool:
+        """Return whether the failures recorded so far should open the breaker."""
+        return self.failures >= self.failure_threshold
+
+    def _reset(self) -> None:
+        """Forget the calls recorded so far."""
+        self.failures = 0
+
+
+class FailureRateCircuitBreaker(CircuitBreaker):
+    """A circuit breaker that opens when the rate of failed calls among the last
+    `window_size` calls reaches `failure_rate_threshold`, once at least `min_calls`
+    calls were recorded.
+
+    Unlike counting consecutive failures, this also trips on a dependency that fails
+    intermittently.
+    """
+
+    failure_rate_threshold: float
+    min_calls: int
+    # The outcomes of the last calls, `True` for a failure.
+    outcomes: deque[bool]
+
+    def __init__(
+        self,
+        failure_rate_threshold: float,
+        window_size: int,
+        min_calls: int,
+        recovery_timeout_sec: float,
+        timer: Callable[[], float] = time.monotonic,
+        on_state_change: Optional[Callable[[CircuitState], None]] = None,
+    ) -> None:
+        """Initialize the circuit breaker in the closed state.
+
+        Raises:
+            ValueError: If `failure_rate_threshold` is not in (0, 1], `window_size` is
+            not positive, `min_calls` is not in [1, `window_size`], or
+            `recovery_timeout_sec` is negative.
+        """
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError(
+                "The circuit breaker `failure_rate_threshold` must be in (0, 1]"
+            )
+        if not 0 < min_calls <= window_size:
+            raise ValueError(
+                "The circuit breaker `min_calls` must be positive and at most "
+                "`window_size`"
+            )
+
+        super().__init__(
+            failure_threshold=min_calls,
+            recovery_timeout_sec=recovery_timeout_sec,
+            timer=timer,
+            on_state_change=on_state_change,
+        )
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.outcomes = deque(maxlen=window_size)
+
+    def _record(self, failed: bool) -> None:
+        """Add the outcome of a call to the window, keeping the count of failures in
+        the window up to date.
+        """
+        if len(self.outcomes) == self.outcomes.maxlen and self.outcomes[0]:
+            self.failures -= 1
+        self.outcomes.append(failed)
+        self.failures += failed
+
+    def _on_success(self) -> None:
+        """Add a successful call to the window."""
+        self._record(False)
+
+    def _on_failure(self) -> None:
+        """Add a failed call to the window."""
+        self._record(True)
+
+    def _should_open(self) -> bool:
+        """Return whether the rate of failed calls in the window reached the
+        threshold.
+        """
+        return len(
+            self.outcomes
+        ) >= self.min_calls and self.failures >= self.failure_rate_threshold * len(
+            self.outcomes
+        )
+
+    def _reset(self) -> None:
+        """Clear the window."""
+        self.failures = 0
+        self.outcomes.clear()
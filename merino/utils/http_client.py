@@ -0,0 +1,157 @@
+"""A factory of connection-pooled HTTP clients for the provider backends."""
+import time
+from typing import Any, AsyncIterator, Callable, Optional, cast
+
+import aiodogstatsd
+from httpx import (
+    AsyncByteStream,
+    AsyncClient,
+    AsyncHTTPTransport,
+    Limits,
+    Request,
+    Response,
+    Timeout,
+)
+
+from merino.config import settings
+from merino.metrics import get_metrics_client
+
+# The minimum interval (in seconds) between two reports of the utilization of a
+# connection pool, which is sampled rather than reported upon each request.
+POOL_METRICS_INTERVAL_SEC: float = 1.0
+
+
+class ReleasingStream(AsyncByteStream):
+    """A response stream that calls back once it's closed, i.e. once its connection
+    is released to the pool.
+    """
+
+    stream: AsyncByteStream
+    on_close: Optional[Callable[[], None]]
+
+    def __init__(self, stream: AsyncByteStream, on_close: Callable[[], None]) -> None:
+        """Wrap the stream of a response."""
+        self.stream = stream
+        self.on_close = on_close
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Iterate over the chunks of the response body."""
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        """Close the stream, then call back once."""
+        try:
+            await self.stream.aclose()
+        finally:
+            on_close, self.on_close = self.on_close, None
+            if on_close is not None:
+                on_close()
+
+
+class InstrumentedTransport(AsyncHTTPTransport):
+    """An HTTP transport that reports the utilization of its connection pool.
+
+    Upon each request, it records the time spent waiting for a connection from
+    the pool. At most once every `POOL_METRICS_INTERVAL_SEC`, upon the release of a
+    connection, it records the number of in-use connections of the pool, which it
+    counts itself.
+    """
+
+    name: str
+    metrics_client: aiodogstatsd.Client
+    in_use: int
+    next_report_at: float
+
+    def __init__(
+        self, name: str, metrics_client: aiodogstatsd.Client, **kwargs: Any
+    ) -> None:
+        """Initialize the transport. Extra keyword arguments are passed to
+        `AsyncHTTPTransport`.
+        """
+        super().__init__(**kwargs)
+        self.name = name
+        self.metrics_client = metrics_client
+        self.in_use = 0
+        self.next_report_at = 0.0
+
+    async def handle_async_request(self, request: Request) -> Response:
+        """Send the request and record the connection pool metrics."""
+        started_at: float = time.perf_counter()
+        connection_acquired: bool = False
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            """Record the pool wait time upon the first event on the connection,
+            which is the first thing to happen after acquiring it from the pool.
+            """
+            nonlocal connection_acquired
+            if not connection_acquired:
+                connection_acquired = True
+                self.in_use += 1
+                self.metrics_client.timing(
+                    f"http_client.{self.name}.pool.wait",
+                    value=(time.perf_counter() - started_at) * 1000,
+                )
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            response: Response = await super().handle_async_request(request)
+        except BaseException:
+            if connection_acquired:
+                self.release()
+            raise
+        # The connection is in use until the response body is read and closed.
+        response.stream = ReleasingStream(
+            cast(AsyncByteStream, response.stream), self.release
+        )
+        return response
+
+    def release(self) -> None:
+        """Count a released connection and record the pool utilization, if it's
+        time to.
+        """
+        self.in_use -= 1
+        now: float = time.monotonic()
+        if now < self.next_report_at:
+            return
+        self.next_report_at = now + POOL_METRICS_INTERVAL_SEC
+        self.metrics_client.gauge(
+            f"http_client.{self.name}.pool.in_use", value=self.in_use
+        )
+
+
+def create_http_client(
+    name: str, base_url: str = "", timeout_sec: Optional[float] = None
+) -> AsyncClient:
+    """Create an HTTP client backed by a connection pool configured by the
+    `http_client` settings. The client should be reused for all the requests of
+    its owner and closed with `aclose()` upon shutdown.
+
+    Args:
+      - `name`: The name of the client used in the metrics
+      - `base_url`: [Optional] The base URL of the client
+      - `timeout_sec`: [Optional] The read, write and pool timeout, which defaults
+        to `http_client.timeout_sec`
+    """
+    return AsyncClient(
+        base_url=base_url,
+        timeout=Timeout(
+            timeout_sec
+            if timeout_sec is not None
+            else settings.http_client.timeout_sec,
+            connect=settings.http_client.connect_timeout_sec,
+        ),
+        transport=InstrumentedTransport(
+            name=name,
+            metrics_client=get_metrics_client(),
+            http2=settings.http_client.http2,
+            limits=Limits(
+                max_connections=settings.http_client.max_connections,
+                max_keepalive_connections=settings.http_client.max_keepalive_connections,
+                keepalive_expiry=settings.http_client.keepalive_expiry_sec,
+            ),
+        ),
+    )
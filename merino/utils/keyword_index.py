@@ -0,0 +1,295 @@
+"""A compact, array-backed keyword index, e.g. for adM suggestions."""
+import glob
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from collections.abc import ItemsView, Iterable, Iterator, Mapping, ValuesView
+from typing import Final, Optional, TypeVar, overload
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+MAGIC: Final[bytes] = b"MKWI"
+FORMAT_VERSION: Final[int] = 1
+# The magic, the format version, the number of keywords, the number of slots and the
+# size of the keyword table.
+HEADER: Final[struct.Struct] = struct.Struct("<4sIIII")
+
+
+class KeywordIndex(Mapping[str, tuple[int, int]]):
+    """A read-only mapping of suggestion keywords to pairs of integers, e.g. adM
+    keywords to `(result_id, fkw_id)` pairs.
+
+    It's an alternative to `dict[str, tuple[int, int]]` that doesn't allocate a
+    string, a tuple and two integers per keyword. All the keywords are UTF-8
+    encoded, sorted and concatenated into a single bytes table, and the values
+    are stored in parallel `array("I")` columns:
+
+      - `_offsets[i]:_offsets[i + 1]` spans the `i`-th keyword in `_keywords`
+      - `_result_ids[i]` and `_full_keyword_ids[i]` are the values of the `i`-th
+        keyword
+
+    Lookups go through `_slots`, an open addressing hash table (with linear
+    probing) of `i + 1` keyed by the CRC-32 of the `i`-th keyword, where 0 marks
+    an empty slot. CRC-32 is used instead of `hash()` as it's stable across
+    processes.
+
+    As the index is position-independent, it can also be saved to a file and
+    memory-mapped with `load()`, in which case the columns are views of the file.
+    Processes mapping the same file share its pages through the page cache, rather
+    than each holding a copy of the index. See `load_or_create()`.
+    """
+
+    _keywords: bytes | memoryview
+    _offsets: "array[int] | memoryview"
+    _result_ids: "array[int] | memoryview"
+    _full_keyword_ids: "array[int] | memoryview"
+    _slots: "array[int] | memoryview"
+    _mask: int
+
+    def __init__(self, items: Iterable[tuple[str, tuple[int, int]]] = ()) -> None:
+        """Build the index from `(keyword, (result_id, fkw_id))` pairs. For
+        duplicate keywords, the last pair wins, like it does for a dictionary.
+        """
+        entries: dict[bytes, tuple[int, int]] = {
+            keyword.encode("utf-8"): value for keyword, value in items
+        }
+        keywords: list[bytes] = sorted(entries)
+
+        offsets: array[int] = array("I", [0])
+        result_ids: array[int] = array("I")
+        full_keyword_ids: array[int] = array("I")
+        offset = 0
+        for keyword in keywords:
+            offset += len(keyword)
+            result_id, fkw_id = entries[keyword]
+            offsets.append(offset)
+            result_ids.append(result_id)
+            full_keyword_ids.append(fkw_id)
+        self._offsets = offsets
+        self._result_ids = result_ids
+        self._full_keyword_ids = full_keyword_ids
+        self._keywords = b"".join(keywords)
+
+        # Keep the load factor of the hash table at or below 0.5.
+        size = 1 << (2 * len(keywords)).bit_length()
+        slots: array[int] = array("I", bytes(4 * size))
+        self._mask = size - 1
+        for position, keyword in enumerate(keywords):
+            slot = zlib.crc32(keyword) & self._mask
+            while slots[slot]:
+                slot = (slot + 1) & self._mask
+            slots[slot] = position + 1
+        self._slots = slots
+
+    @classmethod
+    def load(cls, path: str) -> "KeywordIndex":
+        """Memory-map an index saved with `save()`. The file is mapped read-only
+        and its pages are loaded lazily.
+
+        Raises:
+            ValueError: If the file isn't a valid index.
+            OSError: If the file can't be read.
+        """
+        if sys.byteorder != "little":  # pragma: no cover
+            raise ValueError(
+                "Memory-mapped keyword indexes require a little-endian host"
+            )
+        with open(path, "rb") as file:
+            data = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+        try:
+            magic, version, count, size, keywords_size = HEADER.unpack_from(data)
+        except struct.error as exc:
+            raise ValueError(f"Invalid keyword index {path}: {exc}") from exc
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Invalid keyword index {path}: unsupported format")
+        if len(data) != HEADER.size + 4 * (3 * count + 1 + size) + keywords_size:
+            raise ValueError(f"Invalid keyword index {path}: unexpected size")
+
+        index = cls.__new__(cls)
+        position = HEADER.size
+        columns: list[memoryview] = []
+        for length in (count + 1, count, count, size):
+            columns.append(data[position : position + 4 * length].cast("I"))
+            position += 4 * length
+        index._offsets = columns[0]
+        index._result_ids = columns[1]
+        index._full_keyword_ids = columns[2]
+        index._slots = columns[3]
+        index._keywords = data[position:]
+        index._mask = size - 1
+        return index
+
+    def save(self, path: str) -> None:
+        """Save the index to a file that can be memory-mapped with `load()`. The file
+        is written to a temporary file first and renamed, so that it's replaced
+        atomically.
+        """
+        columns: list[array[int]] = [
+            array("I", column)
+            for column in (
+                self._offsets,
+                self._result_ids,
+                self._full_keyword_ids,
+                self._slots,
+            )
+        ]
+        if sys.byteorder != "little":  # pragma: no cover
+            for column in columns:
+                column.byteswap()
+
+        directory: str = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+            try:
+                file.write(
+                    HEADER.pack(
+                        MAGIC,
+                        FORMAT_VERSION,
+                        len(self),
+                        len(self._slots),
+                        len(self._keywords),
+                    )
+                )
+                for column in columns:
+                    file.write(column.tobytes())
+                file.write(self._keywords)
+                os.chmod(file.name, 0o644)
+            except BaseException:
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, path)
+
+    @classmethod
+    def load_or_create(
+        cls, directory: str, name: str, items: Iterable[tuple[str, tuple[int, int]]]
+    ) -> "KeywordIndex":
+        """Return a memory-mapped index of the items, shared by the processes of the
+        host. If the index can't be saved, it's kept in memory instead.
+
+        The index file is named after `name` and a digest of the items, so that
+        the first process to build the index of some items saves it, and the other
+        processes (e.g. the other workers of the host) map the same file instead of
+        building their own copy. Once an index is mapped, the files of the previous
+        indexes of the same name are removed. Processes that still map them keep
+        their pages until they switch to the new index.
+        """
+        entries: list[tuple[str, tuple[int, int]]] = list(items)
+        digest = hashlib.blake2b(digest_size=16)
+        for keyword, (first, second) in entries:
+            digest.update(keyword.encode("utf-8"))
+            digest.update(struct.pack("<BII", 0xFF, first, second))
+        path: str = os.path.join(directory, f"{name}-{digest.hexdigest()}.idx")
+
+        try:
+            index = cls.load(path)
+        except (OSError, ValueError):
+            index = cls(entries)
+            try:
+                index.save(path)
+                index = cls.load(path)
+            except (OSError, ValueError) as exc:
+                logger.warning(
+                    "Failed to share the keyword index, keeping it in memory",
+                    extra={"path": path, "error message": f"{exc}"},
+                )
+                return index
+
+        for stale_path in glob.glob(os.path.join(directory, f"{name}-*.idx")):
+            if stale_path != path:
+                try:
+                    os.unlink(stale_path)
+                except OSError as exc:
+                    logger.warning(
+                        "Failed to remove a stale keyword index",
+                        extra={"path": stale_path, "error message": f"{exc}"},
+                    )
+        return index
+
+    def _keyword(self, position: int) -> bytes:
+        """Return the encoded keyword at the given position of the table."""
+        return bytes(
+            self._keywords[self._offsets[position] : self._offsets[position + 1]]
+        )
+
+    def _position(self, keyword: str) -> int:
+        """Return the position of the keyword in the table, or -1 if it's missing."""
+        encoded: bytes = keyword.encode("utf-8")
+        slot: int = zlib.crc32(encoded) & self._mask
+        while entry := self._slots[slot]:
+            if self._keyword(entry - 1) == encoded:
+                return entry - 1
+            slot = (slot + 1) & self._mask
+        return -1
+
+    @overload
+    def get(self, key: str) -> Optional[tuple[int, int]]:
+        ...  # pragma: no cover
+
+    @overload
+    def get(self, key: str, default: tuple[int, int] | T) -> tuple[int, int] | T:
+        ...  # pragma: no cover
+
+    def get(
+        self, key: str, default: Optional[tuple[int, int] | T] = None
+    ) -> Optional[tuple[int, int] | T]:
+        """Return the value of the keyword, or `default` if it's missing."""
+        if (position := self._position(key)) < 0:
+            return default
+        return self._result_ids[position], self._full_keyword_ids[position]
+
+    def __getitem__(self, key: str) -> tuple[int, int]:
+        if (value := self.get(key)) is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._position(key) >= 0
+
+    def __len__(self) -> int:
+        return len(self._result_ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return (
+            self._keyword(position).decode("utf-8")
+            for position in range(len(self._result_ids))
+        )
+
+    def items(self) -> ItemsView[str, tuple[int, int]]:
+        """Return a view of the `(keyword, (result_id, fkw_id))` pairs."""
+        return _ItemsView(self)
+
+    def values(self) -> ValuesView[tuple[int, int]]:
+        """Return a view of the `(result_id, fkw_id)` pairs."""
+        return _ValuesView(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} keywords)"
+
+
+class _ItemsView(ItemsView[str, tuple[int, int]]):
+    """Items view that scans the columns instead of looking up each keyword."""
+
+    _mapping: KeywordIndex
+
+    def __iter__(self) -> Iterator[tuple[str, tuple[int, int]]]:
+        index = self._mapping
+        return zip(index, zip(index._result_ids, index._full_keyword_ids))
+
+
+class _ValuesView(ValuesView[tuple[int, int]]):
+    """Values view that scans the columns instead of looking up each keyword."""
+
+    _mapping: KeywordIndex
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        index = self._mapping
+        return zip(index._result_ids, index._full_keyword_ids)
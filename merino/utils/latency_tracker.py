@@ -0,0 +1,76 @@
+"""A tracker of the recent durations of an operation, e.g. the queries of a provider."""
+import math
+from collections import deque
+from typing import Optional
+
+
+class LatencyTracker:
+    """Keep the last `window_size` durations of an operation and report a percentile
+    of them, e.g. the p99 latency.
+
+    As computing the percentile sorts the window, it's only recomputed once every
+    `refresh_interval` new durations, rather than upon every lookup.
+
+    Note that this is not thread-safe. It's meant to be used from the event loop
+    thread only.
+    """
+
+    percentile: float
+    min_samples: int
+    refresh_interval: int
+    durations: deque[float]
+    _new_samples: int
+    _cached_percentile_sec: Optional[float]
+
+    def __init__(
+        self,
+        percentile: float,
+        window_size: int,
+        min_samples: int,
+        refresh_interval: int,
+    ) -> None:
+        """Initialize an empty tracker.
+
+        Raises:
+            ValueError: If `percentile` is not in (0, 1], `window_size` or
+            `refresh_interval` is not positive, or `min_samples` is not in
+            [1, `window_size`].
+        """
+        if not 0 < percentile <= 1:
+            raise ValueError("The latency tracker `percentile` must be in (0, 1]")
+        if not 0 < min_samples <= window_size:
+            raise ValueError(
+                "The latency tracker `min_samples` must be positive and at most "
+                "`window_size`"
+            )
+        if refresh_interval <= 0:
+            raise ValueError("The latency tracker `refresh_interval` must be positive")
+
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.refresh_interval = refresh_interval
+        self.durations = deque(maxlen=window_size)
+        self._new_samples = 0
+        self._cached_percentile_sec = None
+
+    def record(self, duration_sec: float) -> None:
+        """Record the duration of an operation."""
+        self.durations.append(duration_sec)
+        self._new_samples += 1
+
+    def percentile_sec(self) -> Optional[float]:
+        """Return the percentile of the recorded durations, or `None` if fewer than
+        `min_samples` durations were recorded.
+        """
+        if len(self.durations) < self.min_samples:
+            return None
+        if (
+            self._cached_percentile_sec is None
+            or self._new_samples >= self.refresh_interval
+        ):
+            ordered: list[float] = sorted(self.durations)
+            # The nearest-rank percentile.
+            rank: int = math.ceil(self.percentile * len(ordered))
+            self._cached_percentile_sec = ordered[rank - 1]
+            self._new_samples = 0
+        return self._cached_percentile_sec
@@ -7,9 +7,8 @@ from starlette.datastructures import Headers
 from starlette.requests import Request
 from starlette.types import Message
 
-from merino.middleware import ScopeKey
-from merino.middleware.geolocation import Location
-from merino.middleware.user_agent import UserAgent
+from merino.middleware.geolocation import Location, get_geolocation
+from merino.middleware.user_agent import UserAgent, get_user_agent
 
 
 class LogDataModel(BaseModel):
@@ -62,6 +61,25 @@ class SuggestLogDataModel(LogDataModel):
     form_factor: str
 
 
+class SuggestRollupLogDataModel(LogDataModel):
+    """Log metadata specific to Suggest rollup logs, which count the suggest
+    requests of an interval with the same fields.
+    """
+
+    interval_start: str
+    requested_providers: str
+    country: Optional[str] = None
+    form_factor: str
+    code: int
+    count: int
+
+    @validator("interval_start", pre=True)
+    def validate_interval_start(cls, v, values, **kwargs):
+        """Output the start of the interval in isoformat, like `time`."""
+        dt: datetime = parse_obj_as(datetime, v)
+        return dt.isoformat()
+
+
 def create_request_summary_log_data(
     request: Request, message: Message, dt: datetime
 ) -> RequestSummaryLogDataModel:
@@ -82,8 +100,8 @@ def create_suggest_log_data(
     request: Request, message: Message, dt: datetime
 ) -> SuggestLogDataModel:
     """Create log data for the suggest API endpoint."""
-    location: Location = request.scope[ScopeKey.GEOLOCATION]
-    user_agent: UserAgent = request.scope[ScopeKey.USER_AGENT]
+    location: Location = get_geolocation(request)
+    user_agent: UserAgent = get_user_agent(request)
 
     return SuggestLogDataModel(
         # General Data
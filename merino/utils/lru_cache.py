@@ -0,0 +1,126 @@
+"""A bounded, TTL-aware, in-memory LRU cache."""
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """A least-recently-used cache holding at most `max_size` entries.
+
+    If `max_bytes` is set, the cache also holds at most that many bytes, as
+    measured by `sizeof(key, value)` for each entry.
+
+    Entries optionally expire `ttl_sec` seconds after they are stored. Expired
+    entries are dropped lazily on lookup or when making room for new entries.
+
+    Note that this cache is not thread-safe. It's meant to be used from the event
+    loop thread only.
+    """
+
+    max_size: int
+    ttl_sec: Optional[float]
+    timer: Callable[[], float]
+    max_bytes: Optional[int]
+    sizeof: Optional[Callable[[K, V], int]]
+    # The total size of the entries, only tracked if `max_bytes` is set.
+    size_bytes: int
+    _entries: OrderedDict[K, tuple[float, V]]
+    _sizes: dict[K, int]
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_sec: Optional[float] = None,
+        timer: Callable[[], float] = time.monotonic,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[K, V], int]] = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Raises:
+            ValueError: If `max_size` or `max_bytes` is not positive, `ttl_sec` is
+            negative, or `max_bytes` is set without `sizeof`.
+        """
+        if max_size <= 0:
+            raise ValueError("The LRU cache `max_size` must be positive")
+        if ttl_sec is not None and ttl_sec < 0:
+            raise ValueError("The LRU cache `ttl_sec` must not be negative")
+        if max_bytes is not None and (max_bytes <= 0 or sizeof is None):
+            raise ValueError(
+                "The LRU cache `max_bytes` must be positive and requires `sizeof`"
+            )
+
+        self.max_size = max_size
+        self.ttl_sec = ttl_sec
+        self.timer = timer
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.size_bytes = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: K) -> Optional[tuple[float, V]]:
+        """Remove the entry of the key, if any, and return it."""
+        entry = self._entries.pop(key, None)
+        if entry is not None and self.max_bytes is not None:
+            self.size_bytes -= self._sizes.pop(key)
+        return entry
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the value for the key, or `None` if it's missing or expired."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self.timer():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl_sec: Optional[float] = None) -> int:
+        """Store a value for the key and return the number of entries evicted to
+        make room for it. The `ttl_sec` argument overrides the cache-wide TTL.
+
+        Values larger than `max_bytes` on their own aren't stored.
+        """
+        ttl = ttl_sec if ttl_sec is not None else self.ttl_sec
+        expires_at = self.timer() + ttl if ttl is not None else float("inf")
+
+        if self.max_bytes is None or self.sizeof is None:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+        else:
+            size: int = self.sizeof(key, value)
+            self._remove(key)
+            if size > self.max_bytes:
+                return 0
+            self._entries[key] = (expires_at, value)
+            self._sizes[key] = size
+            self.size_bytes += size
+
+        evicted = 0
+        while len(self._entries) > self.max_size or (
+            self.max_bytes is not None and self.size_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            evicted += 1
+        return evicted
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove the key and return its value, or `None` if it's missing."""
+        entry = self._remove(key)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        self._entries.clear()
+        self._sizes.clear()
+        self.size_bytes = 0
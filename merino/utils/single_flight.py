@@ -0,0 +1,59 @@
+"""Coalescing of concurrent calls for the same key into a single call."""
+import asyncio
+from typing import Any, Callable, Coroutine, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """Ensure that only one call per key is in flight at any time.
+
+    Callers of `run()` for a key that already has a call in flight await the
+    result (or the exception) of that call instead of making their own. Each call
+    runs in its own task, so it isn't cancelled when the caller that started it
+    gets cancelled (e.g. due to a query timeout), and its result still benefits
+    the other callers.
+
+    Note that this is not thread-safe. It's meant to be used from the event loop
+    thread only.
+    """
+
+    _calls: dict[K, asyncio.Task[V]]
+
+    def __init__(self) -> None:
+        self._calls = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._calls
+
+    async def run(
+        self, key: K, func: Callable[[], Coroutine[Any, Any, V]]
+    ) -> tuple[V, bool]:
+        """Call `func` unless a call for the key is already in flight, and return
+        its result along with whether it was coalesced with an in-flight call.
+
+        Raises:
+            Any exception raised by the call.
+        """
+        if (task := self._calls.get(key)) is not None:
+            return await asyncio.shield(task), True
+
+        task = asyncio.create_task(func())
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._call_done(key, done))
+        return await asyncio.shield(task), False
+
+    def _call_done(self, key: K, task: asyncio.Task[V]) -> None:
+        """Remove the completed call, so that the next call for the key is made
+        anew.
+        """
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved, it's raised to the callers if any is
+        # still waiting for the call.
+        if not task.cancelled():
+            task.exception()
@@ -1,7 +1,7 @@
 """A utility module to facilitate running & managing asyncio Tasks."""
 
 import logging
-from asyncio import ALL_COMPLETED, Task, wait
+from asyncio import ALL_COMPLETED, FIRST_COMPLETED, Task, get_running_loop, wait
 from typing import Callable, Optional
 
 from merino.metrics import Client
@@ -54,6 +54,61 @@ async def gather(
     return list(done), list(pending)
 
 
+async def gather_with_deadlines(
+    tasks: list[Task],
+    timeouts: list[float],
+    *,
+    timeout_cb: Optional[TimeoutCallback] = None,
+) -> tuple[list[Task], list[Task]]:
+    """Run a list of tasks, each with a timeout of its own, and gather all the
+    completed tasks. A task is cancelled as soon as its own timeout occurs, so this
+    returns once every task either completed or timed out, without waiting for the
+    timeouts of the other tasks.
+
+    Args:
+    - tasks: A list of Tasks.
+    - timeouts: The timeout (in seconds) of each task, in the same order as `tasks`.
+    - timeout_cb: A callable that gets called with the tasks that timed out at the
+      same time. This callback will be executed before the cancellation of those
+      tasks.
+
+    Returns: a tuple of two lists: the completed tasks and the timed out tasks. The
+    same notes as for `gather()` apply.
+    """
+    if len(tasks) == 0:
+        return [], []
+
+    loop = get_running_loop()
+    started_at: float = loop.time()
+    deadlines: dict[Task, float] = {
+        task: started_at + timeout for task, timeout in zip(tasks, timeouts)
+    }
+    done: list[Task] = []
+    timedout: list[Task] = []
+    pending: set[Task] = set(tasks)
+    while pending:
+        finished, pending = await wait(
+            pending,
+            timeout=max(min(deadlines[task] for task in pending) - loop.time(), 0),
+            return_when=FIRST_COMPLETED,
+        )
+        done.extend(finished)
+
+        now: float = loop.time()
+        expired: list[Task] = [task for task in pending if deadlines[task] <= now]
+        if expired:
+            logger.warning("Timeout triggered in the task runner")
+            if timeout_cb:
+                timeout_cb(expired)
+            for task in expired:
+                logger.warning(f"Cancelling the task: {task.get_name()} due to timeout")
+                task.cancel()
+            timedout.extend(expired)
+            pending.difference_update(expired)
+
+    return done, timedout
+
+
 def metrics_timeout_handler(client: Client, tasks: list[Task]) -> None:
     """Timeout handler to record metrics for timed out tasks"""
     for task in tasks:
@@ -1,9 +1,11 @@
 """Merino V1 API"""
 import logging
+import time
 from asyncio import Task
 from collections import Counter
 from functools import partial
 from itertools import chain
+from typing import Hashable, NamedTuple, Optional
 
 from asgi_correlation_id.context import correlation_id
 from fastapi import APIRouter, Depends, Query
@@ -14,10 +16,24 @@ from starlette.requests import Request
 from merino.config import settings
 from merino.metrics import Client
 from merino.middleware import ScopeKey
+from merino.middleware.geolocation import Location, get_geolocation
 from merino.providers import get_providers
-from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
+from merino.providers.base import (
+    BaseProvider,
+    BaseSuggestion,
+    NonBlockingProvider,
+    SuggestionRequest,
+)
+from merino.providers.degraded import track_degraded_providers
 from merino.utils import task_runner
+from merino.utils.latency_tracker import LatencyTracker
+from merino.utils.lru_cache import LRUCache
 from merino.web.models_v1 import ProviderResponse, SuggestResponse
+from merino.web.responses import (
+    SuggestJSONResponse,
+    encode_suggest_response,
+    encode_suggestions,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -29,9 +45,6 @@ SUGGEST_RESPONSE = {
     "request_id": "",
 }
 
-# Timeout for query tasks.
-QUERY_TIMEOUT_SEC = settings.runtime.query_timeout_sec
-
 # Client Variant Maximum - used to limit the number of
 # possible client variants for experiments.
 # See https://mozilla-services.github.io/merino/api.html#suggest
@@ -39,6 +52,34 @@ CLIENT_VARIANT_MAX = settings.web.api.v1.client_variant_max
 QUERY_CHARACTER_MAX = settings.web.api.v1.query_character_max
 CLIENT_VARIANT_CHARACTER_MAX = settings.web.api.v1.client_variant_character_max
 
+RESPONSE_CACHE_ENABLED: bool = settings.web.api.v1.response_cache.enabled
+
+ADAPTIVE_DEADLINE_ENABLED: bool = settings.runtime.adaptive_deadline.enabled
+ADAPTIVE_DEADLINE_MULTIPLIER: float = settings.runtime.adaptive_deadline.multiplier
+ADAPTIVE_DEADLINE_MIN_SEC: float = settings.runtime.adaptive_deadline.min_deadline_sec
+
+
+class CachedSuggestions(NamedTuple):
+    """An entry of the suggest response cache."""
+
+    # The JSON encoded list of suggestions.
+    content: bytes
+    # The number of suggestions per provider, used for metrics.
+    counter: Counter[str]
+
+
+# In-process cache for the suggestions of the suggest endpoint. See `response_cache_key()`
+# for how the entries are keyed.
+response_cache: LRUCache[Hashable, CachedSuggestions] = LRUCache(
+    max_size=settings.web.api.v1.response_cache.max_entries,
+    ttl_sec=settings.web.api.v1.response_cache.ttl_sec,
+)
+
+
+# Trackers of the recent query durations of the providers, keyed by provider name,
+# used to adapt their query deadlines. See `query_deadline()`.
+latency_trackers: dict[str, LatencyTracker] = {}
+
 
 @router.get(
     "/suggest",
@@ -55,7 +96,7 @@ async def suggest(
     sources: tuple[dict[str, BaseProvider], list[BaseProvider]] = Depends(
         get_providers
     ),
-) -> JSONResponse:
+) -> SuggestJSONResponse:
     """Query Merino for suggestions.
 
     Args:
@@ -85,27 +126,85 @@ async def suggest(
     else:
         search_from = default_providers
 
-    lookups: list[Task] = []
+    client_variants_list: list[str] = (
+        # [:CLIENT_VARIANT_MAX] filter at end to drop any trailing string beyond max_split.
+        client_variants.split(",", maxsplit=CLIENT_VARIANT_MAX)[:CLIENT_VARIANT_MAX]
+        if client_variants
+        else []
+    )
+
+    cache_key: Optional[Hashable] = (
+        response_cache_key(q, search_from, get_geolocation(request))
+        if RESPONSE_CACHE_ENABLED
+        else None
+    )
+    if cache_key is not None:
+        if (cached := response_cache.get(cache_key)) is not None:
+            metrics_client.increment("suggest.response_cache.hit")
+            emit_suggestions_per_metrics(metrics_client, cached.counter, search_from)
+            return SuggestJSONResponse(
+                encode_suggest_response(
+                    SuggestResponse.construct(
+                        suggestions=[],
+                        request_id=correlation_id.get(),
+                        client_variants=client_variants_list,
+                    ),
+                    suggestions=cached.content,
+                )
+            )
+        metrics_client.increment("suggest.response_cache.miss")
+
+    geolocation: Location = get_geolocation(request)
+    # The providers that return degraded suggestions because of transient errors.
+    # The query tasks created below share this set.
+    degraded_providers: set[str] = track_degraded_providers()
+
+    # Non-blocking providers are queried inline, as scheduling a task costs more
+    # than their in-memory lookups. They are queried before any task is scheduled,
+    # so that no task is left running if one of them raises.
+    suggestions: list[BaseSuggestion] = []
+    scheduled_providers: list[BaseProvider] = []
     for p in search_from:
+        if not isinstance(p, NonBlockingProvider) or p.circuit_breaker is not None:
+            scheduled_providers.append(p)
+            continue
+        srequest = SuggestionRequest(
+            query=p.normalize_query(q), geolocation=geolocation
+        )
+        started_at: float = time.perf_counter()
+        suggestions.extend(p.query_sync(srequest))
+        metrics_client.timing(
+            f"providers.{p.name}.query",
+            value=(time.perf_counter() - started_at) * 1000,
+        )
+
+    lookups: list[Task] = []
+    for p in scheduled_providers:
         srequest = SuggestionRequest(
-            query=p.normalize_query(q), geolocation=request.scope[ScopeKey.GEOLOCATION]
+            query=p.normalize_query(q), geolocation=geolocation
         )
         task = metrics_client.timeit_task(
-            p.query(srequest), f"providers.{p.name}.query"
+            p.query(srequest)
+            if p.circuit_breaker is None
+            else p.circuit_breaker.call(partial(p.query, srequest)),
+            f"providers.{p.name}.query",
         )
         # `timeit_task()` doesn't support task naming, need to set the task name manually
         task.set_name(p.name)
+        if ADAPTIVE_DEADLINE_ENABLED:
+            task.add_done_callback(
+                partial(record_query_duration, p.name, time.perf_counter())
+            )
         lookups.append(task)
 
-    completed_tasks, _ = await task_runner.gather(
+    # Each provider gets a deadline of its own, so that fast providers don't wait
+    # on slow ones beyond their own deadline.
+    completed_tasks, timedout_tasks = await task_runner.gather_with_deadlines(
         lookups,
-        timeout=max(
-            (provider.query_timeout_sec for provider in search_from),
-            default=QUERY_TIMEOUT_SEC,
-        ),
+        [query_deadline(p) for p in scheduled_providers],
         timeout_cb=partial(task_runner.metrics_timeout_handler, metrics_client),
     )
-    suggestions = list(
+    suggestions.extend(
         chain.from_iterable(
             # TODO: handle exceptions. `task.result()` will throw if the task was
             # completed with an exception. This is OK for now as Merino will return
@@ -116,32 +215,98 @@ async def suggest(
         )
     )
 
-    emit_suggestions_per_metrics(metrics_client, suggestions, search_from)
+    suggestion_counter = Counter(suggestion.provider for suggestion in suggestions)
+    emit_suggestions_per_metrics(metrics_client, suggestion_counter, search_from)
 
-    response = SuggestResponse(
+    # The response model is built without validation as all the fields are known
+    # to be valid.
+    response = SuggestResponse.construct(
         suggestions=suggestions,
         request_id=correlation_id.get(),
-        # [:CLIENT_VARIANT_MAX] filter at end to drop any trailing string beyond max_split.
-        client_variants=client_variants.split(",", maxsplit=CLIENT_VARIANT_MAX)[
-            :CLIENT_VARIANT_MAX
-        ]
-        if client_variants
-        else [],
+        client_variants=client_variants_list,
     )
-    return JSONResponse(
-        content=jsonable_encoder(response, exclude_unset=True, exclude_none=True)
+
+    # Responses with timed out or degraded providers are incomplete, hence not
+    # cached, so that transient errors don't get cached as empty answers.
+    if cache_key is not None and not timedout_tasks and not degraded_providers:
+        content = encode_suggestions(suggestions)
+        if evicted := response_cache.set(
+            cache_key, CachedSuggestions(content, suggestion_counter)
+        ):
+            metrics_client.increment("suggest.response_cache.eviction", value=evicted)
+        return SuggestJSONResponse(
+            encode_suggest_response(response, suggestions=content)
+        )
+
+    return SuggestJSONResponse(response)
+
+
+def query_deadline(provider: BaseProvider) -> float:
+    """Return the query deadline (in seconds) of a provider.
+
+    That's its `query_timeout_sec`, unless adaptive deadlines are enabled, in which
+    case it's a multiple of the configured percentile of its recent query durations,
+    capped by its `query_timeout_sec`. Timed out queries are recorded with the
+    duration of their deadline, so the deadline of a provider that gets slower
+    grows back towards its `query_timeout_sec`.
+    """
+    if not ADAPTIVE_DEADLINE_ENABLED or provider.name not in latency_trackers:
+        return provider.query_timeout_sec
+    percentile_sec: Optional[float] = latency_trackers[provider.name].percentile_sec()
+    if percentile_sec is None:
+        return provider.query_timeout_sec
+    return min(
+        max(percentile_sec * ADAPTIVE_DEADLINE_MULTIPLIER, ADAPTIVE_DEADLINE_MIN_SEC),
+        provider.query_timeout_sec,
+    )
+
+
+def record_query_duration(provider_name: str, started_at: float, _: Task) -> None:
+    """Record the duration of a finished query of a provider, used to adapt its
+    query deadline.
+    """
+    if (tracker := latency_trackers.get(provider_name)) is None:
+        tracker = latency_trackers[provider_name] = LatencyTracker(
+            percentile=settings.runtime.adaptive_deadline.percentile,
+            window_size=settings.runtime.adaptive_deadline.window_size,
+            min_samples=settings.runtime.adaptive_deadline.min_samples,
+            refresh_interval=settings.runtime.adaptive_deadline.refresh_interval,
+        )
+    tracker.record(time.perf_counter() - started_at)
+
+
+def response_cache_key(
+    q: str, searched_providers: list[BaseProvider], geolocation: Location
+) -> Optional[Hashable]:
+    """Return the key of the response cache for a suggest request, or `None` if the
+    response shouldn't be cached.
+
+    Responses are only cached if all the searched providers are cacheable. The key
+    is made of the query normalized by each provider, the provider names along with
+    their cache generations, and the geolocation fields those providers vary on.
+    """
+    if not searched_providers or not all(p.cacheable for p in searched_providers):
+        return None
+
+    providers_key = tuple(
+        sorted(
+            (p.name, p.cache_generation, p.normalize_query(q))
+            for p in searched_providers
+        )
     )
+    vary_fields = sorted({f for p in searched_providers for f in p.cache_vary_fields})
+    return providers_key, tuple(getattr(geolocation, f) for f in vary_fields)
 
 
 def emit_suggestions_per_metrics(
     metrics_client: Client,
-    suggestions: list[BaseSuggestion],
+    suggestion_counter: Counter[str],
     searched_providers: list[BaseProvider],
 ) -> None:
     """Emit metrics for suggestions per request and suggestions per request by provider."""
-    metrics_client.histogram("suggestions-per.request", value=len(suggestions))
-
-    suggestion_counter = Counter(suggestion.provider for suggestion in suggestions)
+    metrics_client.histogram(
+        "suggestions-per.request", value=sum(suggestion_counter.values())
+    )
 
     for provider in searched_providers:
         provider_name = provider.name
@@ -170,7 +335,13 @@ async def providers(
     """
     active_providers, _ = sources
     providers = [
-        ProviderResponse(**{"id": id, "availability": provider.availability()})
+        ProviderResponse(
+            id=id,
+            availability=provider.availability(),
+            circuit_breaker=provider.circuit_breaker.state.value
+            if provider.circuit_breaker
+            else None,
+        )
         for id, provider in active_providers.items()
     ]
-    return JSONResponse(content=jsonable_encoder(providers))
+    return JSONResponse(content=jsonable_encoder(providers, exclude_none=True))
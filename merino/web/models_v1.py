@@ -9,6 +9,8 @@ class ProviderResponse(BaseModel):
 
     id: str
     availability: str
+    # The state of the circuit breaker of the provider, if it has one.
+    circuit_breaker: str | None = None
 
 
 class SuggestResponse(BaseModel):
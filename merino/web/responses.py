@@ -0,0 +1,81 @@
+"""Custom responses for the Merino web APIs."""
+import json
+from typing import Any, Optional
+
+from pydantic.json import pydantic_encoder
+from starlette.responses import Response
+
+from merino.providers.base import BaseSuggestion
+from merino.web.models_v1 import SuggestResponse
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode JSON with the same settings as `JSONResponse.render()`."""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=pydantic_encoder,
+    ).encode("utf-8")
+
+
+def encode_suggestions(suggestions: list[BaseSuggestion]) -> bytes:
+    """Encode a list of suggestions to JSON, excluding unset and `None` fields.
+
+    The output is identical to that of
+    `jsonable_encoder(suggestions, exclude_unset=True, exclude_none=True)` rendered by
+    `JSONResponse`. Unlike `jsonable_encoder`, which recursively walks the dictionary
+    of each suggestion in Python, this encodes the dictionary as is.
+    """
+    return encode_json(
+        [
+            suggestion.dict(by_alias=True, exclude_unset=True, exclude_none=True)
+            for suggestion in suggestions
+        ]
+    )
+
+
+def encode_suggest_response(
+    response: SuggestResponse, suggestions: Optional[bytes] = None
+) -> bytes:
+    """Encode a `SuggestResponse` to JSON, excluding unset and `None` fields.
+
+    Args:
+      - `response`: The suggest response.
+      - `suggestions`: [Optional] The JSON encoded suggestions, as returned by
+        `encode_suggestions()`, to use instead of encoding `response.suggestions`.
+    """
+    fields: dict[str, Any] = response.dict(
+        exclude={"suggestions"}, exclude_unset=True, exclude_none=True
+    )
+    return b"".join(
+        [
+            b'{"suggestions":',
+            suggestions
+            if suggestions is not None
+            else encode_suggestions(response.suggestions),
+            *(
+                b",%b:%b" % (encode_json(name), encode_json(value))
+                for name, value in fields.items()
+            ),
+            b"}",
+        ]
+    )
+
+
+class SuggestJSONResponse(Response):
+    """A JSON response for the suggest API. It renders the `SuggestResponse` in the same
+    wire format as `JSONResponse(jsonable_encoder(response, exclude_unset=True,
+    exclude_none=True))` at a fraction of the cost. Pre-encoded content (`bytes`) is
+    rendered as is.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: SuggestResponse | bytes) -> bytes:
+        """Render the suggest response."""
+        if isinstance(content, SuggestResponse):
+            return encode_suggest_response(content)
+        return super().render(content)
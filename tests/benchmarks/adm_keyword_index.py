@@ -0,0 +1,106 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Microbenchmark for the memory footprint and lookup latency of the adM keyword
+index.
+
+It compares the `dict[str, tuple[int, int]]` built by the Remote Settings backend
+with the compact `KeywordIndex`, in memory and memory-mapped from a file, on a
+synthetic dataset. The memory is the retained size measured by `tracemalloc`,
+which is what each worker process holds on to between two resyncs. The pages of a
+memory-mapped index aren't traced, as they're shared by the workers of the host
+through the page cache; the size of its file is reported instead.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.adm_keyword_index
+"""
+
+import os
+import random
+import tempfile
+import timeit
+import tracemalloc
+from collections.abc import Iterator, Mapping
+from typing import Callable
+
+from merino.utils.keyword_index import KeywordIndex
+
+# The number of adM results and the number of keywords of each result, which
+# make a dataset of 500k keywords.
+RESULTS: int = 10_000
+KEYWORDS_PER_RESULT: int = 50
+# The number of keywords that share one full keyword.
+KEYWORDS_PER_FULL_KEYWORD: int = 5
+QUERIES: int = 100_000
+
+
+def generate_suggestions() -> Iterator[tuple[str, tuple[int, int]]]:
+    """Generate synthetic `(keyword, (result_id, fkw_id))` pairs."""
+    fkw_id = 0
+    for result_id in range(RESULTS):
+        for i in range(KEYWORDS_PER_RESULT):
+            if i and i % KEYWORDS_PER_FULL_KEYWORD == 0:
+                fkw_id += 1
+            yield f"advertiser {result_id} keyword {i}", (result_id, fkw_id)
+        fkw_id += 1
+
+
+def measure(
+    build: Callable[[], Mapping[str, tuple[int, int]]]
+) -> tuple[Mapping[str, tuple[int, int]], int, int]:
+    """Build the mapping and return it along with the retained and peak sizes of
+    the allocated memory in bytes.
+    """
+    tracemalloc.start()
+    mapping = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mapping, retained, peak
+
+
+def main() -> None:
+    """Run the benchmark."""
+    keywords = [keyword for keyword, _ in generate_suggestions()]
+    queries = [random.choice(keywords) for _ in range(QUERIES // 2)] + [
+        f"{random.choice(keywords)} miss" for _ in range(QUERIES // 2)
+    ]
+    random.shuffle(queries)
+
+    print(f"keywords: {len(keywords):,}, queries: {QUERIES:,} (half of them miss)")
+    index_dir = tempfile.mkdtemp()
+    KeywordIndex.load_or_create(index_dir, "keywords", generate_suggestions())
+    (index_file,) = os.listdir(index_dir)
+    index_path = os.path.join(index_dir, index_file)
+    print(f"memory-mapped index file: {os.path.getsize(index_path) / 2**20:.1f} MiB")
+
+    results = []
+    for label, build in [
+        ("dict", lambda: dict(generate_suggestions())),
+        ("KeywordIndex", lambda: KeywordIndex(generate_suggestions())),
+        ("mmap", lambda: KeywordIndex.load(index_path)),
+    ]:
+        mapping, retained, peak = measure(build)
+        lookup = mapping.get
+        elapsed = min(
+            timeit.repeat(
+                lambda: [lookup(query) for query in queries], number=1, repeat=3
+            )
+        )
+        results.append([lookup(query) for query in queries])
+        print(
+            f"{label:>12}: {retained / 2**20:7.1f} MiB retained, "
+            f"{peak / 2**20:7.1f} MiB peak, "
+            f"{elapsed / QUERIES * 1e6:6.2f} us/lookup"
+        )
+        del mapping
+
+    assert all(
+        result == results[0] for result in results
+    ), "The lookup results are not identical"
+    os.unlink(index_path)
+    os.rmdir(index_dir)
+
+
+if __name__ == "__main__":
+    main()
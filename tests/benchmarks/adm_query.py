@@ -0,0 +1,110 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Microbenchmark for the per-query cost of the adM provider.
+
+It compares building the suggestion upon each query (the behavior prior to
+prebuilding suggestions at fetch time) with the prebuilt suggestion lookup.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.adm_query
+"""
+
+import asyncio
+import random
+import timeit
+from typing import Awaitable, Callable
+
+from merino.middleware.geolocation import Location
+from merino.providers.adm.backends.fake_backends import FakeAdmBackend
+from merino.providers.adm.backends.protocol import SuggestionContent
+from merino.providers.adm.provider import Provider
+from merino.providers.base import BaseSuggestion, SuggestionRequest
+
+# The number of adM results and the number of keywords of each result, which
+# make a dataset of about 100k keywords.
+RESULTS: int = 2_000
+KEYWORDS_PER_RESULT: int = 50
+# The number of keywords that share one full keyword.
+KEYWORDS_PER_FULL_KEYWORD: int = 5
+QUERIES: int = 100_000
+
+
+def build_suggestion_content() -> SuggestionContent:
+    """Build a synthetic adM dataset."""
+    suggestions: dict[str, tuple[int, int]] = {}
+    full_keywords: list[str] = []
+    results: list[dict] = []
+    for result_id in range(RESULTS):
+        for i in range(KEYWORDS_PER_RESULT):
+            if i % KEYWORDS_PER_FULL_KEYWORD == 0:
+                full_keywords.append(f"advertiser {result_id} keyword {i}")
+            suggestions[f"adv {result_id} kw {i}"] = (result_id, len(full_keywords) - 1)
+        results.append(
+            {
+                "id": result_id,
+                "advertiser": f"Advertiser {result_id}",
+                "click_url": f"https://example.org/click/{result_id}",
+                "impression_url": f"https://example.org/impression/{result_id}",
+                "iab_category": "22 - Shopping" if result_id % 2 else "5 - Education",
+                "icon": str(result_id % 100),
+                "title": f"Advertiser {result_id} title",
+                "url": f"https://example.org/target/{result_id}",
+            }
+        )
+    icons = {i: f"https://example.org/icon/{i}" for i in range(100)}
+    return SuggestionContent(
+        suggestions=suggestions,
+        full_keywords=full_keywords,
+        results=results,
+        icons=icons,
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    provider = Provider(
+        backend=FakeAdmBackend(),
+        score=0.3,
+        score_wikipedia=0.2,
+        name="adm",
+        resync_interval_sec=10800,
+    )
+    content = build_suggestion_content()
+    provider.suggestion_content = content
+    provider.suggestions = provider.build_suggestions(content)
+
+    keywords = list(content.suggestions)
+    requests = [
+        SuggestionRequest(query=random.choice(keywords), geolocation=Location())
+        for _ in range(QUERIES)
+    ]
+
+    async def query_on_the_fly(srequest: SuggestionRequest) -> list[BaseSuggestion]:
+        """Query by building the suggestion upon each query."""
+        if (look_up := content.suggestions.get(srequest.query)) is not None:
+            results_id, fkw_id = look_up
+            res = content.results[results_id]
+            return [provider.build_suggestion(content, res, fkw_id)]
+        return []
+
+    async def run(
+        query: Callable[[SuggestionRequest], Awaitable[list[BaseSuggestion]]]
+    ) -> None:
+        for srequest in requests:
+            await query(srequest)
+
+    print(f"keywords: {len(keywords):,}, queries: {QUERIES:,}")
+    for label, query in [
+        ("build per query", query_on_the_fly),
+        ("prebuilt", provider.query),
+    ]:
+        elapsed = min(
+            timeit.repeat(lambda: asyncio.run(run(query)), number=1, repeat=3)
+        )
+        print(f"{label:>16}: {elapsed / QUERIES * 1e6:8.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
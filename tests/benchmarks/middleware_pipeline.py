@@ -0,0 +1,115 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Benchmark for the per-request overhead of the middleware.
+
+It serves heartbeat and suggest requests with an app that responds immediately,
+wrapped with the middleware chain registered in `merino.main` or with the composite
+middleware, with and without stage timing. The overhead of a middleware is its time
+per request minus the time of the bare app. The logs are emitted to a null handler,
+and the metrics are dropped since the client isn't connected.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.middleware_pipeline
+"""
+
+import asyncio
+import logging
+import time
+
+from asgi_correlation_id import CorrelationIdMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from merino.middleware.composite import CompositeMiddleware, record_stage_timing
+from merino.middleware.featureflags import FeatureFlagsMiddleware
+from merino.middleware.logging import LoggingMiddleware
+from merino.middleware.metrics import MetricsMiddleware
+
+REQUESTS: int = 20_000
+HEADERS: list[tuple[bytes, bytes]] = [
+    (b"host", b"merino.services.mozilla.com"),
+    (
+        b"user-agent",
+        b"Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:115.0) Gecko/20100101 "
+        b"Firefox/115.0",
+    ),
+    (b"accept-language", b"en-US,en;q=0.5"),
+    (b"x-forwarded-for", b"216.160.83.56"),
+]
+PATHS: dict[str, tuple[str, bytes]] = {
+    "heartbeat": ("/__lbheartbeat__", b""),
+    "suggest": (
+        "/api/v1/suggest",
+        b"q=firefox&sid=deadbeef-0000-1111-2222-333344445555&seq=0",
+    ),
+}
+
+
+async def app(scope: Scope, receive: Receive, send: Send) -> None:
+    """Respond immediately."""
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive() -> Message:
+    """Receive an empty request body."""
+    return {"type": "http.request", "body": b""}  # pragma: no cover
+
+
+async def send(message: Message) -> None:
+    """Drop the response."""
+
+
+async def measure(middleware: ASGIApp, path: str, query_string: bytes) -> float:
+    """Return the time (in us) to serve a request with a middleware."""
+    started_at = time.perf_counter()
+    for _ in range(REQUESTS):
+        scope: Scope = {
+            "type": "http",
+            "method": "GET",
+            "scheme": "https",
+            "server": ("127.0.0.1", 8000),
+            "client": ("216.160.83.56", 50000),
+            "root_path": "",
+            "path": path,
+            "query_string": query_string,
+            "headers": list(HEADERS),
+        }
+        await middleware(scope, receive, send)
+    return (time.perf_counter() - started_at) / REQUESTS * 1e6
+
+
+async def run() -> None:
+    """Run the benchmark."""
+    for name in ("web.suggest.request", "request.summary", "asgi_correlation_id"):
+        logger = logging.getLogger(name)
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+
+    middlewares: dict[str, ASGIApp] = {
+        "none": app,
+        "chain": LoggingMiddleware(
+            FeatureFlagsMiddleware(CorrelationIdMiddleware(MetricsMiddleware(app)))
+        ),
+        "composite": CompositeMiddleware(app),
+        "composite+timing": CompositeMiddleware(app, stage_hook=record_stage_timing),
+    }
+
+    print(f"requests: {REQUESTS:,}")
+    for label, (path, query_string) in PATHS.items():
+        # Warm up the caches of the geolocation, user agents and metric names.
+        for middleware in middlewares.values():
+            await measure(middleware, path, query_string)
+        baseline = await measure(app, path, query_string)
+        for name, middleware in middlewares.items():
+            elapsed = await measure(middleware, path, query_string)
+            print(
+                f"{label:>10} {name:>17}: {elapsed:8.2f} us/request, "
+                f"overhead {elapsed - baseline:8.2f} us/request"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,140 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Benchmark for batching concurrent `RedisAdapter` gets.
+
+It runs waves of concurrent `get()` calls, like those of concurrent weather
+requests, against a local Redis stand-in that speaks enough RESP for `GET`,
+`MGET` and `SET`, and adds a fixed latency per command to simulate the network
+round trip. It compares single-key gets with `batch_gets`, reporting the
+number of commands received by the stand-in and the throughput.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.redis_batching
+"""
+
+import asyncio
+import time
+
+from redis.asyncio import Redis
+
+from merino.cache.redis import RedisAdapter
+
+# The number of waves of concurrent gets, and the number of gets per wave.
+WAVES: int = 200
+CONCURRENCY: int = 100
+# The number of distinct keys, some of which are missing from the stand-in.
+KEYS: int = 500
+STORED_KEYS: int = 400
+# The simulated round trip latency of a command.
+LATENCY_SEC: float = 0.0005
+
+
+class RedisStandIn:
+    """A minimal in-memory Redis server counting the commands it receives."""
+
+    entries: dict[bytes, bytes]
+    commands: int
+
+    def __init__(self) -> None:
+        self.entries = {}
+        self.commands = 0
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve the commands of a connection, one at a time."""
+        try:
+            while command := await self.read_command(reader):
+                self.commands += 1
+                await asyncio.sleep(LATENCY_SEC)
+                writer.write(self.execute(command))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # Connections still open are cancelled upon shutting down the loop.
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def read_command(reader: asyncio.StreamReader) -> list[bytes]:
+        """Read a command sent as a RESP array of bulk strings."""
+        header = await reader.readline()
+        if not header:
+            return []
+        arguments: list[bytes] = []
+        for _ in range(int(header[1:])):
+            length = int((await reader.readline())[1:])
+            arguments.append((await reader.readexactly(length + 2))[:-2])
+        return arguments
+
+    def execute(self, command: list[bytes]) -> bytes:
+        """Execute a command and return its RESP encoded reply."""
+        match [command[0].upper(), *command[1:]]:
+            case [b"GET", key]:
+                return self.encode(self.entries.get(key))
+            case [b"MGET", *keys]:
+                return b"*%d\r\n%b" % (
+                    len(keys),
+                    b"".join(self.encode(self.entries.get(key)) for key in keys),
+                )
+            case [b"SET", key, value, *_]:
+                self.entries[key] = value
+                return b"+OK\r\n"
+            case _:
+                return b"+OK\r\n"
+
+    @staticmethod
+    def encode(value: bytes | None) -> bytes:
+        """Encode a bulk string reply."""
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%b\r\n" % (len(value), value)
+
+
+async def run(adapter: RedisAdapter) -> float:
+    """Run the waves of concurrent gets and return the elapsed time."""
+    started_at = time.perf_counter()
+    for wave in range(WAVES):
+        await asyncio.gather(
+            *(
+                adapter.get(f"key:{(wave * CONCURRENCY + i) % KEYS}")
+                for i in range(CONCURRENCY)
+            )
+        )
+    return time.perf_counter() - started_at
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    stand_in = RedisStandIn()
+    stand_in.entries = {
+        f"key:{i}".encode(): b'{"city_name": "San Francisco"}' * 20
+        for i in range(STORED_KEYS)
+    }
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    port: int = server.sockets[0].getsockname()[1]
+
+    gets: int = WAVES * CONCURRENCY
+    print(f"gets: {gets:,}, concurrency: {CONCURRENCY}, latency: {LATENCY_SEC}s")
+    async with server:
+        for label, batch_gets in [("GET", False), ("batched MGET", True)]:
+            adapter = RedisAdapter(
+                Redis.from_url(f"redis://127.0.0.1:{port}"), batch_gets=batch_gets
+            )
+            # Warm up the connection pool.
+            await run(adapter)
+            stand_in.commands = 0
+            elapsed = await run(adapter)
+            await adapter.close()
+            print(
+                f"{label:>14}: {stand_in.commands:7,} commands, "
+                f"{gets / elapsed:10,.0f} gets/s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
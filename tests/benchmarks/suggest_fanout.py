@@ -0,0 +1,145 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Benchmark for the suggest fan-out over in-memory providers.
+
+It queries the default set of in-memory providers (adM, Top Picks, AMO and Wiki
+Fruit, with their test backends) for keystroke-like queries, and compares
+scheduling a task per provider and gathering them (the behavior prior to the
+non-blocking fast path) with querying them inline with `query_sync()`, after
+checking that both return the same suggestions. It reports the fan-out overhead
+per request, i.e. excluding the parsing and rendering of the request.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.suggest_fanout
+"""
+
+import asyncio
+import time
+from itertools import chain
+
+import aiodogstatsd
+
+from merino.config import settings
+from merino.middleware.geolocation import Location
+from merino.providers.adm.backends.fake_backends import FakeAdmBackend
+from merino.providers.adm.provider import Provider as AdmProvider
+from merino.providers.amo.addons_data import ADDON_KEYWORDS
+from merino.providers.amo.backends.static import StaticAmoBackend
+from merino.providers.amo.provider import Provider as AmoProvider
+from merino.providers.base import BaseSuggestion, NonBlockingProvider, SuggestionRequest
+from merino.providers.top_picks.backends.top_picks import TopPicksBackend
+from merino.providers.top_picks.provider import Provider as TopPicksProvider
+from merino.providers.wiki_fruit import WikiFruitProvider
+from merino.utils import task_runner
+
+REQUESTS: int = 20_000
+# The keystrokes of a few queries, some of which match suggestions.
+QUERIES: list[str] = [
+    query[:length]
+    for query in ["apple", "firefox", "video downloader", "example"]
+    for length in range(1, len(query) + 1)
+]
+LOCATION: Location = Location(country="US", region="CA", city="San Francisco")
+
+
+async def create_providers() -> list[NonBlockingProvider]:
+    """Create and initialize the in-memory providers."""
+    top_picks = settings.providers.top_picks
+    providers: list[NonBlockingProvider] = [
+        AdmProvider(
+            backend=FakeAdmBackend(),
+            score=0.3,
+            score_wikipedia=0.2,
+            name="adm",
+            resync_interval_sec=10800,
+            enabled_by_default=True,
+        ),
+        TopPicksProvider(
+            backend=TopPicksBackend(
+                top_picks_file_path=top_picks.top_picks_file_path,
+                query_char_limit=top_picks.query_char_limit,
+                firefox_char_limit=top_picks.firefox_char_limit,
+            ),
+            score=top_picks.score,
+            name="top_picks",
+            enabled_by_default=True,
+        ),
+        AmoProvider(
+            backend=StaticAmoBackend(),
+            score=0.3,
+            name="amo",
+            min_chars=4,
+            keywords=ADDON_KEYWORDS,
+            enabled_by_default=True,
+        ),
+        WikiFruitProvider(name="wiki_fruit", enabled_by_default=True),
+    ]
+    await asyncio.gather(*(provider.initialize() for provider in providers))
+    return providers
+
+
+async def fan_out_with_tasks(
+    providers: list[NonBlockingProvider], metrics_client: aiodogstatsd.Client, q: str
+) -> list[BaseSuggestion]:
+    """Query the providers with a task each, as the suggest endpoint used to."""
+    lookups = []
+    for p in providers:
+        srequest = SuggestionRequest(query=p.normalize_query(q), geolocation=LOCATION)
+        task = metrics_client.timeit_task(
+            p.query(srequest), f"providers.{p.name}.query"
+        )
+        task.set_name(p.name)
+        lookups.append(task)
+    completed_tasks, _ = await task_runner.gather(
+        lookups, timeout=max(p.query_timeout_sec for p in providers)
+    )
+    return list(chain.from_iterable(task.result() for task in completed_tasks))
+
+
+async def fan_out_inline(
+    providers: list[NonBlockingProvider], metrics_client: aiodogstatsd.Client, q: str
+) -> list[BaseSuggestion]:
+    """Query the providers inline, as the suggest endpoint does for non-blocking
+    providers.
+    """
+    suggestions: list[BaseSuggestion] = []
+    for p in providers:
+        srequest = SuggestionRequest(query=p.normalize_query(q), geolocation=LOCATION)
+        started_at = time.perf_counter()
+        suggestions.extend(p.query_sync(srequest))
+        metrics_client.timing(
+            f"providers.{p.name}.query",
+            value=(time.perf_counter() - started_at) * 1000,
+        )
+    return suggestions
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    providers = await create_providers()
+    # The client isn't connected, so the metrics are dropped upon being reported.
+    metrics_client = aiodogstatsd.Client()
+
+    for q in QUERIES:
+        with_tasks = await fan_out_with_tasks(providers, metrics_client, q)
+        inline = await fan_out_inline(providers, metrics_client, q)
+        assert sorted(s.json() for s in with_tasks) == sorted(
+            s.json() for s in inline
+        ), f"The suggestions differ for {q!r}"
+
+    print(f"providers: {len(providers)}, requests: {REQUESTS:,}")
+    for label, fan_out in [("tasks", fan_out_with_tasks), ("inline", fan_out_inline)]:
+        started_at = time.perf_counter()
+        for i in range(REQUESTS):
+            await fan_out(providers, metrics_client, QUERIES[i % len(QUERIES)])
+        elapsed = time.perf_counter() - started_at
+        print(
+            f"{label:>8}: {elapsed / REQUESTS * 1e6:8.2f} us/request, "
+            f"{REQUESTS / elapsed:10,.0f} requests/s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Benchmark for the emission of the suggest request logs.
+
+It emits a burst of suggest request logs formatted as MozLog JSON, synchronously and
+through the logging queue, to a stream that's always writable and to a slow stream
+that stalls every so often, like a pipe that the log collector drains late. It
+reports the time spent per log on the calling thread, i.e. the event loop, and the
+number of logs dropped by the queue.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.suggest_logging
+"""
+
+import io
+import logging
+import time
+from datetime import datetime
+
+from dockerflow.logging import JsonLogFormatter
+
+from merino.config_logging import start_queue_logging, stop_queue_logging
+from merino.utils.log_data_creators import SuggestLogDataModel
+
+LOGS: int = 20_000
+QUEUE_MAX_SIZE: int = 10_000
+# The slow stream stalls for `STALL_SEC` every `STALL_EVERY` writes.
+STALL_EVERY: int = 1_000
+STALL_SEC: float = 0.05
+
+
+class SlowStream(io.StringIO):
+    """A stream that stalls every so often."""
+
+    writes: int = 0
+
+    def write(self, text: str) -> int:
+        """Discard the text, stalling every `STALL_EVERY` writes."""
+        self.writes += 1
+        if self.writes % STALL_EVERY == 0:
+            time.sleep(STALL_SEC)
+        return len(text)
+
+
+class NullStream(io.StringIO):
+    """A stream that's always writable."""
+
+    def write(self, text: str) -> int:
+        """Discard the text."""
+        return len(text)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    extra = SuggestLogDataModel(
+        sensitive=True,
+        errno=0,
+        time=datetime.now(),
+        path="/api/v1/suggest",
+        method="GET",
+        query="firefox",
+        code=200,
+        rid="7d2b0e5c5c5a4d8e9a3cbd9a1f1f6e3a",
+        session_id="deadbeef-0000-1111-2222-333344445555",
+        sequence_no=0,
+        client_variants="",
+        requested_providers="",
+        country="US",
+        region="WA",
+        city="Milton",
+        dma=819,
+        browser="Firefox(115.0)",
+        os_family="windows",
+        form_factor="desktop",
+    ).dict()
+    logger = logging.getLogger("web.suggest.request")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    print(f"logs: {LOGS:,}, queue max size: {QUEUE_MAX_SIZE:,}")
+    for stream_name, stream_class in [("null", NullStream), ("slow", SlowStream)]:
+        for queued in (False, True):
+            handler = logging.StreamHandler(stream_class())
+            handler.setFormatter(JsonLogFormatter(logger_name="merino"))
+            logger.handlers = [handler]
+            if queued:
+                start_queue_logging(logger, QUEUE_MAX_SIZE)
+            queue_handler = logger.handlers[0]
+
+            started_at = time.perf_counter()
+            for _ in range(LOGS):
+                logger.info("", extra=extra)
+            elapsed = time.perf_counter() - started_at
+            stop_queue_logging()
+
+            print(
+                f"{stream_name:>5} {'queued' if queued else 'sync':>7}: "
+                f"{elapsed / LOGS * 1e6:8.2f} us/log on the caller, "
+                f"dropped {getattr(queue_handler, 'dropped', 0):,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Microbenchmark for rendering suggest responses.
+
+It compares rendering the `SuggestResponse` through `jsonable_encoder` and
+`JSONResponse` (the behavior prior to `SuggestJSONResponse`) with
+`SuggestJSONResponse`, after checking that both produce identical bytes.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.suggest_response
+"""
+
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from merino.providers.adm.provider import SponsoredSuggestion
+from merino.web.models_v1 import SuggestResponse
+from merino.web.responses import SuggestJSONResponse
+
+RESPONSES: int = 10_000
+
+
+def build_response(suggestions: int) -> SuggestResponse:
+    """Build a suggest response with the given number of adM suggestions."""
+    return SuggestResponse.construct(
+        suggestions=[
+            SponsoredSuggestion(
+                block_id=i,
+                full_keyword=f"advertiser {i}",
+                title=f"Advertiser {i} – title",
+                url=f"https://example.org/target/{i}",
+                impression_url=f"https://example.org/impression/{i}",
+                click_url=f"https://example.org/click/{i}",
+                provider="adm",
+                advertiser=f"Advertiser {i}",
+                is_sponsored=True,
+                icon=f"https://example.org/icon/{i}",
+                score=0.3,
+            )
+            for i in range(suggestions)
+        ],
+        request_id="6c0b1e7d-b1e4-4b4d-9d5e-2c3f2e0f7f6a",
+        client_variants=[],
+    )
+
+
+def render_with_json_response(response: SuggestResponse) -> bytes:
+    """Render the response with `jsonable_encoder` and `JSONResponse`."""
+    return JSONResponse(
+        content=jsonable_encoder(response, exclude_unset=True, exclude_none=True)
+    ).body
+
+
+def render_with_suggest_json_response(response: SuggestResponse) -> bytes:
+    """Render the response with `SuggestJSONResponse`."""
+    return SuggestJSONResponse(response).body
+
+
+def main() -> None:
+    """Run the benchmark."""
+    for suggestions in (0, 1, 3):
+        response = build_response(suggestions)
+        assert render_with_json_response(response) == (
+            render_with_suggest_json_response(response)
+        ), "The rendered responses are not identical"
+
+        print(f"suggestions: {suggestions}, responses: {RESPONSES:,}")
+        for label, render in [
+            ("JSONResponse", render_with_json_response),
+            ("SuggestJSONResponse", render_with_suggest_json_response),
+        ]:
+            elapsed = min(
+                timeit.repeat(lambda: render(response), number=RESPONSES, repeat=3)
+            )
+            print(
+                f"{label:>20}: {elapsed / RESPONSES * 1e6:8.2f} us/response, "
+                f"{RESPONSES / elapsed:10,.0f} responses/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Benchmark for the parsing of "User-Agent" strings.
+
+It parses a stream of requests from a corpus of Firefox user agents, with a skewed
+distribution like the traffic of Merino, where a few versions on a few platforms
+make up most of the requests. It compares parsing every request (the behavior prior
+to the user agent cache) with the cached parsing, after checking that both return
+the same user agents.
+
+Note that `ua-parser` caches the results of its regexes for up to 200 user agents,
+which the corpus fits in, and empties that cache whenever it's full, which the few
+thousand user agents seen in production overflow. The "regexes" case measures
+parsing without it.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.user_agent_parsing
+"""
+
+import random
+import time
+from typing import Callable
+
+import aiodogstatsd
+from ua_parser import user_agent_parser
+
+from merino.middleware.user_agent import UserAgent, cache, cached_parse_user_agent
+from merino.utils.user_agent_parsing import parse
+
+REQUESTS: int = 100_000
+# Firefox user agents of the release, ESR and previous versions on the supported
+# platforms, from the most to the least frequent.
+PLATFORMS: list[str] = [
+    "Windows NT 10.0; Win64; x64; rv:{version}",
+    "Macintosh; Intel Mac OS X 10.15; rv:{version}",
+    "X11; Linux x86_64; rv:{version}",
+    "X11; Ubuntu; Linux x86_64; rv:{version}",
+    "Windows NT 6.1; Win64; x64; rv:{version}",
+    "X11; Fedora; Linux x86_64; rv:{version}",
+    "Windows NT 10.0; WOW64; rv:{version}",
+    "X11; CrOS x86_64 14541.0.0; rv:{version}",
+]
+VERSIONS: list[str] = ["115.0", "116.0", "114.0", "102.0", "113.0", "115.0.2", "91.0"]
+MOBILE_USER_AGENTS: list[str] = [
+    "Mozilla/5.0 (Android 13; Mobile; rv:115.0) Gecko/115.0 Firefox/115.0",
+    "Mozilla/5.0 (Android 12; Mobile; rv:114.0) Gecko/114.0 Firefox/114.0",
+    "Mozilla/5.0 (Android 11; Tablet; rv:115.0) Gecko/115.0 Firefox/115.0",
+    (
+        "Mozilla/5.0 (iPhone; CPU iPhone OS 16_5 like Mac OS X) AppleWebKit/605.1.15 "
+        "(KHTML, like Gecko) FxiOS/115.0 Mobile/15E148 Safari/605.1.15"
+    ),
+    (
+        "Mozilla/5.0 (iPad; CPU OS 16_5 like Mac OS X) AppleWebKit/605.1.15 "
+        "(KHTML, like Gecko) FxiOS/115.0 Mobile/15E148 Safari/605.1.15"
+    ),
+]
+CORPUS: list[str] = [
+    f"Mozilla/5.0 ({platform.format(version=version)}) Gecko/20100101 "
+    f"Firefox/{version}"
+    for version in VERSIONS
+    for platform in PLATFORMS
+] + MOBILE_USER_AGENTS
+
+
+def main() -> None:
+    """Run the benchmark."""
+    # A Zipf-like distribution of the user agents over the requests.
+    random.seed(0)
+    stream: list[str] = random.choices(
+        CORPUS, weights=[1 / rank for rank in range(1, len(CORPUS) + 1)], k=REQUESTS
+    )
+    # The client isn't connected, so the metrics are dropped upon being reported.
+    metrics_client = aiodogstatsd.Client()
+
+    for ua_str in CORPUS:
+        assert cached_parse_user_agent(ua_str, metrics_client) == UserAgent(
+            **parse(ua_str)
+        ), f"The user agents differ for {ua_str!r}"
+    if cache is not None:
+        cache.clear()
+
+    print(f"user agents: {len(CORPUS)}, requests: {REQUESTS:,}")
+    cases: list[tuple[str, Callable[[str], object]]] = [
+        (
+            "regexes",
+            lambda ua_str: (
+                user_agent_parser._PARSE_CACHE.clear(),
+                UserAgent(**parse(ua_str)),
+            ),
+        ),
+        ("uncached", lambda ua_str: UserAgent(**parse(ua_str))),
+        ("cached", lambda ua_str: cached_parse_user_agent(ua_str, metrics_client)),
+    ]
+    for label, parse_user_agent in cases:
+        started_at = time.perf_counter()
+        for ua_str in stream:
+            parse_user_agent(ua_str)
+        elapsed = time.perf_counter() - started_at
+        print(
+            f"{label:>10}: {elapsed / REQUESTS * 1e6:8.2f} us/request, "
+            f"{REQUESTS / elapsed:10,.0f} requests/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
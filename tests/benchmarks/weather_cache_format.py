@@ -0,0 +1,76 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Microbenchmark for the formats of the weather reports stored in the cache.
+
+It compares the size of a cached weather report and the time to decode it (upon
+each cache hit) in each of the formats of `CacheFormat`, after checking that they
+all decode to the same report.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.weather_cache_format
+"""
+
+import timeit
+
+from merino.providers.weather.backends.protocol import (
+    CurrentConditions,
+    Forecast,
+    Temperature,
+    WeatherReport,
+)
+from merino.providers.weather.cache_format import (
+    CacheFormat,
+    decode_weather_report,
+    encode_weather_report,
+)
+
+DECODES: int = 20_000
+
+WEATHER_REPORT: WeatherReport = WeatherReport(
+    city_name="San Francisco",
+    current_conditions=CurrentConditions(
+        url=(
+            "http://www.accuweather.com/en/us/san-francisco-ca/94103/current-weather/"
+            "39376_pc?lang=en-us&partner=test_partner"
+        ),
+        summary="Mostly cloudy",
+        icon_id=6,
+        temperature=Temperature(c=15.5, f=60.0),
+    ),
+    forecast=Forecast(
+        url=(
+            "http://www.accuweather.com/en/us/san-francisco-ca/94103/"
+            "daily-weather-forecast/39376_pc?lang=en-us&partner=test_partner"
+        ),
+        summary="Pleasant Saturday",
+        high=Temperature(f=70.0),
+        low=Temperature(f=57.0),
+    ),
+)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    print(f"decodes: {DECODES:,}")
+    for cache_format in CacheFormat:
+        cache_value = encode_weather_report(WEATHER_REPORT, 1e9, cache_format)
+        assert decode_weather_report(cache_value) == (
+            WEATHER_REPORT,
+            1e9,
+        ), "The decoded report is not identical"
+
+        elapsed = min(
+            timeit.repeat(
+                lambda: decode_weather_report(cache_value), number=DECODES, repeat=3
+            )
+        )
+        print(
+            f"{cache_format.value:>13}: {len(cache_value):4} bytes, "
+            f"{elapsed / DECODES * 1e6:6.2f} us/decode"
+        )
+
+
+if __name__ == "__main__":
+    main()
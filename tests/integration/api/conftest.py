@@ -8,13 +8,24 @@ from logging import LogRecord
 from typing import Iterator
 
 import pytest
+from pytest_mock import MockerFixture
 from starlette.testclient import TestClient
 
 from merino.main import app
 from merino.utils.log_data_creators import RequestSummaryLogDataModel
+from merino.utils.lru_cache import LRUCache
 from tests.integration.api.types import RequestSummaryLogDataFixture
 
 
+@pytest.fixture(autouse=True)
+def fixture_empty_lookup_caches(mocker: MockerFixture) -> None:
+    """Start each test with empty geolocation and user agent caches, so that the
+    metrics they record don't depend on the previous tests.
+    """
+    mocker.patch("merino.middleware.geolocation.cache", LRUCache(max_size=100))
+    mocker.patch("merino.middleware.user_agent.cache", LRUCache(max_size=100))
+
+
 @pytest.fixture(name="client")
 def fixture_test_client() -> TestClient:
     """Return a FastAPI TestClient instance.
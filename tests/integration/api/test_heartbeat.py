@@ -11,6 +11,7 @@ import pytest
 from _pytest.logging import LogCaptureFixture
 from fastapi.testclient import TestClient
 from freezegun import freeze_time
+from pytest_mock import MockerFixture
 
 from merino.utils.log_data_creators import RequestSummaryLogDataModel
 from tests.integration.api.types import RequestSummaryLogDataFixture
@@ -25,6 +26,22 @@ def test_heartbeats(client: TestClient, endpoint: str) -> None:
     assert response.status_code == 200
 
 
+@pytest.mark.parametrize("endpoint", ["__heartbeat__", "__lbheartbeat__"])
+def test_heartbeats_skip_geolocation_and_user_agent(
+    mocker: MockerFixture, client: TestClient, endpoint: str
+) -> None:
+    """Test that the heartbeat endpoints don't look up the geolocation nor parse the
+    user agent.
+    """
+    lookup = mocker.patch("merino.middleware.geolocation.cached_lookup_location")
+    parse = mocker.patch("merino.middleware.user_agent.cached_parse_user_agent")
+
+    client.get(f"/{endpoint}")
+
+    lookup.assert_not_called()
+    parse.assert_not_called()
+
+
 @freeze_time("1998-03-31")
 @pytest.mark.parametrize("endpoint", ["__heartbeat__", "__lbheartbeat__"])
 def test_heartbeat_request_log_data(
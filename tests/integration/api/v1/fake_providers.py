@@ -117,6 +117,7 @@ class FakeProvider(BaseProvider):
         hidden: bool,
         query_callable: QueryCallable,
         query_timeout_sec: float = settings.runtime.query_timeout_sec,
+        cacheable: bool = False,
     ) -> None:
         super().__init__()
         self._name = name
@@ -124,6 +125,10 @@ class FakeProvider(BaseProvider):
         self._query_callable = query_callable
         self._enabled_by_default = enabled_by_default
         self._query_timeout_sec = query_timeout_sec
+        self._cacheable = cacheable
+        # Providers are initialized for every request in the integration tests, so
+        # pick the cache generation upon creation instead.
+        self.invalidate_cached_results()
 
     async def initialize(self) -> None:
         """Initialize method for the fake provider."""
@@ -190,6 +195,19 @@ class FakeProviderFactory:
             query_callable=query_sponsored(provider_name),
         )
 
+    @staticmethod
+    def cacheable_sponsored(enabled_by_default: bool = True) -> FakeProvider:
+        """Return a new sponsored fake provider with cacheable suggestions."""
+        provider_name = "cacheable-sponsored"
+
+        return FakeProvider(
+            name=provider_name,
+            enabled_by_default=enabled_by_default,
+            hidden=False,
+            query_callable=query_sponsored(provider_name),
+            cacheable=True,
+        )
+
     @staticmethod
     def timeout_sponsored(enabled_by_default: bool = True) -> FakeProvider:
         """Return a new sponsored fake provider that sleeps."""
@@ -0,0 +1,83 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Integration tests for the circuit breakers of the Merino v1 suggest API endpoint."""
+
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from merino.providers.circuit_breaker import ProviderCircuitBreaker
+from merino.utils.circuit_breaker import CircuitState
+from tests.integration.api.v1.fake_providers import FakeProviderFactory
+from tests.integration.api.v1.types import Providers
+
+
+@pytest.fixture(name="providers")
+def fixture_providers(statsd_mock: Any) -> Providers:
+    """Define providers for this module, each with a circuit breaker that opens upon
+    the first failed query.
+    """
+    providers: Providers = {
+        "sponsored": FakeProviderFactory.sponsored(enabled_by_default=True),
+        "corrupted": FakeProviderFactory.corrupt(enabled_by_default=False),
+    }
+    for name, provider in providers.items():
+        provider.circuit_breaker = ProviderCircuitBreaker(
+            provider_name=name,
+            metrics_client=statsd_mock,
+            failure_rate_threshold=1.0,
+            window_size=1,
+            min_calls=1,
+            slow_call_threshold_sec=0,
+            recovery_timeout_sec=60,
+        )
+    return providers
+
+
+def test_suggest_through_closed_circuit(
+    client: TestClient, providers: Providers
+) -> None:
+    """Test that providers are queried while their circuit is closed."""
+    response = client.get("/api/v1/suggest?q=sponsored")
+
+    assert response.status_code == 200
+    assert len(response.json()["suggestions"]) == 1
+    assert providers["sponsored"].circuit_breaker is not None
+    assert providers["sponsored"].circuit_breaker.state is CircuitState.CLOSED
+
+
+def test_suggest_through_open_circuit(
+    client: TestClient, providers: Providers, statsd_mock: Any
+) -> None:
+    """Test that a provider whose circuit opened upon a failed query returns no
+    suggestions without being queried, and that its state is reported.
+    """
+    with pytest.raises(RuntimeError):
+        client.get("/api/v1/suggest?q=error&providers=corrupted")
+
+    response = client.get("/api/v1/suggest?q=error&providers=corrupted")
+
+    assert response.status_code == 200
+    assert response.json()["suggestions"] == []
+    statsd_mock.increment.assert_any_call("providers.corrupted.circuit_breaker.open")
+    statsd_mock.increment.assert_any_call(
+        "providers.corrupted.circuit_breaker.rejected"
+    )
+
+    response = client.get("/api/v1/providers")
+
+    assert response.json() == [
+        {
+            "id": "sponsored",
+            "availability": "enabled_by_default",
+            "circuit_breaker": "closed",
+        },
+        {
+            "id": "corrupted",
+            "availability": "disabled_by_default",
+            "circuit_breaker": "open",
+        },
+    ]
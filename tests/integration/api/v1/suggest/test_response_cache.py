@@ -0,0 +1,164 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Integration tests for the response cache of the Merino v1 suggest API endpoint."""
+
+import aiodogstatsd
+import pytest
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from merino.providers.base import BaseSuggestion, SuggestionRequest
+from merino.providers.degraded import mark_degraded
+from merino.web import api_v1
+from tests.integration.api.v1.fake_providers import FakeProvider, FakeProviderFactory
+from tests.integration.api.v1.types import Providers
+
+
+@pytest.fixture(name="providers")
+def fixture_providers() -> Providers:
+    """Define providers for this module which are injected automatically."""
+    return {"cacheable-sponsored": FakeProviderFactory.cacheable_sponsored()}
+
+
+def _metric_keys(report) -> list[str]:
+    # TODO: Remove reliance on internal details of aiodogstatsd
+    return [call.args[0] for call in report.call_args_list]
+
+
+def test_cache_hit(mocker: MockerFixture, client: TestClient) -> None:
+    """Test that a repeated query is served from the response cache and that the
+    cached response only differs by its request ID.
+    """
+    report = mocker.patch.object(aiodogstatsd.Client, "_report")
+
+    miss = client.get("/api/v1/suggest?q=sponsored&client_variants=foo,bar")
+    hit = client.get("/api/v1/suggest?q=sponsored&client_variants=foo,bar")
+
+    assert miss.status_code == hit.status_code == 200
+    assert miss.headers["content-type"] == hit.headers["content-type"]
+    miss_result, hit_result = miss.json(), hit.json()
+    assert miss_result["suggestions"][0]["full_keyword"] == "sponsored"
+    assert miss_result.pop("request_id") != hit_result.pop("request_id")
+    assert miss_result == hit_result
+    assert miss_result["client_variants"] == ["foo", "bar"]
+
+    metric_keys = _metric_keys(report)
+    assert metric_keys.count("suggest.response_cache.miss") == 1
+    assert metric_keys.count("suggest.response_cache.hit") == 1
+    # The provider is only queried upon the cache miss.
+    assert metric_keys.count("providers.cacheable-sponsored.query") == 1
+    # Suggestion metrics are recorded for cache hits too.
+    assert metric_keys.count("suggestions-per.provider.cacheable-sponsored") == 2
+
+
+def test_cache_invalidation(
+    mocker: MockerFixture, client: TestClient, providers: Providers
+) -> None:
+    """Test that reloading the provider data invalidates the cached responses."""
+    report = mocker.patch.object(aiodogstatsd.Client, "_report")
+
+    client.get("/api/v1/suggest?q=sponsored")
+    providers["cacheable-sponsored"].invalidate_cached_results()
+    client.get("/api/v1/suggest?q=sponsored")
+
+    metric_keys = _metric_keys(report)
+    assert metric_keys.count("suggest.response_cache.miss") == 2
+    assert "suggest.response_cache.hit" not in metric_keys
+
+
+@pytest.mark.parametrize(
+    "providers",
+    [
+        {
+            "cacheable-sponsored": FakeProviderFactory.cacheable_sponsored(),
+            "non-sponsored": FakeProviderFactory.nonsponsored(),
+        }
+    ],
+)
+def test_not_cached_with_uncacheable_provider(
+    mocker: MockerFixture, client: TestClient
+) -> None:
+    """Test that responses are not cached if any searched provider isn't cacheable."""
+    report = mocker.patch.object(aiodogstatsd.Client, "_report")
+
+    client.get("/api/v1/suggest?q=sponsored")
+    client.get("/api/v1/suggest?q=sponsored")
+
+    metric_keys = _metric_keys(report)
+    assert not [key for key in metric_keys if key.startswith("suggest.response_cache")]
+
+
+async def query_degraded(srequest: SuggestionRequest) -> list[BaseSuggestion]:
+    """Return no suggestions as if the backend failed transiently."""
+    mark_degraded("degraded")
+    return []
+
+
+@pytest.mark.parametrize(
+    "providers",
+    [
+        {
+            "degraded": FakeProvider(
+                name="degraded",
+                enabled_by_default=True,
+                hidden=False,
+                query_callable=query_degraded,
+                cacheable=True,
+            )
+        }
+    ],
+)
+def test_not_cached_with_degraded_provider(
+    mocker: MockerFixture, client: TestClient
+) -> None:
+    """Test that responses are not cached if a provider returned degraded
+    suggestions, e.g. upon a backend error.
+    """
+    report = mocker.patch.object(aiodogstatsd.Client, "_report")
+
+    client.get("/api/v1/suggest?q=sponsored")
+    client.get("/api/v1/suggest?q=sponsored")
+
+    metric_keys = _metric_keys(report)
+    assert metric_keys.count("suggest.response_cache.miss") == 2
+    assert "suggest.response_cache.hit" not in metric_keys
+
+
+def test_cache_eviction(mocker: MockerFixture, client: TestClient) -> None:
+    """Test that evictions are recorded when the cache is full."""
+    mocker.patch.object(
+        api_v1, "response_cache", api_v1.LRUCache(max_size=1, ttl_sec=60)
+    )
+    report = mocker.patch.object(aiodogstatsd.Client, "_report")
+
+    client.get("/api/v1/suggest?q=sponsored")
+    client.get("/api/v1/suggest?q=nope")
+
+    assert _metric_keys(report).count("suggest.response_cache.eviction") == 1
+
+
+@pytest.mark.parametrize(
+    "providers",
+    [
+        {
+            "cacheable-sponsored": FakeProviderFactory.cacheable_sponsored(),
+            "sponsored": FakeProviderFactory.sponsored(),
+        }
+    ],
+)
+def test_cached_response_matches_uncached_response(client: TestClient) -> None:
+    """Test that responses rendered from the response cache are byte-for-byte
+    identical to the ones rendered by `JSONResponse`.
+    """
+    request_id = "6c0b1e7d-b1e4-4b4d-9d5e-2c3f2e0f7f6a"
+    headers = {"X-Request-ID": request_id}
+    query = "/api/v1/suggest?q=sponsored&client_variants=a,b"
+
+    uncached = client.get(f"{query}&providers=sponsored", headers=headers)
+    cached = client.get(f"{query}&providers=cacheable-sponsored", headers=headers)
+
+    assert cached.content == uncached.content.replace(
+        b'"provider":"sponsored"', b'"provider":"cacheable-sponsored"'
+    )
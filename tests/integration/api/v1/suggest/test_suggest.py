@@ -14,6 +14,7 @@ from pytest import LogCaptureFixture
 from pytest_mock import MockerFixture
 
 from merino.config import settings
+from merino.middleware.logging import SuggestLogRollup
 from merino.utils.log_data_creators import SuggestLogDataModel
 from tests.integration.api.v1.fake_providers import FakeProviderFactory
 from tests.integration.api.v1.types import Providers
@@ -282,6 +283,57 @@ def test_suggest_request_log_data(
     assert log_data == expected_log_data
 
 
+@pytest.mark.parametrize(
+    ["sample_rate", "expected_records"], [(0.0, 0), (1.0, 1)], ids=["out", "in"]
+)
+def test_suggest_request_log_sampling(
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    filter_caplog: FilterCaplogFixture,
+    client: TestClient,
+    sample_rate: float,
+    expected_records: int,
+) -> None:
+    """Test that the suggest request log is only emitted for sampled sessions."""
+    caplog.set_level(logging.INFO)
+    mocker.patch("merino.middleware.logging.SUGGEST_LOG_SAMPLE_RATE", sample_rate)
+
+    client.get(
+        "/api/v1/suggest",
+        params={"q": "nope", "sid": "deadbeef-0000-1111-2222-333344445555"},
+    )
+
+    records = filter_caplog(caplog.records, "web.suggest.request")
+    assert len(records) == expected_records
+
+
+def test_suggest_request_log_rollup(
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    filter_caplog: FilterCaplogFixture,
+    client: TestClient,
+) -> None:
+    """Test that suggest requests are counted in the rollup rather than logged one by
+    one in "rollup" mode.
+    """
+    caplog.set_level(logging.INFO)
+    mocker.patch("merino.middleware.logging.SUGGEST_LOG_MODE", "rollup")
+    rollup = mocker.patch(
+        "merino.middleware.logging.suggest_log_rollup",
+        SuggestLogRollup(interval_sec=60),
+    )
+
+    for _ in range(2):
+        client.get("/api/v1/suggest", params={"q": "nope"})
+    rollup.flush()
+
+    assert len(filter_caplog(caplog.records, "web.suggest.request")) == 0
+    records = filter_caplog(caplog.records, "web.suggest.rollup")
+    assert len(records) == 1
+    assert records[0].__dict__["code"] == 200
+    assert records[0].__dict__["count"] == 2
+
+
 def test_suggest_with_invalid_geolocation_ip(
     mocker: MockerFixture,
     caplog: LogCaptureFixture,
@@ -314,6 +366,8 @@ def test_suggest_with_invalid_geolocation_ip(
                 "get.api.v1.suggest.timing",
                 "get.api.v1.suggest.status_codes.200",
                 "response.status_codes.200",
+                "user_agent.cache.miss",
+                "user_agent.parse",
             ],
         ),
         (
@@ -322,6 +376,8 @@ def test_suggest_with_invalid_geolocation_ip(
                 "get.api.v1.suggest.timing",
                 "get.api.v1.suggest.status_codes.400",
                 "response.status_codes.400",
+                "user_agent.cache.miss",
+                "user_agent.parse",
             ],
         ),
     ],
@@ -382,6 +438,8 @@ def test_suggest_metrics_500(mocker: MockerFixture, client: TestClient) -> None:
                 "get.api.v1.suggest.timing",
                 "get.api.v1.suggest.status_codes.200",
                 "response.status_codes.200",
+                "user_agent.cache.miss",
+                "user_agent.parse",
             ],
             [],
         ),
@@ -391,6 +449,8 @@ def test_suggest_metrics_500(mocker: MockerFixture, client: TestClient) -> None:
                 "get.api.v1.suggest.timing",
                 "get.api.v1.suggest.status_codes.400",
                 "response.status_codes.400",
+                "user_agent.cache.miss",
+                "user_agent.parse",
             ],
             [],
         ),
@@ -6,8 +6,10 @@
 Wiki Fruit provider.
 """
 
+import aiodogstatsd
 import pytest
 from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
 
 from merino.providers.wiki_fruit import WikiFruitProvider
 from tests.integration.api.v1.types import Providers
@@ -44,3 +46,25 @@ def test_suggest_miss(client: TestClient) -> None:
 
     result = response.json()
     assert len(result["suggestions"]) == 0
+
+
+def test_suggest_inline(
+    mocker: MockerFixture, client: TestClient, providers: Providers
+) -> None:
+    """Test that the non-blocking wiki fruit provider is queried inline, without
+    scheduling a task, and that its query duration is still recorded.
+    """
+    query_spy = mocker.spy(providers["wiki_fruit"], "query")
+    query_sync_spy = mocker.spy(providers["wiki_fruit"], "query_sync")
+    create_task_spy = mocker.spy(aiodogstatsd.Client, "timeit_task")
+    report = mocker.patch.object(aiodogstatsd.Client, "_report")
+
+    response = client.get("/api/v1/suggest?q=apple")
+
+    assert len(response.json()["suggestions"]) == 1
+    query_sync_spy.assert_called_once()
+    query_spy.assert_not_called()
+    create_task_spy.assert_not_called()
+    assert "providers.wiki_fruit.query" in [
+        call.args[0] for call in report.call_args_list
+    ]
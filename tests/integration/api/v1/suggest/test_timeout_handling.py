@@ -52,6 +52,8 @@ SCENARIOS: dict[str, Scenario] = {
             "get.api.v1.suggest.timing",
             "get.api.v1.suggest.status_codes.200",
             "response.status_codes.200",
+            "user_agent.cache.miss",
+            "user_agent.parse",
         },
     ),
     # Case II: One provider that will time out and another one will not.
@@ -82,6 +84,8 @@ SCENARIOS: dict[str, Scenario] = {
             "get.api.v1.suggest.timing",
             "get.api.v1.suggest.status_codes.200",
             "response.status_codes.200",
+            "user_agent.cache.miss",
+            "user_agent.parse",
         },
     ),
     # Case III: One provider that should not time out since it uses the custom timeout
@@ -106,16 +110,18 @@ SCENARIOS: dict[str, Scenario] = {
             "get.api.v1.suggest.timing",
             "get.api.v1.suggest.status_codes.200",
             "response.status_codes.200",
+            "user_agent.cache.miss",
+            "user_agent.parse",
         },
     ),
     # Case IV: A regular non-timedout provider, a timed-out-tolerant provider, and a timed-out
     #          provider.
     #
     #   - Expects:
-    #     - 3 suggestions returned from all three providers since the max timeout is overridden
-    #       by the timed-out-tolerant provider
-    #     - Timeout logs should not be recorded in the task runner
-    #     - Timeout metrics should not be recorded in the task runner
+    #     - 2 suggestions returned from the non-timedout and the timed-out-tolerant providers,
+    #       since each provider gets its own timeout rather than the largest one
+    #     - Timeout logs recorded in the task runner
+    #     - Timeout metrics recorded in the task runner
     "Case-IV: A-non-timed-out-and-a-timed-out-tolerant-and-a-timed-out-providers": Scenario(
         providers={
             "sponsored": FakeProviderFactory.sponsored(enabled_by_default=True),
@@ -126,11 +132,15 @@ SCENARIOS: dict[str, Scenario] = {
                 enabled_by_default=True
             ),
         },
-        expected_suggestion_count=3,
-        expected_logs_on_task_runner=set(),
+        expected_suggestion_count=2,
+        expected_logs_on_task_runner={
+            "Timeout triggered in the task runner",
+            "Cancelling the task: timedout-sponsored due to timeout",
+        },
         expected_metric_keys={
             "providers.sponsored.query",
             "providers.timedout-sponsored.query",
+            "providers.timedout-sponsored.query.timeout",
             "providers.timedout-tolerant-sponsored.query",
             "suggestions-per.request",
             "suggestions-per.provider.timedout-tolerant-sponsored",
@@ -139,6 +149,8 @@ SCENARIOS: dict[str, Scenario] = {
             "get.api.v1.suggest.timing",
             "get.api.v1.suggest.status_codes.200",
             "response.status_codes.200",
+            "user_agent.cache.miss",
+            "user_agent.parse",
         },
     ),
 }
@@ -29,7 +29,7 @@ def test_cli_help_shows_commands(command_name):
 @pytest.mark.parametrize(
     argnames=["command_name", "subcommand_names"],
     argvalues=[
-        ["wikipedia-indexer", ["index", "copy-export"]],
+        ["wikipedia-indexer", ["index", "copy-export", "build-local-index"]],
         ["navigational-suggestions", ["prepare-domain-metadata"]],
     ],
 )
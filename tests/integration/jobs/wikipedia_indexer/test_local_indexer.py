@@ -0,0 +1,58 @@
+"""LocalIndexer tests"""
+import json
+from pathlib import Path
+
+import pytest
+from google.cloud.storage import Blob
+
+from merino.jobs.wikipedia_indexer.local_indexer import LocalIndexer
+from merino.providers.wikipedia.backends.local import LocalIndex
+
+
+@pytest.fixture
+def file_manager(mocker):
+    """Return a mock FileManager instance."""
+    fm_mock = mocker.patch("merino.jobs.wikipedia_indexer.filemanager.FileManager")
+    return fm_mock.return_value
+
+
+def test_build_from_export_no_exports_available(file_manager, tmp_path: Path):
+    """Test that the build fails if there are no exports on GCS."""
+    file_manager.get_latest_gcs.return_value = Blob("", "bucket")
+    local_indexer = LocalIndexer(set(), set(), file_manager)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        local_indexer.build_from_export(1, str(tmp_path / "index.idx"), 3)
+
+    assert exc_info.value.args[0] == "No exports available on GCS"
+
+
+def test_build_from_export(file_manager, tmp_path: Path):
+    """Test that the titles of the export that aren't blocked are indexed by their
+    score.
+    """
+    file_manager.get_latest_gcs.return_value = Blob(
+        "foo/enwiki-20220101-cirrussearch-content.json.gz", "bar"
+    )
+    documents = [
+        {"title": "Hercule Poirot", "incoming_links": 10, "popularity_score": 0.0003},
+        {"title": "Hercules", "incoming_links": 10, "popularity_score": 0.0001},
+        {"title": "Bad Things", "incoming_links": 10},
+        {"title": "Nyan-cat", "category": ["meme"]},
+        {"incoming_links": 10},
+    ]
+    inputs = []
+    for id, document in enumerate(documents):
+        inputs.append(json.dumps({"index": {"_type": "doc", "_id": str(id)}}))
+        inputs.append(json.dumps(document))
+    file_manager.stream_from_gcs.return_value = (input for input in inputs)
+    output_path = str(tmp_path / "index.idx")
+    local_indexer = LocalIndexer({"meme"}, {"Bad Things"}, file_manager)
+
+    indexed = local_indexer.build_from_export(len(documents), output_path, 3)
+
+    assert indexed == 2
+    local_index = LocalIndex(output_path)
+    assert local_index.complete("hercule", 3) == ["Hercule Poirot", "Hercules"]
+    assert local_index.complete("bad", 3) == []
+    assert local_index.complete("nyan", 3) == []
@@ -0,0 +1,118 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Integration tests for the pre-fork server."""
+import json
+import os
+import signal
+import socket
+import subprocess  # nosec
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+STARTUP_TIMEOUT_SEC: float = 30
+
+
+def wait_for_server(url: str, server: subprocess.Popen) -> None:
+    """Wait until the server serves requests."""
+    deadline: float = time.monotonic() + STARTUP_TIMEOUT_SEC
+    while time.monotonic() < deadline:
+        assert server.poll() is None, "The pre-fork server exited"
+        try:
+            httpx.get(url, timeout=1).raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    pytest.fail("The pre-fork server didn't start")
+
+
+def log_records(log_file: Path) -> list[dict]:
+    """Return the fields of the log records of the server, along with the ID of
+    the process that logged them as `process`.
+    """
+    records: list[dict] = []
+    for line in log_file.read_text().splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        records.append({"process": record["Pid"], **record["Fields"]})
+    return records
+
+
+def test_prefork_server(tmp_path: Path) -> None:
+    """Test that the workers serve the providers initialized by the master, which
+    reloads them and replaces the workers upon a SIGHUP.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+    log_file: Path = tmp_path / "prefork.log"
+    url: str = f"http://127.0.0.1:{port}/api/v1/suggest?q=exam"
+
+    with log_file.open("w") as log:
+        server = subprocess.Popen(  # nosec
+            [sys.executable, "-m", "merino.prefork"],
+            env={
+                **os.environ,
+                "MERINO_ENV": "testing",
+                "MERINO_LOGGING__LEVEL": "INFO",
+                "MERINO_LOGGING__FORMAT": "mozlog",
+                "MERINO_RUNTIME__PREFORK__HOST": "127.0.0.1",
+                "MERINO_RUNTIME__PREFORK__PORT": str(port),
+                "MERINO_RUNTIME__PREFORK__WORKERS": "2",
+            },
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        try:
+            wait_for_server(url, server)
+            assert httpx.get(url).json()["suggestions"]
+
+            server.send_signal(signal.SIGHUP)
+            deadline: float = time.monotonic() + STARTUP_TIMEOUT_SEC
+            while time.monotonic() < deadline and not any(
+                record.get("msg") == "Pre-fork workers replaced"
+                for record in log_records(log_file)
+            ):
+                time.sleep(0.2)
+            assert httpx.get(url).json()["suggestions"]
+        finally:
+            server.send_signal(signal.SIGTERM)
+            exit_code: int = server.wait(timeout=STARTUP_TIMEOUT_SEC)
+
+    assert exit_code == 0
+    records = log_records(log_file)
+    # The providers are only initialized by the master, upon startup and reload.
+    assert [
+        record["process"]
+        for record in records
+        if record.get("msg") == "Provider initialization completed"
+    ] == [server.pid] * 2
+    started = [
+        record["pid"]
+        for record in records
+        if record.get("msg") == "Pre-fork worker started"
+    ]
+    stopped = [
+        record["pid"]
+        for record in records
+        if record.get("msg") == "Pre-fork worker stopped"
+    ]
+    # Two workers were started upon startup and two replaced them upon reload.
+    assert len(started) == 4
+    assert sorted(stopped) == sorted(started)
+    # The master shuts down the providers it replaces and its last ones, and each
+    # worker shuts down the providers it inherited.
+    shut_down = [
+        record["process"]
+        for record in records
+        if record.get("msg") == "Provider shutdown completed"
+    ]
+    assert shut_down.count(server.pid) == 2
+    assert sorted(pid for pid in shut_down if pid != server.pid) == sorted(started)
@@ -11,6 +11,7 @@ import logging
 import os
 import socket
 import struct
+from collections.abc import Mapping, Sequence
 from random import choice, randint
 from typing import Any
 
@@ -28,6 +29,7 @@ from merino.providers.adm.backends.remotesettings import (
 )
 from merino.providers.top_picks.backends.protocol import TopPicksData
 from merino.providers.top_picks.backends.top_picks import TopPicksBackend, TopPicksError
+from merino.utils.keyword_index import KeywordIndex
 from merino.web.models_v1 import SuggestResponse
 from tests.load.locust_tests.client_info import DESKTOP_FIREFOX, LOCALES
 
@@ -199,8 +201,13 @@ def get_top_picks_queries(
     )
     data: TopPicksData = asyncio.run(backend.fetch())
 
-    def add_queries(index: dict[str, list[int]], queries: dict[int, list[str]]):
-        for query, result_ids in index.items():
+    def add_queries(
+        index: Mapping[str, Sequence[int]], queries: dict[int, list[str]]
+    ) -> None:
+        for query, ids in index.items():
+            # The values of a memory-mapped `KeywordIndex` are `(first, count)`
+            # pairs, where only `first` is the ID of a matching result.
+            result_ids = ids[:1] if isinstance(index, KeywordIndex) else ids
             for result_id in result_ids:
                 queries.setdefault(result_id, []).append(query)
 
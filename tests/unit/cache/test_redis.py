@@ -0,0 +1,355 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the redis.py cache adapter module."""
+
+import asyncio
+from datetime import timedelta
+from typing import Any, Optional
+
+import pytest
+from pytest_mock import MockerFixture
+from redis.asyncio import Connection, Redis, RedisError
+from redis.exceptions import ConnectionError, ResponseError
+
+from merino.cache.redis import InstrumentedConnectionPool, RedisAdapter
+from merino.exceptions import CacheAdapterError
+from merino.utils.circuit_breaker import CircuitBreaker, CircuitState
+
+
+@pytest.fixture(name="redis_mock")
+def fixture_redis_mock(mocker: MockerFixture) -> Any:
+    """Create a Redis client mock object for testing."""
+    return mocker.AsyncMock(spec=Redis)
+
+
+def circuit_state(circuit_breaker: CircuitBreaker) -> CircuitState:
+    """Return the state of a circuit breaker, read anew after each command, which
+    mypy would otherwise narrow from a previous check.
+    """
+    return circuit_breaker.state
+
+
+def mock_mget(redis_mock: Any, entries: dict[str, bytes]) -> list[list[str]]:
+    """Mock the `MGET` command, which isn't a coroutine function of the Redis
+    client, and return the list of the keys of each call.
+    """
+    calls: list[list[str]] = []
+
+    async def mget(keys: list[str]) -> list[Optional[bytes]]:
+        calls.append(keys)
+        return [entries.get(key) for key in keys]
+
+    redis_mock.mget.side_effect = mget
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_set_ttl(mocker: MockerFixture, redis_mock: Any) -> None:
+    """Test that the whole time-to-live is passed to Redis, including days."""
+    redis_mock.set = mocker.AsyncMock()
+    adapter = RedisAdapter(redis_mock)
+
+    await adapter.set("key", b"value", ttl=timedelta(days=7, seconds=1))
+
+    redis_mock.set.assert_called_once_with("key", b"value", px=604801000)
+
+
+@pytest.mark.asyncio
+async def test_get_many(redis_mock: Any) -> None:
+    """Test that multiple keys are fetched with a single `MGET` command."""
+    calls = mock_mget(redis_mock, {"a": b"1", "c": b"3"})
+    adapter = RedisAdapter(redis_mock)
+
+    assert await adapter.get_many(["a", "b", "c"]) == [b"1", None, b"3"]
+    assert await adapter.get_many([]) == []
+    assert calls == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_get_many_error(redis_mock: Any) -> None:
+    """Test that Redis errors are raised as `CacheAdapterError`."""
+    redis_mock.mget.side_effect = RedisError("Connection refused")
+    adapter = RedisAdapter(redis_mock)
+
+    with pytest.raises(CacheAdapterError) as error:
+        await adapter.get_many(["a", "b"])
+
+    assert str(error.value) == "Failed to get 2 keys with error: `Connection refused`"
+
+
+@pytest.mark.asyncio
+async def test_set_many(mocker: MockerFixture, redis_mock: Any) -> None:
+    """Test that multiple key-value pairs are stored in a single pipeline."""
+    pipeline_mock = mocker.MagicMock()
+    pipeline_mock.execute = mocker.AsyncMock()
+    redis_mock.pipeline = mocker.MagicMock()
+    redis_mock.pipeline.return_value = pipeline_mock
+    adapter = RedisAdapter(redis_mock)
+
+    await adapter.set_many([("a", b"1"), ("b", b"2")], ttl=timedelta(minutes=1))
+    await adapter.set_many([])
+
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    assert [call.args for call in pipeline_mock.set.call_args_list] == [
+        ("a", b"1"),
+        ("b", b"2"),
+    ]
+    assert all(
+        call.kwargs == {"px": 60000} for call in pipeline_mock.set.call_args_list
+    )
+    pipeline_mock.execute.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_batch_gets(redis_mock: Any) -> None:
+    """Test that concurrent gets are merged into a single `MGET` command."""
+    calls = mock_mget(redis_mock, {"a": b"1", "b": b"2"})
+    adapter = RedisAdapter(redis_mock, batch_gets=True)
+
+    values = await asyncio.gather(
+        adapter.get("a"), adapter.get("b"), adapter.get("a"), adapter.get("c")
+    )
+
+    assert values == [b"1", b"2", b"1", None]
+    assert calls == [["a", "b", "c"]]
+    redis_mock.get.assert_not_called()
+
+    # Gets made after a batch was sent go in the next one.
+    assert await adapter.get("b") == b"2"
+    assert calls == [["a", "b", "c"], ["b"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_gets_error(redis_mock: Any) -> None:
+    """Test that a failed batch raises `CacheAdapterError` to all of its gets."""
+    redis_mock.mget.side_effect = RedisError("Connection refused")
+    adapter = RedisAdapter(redis_mock, batch_gets=True)
+
+    results = await asyncio.gather(
+        adapter.get("a"), adapter.get("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, CacheAdapterError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_gets_unexpected_error(redis_mock: Any) -> None:
+    """Test that an unexpected error of a batch is raised to all of its gets."""
+    redis_mock.mget.side_effect = RuntimeError("unexpected")
+    adapter = RedisAdapter(redis_mock, batch_gets=True)
+
+    results = await asyncio.gather(
+        adapter.get("a"), adapter.get("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_cancelled(redis_mock: Any) -> None:
+    """Test that cancelling a batch while it's sent cancels all of its gets."""
+    sent = asyncio.Event()
+
+    async def mget(keys: list[str]) -> list[Optional[bytes]]:
+        sent.set()
+        await asyncio.Event().wait()
+        return [None for _ in keys]  # pragma: no cover
+
+    redis_mock.mget.side_effect = mget
+    adapter = RedisAdapter(redis_mock, batch_gets=True)
+
+    gets = [asyncio.create_task(adapter.get(key)) for key in ["a", "b"]]
+    await sent.wait()
+    for batch_task in adapter._batch_tasks:
+        batch_task.cancel()
+
+    results = await asyncio.gather(*gets, return_exceptions=True)
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert not adapter._batch_tasks
+
+
+@pytest.mark.asyncio
+async def test_batch_gets_cancelled(redis_mock: Any) -> None:
+    """Test that cancelling a get doesn't affect the other gets of its batch."""
+    mock_mget(redis_mock, {"a": b"1"})
+    adapter = RedisAdapter(redis_mock, batch_gets=True)
+
+    cancelled = asyncio.create_task(adapter.get("a"))
+    task = asyncio.create_task(adapter.get("a"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await task == b"1"
+    assert cancelled.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens(
+    mocker: MockerFixture, redis_mock: Any, statsd_mock: Any
+) -> None:
+    """Test that consecutive connection errors open the circuit breaker, which
+    rejects the following commands without sending them.
+    """
+    redis_mock.get = mocker.AsyncMock(side_effect=ConnectionError("Connection refused"))
+    circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout_sec=10)
+    adapter = RedisAdapter(
+        redis_mock,
+        circuit_breaker=circuit_breaker,
+        name="accuweather",
+        metrics_client=statsd_mock,
+    )
+
+    for _ in range(3):
+        with pytest.raises(CacheAdapterError):
+            await adapter.get("key")
+
+    with pytest.raises(CacheAdapterError) as error:
+        await adapter.get("key")
+
+    assert str(error.value) == (
+        "Failed to get `'key'` with error: `Circuit breaker is open`"
+    )
+    assert circuit_breaker.state is CircuitState.OPEN
+    assert redis_mock.get.call_count == 2
+    assert statsd_mock.increment.call_args_list == [
+        mocker.call("redis.accuweather.error"),
+        mocker.call("redis.accuweather.error"),
+        mocker.call("redis.accuweather.circuit_breaker.open"),
+        mocker.call("redis.accuweather.circuit_breaker.rejected"),
+        mocker.call("redis.accuweather.circuit_breaker.rejected"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_ignores_command_errors(
+    mocker: MockerFixture, redis_mock: Any
+) -> None:
+    """Test that errors of individual commands don't open the circuit breaker."""
+    redis_mock.get = mocker.AsyncMock(side_effect=ResponseError("WRONGTYPE"))
+    circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout_sec=10)
+    adapter = RedisAdapter(redis_mock, circuit_breaker=circuit_breaker)
+
+    with pytest.raises(CacheAdapterError):
+        await adapter.get("key")
+
+    assert circuit_breaker.state is CircuitState.CLOSED
+
+
+async def hang(key: str) -> Optional[bytes]:
+    """Mock a command that never returns, until it's cancelled."""
+    await asyncio.Event().wait()
+    return None  # pragma: no cover
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_ignores_cancelled_commands(
+    mocker: MockerFixture, redis_mock: Any
+) -> None:
+    """Test that cancelled commands, e.g. past a request deadline, don't open the
+    circuit breaker.
+    """
+    redis_mock.get = mocker.AsyncMock(side_effect=hang)
+    circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout_sec=10)
+    adapter = RedisAdapter(redis_mock, circuit_breaker=circuit_breaker)
+
+    for _ in range(5):
+        task = asyncio.create_task(adapter.get("key"))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert redis_mock.get.call_count == 5
+    assert circuit_breaker.state is CircuitState.CLOSED
+    assert circuit_breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_cancelled_trial(
+    mocker: MockerFixture, redis_mock: Any
+) -> None:
+    """Test that a cancelled trial command of a half-open circuit breaker lets the
+    next command through as the trial, instead of leaving the breaker waiting for
+    the outcome of the cancelled one.
+    """
+    redis_mock.get = mocker.AsyncMock(side_effect=ConnectionError("Connection refused"))
+    circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout_sec=0)
+    adapter = RedisAdapter(redis_mock, circuit_breaker=circuit_breaker)
+    with pytest.raises(CacheAdapterError):
+        await adapter.get("key")
+    assert circuit_state(circuit_breaker) is CircuitState.OPEN
+
+    redis_mock.get.side_effect = hang
+    trial = asyncio.create_task(adapter.get("key"))
+    await asyncio.sleep(0)
+    assert circuit_state(circuit_breaker) is CircuitState.HALF_OPEN
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    assert circuit_state(circuit_breaker) is CircuitState.HALF_OPEN
+    redis_mock.get.side_effect = None
+    redis_mock.get.return_value = b"value"
+    assert await adapter.get("key") == b"value"
+    assert circuit_state(circuit_breaker) is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_connection_pool_metrics(mocker: MockerFixture, statsd_mock: Any) -> None:
+    """Test that the connection pool records its wait time upon each command, and
+    its utilization at most once per interval.
+    """
+    mocker.patch.object(Connection, "connect")
+    mocker.patch.object(Connection, "can_read_destructive", return_value=False)
+    pool: InstrumentedConnectionPool = InstrumentedConnectionPool.from_url(
+        "redis://localhost:6379",
+        name="accuweather",
+        metrics_client=statsd_mock,
+        max_connections=4,
+    )
+
+    connection = await pool.get_connection("GET")
+    assert pool.pool_utilization() == (1, 0)
+    await pool.release(connection)
+
+    assert pool.pool_utilization() == (0, 1)
+    assert statsd_mock.timing.call_args.args == ("redis.accuweather.pool.wait",)
+    assert statsd_mock.gauge.call_args_list == [
+        mocker.call("redis.accuweather.pool.in_use", value=0),
+        mocker.call("redis.accuweather.pool.idle", value=1),
+    ]
+
+    connections = [await pool.get_connection("GET") for _ in range(2)]
+    await pool.release(connections[0])
+    assert pool.pool_utilization() == (1, 1)
+    assert statsd_mock.timing.call_count == 3
+    assert statsd_mock.gauge.call_count == 2
+
+    pool.next_report_at = 0.0
+    await pool.release(connections[1])
+    assert statsd_mock.gauge.call_args_list[2:] == [
+        mocker.call("redis.accuweather.pool.in_use", value=0),
+        mocker.call("redis.accuweather.pool.idle", value=2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_connection_pool_connect_error(
+    mocker: MockerFixture, statsd_mock: Any
+) -> None:
+    """Test that a connection the pool fails to connect isn't counted as in use."""
+    mocker.patch.object(Connection, "connect", side_effect=ConnectionError("refused"))
+    pool: InstrumentedConnectionPool = InstrumentedConnectionPool.from_url(
+        "redis://localhost:6379",
+        name="accuweather",
+        metrics_client=statsd_mock,
+        max_connections=4,
+    )
+
+    with pytest.raises(ConnectionError):
+        await pool.get_connection("GET")
+
+    assert pool.pool_utilization() == (0, 1)
@@ -0,0 +1,219 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the tiered.py cache adapter module."""
+
+from datetime import timedelta
+from typing import Any, Optional
+from unittest.mock import call as mocker_call
+
+import pytest
+from pytest_mock import MockerFixture
+
+from merino.cache.tiered import TieredCacheAdapter
+from merino.exceptions import CacheAdapterError
+
+
+class FakeCacheAdapter:
+    """An in-memory cache adapter that records its calls."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, bytes] = {}
+        self.gets: list[str] = []
+
+    async def get(self, key: str) -> Optional[bytes]:  # noqa: D102
+        self.gets.append(key)
+        return self.entries.get(key)
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:  # noqa: D102
+        self.gets.extend(keys)
+        return [self.entries.get(key) for key in keys]
+
+    async def set(
+        self, key: str, value: bytes, ttl: Optional[timedelta] = None
+    ) -> None:  # noqa: D102
+        self.entries[key] = value
+
+    async def set_many(
+        self, items: list[tuple[str, bytes]], ttl: Optional[timedelta] = None
+    ) -> None:  # noqa: D102
+        self.entries.update(items)
+
+    async def set_if_absent(
+        self, key: str, value: bytes, ttl: timedelta
+    ) -> bool:  # noqa: D102
+        return self.entries.setdefault(key, value) is value
+
+    async def close(self) -> None:  # noqa: D102
+        pass
+
+
+@pytest.fixture(name="backend")
+def fixture_backend() -> FakeCacheAdapter:
+    """Create a fake shared cache."""
+    return FakeCacheAdapter()
+
+
+@pytest.fixture(name="adapter")
+def fixture_adapter(backend: FakeCacheAdapter, statsd_mock: Any) -> TieredCacheAdapter:
+    """Create a tiered cache adapter in front of the fake shared cache."""
+    return TieredCacheAdapter(
+        backend=backend,
+        name="test",
+        metrics_client=statsd_mock,
+        max_bytes=16,
+        max_ttl_sec=60,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_from_shared_cache(
+    adapter: TieredCacheAdapter, backend: FakeCacheAdapter, statsd_mock: Any
+) -> None:
+    """Test that values fetched from the shared cache are kept locally."""
+    backend.entries["key"] = b"value"
+
+    assert await adapter.get("key") == b"value"
+    assert await adapter.get("key") == b"value"
+    assert await adapter.get("missing") is None
+
+    assert backend.gets == ["key", "missing"]
+    assert [call.args[0] for call in statsd_mock.increment.call_args_list] == [
+        "cache.test.l1.miss",
+        "cache.test.l2.hit",
+        "cache.test.l1.hit",
+        "cache.test.l1.miss",
+        "cache.test.l2.miss",
+    ]
+    statsd_mock.gauge.assert_called_once_with("cache.test.l1.bytes", value=8)
+
+
+@pytest.mark.asyncio
+async def test_set(
+    adapter: TieredCacheAdapter, backend: FakeCacheAdapter, mocker: MockerFixture
+) -> None:
+    """Test that stored values are written through to the shared cache and kept
+    locally for at most `max_ttl_sec`.
+    """
+    set_spy = mocker.spy(adapter.local_cache, "set")
+
+    await adapter.set("a", b"1", ttl=timedelta(seconds=10))
+    await adapter.set("b", b"2", ttl=timedelta(days=1))
+    await adapter.set("c", b"3")
+
+    assert backend.entries == {"a": b"1", "b": b"2", "c": b"3"}
+    assert [call.kwargs["ttl_sec"] for call in set_spy.call_args_list] == [10, 60, 60]
+    assert await adapter.get("a") == b"1"
+    assert backend.gets == []
+
+
+@pytest.mark.asyncio
+async def test_set_error(
+    adapter: TieredCacheAdapter, backend: FakeCacheAdapter, mocker: MockerFixture
+) -> None:
+    """Test that a key is dropped locally if it can't be stored in the shared cache."""
+    await adapter.set("a", b"1")
+    mocker.patch.object(backend, "set", side_effect=CacheAdapterError("error"))
+
+    with pytest.raises(CacheAdapterError):
+        await adapter.set("a", b"2")
+
+    assert await adapter.get("a") == b"1"
+    assert backend.gets == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_local_cache_max_bytes(
+    adapter: TieredCacheAdapter, backend: FakeCacheAdapter, statsd_mock: Any
+) -> None:
+    """Test that the least recently used local entries are evicted to stay within
+    `max_bytes`.
+    """
+    await adapter.set("a", b"1234567")
+    await adapter.set("b", b"1234567")
+    await adapter.set("c", b"1234567")
+
+    statsd_mock.increment.assert_called_once_with("cache.test.l1.eviction", value=1)
+    assert adapter.local_cache.size_bytes == 16
+    assert await adapter.get("a") == b"1234567"
+    assert backend.gets == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_get_many(
+    adapter: TieredCacheAdapter, backend: FakeCacheAdapter, statsd_mock: Any
+) -> None:
+    """Test that only the keys missing locally are fetched from the shared cache."""
+    await adapter.set("a", b"1")
+    backend.entries["b"] = b"2"
+
+    assert await adapter.get_many(["a", "b", "c"]) == [b"1", b"2", None]
+    assert await adapter.get_many(["a", "b"]) == [b"1", b"2"]
+
+    assert backend.gets == ["b", "c"]
+    statsd_mock.increment.assert_has_calls(
+        [
+            mocker_call("cache.test.l1.hit", value=1),
+            mocker_call("cache.test.l1.miss", value=2),
+            mocker_call("cache.test.l2.hit", value=1),
+            mocker_call("cache.test.l2.miss", value=1),
+            mocker_call("cache.test.l1.hit", value=2),
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_set_many(adapter: TieredCacheAdapter, backend: FakeCacheAdapter) -> None:
+    """Test that key-value pairs are written through to the shared cache and kept
+    locally.
+    """
+    await adapter.set_many([("a", b"1"), ("b", b"2")], ttl=timedelta(seconds=10))
+
+    assert backend.entries == {"a": b"1", "b": b"2"}
+    assert await adapter.get_many(["a", "b"]) == [b"1", b"2"]
+    assert backend.gets == []
+
+
+@pytest.mark.asyncio
+async def test_set_many_error(
+    adapter: TieredCacheAdapter, backend: FakeCacheAdapter, mocker: MockerFixture
+) -> None:
+    """Test that keys are dropped locally if they can't be stored in the shared
+    cache.
+    """
+    await adapter.set("a", b"1")
+    mocker.patch.object(backend, "set_many", side_effect=CacheAdapterError("error"))
+
+    with pytest.raises(CacheAdapterError):
+        await adapter.set_many([("a", b"2")])
+
+    assert len(adapter.local_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_set_if_absent(
+    adapter: TieredCacheAdapter, backend: FakeCacheAdapter
+) -> None:
+    """Test that `set_if_absent()` goes to the shared cache only."""
+    assert await adapter.set_if_absent("lock", b"1", ttl=timedelta(seconds=1))
+    assert not await adapter.set_if_absent("lock", b"2", ttl=timedelta(seconds=1))
+
+    assert len(adapter.local_cache) == 0
+    assert backend.entries == {"lock": b"1"}
+
+
+@pytest.mark.asyncio
+async def test_close(
+    adapter: TieredCacheAdapter, backend: FakeCacheAdapter, mocker: MockerFixture
+) -> None:
+    """Test that closing the adapter clears the local cache and closes the shared
+    cache.
+    """
+    close_spy = mocker.spy(backend, "close")
+    await adapter.set("a", b"1")
+
+    await adapter.close()
+
+    assert len(adapter.local_cache) == 0
+    close_spy.assert_called_once()
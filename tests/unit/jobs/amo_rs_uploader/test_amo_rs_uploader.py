@@ -6,7 +6,10 @@
 
 from typing import Any
 
+import pytest
+
 from merino.jobs.amo_rs_uploader import upload
+from merino.providers.amo.backends.protocol import AmoBackendError
 
 # The number of mock addons to set up.
 TEST_ADDON_COUNT = 3
@@ -85,6 +88,7 @@ def do_upload_test(mocker, delete_existing_records: bool) -> None:
     mock_backend_ctor = mocker.patch("merino.jobs.amo_rs_uploader.DynamicAmoBackend")
     mock_backend = mock_backend_ctor.return_value
     type(mock_backend).fetch_and_cache_addons_info = mocker.AsyncMock()
+    type(mock_backend).shutdown = mocker.AsyncMock()
 
     # Mock the addons data.
     mock_addons_data(mocker, mock_backend)
@@ -110,6 +114,7 @@ def do_upload_test(mocker, delete_existing_records: bool) -> None:
     # Check calls.
     mock_backend_ctor.assert_called_once()
     mock_backend.fetch_and_cache_addons_info.assert_called_once()
+    mock_backend.shutdown.assert_called_once()
 
     mock_uploader_ctor.assert_called_once_with(**uploader_kwargs)
 
@@ -129,3 +134,31 @@ def test_upload_without_deleting(mocker):
 def test_delete_and_upload(mocker):
     """Tests `upload(delete_existing_records=True)`"""
     do_upload_test(mocker, delete_existing_records=True)
+
+
+def test_upload_shuts_down_backend_on_fetch_error(mocker):
+    """Tests that `upload()` shuts down the backend when fetching the addons fails"""
+    mock_backend_ctor = mocker.patch("merino.jobs.amo_rs_uploader.DynamicAmoBackend")
+    mock_backend = mock_backend_ctor.return_value
+    type(mock_backend).fetch_and_cache_addons_info = mocker.AsyncMock(
+        side_effect=AmoBackendError("Error!!!")
+    )
+    type(mock_backend).shutdown = mocker.AsyncMock()
+    mock_uploader_ctor = mocker.patch(
+        "merino.jobs.amo_rs_uploader.ChunkedRemoteSettingsUploader"
+    )
+
+    with pytest.raises(AmoBackendError):
+        upload(
+            auth="auth",
+            bucket="bucket",
+            chunk_size=99,
+            collection="collection",
+            delete_existing_records=False,
+            dry_run=False,
+            record_type="record_type",
+            server="server",
+        )
+
+    mock_backend.shutdown.assert_called_once()
+    mock_uploader_ctor.assert_not_called()
@@ -0,0 +1,234 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the composite middleware module."""
+
+import logging
+from typing import Any
+
+import pytest
+from asgi_correlation_id import CorrelationIdMiddleware
+from asgi_correlation_id.context import correlation_id
+from pytest import LogCaptureFixture
+from pytest_mock import MockerFixture
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from merino.featureflags import session_id_context
+from merino.middleware import ScopeKey, geolocation, user_agent
+from merino.middleware.composite import CompositeMiddleware, record_stage_timing
+from merino.middleware.featureflags import FeatureFlagsMiddleware
+from merino.middleware.logging import LoggingMiddleware
+from merino.middleware.metrics import MetricsMiddleware
+
+REQUEST_ID: str = "7d2b0e5c5c5a4d8e9a3cbd9a1f1f6e3a"
+GENERATED_REQUEST_ID: str = "0b1d0e8b7a3f4c6d9e2a5b8c1d4e7f0a"
+USER_AGENT: str = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:115.0) Gecko/20100101 "
+    "Firefox/115.0"
+)
+
+
+def make_scope(path: str, query_string: str, headers: list[tuple[str, str]]) -> Scope:
+    """Create the scope of an HTTP GET request."""
+    return {
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("216.160.83.56", 50000),
+        "root_path": "",
+        "path": path,
+        "query_string": query_string.encode(),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+    }
+
+
+def make_app(status: int | None) -> tuple[ASGIApp, dict[str, Any]]:
+    """Create an app responding with a status, or raising if it's `None`, and the
+    context it saw.
+    """
+    context: dict[str, Any] = {}
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        context["session_id"] = session_id_context.get()
+        context["correlation_id"] = correlation_id.get()
+        context["scope_keys"] = {
+            key
+            for key in (ScopeKey.FEATURE_FLAGS, ScopeKey.METRICS_CLIENT)
+            if key in scope
+        }
+        if status is None:
+            raise RuntimeError("app failure")
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    return app, context
+
+
+def make_chain(app: ASGIApp) -> ASGIApp:
+    """Wrap an app with the middleware chain registered in `merino.main`."""
+    return LoggingMiddleware(
+        FeatureFlagsMiddleware(CorrelationIdMiddleware(MetricsMiddleware(app)))
+    )
+
+
+async def serve(
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    middleware: ASGIApp,
+    scope: Scope,
+) -> dict[str, Any]:
+    """Serve a request with a middleware and return what it sent, logged and
+    recorded as metrics.
+    """
+    for cache in (geolocation.cache, user_agent.cache):
+        if cache is not None:
+            cache.clear()
+    statsd_client = mocker.MagicMock()
+    for module in ("metrics", "composite", "geolocation", "user_agent"):
+        mocker.patch(
+            f"merino.middleware.{module}.get_metrics_client",
+            return_value=statsd_client,
+        )
+    # Generate the same request ID for invalid "X-Request-ID" headers.
+    for module in ("asgi_correlation_id.middleware", "merino.middleware.composite"):
+        mocker.patch(f"{module}.uuid4").return_value.hex = GENERATED_REQUEST_ID
+    caplog.clear()
+    messages: list[Message] = []
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    error: Exception | None = None
+    try:
+        await middleware(scope, mocker.AsyncMock(spec=Receive), send)
+    except RuntimeError as exc:
+        error = exc
+
+    return {
+        "error": repr(error),
+        "messages": messages,
+        "logs": [
+            (
+                record.name,
+                record.levelname,
+                record.getMessage(),
+                {
+                    key: value
+                    for key, value in record.__dict__.items()
+                    if key not in logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+                    and key not in {"time", "message"}
+                },
+            )
+            for record in caplog.records
+        ],
+        "metrics": [
+            (name, args[0], kwargs.get("tags"))
+            for name, args, kwargs in statsd_client.method_calls
+        ],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["path", "query_string", "headers", "status"],
+    [
+        (
+            "/api/v1/suggest",
+            "q=firefox&sid=deadbeef-0000-1111-2222-333344445555&seq=0",
+            [("User-Agent", USER_AGENT), ("X-Request-ID", REQUEST_ID)],
+            200,
+        ),
+        ("/api/v1/suggest", "q=firefox", [("X-Request-ID", "invalid")], 400),
+        ("/__lbheartbeat__", "", [("X-Request-ID", REQUEST_ID)], 200),
+        ("/unknown", "", [("X-Request-ID", REQUEST_ID)], 404),
+        ("/api/v1/providers", "", [("X-Request-ID", REQUEST_ID)], None),
+    ],
+    ids=["suggest", "invalid_request_id", "heartbeat", "not_found", "error"],
+)
+async def test_composite_equivalent_to_chain(
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    path: str,
+    query_string: str,
+    headers: list[tuple[str, str]],
+    status: int | None,
+) -> None:
+    """Test that the composite middleware sends, logs and records the same as the
+    middleware chain, and sets up the same context for the app.
+    """
+    caplog.set_level(logging.INFO)
+    chain_app, chain_context = make_app(status)
+    composite_app, composite_context = make_app(status)
+
+    chain_result = await serve(
+        mocker, caplog, make_chain(chain_app), make_scope(path, query_string, headers)
+    )
+    composite_result = await serve(
+        mocker,
+        caplog,
+        CompositeMiddleware(composite_app),
+        make_scope(path, query_string, headers),
+    )
+
+    assert composite_context == chain_context
+    assert composite_result == chain_result
+    assert chain_result["metrics"]
+    assert chain_result["logs"] or status is None
+
+
+@pytest.mark.asyncio
+async def test_composite_stage_hook(
+    mocker: MockerFixture, caplog: LogCaptureFixture
+) -> None:
+    """Test that the composite middleware reports the duration of its stages."""
+    app, _ = make_app(200)
+    stage_hook = mocker.Mock()
+
+    await serve(
+        mocker,
+        caplog,
+        CompositeMiddleware(app, stage_hook=stage_hook),
+        make_scope("/__heartbeat__", "", []),
+    )
+
+    assert [call.args[1] for call in stage_hook.call_args_list] == [
+        "feature_flags",
+        "correlation_id",
+        "metrics",
+        "response.metrics",
+        "response.correlation_id",
+        "response.logging",
+    ]
+    assert all(call.args[2] >= 0 for call in stage_hook.call_args_list)
+
+
+def test_record_stage_timing(mocker: MockerFixture) -> None:
+    """Test that stage durations are recorded with the metrics client of the
+    request.
+    """
+    metrics_client = mocker.Mock()
+
+    record_stage_timing({ScopeKey.METRICS_CLIENT: metrics_client}, "metrics", 0.5)
+
+    metrics_client.timing.assert_called_once_with("middleware.metrics", value=0.5)
+
+
+@pytest.mark.asyncio
+async def test_composite_invalid_scope_type(
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    receive_mock: Receive,
+    send_mock: Send,
+) -> None:
+    """Test that no action takes place for an unexpected Scope type."""
+    caplog.set_level(logging.INFO)
+    scope: Scope = {"type": "not-http"}
+    app = mocker.AsyncMock(spec=ASGIApp)
+
+    await CompositeMiddleware(app)(scope, receive_mock, send_mock)
+
+    app.assert_awaited_once_with(scope, receive_mock, send_mock)
+    assert scope == {"type": "not-http"}
+    assert len(caplog.messages) == 0
@@ -3,33 +3,47 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 """Unit tests for the middleware geolocation module."""
+from typing import Any
 
 import pytest
 from pytest import LogCaptureFixture
 from pytest_mock import MockerFixture
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.requests import Request
+from starlette.types import Scope
 
-from merino.middleware import ScopeKey
-from merino.middleware.geolocation import GeolocationMiddleware, Location
+from merino.middleware import ScopeKey, geolocation
+from merino.middleware.geolocation import Location, cache_key, get_geolocation
+from merino.utils.lru_cache import LRUCache
 
+MILTON: Location = Location(
+    country="US", region="WA", city="Milton", dma=819, postal_code="98354"
+)
+
+
+@pytest.fixture(name="cache", autouse=True)
+def fixture_cache(mocker: MockerFixture) -> LRUCache[str, Location]:
+    """Replace the geolocation cache with an empty one."""
+    cache: LRUCache[str, Location] = LRUCache(max_size=10)
+    mocker.patch("merino.middleware.geolocation.cache", cache)
+    return cache
 
-@pytest.fixture(name="geolocation_middleware")
-def fixture_geolocation_middleware(mocker: MockerFixture) -> GeolocationMiddleware:
-    """Create a GeolocationMiddleware object for test."""
-    asgiapp_mock = mocker.AsyncMock(spec=ASGIApp)
-    return GeolocationMiddleware(asgiapp_mock)
+
+@pytest.fixture(name="metrics_client")
+def fixture_metrics_client(mocker: MockerFixture) -> Any:
+    """Replace the metrics client of the geolocation module with a mock."""
+    metrics_client = mocker.MagicMock()
+    mocker.patch(
+        "merino.middleware.geolocation.get_metrics_client",
+        return_value=metrics_client,
+    )
+    return metrics_client
 
 
 # The first two IP addresses are taken from `GeoLite2-City-Test.mmdb`
 @pytest.mark.parametrize(
     ["expected_location", "client_ip_and_port"],
     [
-        (
-            Location(
-                country="US", region="WA", city="Milton", dma=819, postal_code="98354"
-            ),
-            ["216.160.83.56", 50000],
-        ),
+        (MILTON, ["216.160.83.56", 50000]),
         (
             Location(country="GB", region="ENG", city="Boxford", postal_code="OX1"),
             ["2.125.160.216", 50000],
@@ -40,65 +54,44 @@ def fixture_geolocation_middleware(mocker: MockerFixture) -> GeolocationMiddlewa
         ),
     ],
 )
-@pytest.mark.asyncio
-async def test_geolocation_address_found(
+def test_geolocation_address_found(
     caplog: LogCaptureFixture,
-    geolocation_middleware: GeolocationMiddleware,
     scope: Scope,
-    receive_mock: Receive,
-    send_mock: Send,
     expected_location: Location,
     client_ip_and_port: list,
 ) -> None:
     """Test the proper assignment of Location properties given a request IP address."""
     scope["client"] = client_ip_and_port
 
-    await geolocation_middleware(scope, receive_mock, send_mock)
-
+    assert get_geolocation(Request(scope)) == expected_location
     assert scope[ScopeKey.GEOLOCATION] == expected_location
     assert len(caplog.messages) == 0
 
 
-@pytest.mark.asyncio
-async def test_geolocation_address_not_found(
+def test_geolocation_address_not_found(
     caplog: LogCaptureFixture,
-    geolocation_middleware: GeolocationMiddleware,
     scope: Scope,
-    receive_mock: Receive,
-    send_mock: Send,
 ) -> None:
     """Test that no assignment of Location properties takes place, given a request
     with an unrecognised IP address.
     """
-    expected_location: Location = Location()
     scope["client"] = ["255.255.255.255", 50000]  # IP and port
 
-    await geolocation_middleware(scope, receive_mock, send_mock)
-
-    assert scope[ScopeKey.GEOLOCATION] == expected_location
+    assert get_geolocation(Request(scope)) == Location()
     assert len(caplog.messages) == 0
 
 
-@pytest.mark.asyncio
-async def test_geolocation_client_ip_override(
+def test_geolocation_client_ip_override(
     mocker: MockerFixture,
     caplog: LogCaptureFixture,
-    geolocation_middleware: GeolocationMiddleware,
     scope: Scope,
-    receive_mock: Receive,
-    send_mock: Send,
 ) -> None:
     """Test that the CLIENT_IP_OVERRIDE environment variable will take precedence over
     request IP assignment.
     """
-    expected_location: Location = Location(
-        country="US", region="WA", city="Milton", dma=819, postal_code="98354"
-    )
     mocker.patch("merino.middleware.geolocation.CLIENT_IP_OVERRIDE", "216.160.83.56")
 
-    await geolocation_middleware(scope, receive_mock, send_mock)
-
-    assert scope[ScopeKey.GEOLOCATION] == expected_location
+    assert get_geolocation(Request(scope)) == MILTON
     assert len(caplog.messages) == 0
 
 
@@ -106,41 +99,117 @@ async def test_geolocation_client_ip_override(
     "client_ip_and_port",
     [None, [None, 50000], ["", 50000], ["invalid-ip", 50000]],
 )
-@pytest.mark.asyncio
-async def test_geolocation_invalid_address(
+def test_geolocation_invalid_address(
     caplog: LogCaptureFixture,
-    geolocation_middleware: GeolocationMiddleware,
-    scope: Scope,
-    receive_mock: Receive,
-    send_mock: Send,
+    cache: LRUCache[str, Location],
     client_ip_and_port: list,
 ) -> None:
     """Test that a warning is logged and no assignment of Location properties takes
     place, given a request with an unexpected IP addresses.
     """
-    expected_location: Location = Location()
-    scope["client"] = client_ip_and_port
+    for _ in range(2):
+        assert (
+            get_geolocation(Request({"type": "http", "client": client_ip_and_port}))
+            == Location()
+        )
 
-    await geolocation_middleware(scope, receive_mock, send_mock)
+    # Invalid addresses aren't cached.
+    assert len(cache) == 0
+    assert caplog.messages == ["Invalid IP address for geolocation parsing"] * 2
 
-    assert scope[ScopeKey.GEOLOCATION] == expected_location
-    assert len(caplog.messages) == 1
-    assert caplog.messages[0] == "Invalid IP address for geolocation parsing"
 
+def test_geolocation_is_looked_up_once_per_request(
+    mocker: MockerFixture, scope: Scope
+) -> None:
+    """Test that the geolocation is looked up upon the first access only."""
+    lookup = mocker.spy(geolocation, "cached_lookup_location")
+    scope["client"] = ["216.160.83.56", 50000]
+    request = Request(scope)
 
-@pytest.mark.asyncio
-async def test_geolocation_invalid_scope_type(
-    caplog: LogCaptureFixture,
-    geolocation_middleware: GeolocationMiddleware,
-    receive_mock: Receive,
-    send_mock: Send,
+    assert get_geolocation(request) is get_geolocation(request)
+    lookup.assert_called_once()
+    assert lookup.call_args.args[0] == "216.160.83.56"
+
+
+def test_geolocation_cache(
+    mocker: MockerFixture,
+    metrics_client: Any,
+    cache: LRUCache[str, Location],
 ) -> None:
-    """Test that no action, Location assignment or logging, takes place for an
-    unexpected Scope type.
-    """
-    scope: Scope = {"type": "not-http"}
+    """Test that geolocations are cached by IP address."""
+    lookup = mocker.spy(geolocation, "lookup_location")
+
+    locations = [
+        get_geolocation(Request({"type": "http", "client": [ip_address, 50000]}))
+        for ip_address in ["216.160.83.56", "216.160.83.56", "216.160.83.57"]
+    ]
+
+    assert locations == [MILTON] * 3
+    assert locations[0] is locations[1]
+    assert lookup.call_count == 2
+    assert len(cache) == 2
+    assert [call.args[0] for call in metrics_client.increment.call_args_list] == [
+        "geolocation.cache.miss",
+        "geolocation.cache.hit",
+        "geolocation.cache.miss",
+    ]
+
+
+def test_geolocation_cache_by_network(
+    mocker: MockerFixture,
+    metrics_client: Any,
+    cache: LRUCache[str, Location],
+) -> None:
+    """Test that geolocations are cached by network if `CACHE_BY_NETWORK` is set."""
+    mocker.patch("merino.middleware.geolocation.CACHE_BY_NETWORK", True)
 
-    await geolocation_middleware(scope, receive_mock, send_mock)
+    locations = [
+        get_geolocation(Request({"type": "http", "client": [ip_address, 50000]}))
+        for ip_address in ["216.160.83.56", "216.160.83.57"]
+    ]
 
-    assert ScopeKey.GEOLOCATION not in scope
-    assert len(caplog.messages) == 0
+    assert locations == [MILTON] * 2
+    assert len(cache) == 1
+    assert [call.args[0] for call in metrics_client.increment.call_args_list] == [
+        "geolocation.cache.miss",
+        "geolocation.cache.hit",
+    ]
+
+
+def test_geolocation_without_cache(mocker: MockerFixture, metrics_client: Any) -> None:
+    """Test that geolocations are looked up every time if the cache is disabled."""
+    mocker.patch("merino.middleware.geolocation.cache", None)
+
+    location = get_geolocation(
+        Request({"type": "http", "client": ["216.160.83.56", 50000]})
+    )
+
+    assert location == MILTON
+    metrics_client.increment.assert_not_called()
+
+
+def test_cache_key() -> None:
+    """Test that the cache key of an IP address is its normalized form."""
+    assert cache_key("2001:DB8:0::1") == "2001:db8::1"
+
+
+@pytest.mark.parametrize(
+    ["ip_address", "expected_key"],
+    [
+        ("216.160.83.56", "216.160.83.0/24"),
+        ("2001:db8:1234:5678::1", "2001:db8:1234::/48"),
+    ],
+)
+def test_cache_key_by_network(
+    mocker: MockerFixture, ip_address: str, expected_key: str
+) -> None:
+    """Test that the cache key of an IP address is its network."""
+    mocker.patch("merino.middleware.geolocation.CACHE_BY_NETWORK", True)
+
+    assert cache_key(ip_address) == expected_key
+
+
+def test_cache_key_invalid_address() -> None:
+    """Test that the cache key of an invalid IP address is an error."""
+    with pytest.raises(ValueError):
+        cache_key("invalid-ip")
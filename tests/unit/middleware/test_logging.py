@@ -5,13 +5,23 @@
 """Unit tests for the middleware logging module."""
 
 import logging
+import uuid
 
 import pytest
 from pytest import LogCaptureFixture
 from pytest_mock import MockerFixture
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from merino.middleware.logging import LoggingMiddleware
+from merino.middleware.geolocation import Location
+from merino.middleware.logging import (
+    LoggingMiddleware,
+    SuggestLogRollup,
+    is_sampled,
+    log_request,
+    normalize_requested_providers,
+)
+from merino.middleware.user_agent import UserAgent
 
 
 @pytest.mark.asyncio
@@ -31,3 +41,216 @@ async def test_logging_invalid_scope_type(
     await logging_middleware(scope, receive_mock, send_mock)
 
     assert len(caplog.messages) == 0
+
+
+@pytest.mark.parametrize(
+    ["sample_rate", "expected_fraction"], [(0.0, 0.0), (0.25, 0.25), (1.0, 1.0)]
+)
+def test_is_sampled_fraction(sample_rate: float, expected_fraction: float) -> None:
+    """Test that the given fraction of the keys is sampled."""
+    keys: list[str] = [str(uuid.UUID(int=index)) for index in range(10_000)]
+
+    fraction: float = sum(is_sampled(key, sample_rate) for key in keys) / len(keys)
+
+    assert fraction == pytest.approx(expected_fraction, abs=0.02)
+
+
+def test_is_sampled_deterministic() -> None:
+    """Test that the sampling decision for a key doesn't change, and that a key
+    sampled at a rate is sampled at higher rates.
+    """
+    keys: list[str] = [str(uuid.UUID(int=index)) for index in range(1_000)]
+
+    sampled: list[bool] = [is_sampled(key, 0.5) for key in keys]
+
+    assert sampled == [is_sampled(key, 0.5) for key in keys]
+    assert all(is_sampled(key, 0.75) for key, kept in zip(keys, sampled) if kept)
+
+
+def test_log_request_sampled_without_request_id(
+    mocker: MockerFixture, caplog: LogCaptureFixture
+) -> None:
+    """Test that a suggest request without a session or a request ID is sampled
+    rather than failing.
+    """
+    caplog.set_level(logging.INFO)
+    mocker.patch("merino.middleware.logging.SUGGEST_LOG_MODE", "request")
+    mocker.patch("merino.middleware.logging.SUGGEST_LOG_SAMPLE_RATE", 0.0)
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/suggest",
+            "query_string": b"q=firefox",
+            "headers": [],
+        }
+    )
+
+    log_request(request, {"type": "http.response.start", "status": 200})
+
+    assert len(caplog.records) == 0
+
+
+def test_log_request_not_sampled_at_full_rate(mocker: MockerFixture) -> None:
+    """Test that no sampling key is computed when all the requests are logged."""
+    mocker.patch("merino.middleware.logging.SUGGEST_LOG_MODE", "request")
+    mocker.patch("merino.middleware.logging.SUGGEST_LOG_SAMPLE_RATE", 1.0)
+    mocker.patch("merino.middleware.logging.suggest_request_logger")
+    mocker.patch("merino.middleware.logging.create_suggest_log_data")
+    is_sampled_mock = mocker.patch("merino.middleware.logging.is_sampled")
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/suggest",
+            "query_string": b"q=firefox",
+            "headers": [],
+        }
+    )
+
+    log_request(request, {"type": "http.response.start", "status": 200})
+
+    is_sampled_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ["providers", "expected"],
+    [
+        ("", ""),
+        ("adm", "adm"),
+        ("wikipedia,adm,adm", "adm,wikipedia"),
+        ("adm,unknown,,another", "adm,other"),
+        ("unknown", "other"),
+    ],
+)
+def test_normalize_requested_providers(providers: str, expected: str) -> None:
+    """Test that the requested providers are sorted, deduplicated and limited to the
+    known providers.
+    """
+    assert normalize_requested_providers(providers) == expected
+
+
+@pytest.mark.parametrize(
+    ["path", "method", "expected"],
+    [
+        ("/api/v1/suggest", "GET", ("/api/v1/suggest", "GET")),
+        ("/api/v1/suggest", "HEAD", ("/api/v1/suggest", "HEAD")),
+        ("/api/v1/suggest", "PATCH", ("/api/v1/suggest", "other")),
+        ("/api/v9/suggest", "GET", ("other", "GET")),
+        ("/api/v42/suggest", "BREW", ("other", "other")),
+    ],
+)
+def test_suggest_log_rollup_paths_and_methods(
+    mocker: MockerFixture, path: str, method: str, expected: tuple[str, str]
+) -> None:
+    """Test that the rollup counts the paths and methods other than the suggest
+    endpoint's as "other".
+    """
+    mocker.patch("merino.middleware.logging.get_geolocation", return_value=Location())
+    mocker.patch(
+        "merino.middleware.logging.get_user_agent",
+        return_value=UserAgent(browser="Other", os_family="other", form_factor="other"),
+    )
+    rollup = SuggestLogRollup(interval_sec=60)
+    request = Request(
+        {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "query_string": b"q=firefox",
+            "headers": [],
+        }
+    )
+
+    rollup.add(request, {"type": "http.response.start", "status": 404})
+
+    assert [key[:2] for key in rollup.counts] == [expected]
+
+
+def test_suggest_log_rollup(mocker: MockerFixture, caplog: LogCaptureFixture) -> None:
+    """Test that suggest requests are counted by their rollup fields and logged upon
+    flushing the rollup.
+    """
+    caplog.set_level(logging.INFO)
+    mocker.patch(
+        "merino.middleware.logging.get_geolocation", return_value=Location(country="US")
+    )
+    user_agent = UserAgent(browser="Firefox(115.0)", os_family="macos", form_factor="")
+    mocker.patch("merino.middleware.logging.get_user_agent", return_value=user_agent)
+    rollup = SuggestLogRollup(interval_sec=60)
+
+    for form_factor, providers, status in [
+        ("desktop", "adm", 200),
+        ("desktop", "adm,adm", 200),
+        ("phone", "adm", 200),
+        ("desktop", "", 400),
+        ("desktop", "unknown", 200),
+    ]:
+        user_agent.form_factor = form_factor
+        request = Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/api/v1/suggest",
+                "query_string": f"q=firefox&providers={providers}".encode(),
+                "headers": [],
+            }
+        )
+        rollup.add(request, {"type": "http.response.start", "status": status})
+    assert len(caplog.records) == 0
+
+    rollup.flush()
+
+    assert {
+        (
+            record.__dict__["requested_providers"],
+            record.__dict__["country"],
+            record.__dict__["form_factor"],
+            record.__dict__["code"],
+            record.__dict__["count"],
+        )
+        for record in caplog.records
+        if record.name == "web.suggest.rollup"
+    } == {
+        ("adm", "US", "desktop", 200, 2),
+        ("adm", "US", "phone", 200, 1),
+        ("", "US", "desktop", 400, 1),
+        ("other", "US", "desktop", 200, 1),
+    }
+    assert len(rollup.counts) == 0
+
+
+def test_suggest_log_rollup_interval(
+    mocker: MockerFixture, caplog: LogCaptureFixture
+) -> None:
+    """Test that the rollup is logged upon the first request after its interval."""
+    caplog.set_level(logging.INFO)
+    mocker.patch("merino.middleware.logging.get_geolocation", return_value=Location())
+    mocker.patch(
+        "merino.middleware.logging.get_user_agent",
+        return_value=UserAgent(browser="Other", os_family="other", form_factor="other"),
+    )
+    monotonic = mocker.patch("merino.middleware.logging.time.monotonic")
+    monotonic.return_value = 0.0
+    rollup = SuggestLogRollup(interval_sec=60)
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/suggest",
+            "query_string": b"q=firefox",
+            "headers": [],
+        }
+    )
+    message: Message = {"type": "http.response.start", "status": 200}
+
+    rollup.add(request, message)
+    monotonic.return_value = 59.0
+    rollup.add(request, message)
+    assert len(caplog.records) == 0
+
+    monotonic.return_value = 60.0
+    rollup.add(request, message)
+
+    assert [record.__dict__["count"] for record in caplog.records] == [2]
+    assert sum(rollup.counts.values()) == 1
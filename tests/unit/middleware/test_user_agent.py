@@ -3,58 +3,117 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 """Unit tests for the middleware user_agent module."""
+from typing import Any
 
 import pytest
 from pytest_mock import MockerFixture
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.requests import Request
+from starlette.types import Scope
 
-from merino.middleware import ScopeKey
-from merino.middleware.user_agent import UserAgent, UserAgentMiddleware
+from merino.middleware import ScopeKey, user_agent
+from merino.middleware.user_agent import UserAgent, get_user_agent
+from merino.utils.lru_cache import LRUCache
 
+FIREFOX_UA: bytes = (
+    b"Mozilla/5.0 (Macintosh; Intel Mac OS X 11.2; rv:85.0) Gecko/20100101"
+    b" Firefox/103.0"
+)
+FIREFOX_USER_AGENT: UserAgent = UserAgent(
+    browser="Firefox(103.0)", os_family="macos", form_factor="desktop"
+)
 
-@pytest.fixture(name="user_agent_middleware")
-def fixture_user_agent_middleware(mocker: MockerFixture) -> UserAgentMiddleware:
-    """Create a UserAgentMiddleware object for test."""
-    asgiapp_mock = mocker.AsyncMock(spec=ASGIApp)
-    return UserAgentMiddleware(asgiapp_mock)
 
+@pytest.fixture(name="cache", autouse=True)
+def fixture_cache(mocker: MockerFixture) -> LRUCache[str, UserAgent]:
+    """Replace the user agent cache with an empty one."""
+    cache: LRUCache[str, UserAgent] = LRUCache(max_size=10)
+    mocker.patch("merino.middleware.user_agent.cache", cache)
+    return cache
 
-@pytest.mark.asyncio
-async def test_user_agent_parsing(
-    user_agent_middleware: UserAgentMiddleware,
-    scope: Scope,
-    receive_mock: Receive,
-    send_mock: Send,
-):
-    """Test the proper assignment of UserAgent properties given a request IP address."""
-    expected_user_agent = UserAgent(
-        browser="Firefox(103.0)", os_family="macos", form_factor="desktop"
+
+@pytest.fixture(name="metrics_client")
+def fixture_metrics_client(mocker: MockerFixture) -> Any:
+    """Replace the metrics client of the user agent module with a mock."""
+    metrics_client = mocker.MagicMock()
+    mocker.patch(
+        "merino.middleware.user_agent.get_metrics_client",
+        return_value=metrics_client,
     )
+    return metrics_client
 
-    scope["headers"] = [
-        (
-            b"user-agent",
-            (
-                b"Mozilla/5.0 (Macintosh; Intel Mac OS X 11.2; rv:85.0) Gecko/20100101"
-                b" Firefox/103.0"
-            ),
-        )
-    ]
 
-    await user_agent_middleware(scope, receive_mock, send_mock)
+def create_request(ua_str: bytes) -> Request:
+    """Create a request with the given "User-Agent" header."""
+    return Request({"type": "http", "headers": [(b"user-agent", ua_str)]})
+
+
+def test_user_agent_parsing(scope: Scope) -> None:
+    """Test the proper assignment of UserAgent properties given a User-Agent header."""
+    scope["headers"] = [(b"user-agent", FIREFOX_UA)]
+
+    assert get_user_agent(Request(scope)) == FIREFOX_USER_AGENT
+    assert scope[ScopeKey.USER_AGENT] == FIREFOX_USER_AGENT
+
+
+def test_user_agent_missing_header(scope: Scope) -> None:
+    """Test that a request without a User-Agent header gets the "Other" user agent."""
+    scope["headers"] = []
+
+    assert get_user_agent(Request(scope)) == UserAgent(
+        browser="Other", os_family="other", form_factor="other"
+    )
+
 
-    assert scope[ScopeKey.USER_AGENT] == expected_user_agent
+def test_user_agent_is_parsed_once_per_request(mocker: MockerFixture) -> None:
+    """Test that the user agent is parsed upon the first access only."""
+    parse = mocker.spy(user_agent, "cached_parse_user_agent")
+    request = create_request(FIREFOX_UA)
 
+    assert get_user_agent(request) is get_user_agent(request)
+    parse.assert_called_once()
+    assert parse.call_args.args[0] == FIREFOX_UA.decode()
 
-@pytest.mark.asyncio
-async def test_user_agent_invalid_scope_type(
-    user_agent_middleware: UserAgentMiddleware,
-    receive_mock: Receive,
-    send_mock: Send,
+
+def test_user_agent_cache(
+    mocker: MockerFixture, metrics_client: Any, cache: LRUCache[str, UserAgent]
+) -> None:
+    """Test that parsed user agents are cached by User-Agent string."""
+    parse = mocker.spy(user_agent, "parse")
+
+    user_agents = [
+        get_user_agent(create_request(ua_str))
+        for ua_str in [FIREFOX_UA, FIREFOX_UA, FIREFOX_UA.replace(b"11.2", b"11.3")]
+    ]
+
+    assert user_agents == [FIREFOX_USER_AGENT] * 3
+    assert user_agents[0] is user_agents[1]
+    assert parse.call_count == 2
+    assert len(cache) == 2
+    assert [call.args[0] for call in metrics_client.increment.call_args_list] == [
+        "user_agent.cache.miss",
+        "user_agent.cache.hit",
+        "user_agent.cache.miss",
+    ]
+    assert [call.args[0] for call in metrics_client.timing.call_args_list] == [
+        "user_agent.parse"
+    ] * 2
+
+
+def test_user_agent_cache_skips_long_user_agents(
+    metrics_client: Any, cache: LRUCache[str, UserAgent]
 ) -> None:
-    """Test that no user agent assignment takes place for an unexpected Scope type."""
-    scope: Scope = {"type": "not-http"}
+    """Test that overly long User-Agent strings are parsed but not cached."""
+    ua_str = FIREFOX_UA + b" " + b"x" * user_agent.MAX_CACHED_LENGTH
+
+    assert get_user_agent(create_request(ua_str)) == FIREFOX_USER_AGENT
+    assert len(cache) == 0
+    metrics_client.increment.assert_not_called()
+
 
-    await user_agent_middleware(scope, receive_mock, send_mock)
+def test_user_agent_without_cache(mocker: MockerFixture, metrics_client: Any) -> None:
+    """Test that user agents are parsed every time if the cache is disabled."""
+    mocker.patch("merino.middleware.user_agent.cache", None)
 
-    assert ScopeKey.USER_AGENT not in scope
+    assert get_user_agent(create_request(FIREFOX_UA)) == FIREFOX_USER_AGENT
+    metrics_client.increment.assert_not_called()
+    metrics_client.timing.assert_called_once()
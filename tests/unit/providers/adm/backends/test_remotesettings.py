@@ -3,6 +3,8 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 """Unit tests for the Remote Settings backend module."""
+from copy import deepcopy
+from pathlib import Path
 from typing import Any
 from urllib.parse import urljoin
 
@@ -19,10 +21,11 @@ from merino.providers.adm.backends.remotesettings import (
     KintoSuggestion,
     RemoteSettingsBackend,
 )
+from merino.utils.keyword_index import KeywordIndex
 
 
 @pytest.fixture(name="rs_parameters")
-def fixture_rs_parameters() -> dict[str, str]:
+def fixture_rs_parameters() -> dict[str, Any]:
     """Define default Remote Settings parameters for test."""
     return {
         "server": "test://test",
@@ -32,7 +35,7 @@ def fixture_rs_parameters() -> dict[str, str]:
 
 
 @pytest.fixture(name="rs_backend")
-def fixture_rs_backend(rs_parameters: dict[str, str]) -> RemoteSettingsBackend:
+def fixture_rs_backend(rs_parameters: dict[str, Any]) -> RemoteSettingsBackend:
     """Create a RemoteSettingsBackend object for test."""
     return RemoteSettingsBackend(**rs_parameters)
 
@@ -178,7 +181,7 @@ def fixture_rs_attachment_response(rs_attachment: KintoSuggestion) -> httpx.Resp
     ["server", "collection", "bucket"],
 )
 def test_init_invalid_remote_settings_parameter_error(
-    rs_parameters: dict[str, str], parameter: str
+    rs_parameters: dict[str, Any], parameter: str
 ) -> None:
     """Test that a ValueError is raised if initializing with empty Remote Settings
     values.
@@ -216,6 +219,68 @@ async def test_fetch(
     assert suggestion_content == adm_suggestion_content
 
 
+@pytest.mark.asyncio
+async def test_fetch_compact_keyword_index(
+    mocker: MockerFixture,
+    rs_parameters: dict[str, Any],
+    rs_records: list[dict[str, Any]],
+    rs_server_info: dict[str, Any],
+    rs_attachment_response: httpx.Response,
+    adm_suggestion_content: SuggestionContent,
+) -> None:
+    """Test that the fetch method returns the suggestion keywords in a compact
+    keyword index if configured.
+    """
+    mocker.patch.object(kinto_http.AsyncClient, "get_records", return_value=rs_records)
+    mocker.patch.object(
+        kinto_http.AsyncClient, "server_info", return_value=rs_server_info
+    )
+    mocker.patch.object(httpx.AsyncClient, "get", return_value=rs_attachment_response)
+    rs_backend = RemoteSettingsBackend(**rs_parameters, keyword_index="compact")
+
+    suggestion_content: SuggestionContent = await rs_backend.fetch()
+
+    assert isinstance(suggestion_content.suggestions, KeywordIndex)
+    assert suggestion_content == adm_suggestion_content
+
+
+@pytest.mark.asyncio
+async def test_fetch_mmap_keyword_index(
+    mocker: MockerFixture,
+    rs_parameters: dict[str, Any],
+    rs_records: list[dict[str, Any]],
+    rs_server_info: dict[str, Any],
+    rs_attachment_response: httpx.Response,
+    adm_suggestion_content: SuggestionContent,
+    tmp_path: Path,
+) -> None:
+    """Test that the fetch method returns the suggestion keywords in a keyword index
+    memory-mapped from the index directory if configured.
+    """
+    mocker.patch.object(kinto_http.AsyncClient, "get_records", return_value=rs_records)
+    mocker.patch.object(
+        kinto_http.AsyncClient, "server_info", return_value=rs_server_info
+    )
+    mocker.patch.object(httpx.AsyncClient, "get", return_value=rs_attachment_response)
+    rs_backend = RemoteSettingsBackend(
+        **rs_parameters, keyword_index="mmap", mmap_index_dir=str(tmp_path)
+    )
+
+    suggestion_content: SuggestionContent = await rs_backend.fetch()
+
+    assert isinstance(suggestion_content.suggestions, KeywordIndex)
+    assert suggestion_content == adm_suggestion_content
+    assert len(list(tmp_path.glob("adm-keywords-*.idx"))) == 1
+
+
+def test_init_mmap_keyword_index_without_directory(
+    rs_parameters: dict[str, Any]
+) -> None:
+    """Test that the mmap keyword index requires an index directory."""
+    with pytest.raises(ValueError):
+        RemoteSettingsBackend(**rs_parameters, keyword_index="mmap")
+
+
 @pytest.mark.asyncio
 async def test_get_records_backend_error(
     mocker: MockerFixture,
@@ -367,3 +432,135 @@ async def test_get_attachment_backend_error(
         await rs_backend.get_attachment(url)
 
     assert str(error.value) == expected_error_value
+
+
+@pytest.fixture(name="rs_data_records")
+def fixture_rs_data_records(rs_records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return fake records data with two "offline-expansion-data" records."""
+    second_record: dict[str, Any] = deepcopy(rs_records[1])
+    second_record["id"] = "offline-expansion-data-02"
+    second_record["attachment"]["hash"] = "ijkl"
+    second_record["attachment"][
+        "location"
+    ] = "main-workspace/quicksuggest/attachment-03.json"
+    return [*rs_records, second_record]
+
+
+@pytest.fixture(name="rs_attachment_response_02")
+def fixture_rs_attachment_response_02(
+    rs_attachment: KintoSuggestion,
+) -> httpx.Response:
+    """Return response content for a second Remote Settings attachment."""
+    attachment: dict[str, Any] = dict(
+        rs_attachment,
+        id=3,
+        full_keywords=[["example", 1]],
+        keywords=["example"],
+    )
+    return httpx.Response(
+        status_code=200,
+        json=[attachment],
+        request=httpx.Request(
+            method="GET", url="attachment-host/main-workspace/quicksuggest/03.json"
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_fetch_unchanged_records(
+    mocker: MockerFixture,
+    rs_backend: RemoteSettingsBackend,
+    rs_records: list[dict[str, Any]],
+    rs_server_info: dict[str, Any],
+    rs_attachment_response: httpx.Response,
+) -> None:
+    """Test that the fetch method returns the previous suggestion content without
+    downloading any attachment if the records haven't changed.
+    """
+    mocker.patch.object(
+        kinto_http.AsyncClient, "get_records", return_value=deepcopy(rs_records)
+    )
+    mocker.patch.object(
+        kinto_http.AsyncClient, "server_info", return_value=rs_server_info
+    )
+    get_mock = mocker.patch.object(
+        httpx.AsyncClient, "get", return_value=rs_attachment_response
+    )
+
+    suggestion_content: SuggestionContent = await rs_backend.fetch()
+    assert await rs_backend.fetch() is suggestion_content
+    assert get_mock.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_changed_attachment(
+    mocker: MockerFixture,
+    rs_backend: RemoteSettingsBackend,
+    rs_data_records: list[dict[str, Any]],
+    rs_server_info: dict[str, Any],
+    rs_attachment_response: httpx.Response,
+    rs_attachment_response_02: httpx.Response,
+) -> None:
+    """Test that the fetch method only downloads the attachments that changed and
+    merges them with the ones of the previous fetch.
+    """
+    get_records_mock = mocker.patch.object(
+        kinto_http.AsyncClient, "get_records", return_value=rs_data_records
+    )
+    mocker.patch.object(
+        kinto_http.AsyncClient, "server_info", return_value=rs_server_info
+    )
+    get_mock = mocker.patch.object(
+        httpx.AsyncClient,
+        "get",
+        side_effect=[rs_attachment_response, rs_attachment_response_02],
+    )
+    suggestion_content: SuggestionContent = await rs_backend.fetch()
+    assert suggestion_content.suggestions["example"] == (1, 2)
+
+    updated_records: list[dict[str, Any]] = deepcopy(rs_data_records)
+    updated_records[3]["attachment"]["hash"] = "mnop"
+    updated_records[3]["last_modified"] = 456
+    get_records_mock.return_value = updated_records
+    get_mock.side_effect = [rs_attachment_response_02]
+
+    updated_content: SuggestionContent = await rs_backend.fetch()
+
+    assert get_mock.call_count == 3
+    assert get_mock.call_args.args == (
+        "attachment-host/main-workspace/quicksuggest/attachment-03.json",
+    )
+    assert updated_content is not suggestion_content
+    assert updated_content == suggestion_content
+
+
+@pytest.mark.asyncio
+async def test_fetch_deleted_record(
+    mocker: MockerFixture,
+    rs_backend: RemoteSettingsBackend,
+    rs_data_records: list[dict[str, Any]],
+    rs_server_info: dict[str, Any],
+    rs_attachment_response: httpx.Response,
+    rs_attachment_response_02: httpx.Response,
+    adm_suggestion_content: SuggestionContent,
+) -> None:
+    """Test that the fetch method drops the suggestions of deleted records without
+    downloading any attachment.
+    """
+    get_records_mock = mocker.patch.object(
+        kinto_http.AsyncClient, "get_records", return_value=rs_data_records
+    )
+    mocker.patch.object(
+        kinto_http.AsyncClient, "server_info", return_value=rs_server_info
+    )
+    get_mock = mocker.patch.object(
+        httpx.AsyncClient,
+        "get",
+        side_effect=[rs_attachment_response, rs_attachment_response_02],
+    )
+    await rs_backend.fetch()
+
+    get_records_mock.return_value = rs_data_records[:3]
+
+    assert await rs_backend.fetch() == adm_suggestion_content
+    assert get_mock.call_count == 2
@@ -11,6 +11,7 @@ from pytest import LogCaptureFixture
 
 from merino.providers.adm.backends.protocol import SuggestionContent
 from merino.providers.adm.provider import NonsponsoredSuggestion, Provider
+from merino.utils.keyword_index import KeywordIndex
 from tests.types import FilterCaplogFixture
 from tests.unit.types import SuggestionRequestFixture
 
@@ -36,6 +37,22 @@ async def test_initialize(
     assert adm.last_fetch_at > 0
 
 
+@pytest.mark.asyncio
+async def test_initialize_without_resync_in_background(
+    adm: Provider, backend_mock: Any, adm_suggestion_content: SuggestionContent
+) -> None:
+    """Test that the adM provider doesn't start its resync cron job if it doesn't
+    resync in the background, and shuts down its backend once it has fetched.
+    """
+    adm.resync_in_background = False
+
+    await adm.initialize()
+
+    assert adm.suggestion_content == adm_suggestion_content
+    assert not hasattr(adm, "cron_task")
+    backend_mock.shutdown.assert_awaited_once()
+
+
 @pytest.mark.parametrize(
     ["query", "expected"],
     [
@@ -143,3 +160,97 @@ async def test_query_with_missing_key(
     await adm.initialize()
 
     assert await adm.query(srequest("nope")) == []
+
+
+@pytest.mark.asyncio
+async def test_query_returns_prebuilt_suggestions(
+    srequest: SuggestionRequestFixture, adm: Provider
+) -> None:
+    """Test that suggestions are built upon fetch and shared by all the keywords
+    of the same full keyword.
+    """
+    await adm.initialize()
+
+    assert set(adm.suggestions) == {0, 1}
+
+    [firefox] = await adm.query(srequest("firefox"))
+    [firefox_account] = await adm.query(srequest("firefox account"))
+    [mozilla] = await adm.query(srequest("mozilla"))
+
+    assert firefox is firefox_account is adm.suggestions[0]
+    assert mozilla is adm.suggestions[1]
+
+
+@pytest.mark.asyncio
+async def test_initialize_skips_invalid_suggestions(
+    caplog: LogCaptureFixture,
+    filter_caplog: FilterCaplogFixture,
+    srequest: SuggestionRequestFixture,
+    backend_mock: Any,
+    adm: Provider,
+    adm_suggestion_content: SuggestionContent,
+) -> None:
+    """Test that results failing the validation are skipped upon fetch."""
+    adm_suggestion_content.results[0]["url"] = "not a url"
+    backend_mock.fetch.return_value = adm_suggestion_content
+
+    await adm.initialize()
+
+    records = filter_caplog(caplog.records, "merino.providers.adm.provider")
+    assert [record.message for record in records] == [
+        "Skipped invalid adM suggestion"
+    ] * 2
+    assert adm.suggestions == {}
+    assert await adm.query(srequest("firefox")) == []
+
+
+@pytest.mark.asyncio
+async def test_query_compact_keyword_index(
+    srequest: SuggestionRequestFixture,
+    backend_mock: Any,
+    adm: Provider,
+    adm_suggestion_content: SuggestionContent,
+) -> None:
+    """Test that querying a compact keyword index returns the same suggestions as
+    querying a dictionary.
+    """
+    await adm.initialize()
+    expected = {
+        query: await adm.query(srequest(query))
+        for query in [*adm_suggestion_content.suggestions, "nope"]
+    }
+
+    adm_suggestion_content.suggestions = KeywordIndex(
+        adm_suggestion_content.suggestions.items()
+    )
+    backend_mock.fetch.return_value = adm_suggestion_content
+    await adm.initialize()
+
+    assert isinstance(adm.suggestion_content.suggestions, KeywordIndex)
+    for query, suggestions in expected.items():
+        assert await adm.query(srequest(query)) == suggestions
+
+
+@pytest.mark.asyncio
+async def test_fetch_unchanged_content(adm: Provider) -> None:
+    """Test that the suggestions are neither rebuilt nor invalidated if the backend
+    returns the same content as the last fetch.
+    """
+    await adm.initialize()
+    suggestions = adm.suggestions
+    cache_generation = adm.cache_generation
+    last_fetch_at = adm.last_fetch_at
+
+    await adm._fetch()
+
+    assert adm.suggestions is suggestions
+    assert adm.cache_generation == cache_generation
+    assert adm.last_fetch_at >= last_fetch_at
+
+
+@pytest.mark.asyncio
+async def test_shutdown(adm: Provider, backend_mock: Any) -> None:
+    """Test that the shutdown method shuts down the backend."""
+    await adm.shutdown()
+
+    backend_mock.shutdown.assert_called_once()
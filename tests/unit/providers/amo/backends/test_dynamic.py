@@ -160,7 +160,7 @@ async def test_get_addon_request(
     _patch_addons_api_calls(mocker)
     await dynamic_backend.fetch_and_cache_addons_info()
 
-    addons = await dynamic_backend.get_addon(SupportedAddon.VIDEO_DOWNLOADER)
+    addons = dynamic_backend.get_addon(SupportedAddon.VIDEO_DOWNLOADER)
 
     video_downloader = ADDON_DATA[SupportedAddon.VIDEO_DOWNLOADER]
     assert (
@@ -187,6 +187,6 @@ async def test_get_addon_key_error(
     del dynamic_backend.dynamic_data[SupportedAddon.VIDEO_DOWNLOADER]
 
     with pytest.raises(DynamicAmoBackendException) as ex:
-        await dynamic_backend.get_addon(SupportedAddon.VIDEO_DOWNLOADER)
+        dynamic_backend.get_addon(SupportedAddon.VIDEO_DOWNLOADER)
 
     assert str(ex.value) == "Missing Addon in execution. Skip returning Addon."
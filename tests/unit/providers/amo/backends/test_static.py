@@ -15,10 +15,9 @@ def fixture_static_backend() -> StaticAmoBackend:
     return StaticAmoBackend()
 
 
-@pytest.mark.asyncio
-async def test_get_addon_success(static_backend: StaticAmoBackend):
+def test_get_addon_success(static_backend: StaticAmoBackend):
     """Test that we can get Addon information statically."""
-    addons = await static_backend.get_addon(SupportedAddon.VIDEO_DOWNLOADER)
+    addons = static_backend.get_addon(SupportedAddon.VIDEO_DOWNLOADER)
     video_downloader = ADDON_DATA[SupportedAddon.VIDEO_DOWNLOADER]
     vd_icon_rating = STATIC_RATING_AND_ICONS[SupportedAddon.VIDEO_DOWNLOADER]
     assert (
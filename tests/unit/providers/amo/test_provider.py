@@ -4,6 +4,7 @@ import datetime
 import freezegun
 import pytest
 from _pytest.logging import LogCaptureFixture
+from pytest_mock import MockerFixture
 
 from merino.middleware.geolocation import Location
 from merino.providers.amo.addons_data import ADDON_DATA, SupportedAddon
@@ -22,7 +23,7 @@ from merino.providers.custom_details import AmoDetails, CustomDetails
 class AmoErrorBackend:
     """AmoBackend that raises an error for testing."""
 
-    async def get_addon(self, addon_key: SupportedAddon) -> Addon:  # pragma: no cover
+    def get_addon(self, addon_key: SupportedAddon) -> Addon:  # pragma: no cover
         """Get an Addon based on the addon_key.
         Raise a `BackendError` if the addon key is missing.
         """
@@ -32,11 +33,15 @@ class AmoErrorBackend:
         """Fetch addons to be stored."""
         pass
 
+    async def shutdown(self) -> None:
+        """Shut down connections to the backend."""
+        pass
+
 
 class AmoInitErrorBackend:
     """AmoBackend that raises an error during initialization."""
 
-    async def get_addon(self, addon_key: SupportedAddon) -> Addon:  # pragma: no cover
+    def get_addon(self, addon_key: SupportedAddon) -> Addon:  # pragma: no cover
         """Get an Addon based on the addon_key.
         Raise a `BackendError` if the addon key is missing.
         """
@@ -46,6 +51,10 @@ class AmoInitErrorBackend:
         """Initialize addons to be stored."""
         raise AmoBackendError("Error!!!")
 
+    async def shutdown(self) -> None:
+        """Shut down connections to the backend."""
+        pass
+
 
 @pytest.fixture(name="keywords")
 def fixture_keywords() -> dict[SupportedAddon, set[str]]:
@@ -212,3 +221,21 @@ async def test_fetch_addon(
             year=2012, month=1, day=14, hour=3, minute=21, second=34
         ).timestamp()
     )
+
+
+@pytest.mark.asyncio
+async def test_initialize_without_resync_in_background(
+    mocker: MockerFixture, addons_provider: AddonsProvider
+) -> None:
+    """Test that the provider fetches the addon information once upon its
+    initialization, rather than in a cron job, then shuts down its backend if it
+    doesn't resync in the background.
+    """
+    shutdown = mocker.spy(addons_provider.backend, "shutdown")
+    addons_provider.resync_in_background = False
+
+    await addons_provider.initialize()
+
+    assert addons_provider.last_fetch_at is not None
+    assert not hasattr(addons_provider, "cron_task")
+    assert shutdown.await_count == 1
@@ -0,0 +1,120 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the providers circuit_breaker.py module."""
+import asyncio
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from merino.providers.circuit_breaker import ProviderCircuitBreaker
+from merino.providers.degraded import track_degraded_providers
+from merino.utils.circuit_breaker import CircuitState
+
+
+@pytest.fixture(name="circuit_breaker")
+def fixture_circuit_breaker(statsd_mock: Any) -> ProviderCircuitBreaker:
+    """Create a circuit breaker that opens once half of the last 4 queries failed."""
+    return ProviderCircuitBreaker(
+        provider_name="wikipedia",
+        metrics_client=statsd_mock,
+        failure_rate_threshold=0.5,
+        window_size=4,
+        min_calls=2,
+        slow_call_threshold_sec=0.05,
+        recovery_timeout_sec=60,
+    )
+
+
+def state(circuit_breaker: ProviderCircuitBreaker) -> CircuitState:
+    """Return the state of a circuit breaker, which mypy would otherwise narrow from
+    a previous assertion, as if the calls in between couldn't change it.
+    """
+    return circuit_breaker.state
+
+
+async def succeed() -> list[str]:
+    """Return a suggestion."""
+    return ["suggestion"]
+
+
+async def fail() -> list[str]:
+    """Raise an error."""
+    raise RuntimeError("Connection refused")
+
+
+async def hang() -> list[str]:
+    """Take longer than the slow call threshold."""
+    await asyncio.sleep(0.1)
+    return ["suggestion"]
+
+
+@pytest.mark.asyncio
+async def test_call_opens_on_failure_rate(
+    mocker: MockerFixture, circuit_breaker: ProviderCircuitBreaker, statsd_mock: Any
+) -> None:
+    """Test that the circuit opens once the failure rate reaches the threshold, and
+    that queries then return no suggestions without being run.
+    """
+    query = mocker.AsyncMock(side_effect=succeed)
+
+    assert await circuit_breaker.call(query) == ["suggestion"]
+    assert await circuit_breaker.call(query) == ["suggestion"]
+    with pytest.raises(RuntimeError):
+        await circuit_breaker.call(fail)
+    assert state(circuit_breaker) is CircuitState.CLOSED
+
+    with pytest.raises(RuntimeError):
+        await circuit_breaker.call(fail)
+    assert state(circuit_breaker) is CircuitState.OPEN
+
+    assert await circuit_breaker.call(query) == []
+    assert query.await_count == 2
+    assert statsd_mock.increment.call_args_list == [
+        mocker.call("providers.wikipedia.circuit_breaker.open"),
+        mocker.call("providers.wikipedia.circuit_breaker.rejected"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_call_rejected_marks_degraded(
+    circuit_breaker: ProviderCircuitBreaker,
+) -> None:
+    """Test that the empty suggestions of a rejected query are marked as degraded."""
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await circuit_breaker.call(fail)
+    degraded_providers: set[str] = track_degraded_providers()
+
+    assert await circuit_breaker.call(succeed) == []
+    assert degraded_providers == {"wikipedia"}
+
+
+@pytest.mark.asyncio
+async def test_call_counts_slow_queries_as_failed(
+    circuit_breaker: ProviderCircuitBreaker,
+) -> None:
+    """Test that queries slower than the threshold count as failed, even though
+    their suggestions are returned.
+    """
+    assert await circuit_breaker.call(hang) == ["suggestion"]
+    assert await circuit_breaker.call(hang) == ["suggestion"]
+
+    assert state(circuit_breaker) is CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_call_counts_cancelled_queries_as_failed(
+    circuit_breaker: ProviderCircuitBreaker,
+) -> None:
+    """Test that queries cancelled upon timing out count as failed."""
+    for _ in range(2):
+        task = asyncio.create_task(circuit_breaker.call(hang))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert state(circuit_breaker) is CircuitState.OPEN
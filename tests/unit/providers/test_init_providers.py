@@ -30,6 +30,22 @@ async def test_init_providers() -> None:
     }
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resync_in_background", [True, False])
+async def test_init_providers_resync_in_background(resync_in_background: bool) -> None:
+    """Test that `init_providers` sets whether the providers resync in the
+    background.
+    """
+    await init_providers(resync_in_background=resync_in_background)
+
+    providers, _ = get_providers()
+
+    assert all(
+        provider.resync_in_background is resync_in_background
+        for provider in providers.values()
+    )
+
+
 @pytest.mark.asyncio
 async def test_init_providers_unknown_provider_type(mocker: MockerFixture) -> None:
     """Test for the `init_providers` with an unknown provider."""
@@ -63,3 +79,16 @@ async def test_shutdown_providers(
     providers = records[1].__dict__["providers"]
 
     assert set(providers) == {provider.value for provider in ProviderType}
+
+
+@pytest.mark.asyncio
+async def test_shutdown_providers_given(mocker: MockerFixture) -> None:
+    """Test that `shutdown_providers` only shuts down the given providers, if any."""
+    await init_providers()
+    providers, _ = get_providers()
+    given, *others = providers.values()
+    shutdowns = [mocker.spy(provider, "shutdown") for provider in providers.values()]
+
+    await shutdown_providers({given.name: given})
+
+    assert [shutdown.await_count for shutdown in shutdowns] == [1] + [0] * len(others)
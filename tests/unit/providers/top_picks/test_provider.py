@@ -3,6 +3,8 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 """Unit tests for the top picks provider module."""
+from pathlib import Path
+from typing import Any
 
 import pytest
 from pytest import LogCaptureFixture
@@ -12,6 +14,7 @@ from merino.exceptions import BackendError
 from merino.providers.base import BaseSuggestion
 from merino.providers.top_picks.backends.top_picks import TopPicksBackend
 from merino.providers.top_picks.provider import Provider, Suggestion
+from merino.utils.keyword_index import KeywordIndex
 from tests.types import FilterCaplogFixture
 from tests.unit.types import SuggestionRequestFixture
 
@@ -228,3 +231,31 @@ async def test_short_domain_query_similars_longer_than_domain(
 
     result = await top_picks.query(srequest(query))
     assert result == expected_suggestion
+
+
+@pytest.mark.asyncio
+async def test_query_mmap_index(
+    srequest: SuggestionRequestFixture,
+    top_picks: Provider,
+    top_picks_backend_parameters: dict[str, Any],
+    top_picks_parameters: dict[str, Any],
+    tmp_path: Path,
+) -> None:
+    """Test that the provider returns the same suggestions with the memory-mapped
+    indices as with the dictionaries.
+    """
+    mmap_top_picks = Provider(
+        backend=TopPicksBackend(
+            **top_picks_backend_parameters, index="mmap", mmap_index_dir=str(tmp_path)
+        ),
+        **top_picks_parameters,
+    )
+    await top_picks.initialize()
+    await mmap_top_picks.initialize()
+
+    assert isinstance(mmap_top_picks.top_picks_data.primary_index, KeywordIndex)
+    assert len(list(tmp_path.glob("top-picks-*.idx"))) == 3
+    for query in ["ex", "exam", "exxamp", "example", "aa", "abc", "mozilla", "http"]:
+        assert await mmap_top_picks.query(srequest(query)) == await top_picks.query(
+            srequest(query)
+        )
@@ -5,6 +5,7 @@
 """Unit tests for the AccuWeather backend module."""
 
 import json
+from datetime import timedelta
 from typing import Any, Optional
 
 import pytest
@@ -12,6 +13,8 @@ from httpx import AsyncClient, HTTPError, Request, Response
 from pytest import FixtureRequest
 from pytest_mock import MockerFixture
 
+from merino.cache.protocol import CacheAdapter
+from merino.exceptions import CacheAdapterError
 from merino.middleware.geolocation import Location
 from merino.providers.weather.backends.accuweather import (
     AccuweatherBackend,
@@ -27,7 +30,7 @@ from merino.providers.weather.backends.protocol import (
 
 
 @pytest.fixture(name="accuweather_parameters")
-def fixture_accuweather_parameters() -> dict[str, str]:
+def fixture_accuweather_parameters() -> dict[str, Any]:
     """Create an Accuweather object for test."""
     return {
         "api_key": "test",
@@ -41,14 +44,14 @@ def fixture_accuweather_parameters() -> dict[str, str]:
 
 
 @pytest.fixture(name="accuweather")
-def fixture_accuweather(accuweather_parameters: dict[str, str]) -> AccuweatherBackend:
+def fixture_accuweather(accuweather_parameters: dict[str, Any]) -> AccuweatherBackend:
     """Create an Accuweather object for test."""
     return AccuweatherBackend(**accuweather_parameters)
 
 
 @pytest.fixture(name="accuweather_with_partner_code")
 def fixture_accuweather_with_partner_code(
-    accuweather_parameters: dict[str, str]
+    accuweather_parameters: dict[str, Any]
 ) -> AccuweatherBackend:
     """Create an Accuweather object with a partner code for test."""
     return AccuweatherBackend(
@@ -251,7 +254,7 @@ def fixture_accuweather_forecast_response_fahrenheit(
     return json.dumps(accuweather_forecast_response).encode("utf-8")
 
 
-def test_init_api_key_value_error(accuweather_parameters: dict[str, str]) -> None:
+def test_init_api_key_value_error(accuweather_parameters: dict[str, Any]) -> None:
     """Test that a ValueError is raised if initializing with an empty API key."""
     expected_error_value: str = "AccuWeather API key not specified"
     accuweather_parameters["api_key"] = ""
@@ -274,7 +277,7 @@ def test_init_api_key_value_error(accuweather_parameters: dict[str, str]) -> Non
     ],
 )
 def test_init_url_value_error(
-    accuweather_parameters: dict[str, str], url_value: str
+    accuweather_parameters: dict[str, Any], url_value: str
 ) -> None:
     """Test that a ValueError is raised if initializing with empty URL values."""
     expected_error_value: str = (
@@ -864,3 +867,148 @@ async def test_cache_inputs_for_weather_report(
         cache_inputs_by_location[0]
     )
     assert cache_inputs == cache_inputs_by_location[1]
+
+
+@pytest.fixture(name="location_cache")
+def fixture_location_cache(mocker: MockerFixture) -> Any:
+    """Create a cache adapter mock for location keys."""
+    return mocker.AsyncMock(spec=CacheAdapter)
+
+
+@pytest.fixture(name="accuweather_with_location_cache")
+def fixture_accuweather_with_location_cache(
+    accuweather_parameters: dict[str, Any], location_cache: Any, statsd_mock: Any
+) -> AccuweatherBackend:
+    """Create an Accuweather object caching location keys for test."""
+    return AccuweatherBackend(
+        cache=location_cache,
+        cached_location_key_ttl_sec=86400,
+        metrics_client=statsd_mock,
+        **accuweather_parameters,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_cached_location_hit(
+    mocker: MockerFixture,
+    accuweather_with_location_cache: AccuweatherBackend,
+    location_cache: Any,
+    statsd_mock: Any,
+) -> None:
+    """Test that cached locations are returned without requesting AccuWeather."""
+    location = AccuweatherLocation(key="39376_PC", localized_name="San Francisco")
+    location_cache.get.return_value = location.json().encode("utf-8")
+    mock_client: Any = mocker.AsyncMock(spec=AsyncClient)
+
+    assert (
+        await accuweather_with_location_cache.get_cached_location(
+            mock_client, "US", "94105"
+        )
+        == location
+    )
+    location_cache.get.assert_called_once_with(
+        accuweather_with_location_cache.cache_key_for_location("US", "94105")
+    )
+    mock_client.get.assert_not_called()
+    statsd_mock.increment.assert_called_once_with("accuweather.location_key.cache.hit")
+
+
+@pytest.mark.asyncio
+async def test_get_cached_location_negative_hit(
+    mocker: MockerFixture,
+    accuweather_with_location_cache: AccuweatherBackend,
+    location_cache: Any,
+) -> None:
+    """Test that postal codes cached without a location return None."""
+    location_cache.get.return_value = b"{}"
+    mock_client: Any = mocker.AsyncMock(spec=AsyncClient)
+
+    assert (
+        await accuweather_with_location_cache.get_cached_location(
+            mock_client, "US", "00000"
+        )
+        is None
+    )
+    mock_client.get.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ["content", "cache_value"],
+    [
+        (
+            b'[{"Key": "39376_PC", "LocalizedName": "San Francisco"}]',
+            b'{"key": "39376_PC", "localized_name": "San Francisco"}',
+        ),
+        (b"[]", b"{}"),
+    ],
+    ids=["location", "no_location"],
+)
+@pytest.mark.asyncio
+async def test_get_cached_location_miss(
+    mocker: MockerFixture,
+    accuweather_with_location_cache: AccuweatherBackend,
+    location_cache: Any,
+    statsd_mock: Any,
+    content: bytes,
+    cache_value: bytes,
+) -> None:
+    """Test that locations, or the absence of one, are requested from AccuWeather
+    and cached upon a miss.
+    """
+    location_cache.get.return_value = None
+    mock_client: Any = mocker.AsyncMock(spec=AsyncClient)
+    mock_client.get.return_value = Response(
+        status_code=200,
+        content=content,
+        request=Request(
+            method="GET",
+            url="test://test/locations/v1/postalcodes/US/search.json?apikey=test&q=94105",
+        ),
+    )
+
+    await accuweather_with_location_cache.get_cached_location(
+        mock_client, "US", "94105"
+    )
+
+    mock_client.get.assert_called_once()
+    location_cache.set.assert_called_once_with(
+        accuweather_with_location_cache.cache_key_for_location("US", "94105"),
+        cache_value,
+        ttl=timedelta(days=1),
+    )
+    statsd_mock.increment.assert_called_once_with("accuweather.location_key.cache.miss")
+
+
+@pytest.mark.asyncio
+async def test_get_cached_location_cache_error(
+    mocker: MockerFixture,
+    accuweather_with_location_cache: AccuweatherBackend,
+    location_cache: Any,
+    statsd_mock: Any,
+    accuweather_location_response: bytes,
+) -> None:
+    """Test that cache errors are treated as misses."""
+    location_cache.get.side_effect = CacheAdapterError("Failed to get")
+    location_cache.set.side_effect = CacheAdapterError("Failed to set")
+    mock_client: Any = mocker.AsyncMock(spec=AsyncClient)
+    mock_client.get.return_value = Response(
+        status_code=200,
+        content=accuweather_location_response,
+        request=Request(
+            method="GET",
+            url="test://test/locations/v1/postalcodes/US/search.json?apikey=test&q=94105",
+        ),
+    )
+
+    location = await accuweather_with_location_cache.get_cached_location(
+        mock_client, "US", "94105"
+    )
+
+    assert location == AccuweatherLocation(
+        key="39376_PC", localized_name="San Francisco"
+    )
+    assert [call.args[0] for call in statsd_mock.increment.call_args_list] == [
+        "accuweather.location_key.cache.error",
+        "accuweather.location_key.cache.miss",
+        "accuweather.location_key.cache.error",
+    ]
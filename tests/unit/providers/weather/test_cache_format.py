@@ -0,0 +1,105 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the weather cache_format.py module."""
+
+import zlib
+from typing import Optional
+
+import pytest
+
+from merino.providers.weather.backends.protocol import (
+    CurrentConditions,
+    Forecast,
+    Temperature,
+    WeatherReport,
+)
+from merino.providers.weather.cache_format import (
+    CacheFormat,
+    decode_weather_report,
+    encode_weather_report,
+)
+
+
+@pytest.fixture(name="weather_report")
+def fixture_weather_report() -> WeatherReport:
+    """Return a test WeatherReport."""
+    return WeatherReport(
+        city_name="Montréal",
+        current_conditions=CurrentConditions(
+            url="http://www.accuweather.com/en/ca/montreal/h3a/current-weather/56186",
+            summary="Mostly cloudy",
+            icon_id=6,
+            temperature=Temperature(c=-5.5),
+        ),
+        forecast=Forecast(
+            url="http://www.accuweather.com/en/ca/montreal/h3a/daily-weather-forecast",
+            summary="Snow tonight",
+            high=Temperature(f=30.0),
+            low=Temperature(c=-10.0, f=14.0),
+        ),
+    )
+
+
+@pytest.mark.parametrize("cache_format", list(CacheFormat), ids=str)
+@pytest.mark.parametrize("soft_expires_at", [None, 1234.5], ids=["hard", "soft"])
+@pytest.mark.parametrize("has_report", [True, False], ids=["report", "no_report"])
+def test_round_trip(
+    weather_report: WeatherReport,
+    cache_format: CacheFormat,
+    soft_expires_at: Optional[float],
+    has_report: bool,
+) -> None:
+    """Test that encoded weather reports are decoded as is."""
+    report: Optional[WeatherReport] = weather_report if has_report else None
+
+    cache_value = encode_weather_report(report, soft_expires_at, cache_format)
+
+    assert decode_weather_report(cache_value) == (report, soft_expires_at)
+
+
+def test_decode_json_entries(weather_report: WeatherReport) -> None:
+    """Test that entries in the JSON format written before versioning are decoded."""
+    assert decode_weather_report(weather_report.json().encode("utf-8")) == (
+        weather_report,
+        None,
+    )
+    assert decode_weather_report(b"{}") == (None, None)
+
+
+def test_compact_format_size(weather_report: WeatherReport) -> None:
+    """Test that the compact formats are smaller than the JSON format."""
+    json_size = len(encode_weather_report(weather_report, None, CacheFormat.JSON))
+    compact_size = len(encode_weather_report(weather_report, None, CacheFormat.COMPACT))
+
+    assert compact_size < json_size
+    assert encode_weather_report(weather_report, None, CacheFormat.COMPACT)[0] == 1
+    assert encode_weather_report(weather_report, None, CacheFormat.COMPACT_ZLIB)[0] == (
+        0x81
+    )
+
+
+@pytest.mark.parametrize(
+    "cache_value",
+    [
+        b"\x02[null]",
+        b"\x01[null,1]",
+        b"\x01[",
+        b"\x81[null]",
+        bytes([0x81]) + zlib.compress(b'"report"'),
+        b"{",
+    ],
+    ids=[
+        "unsupported_version",
+        "unexpected_layout",
+        "invalid_json",
+        "invalid_compression",
+        "unexpected_value",
+        "invalid_legacy_json",
+    ],
+)
+def test_decode_invalid_entry(cache_value: bytes) -> None:
+    """Test that invalid entries raise `ValueError`."""
+    with pytest.raises(ValueError):
+        decode_weather_report(cache_value)
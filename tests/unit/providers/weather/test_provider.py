@@ -4,7 +4,9 @@
 
 """Unit tests for the weather provider module."""
 
-from typing import Any, cast
+import asyncio
+import json
+from typing import Any, Optional, cast
 
 import pytest
 from pytest import LogCaptureFixture
@@ -16,6 +18,7 @@ from merino.config import settings
 from merino.exceptions import BackendError
 from merino.middleware.geolocation import Location
 from merino.providers.base import BaseSuggestion, SuggestionRequest
+from merino.providers.degraded import track_degraded_providers
 from merino.providers.weather.backends.protocol import (
     CurrentConditions,
     Forecast,
@@ -23,6 +26,7 @@ from merino.providers.weather.backends.protocol import (
     WeatherBackend,
     WeatherReport,
 )
+from merino.providers.weather.cache_format import CacheFormat, encode_weather_report
 from merino.providers.weather.provider import Provider, Suggestion
 from tests.types import FilterCaplogFixture
 
@@ -75,6 +79,30 @@ def test_not_hidden_by_default(provider: Provider) -> None:
     assert provider.hidden() is False
 
 
+def test_init_refresh_lock_ttl_exceeds_query_timeout(
+    backend_mock: Any, redis_mock: Any, statsd_mock: Any
+) -> None:
+    """Test that the provider rejects a refresh lock TTL exceeding its query
+    timeout.
+    """
+    with pytest.raises(ValueError) as excinfo:
+        Provider(
+            backend=backend_mock,
+            cache=RedisAdapter(redis_mock),
+            metrics_client=statsd_mock,
+            name="weather",
+            score=0.3,
+            query_timeout_sec=0.2,
+            cached_report_ttl_sec=10,
+            refresh_lock_ttl_sec=1.0,
+        )
+
+    assert str(excinfo.value) == (
+        "The refresh lock TTL (1.0s) of the weather provider exceeds its query "
+        "timeout (0.2s)."
+    )
+
+
 @pytest.mark.asyncio
 async def test_query_weather_report_returned(
     backend_mock: Any, provider: Provider, geolocation: Location
@@ -154,7 +182,7 @@ async def test_query_error(
     geolocation: Location,
 ) -> None:
     """Test that the query method logs a warning and doesn't provide a weather
-    suggestion if the backend raises an error.
+    suggestion, marked as degraded, if the backend raises an error.
     """
     expected_suggestions: list[Suggestion] = []
     expected_log_messages: list[dict[str, str]] = [
@@ -164,12 +192,14 @@ async def test_query_error(
     backend_mock.get_weather_report.side_effect = BackendError(
         expected_log_messages[0]["message"]
     )
+    degraded_providers: set[str] = track_degraded_providers()
 
     suggestions: list[BaseSuggestion] = await provider.query(
         SuggestionRequest(query="", geolocation=geolocation)
     )
 
     assert suggestions == expected_suggestions
+    assert degraded_providers == {provider.name}
     actual_log_messages: list[dict[str, str]] = [
         {"levelname": record.levelname, "message": record.message}
         for record in filter_caplog(caplog.records, "merino.providers.weather.provider")
@@ -253,7 +283,7 @@ async def test_query_cached_weather_report(
     statsd_mock.increment.assert_called_once_with("providers.weather.query.cache.miss")
     backend_mock.get_weather_report.assert_called_once()
     redis_mock.set.assert_called_once_with(
-        cache_key, report.json().encode("utf-8"), ex=10
+        cache_key, report.json().encode("utf-8"), px=10000
     )
     assert cache_keys[cache_key] is not None
 
@@ -311,7 +341,7 @@ async def test_query_cached_no_weather_report(
     redis_mock.get.assert_called_once_with(cache_key)
     statsd_mock.increment.assert_called_once_with("providers.weather.query.cache.miss")
     backend_mock.get_weather_report.assert_called_once()
-    redis_mock.set.assert_called_once_with(cache_key, b"{}", ex=10)
+    redis_mock.set.assert_called_once_with(cache_key, b"{}", px=10000)
     assert cache_keys[cache_key] is not None
 
     redis_mock.reset_mock()
@@ -408,7 +438,7 @@ async def test_query_with_bad_cache_entry(
     statsd_mock.increment.assert_called_once_with("providers.weather.query.cache.error")
     backend_mock.get_weather_report.assert_called_once()
     redis_mock.set.assert_called_once_with(
-        cache_key, report.json().encode("utf-8"), ex=10
+        cache_key, report.json().encode("utf-8"), px=10000
     )
 
 
@@ -482,3 +512,329 @@ async def test_query_redis_unavailable(
             mocker.call("providers.weather.query.cache.error"),
         ]
     )
+
+
+@pytest.mark.asyncio
+async def test_shutdown(provider: Provider, backend_mock: Any, redis_mock: Any) -> None:
+    """Test that the shutdown method closes the backend and the cache."""
+    await provider.shutdown()
+
+    backend_mock.shutdown.assert_called_once()
+    redis_mock.close.assert_called_once()
+
+
+@pytest.fixture(name="weather_report")
+def fixture_weather_report() -> WeatherReport:
+    """Return a test WeatherReport."""
+    return WeatherReport(
+        city_name="San Francisco",
+        current_conditions=CurrentConditions(
+            url="http://www.accuweather.com/en/us/san-francisco-ca/94103/current-weather",
+            summary="Mostly cloudy",
+            icon_id=6,
+            temperature=Temperature(c=15.5, f=60.0),
+        ),
+        forecast=Forecast(
+            url="http://www.accuweather.com/en/us/san-francisco-ca/94103/forecast",
+            summary="Pleasant Saturday",
+            high=Temperature(c=21.1, f=70.0),
+            low=Temperature(c=13.9, f=57.0),
+        ),
+    )
+
+
+def mock_redis(
+    redis_mock: Any, get_values: list[Optional[bytes]], set_return: Optional[bool]
+) -> None:
+    """Mock the `get` and `set` Redis commands, which aren't coroutine functions of
+    the Redis client.
+    """
+
+    async def mock_redis_get(key: str) -> Optional[bytes]:
+        return get_values.pop(0) if len(get_values) > 1 else get_values[0]
+
+    async def mock_redis_set(key: str, value: bytes, **kwargs: Any) -> Optional[bool]:
+        return set_return
+
+    redis_mock.get.side_effect = mock_redis_get
+    redis_mock.set.side_effect = mock_redis_set
+
+
+@pytest.mark.asyncio
+async def test_query_coalesces_concurrent_cache_misses(
+    redis_mock: Any,
+    statsd_mock: Any,
+    backend_mock: Any,
+    provider: Provider,
+    geolocation: Location,
+    weather_report: WeatherReport,
+) -> None:
+    """Test that concurrent cache misses for the same location share a single backend
+    request.
+    """
+    release = asyncio.Event()
+
+    async def get_weather_report(_: Location) -> WeatherReport:
+        await release.wait()
+        return weather_report
+
+    mock_redis(redis_mock, get_values=[None], set_return=True)
+    backend_mock.cache_inputs_for_weather_report.return_value = b"US94105"
+    backend_mock.get_weather_report.side_effect = get_weather_report
+
+    tasks = [
+        asyncio.create_task(
+            provider.query(SuggestionRequest(query="", geolocation=geolocation))
+        )
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert all(len(suggestions) == 1 for suggestions in results)
+    backend_mock.get_weather_report.assert_called_once()
+    redis_mock.set.assert_called_once()
+    assert [
+        call.args[0]
+        for call in statsd_mock.increment.call_args_list
+        if call.args[0] == "providers.weather.query.coalesced"
+    ] == ["providers.weather.query.coalesced"] * 2
+
+
+@pytest.mark.asyncio
+async def test_query_refresh_lock_acquired(
+    redis_mock: Any,
+    backend_mock: Any,
+    provider: Provider,
+    geolocation: Location,
+    weather_report: WeatherReport,
+) -> None:
+    """Test that the backend is requested after acquiring the refresh lock."""
+    provider.refresh_lock_ttl_sec = 1.0
+    mock_redis(redis_mock, get_values=[None], set_return=True)
+    backend_mock.cache_inputs_for_weather_report.return_value = b"US94105"
+    backend_mock.get_weather_report.return_value = weather_report
+
+    suggestions = await provider.query(
+        SuggestionRequest(query="", geolocation=geolocation)
+    )
+
+    assert len(suggestions) == 1
+    cache_key = provider.cache_key_for_weather_report(geolocation)
+    redis_mock.set.assert_any_call(f"{cache_key}:lock", b"1", px=1000, nx=True)
+    backend_mock.get_weather_report.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_query_refresh_lock_contended(
+    redis_mock: Any,
+    statsd_mock: Any,
+    backend_mock: Any,
+    provider: Provider,
+    geolocation: Location,
+    weather_report: WeatherReport,
+) -> None:
+    """Test that the provider waits for the report cached by the instance holding the
+    refresh lock instead of requesting the backend.
+    """
+    provider.refresh_lock_ttl_sec = 1.0
+    # The lock is held by another instance, which caches the report later on.
+    mock_redis(
+        redis_mock,
+        get_values=[None, None, weather_report.json().encode("utf-8")],
+        set_return=None,
+    )
+    backend_mock.cache_inputs_for_weather_report.return_value = b"US94105"
+
+    suggestions = await provider.query(
+        SuggestionRequest(query="", geolocation=geolocation)
+    )
+
+    assert len(suggestions) == 1
+    assert redis_mock.get.call_count == 3
+    backend_mock.get_weather_report.assert_not_called()
+    statsd_mock.increment.assert_any_call(
+        "providers.weather.query.cache.lock.contended"
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_refresh_lock_expired(
+    redis_mock: Any,
+    backend_mock: Any,
+    provider: Provider,
+    geolocation: Location,
+    weather_report: WeatherReport,
+) -> None:
+    """Test that the backend is requested if the report isn't cached by the time the
+    refresh lock expires.
+    """
+    provider.refresh_lock_ttl_sec = 0.1
+    mock_redis(redis_mock, get_values=[None], set_return=None)
+    backend_mock.cache_inputs_for_weather_report.return_value = b"US94105"
+    backend_mock.get_weather_report.return_value = weather_report
+
+    suggestions = await provider.query(
+        SuggestionRequest(query="", geolocation=geolocation)
+    )
+
+    assert len(suggestions) == 1
+    backend_mock.get_weather_report.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_query_stores_soft_expiry(
+    redis_mock: Any,
+    backend_mock: Any,
+    provider: Provider,
+    geolocation: Location,
+    weather_report: WeatherReport,
+    mocker: MockerFixture,
+) -> None:
+    """Test that weather reports are cached with their soft expiry, past which they
+    are kept for the stale TTL.
+    """
+    provider.cached_report_stale_ttl_sec = 20
+    mocker.patch("merino.providers.weather.provider.time.time", return_value=1000.0)
+    mock_redis(redis_mock, get_values=[None], set_return=True)
+    backend_mock.cache_inputs_for_weather_report.return_value = b"US94105"
+    backend_mock.get_weather_report.return_value = weather_report
+
+    await provider.query(SuggestionRequest(query="", geolocation=geolocation))
+
+    cache_key = provider.cache_key_for_weather_report(geolocation)
+    redis_mock.set.assert_called_once_with(
+        cache_key,
+        json.dumps({"soft_expires_at": 1010.0, "report": weather_report.dict()}).encode(
+            "utf-8"
+        ),
+        px=30000,
+    )
+    mock_redis(
+        redis_mock, get_values=[redis_mock.set.call_args.args[1]], set_return=True
+    )
+    assert await provider.fetch_cached_weather_report(geolocation) == (
+        weather_report,
+        False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_stale_weather_report(
+    redis_mock: Any,
+    statsd_mock: Any,
+    backend_mock: Any,
+    provider: Provider,
+    geolocation: Location,
+    weather_report: WeatherReport,
+) -> None:
+    """Test that a stale weather report is served right away and refreshed in the
+    background.
+    """
+    provider.cached_report_stale_ttl_sec = 20
+    release = asyncio.Event()
+    refreshed_report = weather_report.copy(update={"city_name": "Oakland"})
+
+    async def get_weather_report(_: Location) -> WeatherReport:
+        await release.wait()
+        return refreshed_report
+
+    stale_entry = json.dumps(
+        {"soft_expires_at": 0, "report": weather_report.dict()}
+    ).encode("utf-8")
+    mock_redis(redis_mock, get_values=[stale_entry], set_return=True)
+    backend_mock.cache_inputs_for_weather_report.return_value = b"US94105"
+    backend_mock.get_weather_report.side_effect = get_weather_report
+
+    suggestions = [
+        await provider.query(SuggestionRequest(query="", geolocation=geolocation))
+        for _ in range(2)
+    ]
+
+    # Both requests are served the stale report while a single refresh is pending.
+    assert [cast(Suggestion, s[0]).city_name for s in suggestions] == [
+        "San Francisco"
+    ] * 2
+    assert len(provider.background_refreshes) == 1
+    statsd_mock.increment.assert_any_call("providers.weather.query.cache.stale")
+
+    release.set()
+    await asyncio.gather(*provider.background_refreshes.values())
+
+    backend_mock.get_weather_report.assert_called_once()
+    cached_value = redis_mock.set.call_args.args[1]
+    assert json.loads(cached_value)["report"]["city_name"] == "Oakland"
+    assert len(provider.background_refreshes) == 0
+
+
+@pytest.mark.asyncio
+async def test_query_stale_weather_report_refresh_error(
+    redis_mock: Any,
+    backend_mock: Any,
+    provider: Provider,
+    geolocation: Location,
+    weather_report: WeatherReport,
+    filter_caplog: FilterCaplogFixture,
+    caplog: LogCaptureFixture,
+) -> None:
+    """Test that backend errors while refreshing a stale weather report are logged."""
+    provider.cached_report_stale_ttl_sec = 20
+    stale_entry = json.dumps({"soft_expires_at": 0, "report": None}).encode("utf-8")
+    mock_redis(redis_mock, get_values=[stale_entry], set_return=True)
+    backend_mock.cache_inputs_for_weather_report.return_value = b"US94105"
+    backend_mock.get_weather_report.side_effect = BackendError("Backend failure")
+
+    suggestions = await provider.query(
+        SuggestionRequest(query="", geolocation=geolocation)
+    )
+    await asyncio.gather(*provider.background_refreshes.values())
+
+    assert suggestions == []
+    redis_mock.set.assert_not_called()
+    records = filter_caplog(caplog.records, "merino.providers.weather.provider")
+    assert [record.message for record in records] == [
+        "Failed to refresh stale weather report: Backend failure"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_query_compact_cache_format(
+    redis_mock: Any,
+    backend_mock: Any,
+    provider: Provider,
+    geolocation: Location,
+    weather_report: WeatherReport,
+) -> None:
+    """Test that weather reports stored in the compact format are served from the
+    cache.
+    """
+    provider.cached_report_format = CacheFormat.COMPACT_ZLIB
+    mock_redis(redis_mock, get_values=[None], set_return=True)
+    backend_mock.cache_inputs_for_weather_report.return_value = b"US94105"
+    backend_mock.get_weather_report.return_value = weather_report
+
+    await provider.query(SuggestionRequest(query="", geolocation=geolocation))
+    cache_value = redis_mock.set.call_args.args[1]
+    mock_redis(redis_mock, get_values=[cache_value], set_return=True)
+    suggestions = await provider.query(
+        SuggestionRequest(query="", geolocation=geolocation)
+    )
+
+    assert cache_value == encode_weather_report(
+        weather_report, None, CacheFormat.COMPACT_ZLIB
+    )
+    assert suggestions == [
+        Suggestion(
+            title="Weather for San Francisco",
+            url=weather_report.current_conditions.url,
+            provider="weather",
+            is_sponsored=False,
+            score=settings.providers.accuweather.score,
+            icon=None,
+            city_name=weather_report.city_name,
+            current_conditions=weather_report.current_conditions,
+            forecast=weather_report.forecast,
+        )
+    ]
+    backend_mock.get_weather_report.assert_called_once()
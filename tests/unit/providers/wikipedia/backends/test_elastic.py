@@ -1,4 +1,6 @@
 """Unit tests for the Elastic Backend."""
+import asyncio
+from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
@@ -158,3 +160,188 @@ async def test_es_backend_shutdown(
 
     await es_backend.shutdown()
     spy.assert_called_once()
+
+
+def es_response(title: str) -> dict[str, Any]:
+    """Return an ES response with a single suggestion."""
+    return {"suggest": {SUGGEST_ID: [{"options": [{"_source": {"title": title}}]}]}}
+
+
+def delayed_searches(*delays_and_results: tuple[float, Any]) -> AsyncMock:
+    """Return a mock of `AsyncElasticsearch.search` whose successive calls return, or
+    raise, their result after their delay in seconds.
+    """
+    results = iter(delays_and_results)
+
+    async def search(*args: Any, **kwargs: Any) -> Any:
+        delay, result = next(results)
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return AsyncMock(side_effect=search)
+
+
+@pytest.fixture(name="hedged_es_backend")
+def fixture_hedged_es_backend(statsd_mock: Any) -> ElasticBackend:
+    """Return an ES backend instance that hedges every slow request."""
+    return ElasticBackend(
+        url="https://localhost:9200",
+        api_key=settings.providers.wikipedia.es_api_key,
+        hedge_enabled=True,
+        hedge_percentile=0.95,
+        hedge_min_delay_ms=10,
+        hedge_max_rate=1.0,
+        metrics_client=statsd_mock,
+    )
+
+
+def test_es_backend_invalid_hedge_max_rate() -> None:
+    """Test that the backend rejects a hedge rate greater than 1."""
+    with pytest.raises(ValueError):
+        ElasticBackend(
+            url="https://localhost:9200",
+            api_key=settings.providers.wikipedia.es_api_key,
+            hedge_max_rate=1.5,
+        )
+
+
+@pytest.mark.asyncio
+async def test_es_backend_hedge_not_fired_for_fast_search(
+    mocker: MockerFixture, hedged_es_backend: ElasticBackend, statsd_mock: Any
+) -> None:
+    """Test that a search completing within the hedging delay isn't hedged."""
+    search_mock = delayed_searches((0, es_response("Food")))
+    mocker.patch.object(AsyncElasticsearch, "search", search_mock)
+
+    suggestions = await hedged_es_backend.search("foo")
+
+    assert [suggestion["title"] for suggestion in suggestions] == ["Wikipedia - Food"]
+    assert search_mock.call_count == 1
+    statsd_mock.increment.assert_not_called()
+    assert len(hedged_es_backend.latency_tracker.durations) == 1
+
+
+@pytest.mark.asyncio
+async def test_es_backend_hedge_wins(
+    mocker: MockerFixture, hedged_es_backend: ElasticBackend, statsd_mock: Any
+) -> None:
+    """Test that a slow search is hedged, and the first response is used while the
+    slow request is cancelled.
+    """
+    search_mock = delayed_searches(
+        (10, es_response("Slow food")), (0, es_response("Fast food"))
+    )
+    mocker.patch.object(AsyncElasticsearch, "search", search_mock)
+
+    suggestions = await asyncio.wait_for(hedged_es_backend.search("foo"), timeout=1)
+
+    assert [suggestion["title"] for suggestion in suggestions] == [
+        "Wikipedia - Fast food"
+    ]
+    assert search_mock.call_count == 2
+    assert statsd_mock.increment.call_args_list == [
+        mocker.call("wikipedia.es.hedge.fired"),
+        mocker.call("wikipedia.es.hedge.won"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_es_backend_hedge_first_request_wins(
+    mocker: MockerFixture, hedged_es_backend: ElasticBackend, statsd_mock: Any
+) -> None:
+    """Test that a hedged search uses the first request if it returns before the
+    duplicate.
+    """
+    search_mock = delayed_searches(
+        (0.03, es_response("Slow food")), (10, es_response("Slower food"))
+    )
+    mocker.patch.object(AsyncElasticsearch, "search", search_mock)
+
+    suggestions = await asyncio.wait_for(hedged_es_backend.search("foo"), timeout=1)
+
+    assert [suggestion["title"] for suggestion in suggestions] == [
+        "Wikipedia - Slow food"
+    ]
+    assert statsd_mock.increment.call_args_list == [
+        mocker.call("wikipedia.es.hedge.fired")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_es_backend_hedge_error_falls_back_to_other_request(
+    mocker: MockerFixture, hedged_es_backend: ElasticBackend
+) -> None:
+    """Test that a hedged search that fails uses the response of the other request,
+    and only raises if both fail.
+    """
+    mocker.patch.object(
+        AsyncElasticsearch,
+        "search",
+        delayed_searches((0.03, Exception("503 error")), (0.05, es_response("Food"))),
+    )
+
+    suggestions = await hedged_es_backend.search("foo")
+
+    assert [suggestion["title"] for suggestion in suggestions] == ["Wikipedia - Food"]
+
+    mocker.patch.object(
+        AsyncElasticsearch,
+        "search",
+        delayed_searches((0.03, Exception("503 error")), (0, Exception("404 error"))),
+    )
+
+    with pytest.raises(BackendError) as excinfo:
+        await hedged_es_backend.search("foo")
+
+    assert str(excinfo.value) == "Failed to search from Elasticsearch: 503 error"
+
+
+@pytest.mark.asyncio
+async def test_es_backend_hedge_rate_limited(
+    mocker: MockerFixture, statsd_mock: Any
+) -> None:
+    """Test that hedges are limited to the maximum hedge rate of the searches."""
+    backend = ElasticBackend(
+        url="https://localhost:9200",
+        api_key=settings.providers.wikipedia.es_api_key,
+        hedge_enabled=True,
+        hedge_min_delay_ms=0,
+        hedge_max_rate=0.5,
+        metrics_client=statsd_mock,
+    )
+    # Each search is slower than the hedging delay, and its hedge returns first.
+    mocker.patch.object(
+        AsyncElasticsearch,
+        "search",
+        delayed_searches(
+            *[(0.01, es_response("Food"))] * 6,
+        ),
+    )
+
+    for _ in range(4):
+        await backend.search("foo")
+
+    assert statsd_mock.increment.call_args_list == [
+        mocker.call("wikipedia.es.hedge.throttled"),
+        mocker.call("wikipedia.es.hedge.fired"),
+        mocker.call("wikipedia.es.hedge.throttled"),
+        mocker.call("wikipedia.es.hedge.fired"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_es_backend_hedge_delay(hedged_es_backend: ElasticBackend) -> None:
+    """Test that the hedging delay is the percentile of the recent latencies, and at
+    least the minimum delay.
+    """
+    assert hedged_es_backend.hedge_delay_sec() == 0.01
+
+    for i in range(100):
+        hedged_es_backend.latency_tracker.record(i / 1000)
+    assert hedged_es_backend.hedge_delay_sec() == 0.094
+
+    for _ in range(1000):
+        hedged_es_backend.latency_tracker.record(0.001)
+    assert hedged_es_backend.hedge_delay_sec() == 0.01
@@ -0,0 +1,209 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the local prefix index backend."""
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from merino.providers.wikipedia.backends.local import (
+    LocalBackend,
+    LocalIndex,
+    LocalIndexError,
+    write_index,
+)
+
+ENTRIES: list[tuple[str, int]] = [
+    ("Food", 500),
+    ("Dog food", 900),
+    ("Food for Thought", 300),
+    ("Food Fortune", 400),
+    ("Foo Fighters", 800),
+    ("Zürich", 100),
+    ("Éclair", 200),
+    ("", 1000),
+]
+
+
+@pytest.fixture(name="index_path")
+def fixture_index_path(tmp_path: Path) -> str:
+    """Write a local index of the test entries and return its path."""
+    path = str(tmp_path / "wikipedia_titles.idx")
+    write_index(ENTRIES, path, suggestions_per_prefix=3, heavy_prefix_threshold=2)
+    return path
+
+
+@pytest.fixture(name="local_index")
+def fixture_local_index(index_path: str) -> LocalIndex:
+    """Return the local index of the test entries."""
+    return LocalIndex(index_path)
+
+
+def test_write_index_skips_empty_titles(local_index: LocalIndex) -> None:
+    """Test that titles normalizing to an empty string aren't indexed."""
+    assert len(local_index) == 7
+
+
+def test_write_index_invalid_parameters(tmp_path: Path) -> None:
+    """Test that the index parameters must be positive."""
+    with pytest.raises(ValueError):
+        write_index(ENTRIES, str(tmp_path / "index"), suggestions_per_prefix=0)
+
+
+@pytest.mark.parametrize(
+    ["prefix", "limit", "expected_titles"],
+    [
+        # A heavy prefix, matched by more titles than the threshold.
+        ("f", 3, ["Foo Fighters", "Food", "Food Fortune"]),
+        ("FOO", 3, ["Foo Fighters", "Food", "Food Fortune"]),
+        ("food", 2, ["Food", "Food Fortune"]),
+        # A prefix matched by few titles.
+        ("food f", 3, ["Food Fortune", "Food for Thought"]),
+        ("dog", 3, ["Dog food"]),
+        ("zü", 3, ["Zürich"]),
+        ("ZÜRICH", 3, ["Zürich"]),
+        ("éc", 3, ["Éclair"]),
+        ("x", 3, []),
+        ("", 3, []),
+        ("food", 0, []),
+    ],
+    ids=[
+        "heavy",
+        "heavy-uppercase",
+        "heavy-limit",
+        "light",
+        "single",
+        "unicode",
+        "unicode-uppercase",
+        "unicode-accent",
+        "no-match",
+        "empty",
+        "zero-limit",
+    ],
+)
+def test_local_index_complete(
+    local_index: LocalIndex, prefix: str, limit: int, expected_titles: list[str]
+) -> None:
+    """Test that the index completes prefixes by descending weight."""
+    assert local_index.complete(prefix, limit) == expected_titles
+
+
+def test_local_index_heavy_prefixes(local_index: LocalIndex) -> None:
+    """Test that the top titles are precomputed for the prefixes matched by more
+    titles than the threshold.
+    """
+    assert [
+        local_index.heavy_prefixes[index]
+        for index in range(len(local_index.heavy_prefixes))
+    ] == [b"f", b"fo", b"foo", b"food"]
+
+
+def test_write_index_replaces_index(index_path: str) -> None:
+    """Test that an index can be rewritten while it's mapped, and the previous
+    mapping stays valid.
+    """
+    previous_index = LocalIndex(index_path)
+
+    write_index([("Fortune", 1)], index_path)
+
+    assert previous_index.complete("food fort", 3) == ["Food Fortune"]
+    assert LocalIndex(index_path).complete("food fort", 3) == []
+    assert LocalIndex(index_path).complete("fort", 3) == ["Fortune"]
+
+
+def test_local_index_missing_file(tmp_path: Path) -> None:
+    """Test that opening a missing index raises a `LocalIndexError`."""
+    with pytest.raises(LocalIndexError):
+        LocalIndex(str(tmp_path / "missing.idx"))
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"not an index", b"MWPI\x02\x00\x00\x00" + b"\x00" * 16],
+    ids=["empty", "garbage", "unsupported-version"],
+)
+def test_local_index_invalid_file(tmp_path: Path, content: bytes) -> None:
+    """Test that opening an invalid index raises a `LocalIndexError`."""
+    path = tmp_path / "invalid.idx"
+    path.write_bytes(content)
+
+    with pytest.raises(LocalIndexError):
+        LocalIndex(str(path))
+
+
+def test_local_index_truncated_file(tmp_path: Path, index_path: str) -> None:
+    """Test that opening a truncated index raises a `LocalIndexError`."""
+    path = tmp_path / "truncated.idx"
+    path.write_bytes(Path(index_path).read_bytes()[:-4])
+
+    with pytest.raises(LocalIndexError):
+        LocalIndex(str(path))
+
+
+@pytest.mark.asyncio
+async def test_local_backend_search(index_path: str) -> None:
+    """Test that the backend returns the same articles as the Elasticsearch
+    backend.
+    """
+    backend = LocalBackend(index_path=index_path, max_suggestions=2)
+    await backend.initialize()
+
+    suggestions = await backend.search("foOd")
+
+    assert suggestions == [
+        {
+            "full_keyword": "food",
+            "title": "Wikipedia - Food",
+            "url": "https://en.wikipedia.org/wiki/Food",
+        },
+        {
+            "full_keyword": "food",
+            "title": "Wikipedia - Food Fortune",
+            "url": "https://en.wikipedia.org/wiki/Food_Fortune",
+        },
+    ]
+
+    await backend.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_local_backend_missing_index(tmp_path: Path) -> None:
+    """Test that initializing the backend with a missing index raises a
+    `LocalIndexError`, and that it can't be searched.
+    """
+    backend = LocalBackend(index_path=str(tmp_path / "missing.idx"))
+
+    with pytest.raises(LocalIndexError):
+        await backend.initialize()
+    with pytest.raises(LocalIndexError):
+        await backend.search("food")
+
+    await backend.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_local_backend_reloads_replaced_index(index_path: str) -> None:
+    """Test that the backend maps the index anew once the file is replaced."""
+    backend = LocalBackend(
+        index_path=index_path, max_suggestions=2, reload_interval_sec=0.01
+    )
+    await backend.initialize()
+    previous_index = backend.index
+    assert [article["title"] for article in await backend.search("fort")] == []
+
+    write_index([("Fortune", 1)], index_path)
+    async with asyncio.timeout(1):
+        while backend.index is previous_index:
+            await asyncio.sleep(0.01)
+
+    assert [article["title"] for article in await backend.search("fort")] == [
+        "Wikipedia - Fortune"
+    ]
+    assert backend.cron_task is not None
+
+    await backend.shutdown()
+    await asyncio.sleep(0)
+    assert backend.cron_task.cancelled()
+    assert backend.index is None
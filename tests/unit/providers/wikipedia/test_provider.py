@@ -53,6 +53,14 @@ async def test_query_failure(
         assert result == []
 
 
+@pytest.mark.asyncio
+async def test_initialize(wikipedia: Provider, mocker: MockerFixture) -> None:
+    """Test that initializing the provider initializes its backend."""
+    spy = mocker.spy(FakeEchoWikipediaBackend, "initialize")
+    await wikipedia.initialize()
+    spy.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_shutdown(wikipedia: Provider, mocker: MockerFixture) -> None:
     """Test for the shutdown method."""
@@ -6,12 +6,20 @@
 
 
 import logging
+import time
+from queue import Queue
 from typing import Any
 
 import pytest
+from pytest_mock import MockerFixture
 
 from merino.config import settings
-from merino.config_logging import configure_logging
+from merino.config_logging import (
+    BoundedQueueHandler,
+    configure_logging,
+    start_queue_logging,
+    stop_queue_logging,
+)
 
 
 def test_configure_logging_invalid_format() -> None:
@@ -63,3 +71,105 @@ def test_configure_log_handler_assigned_pretty() -> None:
     merino_log_manager: Any = logging.root.manager
     merino_logger: Any = merino_log_manager.loggerDict["merino"].handlers[0].name
     assert merino_logger == "console-pretty"
+
+
+def test_start_queue_logging(mocker: MockerFixture) -> None:
+    """Test that the handlers of a logger emit its records from the queue listener."""
+    logger = logging.getLogger("test.queue.logging")
+    handler = mocker.Mock(spec=logging.Handler, level=logging.NOTSET)
+    logger.handlers = [handler]
+
+    start_queue_logging(logger, max_size=10)
+    assert [type(handler) for handler in logger.handlers] == [BoundedQueueHandler]
+    logger.warning("queued")
+    stop_queue_logging()
+
+    handler.handle.assert_called_once()
+    assert handler.handle.call_args.args[0].getMessage() == "queued"
+
+
+def test_stop_queue_logging_restores_handlers(mocker: MockerFixture) -> None:
+    """Test that stopping the queue logging gives the handlers back to the logger, so
+    that its later records are emitted rather than queued.
+    """
+    logger = logging.getLogger("test.queue.restore")
+    handler = mocker.Mock(spec=logging.Handler, level=logging.NOTSET)
+    logger.handlers = [handler]
+
+    start_queue_logging(logger, max_size=10)
+    stop_queue_logging()
+    logger.warning("after stop")
+
+    assert logger.handlers == [handler]
+    handler.handle.assert_called_once()
+    assert handler.handle.call_args.args[0].getMessage() == "after stop"
+
+
+def test_stop_queue_logging_reconfigured_logger(mocker: MockerFixture) -> None:
+    """Test that stopping the queue logging keeps the handlers of a logger that was
+    reconfigured since it started.
+    """
+    logger = logging.getLogger("test.queue.reconfigured")
+    logger.handlers = [mocker.Mock(spec=logging.Handler, level=logging.NOTSET)]
+    start_queue_logging(logger, max_size=10)
+    logger.handlers = [handler := mocker.Mock(spec=logging.Handler)]
+
+    stop_queue_logging()
+
+    assert logger.handlers == [handler]
+
+
+def test_bounded_queue_handler_full(mocker: MockerFixture) -> None:
+    """Test that records are dropped and counted when the queue is full."""
+    metrics_client = mocker.patch(
+        "merino.config_logging.get_metrics_client"
+    ).return_value
+    queue: Queue = Queue(maxsize=1)
+    logger = logging.getLogger("test.queue.full")
+    logger.handlers = [handler := BoundedQueueHandler(queue)]
+
+    logger.warning("queued")
+    logger.warning("dropped")
+
+    assert queue.get_nowait().getMessage() == "queued"
+    assert handler.dropped == 1
+    metrics_client.increment.assert_called_once_with(
+        "logging.queue.dropped", tags={"logger": "test.queue.full"}
+    )
+
+
+def test_configure_logging_queue() -> None:
+    """Test that the suggest request logs are queued when `logging.queue.enabled` is
+    set.
+    """
+    settings.logging.queue.enabled = True
+    try:
+        configure_logging()
+
+        suggest_logger: Any = logging.getLogger("web.suggest.request")
+        assert [type(handler) for handler in suggest_logger.handlers] == [
+            BoundedQueueHandler
+        ]
+    finally:
+        settings.logging.queue.enabled = False
+        configure_logging()
+
+
+def test_stop_queue_logging_full(mocker: MockerFixture) -> None:
+    """Test that stopping the queue logging emits the queued records even if the
+    queue is full.
+    """
+    logger = logging.getLogger("test.queue.stop")
+    handler = mocker.Mock(spec=logging.Handler, level=logging.NOTSET)
+    handler.handle.side_effect = lambda record: time.sleep(0.01)
+    logger.handlers = [handler]
+
+    start_queue_logging(logger, max_size=1)
+    queue_handler = logger.handlers[0]
+    assert isinstance(queue_handler, BoundedQueueHandler)
+    for _ in range(3):
+        logger.warning("queued")
+    stop_queue_logging()
+
+    assert 1 <= handler.handle.call_count <= 3
+    assert handler.handle.call_count + queue_handler.dropped == 3
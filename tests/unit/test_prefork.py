@@ -0,0 +1,169 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the prefork.py module."""
+import gc
+import weakref
+from typing import Iterator, TypedDict
+
+import pytest
+from pytest import LogCaptureFixture
+from pytest_mock import MockerFixture
+
+from merino import providers
+from merino.exceptions import InvalidProviderError
+from merino.prefork import PreforkServer, is_worker
+from tests.types import FilterCaplogFixture
+
+
+class PreforkParameters(TypedDict, total=False):
+    """Parameters of the pre-fork server overriding valid ones."""
+
+    workers: int
+    reload_interval_sec: float
+    graceful_timeout_sec: float
+
+
+@pytest.fixture(name="server")
+def fixture_server() -> Iterator[PreforkServer]:
+    """Create a pre-fork server, then close it and unfreeze the garbage collector
+    afterwards.
+    """
+    server = PreforkServer(
+        host="127.0.0.1",
+        port=0,
+        workers=2,
+        reload_interval_sec=60,
+        graceful_timeout_sec=1,
+    )
+    yield server
+    server.close()
+    gc.unfreeze()
+
+
+@pytest.mark.parametrize(
+    ["parameters", "error"],
+    [
+        ({"workers": 0}, "`workers` must be positive"),
+        ({"reload_interval_sec": 0}, "`reload_interval_sec` must be positive"),
+        ({"graceful_timeout_sec": -1}, "`graceful_timeout_sec` must not be negative"),
+    ],
+)
+def test_invalid_parameters(parameters: PreforkParameters, error: str) -> None:
+    """Test that the pre-fork server rejects invalid parameters."""
+    with pytest.raises(ValueError, match=error):
+        PreforkServer(
+            host="127.0.0.1",
+            port=0,
+            workers=parameters.get("workers", 1),
+            reload_interval_sec=parameters.get("reload_interval_sec", 60),
+            graceful_timeout_sec=parameters.get("graceful_timeout_sec", 1),
+        )
+
+
+def test_is_worker() -> None:
+    """Test that the test process isn't a pre-fork worker."""
+    assert is_worker() is False
+
+
+def test_init_providers(server: PreforkServer) -> None:
+    """Test that the master initializes the providers without background resyncs
+    and freezes them.
+    """
+    assert server.init_providers() is True
+
+    loaded, default_providers = providers.get_providers()
+    assert loaded
+    assert default_providers
+    assert all(not provider.resync_in_background for provider in loaded.values())
+    assert gc.get_freeze_count() > 0
+
+
+def test_init_providers_reload(server: PreforkServer) -> None:
+    """Test that reloading replaces the providers."""
+    server.init_providers()
+    previous = dict(providers.providers)
+
+    assert server.init_providers() is True
+
+    assert providers.providers.keys() == previous.keys()
+    assert all(
+        providers.providers[name] is not provider for name, provider in previous.items()
+    )
+    assert len(providers.default_providers) == len(
+        [p for p in providers.providers.values() if p.enabled_by_default]
+    )
+
+
+def test_init_providers_reload_shuts_down_previous(
+    server: PreforkServer, mocker: MockerFixture
+) -> None:
+    """Test that reloading shuts down the previous providers."""
+    server.init_providers()
+    shutdowns = [
+        mocker.spy(provider, "shutdown") for provider in providers.providers.values()
+    ]
+
+    assert server.init_providers() is True
+
+    assert all(shutdown.await_count == 1 for shutdown in shutdowns)
+
+
+def test_init_providers_reload_collects_previous(server: PreforkServer) -> None:
+    """Test that the previous providers are collected rather than frozen, even if
+    they're part of a reference cycle.
+    """
+    gc.disable()
+    try:
+        server.init_providers()
+        provider = next(iter(providers.providers.values()))
+        # A reference cycle that only a collection frees.
+        setattr(provider, "cycle", provider)
+        previous_provider = weakref.ref(provider)
+        del provider
+
+        assert server.init_providers() is True
+
+        assert previous_provider() is None
+    finally:
+        gc.enable()
+
+
+def test_init_providers_reload_failure(
+    server: PreforkServer,
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    filter_caplog: FilterCaplogFixture,
+) -> None:
+    """Test that the previous providers are kept if reloading fails."""
+    server.init_providers()
+    previous = dict(providers.providers)
+    previous_default_providers = list(providers.default_providers)
+    mocker.patch(
+        "merino.providers.load_providers",
+        side_effect=InvalidProviderError("Unknown provider type: unknown-type"),
+    )
+
+    assert server.init_providers() is False
+
+    assert providers.providers == previous
+    assert providers.default_providers == previous_default_providers
+    records = filter_caplog(caplog.records, "merino.prefork")
+    assert len(records) == 1
+    assert records[0].message == (
+        "Failed to reload the providers, keeping the previous ones"
+    )
+
+
+def test_init_providers_failure(server: PreforkServer, mocker: MockerFixture) -> None:
+    """Test that the initial failure to initialize the providers is raised."""
+    providers.providers.clear()
+    providers.default_providers.clear()
+    mocker.patch(
+        "merino.providers.load_providers",
+        side_effect=InvalidProviderError("Unknown provider type: unknown-type"),
+    )
+
+    with pytest.raises(InvalidProviderError):
+        server.init_providers()
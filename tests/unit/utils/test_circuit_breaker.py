@@ -0,0 +1,184 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the circuit_breaker.py module."""
+import pytest
+
+from merino.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState,
+    FailureRateCircuitBreaker,
+)
+
+
+class FakeTimer:
+    """A timer that only moves forward when told to."""
+
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def state(breaker: CircuitBreaker) -> CircuitState:
+    """Return the state of a breaker, hiding it from the type narrowing of mypy,
+    which doesn't know that recording a call changes it.
+    """
+    return breaker.state
+
+
+def test_opens_after_consecutive_failures() -> None:
+    """Test that the breaker opens once the failure threshold is reached, and that a
+    success resets the count of consecutive failures.
+    """
+    states: list[CircuitState] = []
+    breaker = CircuitBreaker(
+        failure_threshold=2, recovery_timeout_sec=10, on_state_change=states.append
+    )
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert state(breaker) is CircuitState.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert state(breaker) is CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert states == [CircuitState.OPEN]
+
+
+def test_half_open_allows_a_single_trial() -> None:
+    """Test that the breaker lets a single trial call through after the recovery
+    timeout, and closes if it succeeds.
+    """
+    timer = FakeTimer()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout_sec=10, timer=timer)
+    breaker.record_failure()
+
+    timer.now = 9.9
+    assert not breaker.allow_request()
+
+    timer.now = 10.0
+    assert breaker.allow_request()
+    assert state(breaker) is CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert state(breaker) is CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_half_open_reopens_on_failure() -> None:
+    """Test that a failed trial call opens the breaker for another recovery timeout."""
+    timer = FakeTimer()
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout_sec=10, timer=timer)
+    for _ in range(3):
+        breaker.record_failure()
+
+    timer.now = 10.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert state(breaker) is CircuitState.OPEN
+    timer.now = 19.9
+    assert not breaker.allow_request()
+    timer.now = 20.0
+    assert breaker.allow_request()
+
+
+def test_release_trial() -> None:
+    """Test that releasing a trial call lets the next call through as the trial,
+    without changing the state or the failure count.
+    """
+    timer = FakeTimer()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout_sec=10, timer=timer)
+    breaker.record_failure()
+    breaker.release_trial()
+    assert state(breaker) is CircuitState.CLOSED
+    assert breaker.failures == 1
+
+    breaker.record_failure()
+    timer.now = 10.0
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.release_trial()
+    assert state(breaker) is CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+@pytest.mark.parametrize(
+    ["failure_threshold", "recovery_timeout_sec"],
+    [(0, 10), (1, -1)],
+    ids=["zero_threshold", "negative_timeout"],
+)
+def test_invalid_parameters(
+    failure_threshold: int, recovery_timeout_sec: float
+) -> None:
+    """Test that invalid parameters raise `ValueError`."""
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold, recovery_timeout_sec)
+
+
+def test_failure_rate_opens_on_rate() -> None:
+    """Test that the failure rate breaker opens once the rate of failures in the
+    window reaches the threshold, regardless of the interleaved successes.
+    """
+    breaker = FailureRateCircuitBreaker(
+        failure_rate_threshold=0.5, window_size=4, min_calls=3, recovery_timeout_sec=10
+    )
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert state(breaker) is CircuitState.CLOSED
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_success()
+    # Both failures left the window.
+    breaker.record_success()
+    assert breaker.failures == 0
+    breaker.record_failure()
+    assert state(breaker) is CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert state(breaker) is CircuitState.OPEN
+
+
+def test_failure_rate_resets_window_on_close() -> None:
+    """Test that the window is cleared when the breaker closes again."""
+    timer = FakeTimer()
+    breaker = FailureRateCircuitBreaker(
+        failure_rate_threshold=0.5,
+        window_size=4,
+        min_calls=1,
+        recovery_timeout_sec=10,
+        timer=timer,
+    )
+    breaker.record_failure()
+
+    timer.now = 10.0
+    assert breaker.allow_request()
+    breaker.record_success()
+
+    assert state(breaker) is CircuitState.CLOSED
+    assert len(breaker.outcomes) == 0
+
+
+@pytest.mark.parametrize(
+    ["failure_rate_threshold", "window_size", "min_calls"],
+    [(0, 10, 5), (1.5, 10, 5), (0.5, 10, 0), (0.5, 10, 11)],
+    ids=["zero_rate", "rate_above_one", "zero_min_calls", "min_calls_above_window"],
+)
+def test_failure_rate_invalid_parameters(
+    failure_rate_threshold: float, window_size: int, min_calls: int
+) -> None:
+    """Test that invalid parameters raise `ValueError`."""
+    with pytest.raises(ValueError):
+        FailureRateCircuitBreaker(
+            failure_rate_threshold, window_size, min_calls, recovery_timeout_sec=10
+        )
@@ -0,0 +1,102 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the http_client.py module."""
+import asyncio
+from typing import Any, AsyncIterator
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ConnectError
+from pytest_mock import MockerFixture
+
+from merino.config import settings
+from merino.utils.http_client import InstrumentedTransport, create_http_client
+
+RESPONSE: bytes = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+
+@pytest_asyncio.fixture(name="server_url")
+async def fixture_server_url() -> AsyncIterator[str]:
+    """Run a local HTTP/1.1 server that responds "ok" to any request on a
+    keep-alive connection.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(RESPONSE)
+            await writer.drain()
+
+    server = await asyncio.start_server(handle, host="127.0.0.1", port=0)
+    host, port = server.sockets[0].getsockname()
+    async with server:
+        yield f"http://{host}:{port}"
+
+
+@pytest.fixture(name="http_client")
+def fixture_http_client(mocker: MockerFixture, statsd_mock: Any) -> AsyncClient:
+    """Create an HTTP client for test."""
+    mocker.patch(
+        "merino.utils.http_client.get_metrics_client", return_value=statsd_mock
+    )
+    return create_http_client(name="test", timeout_sec=1.0)
+
+
+def test_create_http_client(http_client: AsyncClient) -> None:
+    """Test that the client is configured by the settings."""
+    assert isinstance(http_client._transport, InstrumentedTransport)
+    assert http_client.timeout.read == 1.0
+    assert http_client.timeout.connect == settings.http_client.connect_timeout_sec
+    pool = http_client._transport._pool
+    assert pool._max_connections == settings.http_client.max_connections
+    assert (
+        pool._max_keepalive_connections
+        == settings.http_client.max_keepalive_connections
+    )
+
+
+@pytest.mark.asyncio
+async def test_connection_reuse_and_metrics(
+    mocker: MockerFixture, http_client: AsyncClient, server_url: str, statsd_mock: Any
+) -> None:
+    """Test that subsequent requests reuse the pooled connection, that the pool wait
+    time is recorded for each request, and the pool utilization at most once per
+    interval.
+    """
+    transport = http_client._transport
+    assert isinstance(transport, InstrumentedTransport)
+
+    async with http_client.stream("GET", server_url) as response:
+        # The connection is in use until the response is closed.
+        assert transport.in_use == 1
+        assert await response.aread() == b"ok"
+    assert transport.in_use == 0
+
+    response = await http_client.get(server_url)
+    assert response.text == "ok"
+
+    assert statsd_mock.timing.call_count == 2
+    assert statsd_mock.timing.call_args.args == ("http_client.test.pool.wait",)
+    assert statsd_mock.gauge.call_args_list == [
+        mocker.call("http_client.test.pool.in_use", value=0)
+    ]
+
+    transport.next_report_at = 0.0
+    await http_client.get(server_url)
+    assert statsd_mock.gauge.call_count == 2
+
+    await http_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_connection_error_metrics(http_client: AsyncClient) -> None:
+    """Test that a request failing to connect doesn't leave a connection in use."""
+    with pytest.raises(ConnectError):
+        await http_client.get("http://127.0.0.1:1")
+
+    transport = http_client._transport
+    assert isinstance(transport, InstrumentedTransport)
+    assert transport.in_use == 0
+
+    await http_client.aclose()
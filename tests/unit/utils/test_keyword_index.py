@@ -0,0 +1,177 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the keyword index module."""
+import os
+from pathlib import Path
+
+import pytest
+
+from merino.utils.keyword_index import KeywordIndex
+
+SUGGESTIONS: dict[str, tuple[int, int]] = {
+    "mozilla": (0, 1),
+    "firefox": (0, 0),
+    "firefox account": (0, 0),
+    "firefox accounts": (0, 0),
+    "mozilla firefox accounts": (0, 1),
+    "café": (1, 2),
+    "日本": (2, 3),
+    "": (3, 4),
+}
+
+
+@pytest.fixture(name="keyword_index")
+def fixture_keyword_index() -> KeywordIndex:
+    """Create a keyword index for test."""
+    return KeywordIndex(SUGGESTIONS.items())
+
+
+def test_lookup(keyword_index: KeywordIndex) -> None:
+    """Test that the index returns the same values as a dictionary."""
+    for keyword, value in SUGGESTIONS.items():
+        assert keyword_index.get(keyword) == value
+        assert keyword_index[keyword] == value
+        assert keyword in keyword_index
+
+
+@pytest.mark.parametrize(
+    "keyword",
+    ["firefox a", "mozilla firefox", "cafe", "日", "zzz", "a"],
+)
+def test_lookup_missing(keyword_index: KeywordIndex, keyword: str) -> None:
+    """Test lookups of missing keywords."""
+    assert keyword_index.get(keyword) is None
+    assert keyword_index.get(keyword, (9, 9)) == (9, 9)
+    assert keyword not in keyword_index
+    with pytest.raises(KeyError):
+        keyword_index[keyword]
+
+
+def test_mapping(keyword_index: KeywordIndex) -> None:
+    """Test that the index iterates in keyword order and compares equal to the
+    dictionary it's built from.
+    """
+    assert len(keyword_index) == len(SUGGESTIONS)
+    assert list(keyword_index) == sorted(SUGGESTIONS, key=lambda k: k.encode())
+    assert dict(keyword_index.items()) == SUGGESTIONS
+    assert sorted(keyword_index.values()) == sorted(SUGGESTIONS.values())
+    assert keyword_index == SUGGESTIONS
+    assert SUGGESTIONS == keyword_index
+
+
+def test_duplicate_keywords() -> None:
+    """Test that the last value of a duplicate keyword wins."""
+    keyword_index = KeywordIndex([("firefox", (0, 0)), ("firefox", (1, 1))])
+
+    assert len(keyword_index) == 1
+    assert keyword_index["firefox"] == (1, 1)
+
+
+def test_empty() -> None:
+    """Test lookups on an empty index."""
+    keyword_index = KeywordIndex()
+
+    assert len(keyword_index) == 0
+    assert keyword_index.get("firefox") is None
+    assert keyword_index == {}
+
+
+def test_save_and_load(keyword_index: KeywordIndex, tmp_path: Path) -> None:
+    """Test that a memory-mapped index behaves like the index it was saved from."""
+    path = str(tmp_path / "index.idx")
+    keyword_index.save(path)
+
+    loaded_index = KeywordIndex.load(path)
+
+    for keyword, value in SUGGESTIONS.items():
+        assert loaded_index.get(keyword) == value
+    assert loaded_index.get("firefox browser") is None
+    assert list(loaded_index) == list(keyword_index)
+    assert loaded_index == SUGGESTIONS
+
+
+def test_save_and_load_empty(tmp_path: Path) -> None:
+    """Test that an empty index can be saved and memory-mapped."""
+    path = str(tmp_path / "index.idx")
+    KeywordIndex().save(path)
+
+    assert KeywordIndex.load(path) == {}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"not an index at all", b"MKWI\x02\x00\x00\x00" + b"\x00" * 12],
+    ids=["empty", "garbage", "unsupported-version"],
+)
+def test_load_invalid_file(tmp_path: Path, content: bytes) -> None:
+    """Test that loading an invalid file raises a `ValueError`."""
+    path = tmp_path / "index.idx"
+    path.write_bytes(content)
+
+    with pytest.raises(ValueError):
+        KeywordIndex.load(str(path))
+
+
+def test_load_truncated_file(keyword_index: KeywordIndex, tmp_path: Path) -> None:
+    """Test that loading a truncated index raises a `ValueError`."""
+    path = tmp_path / "index.idx"
+    keyword_index.save(str(path))
+    path.write_bytes(path.read_bytes()[:-1])
+
+    with pytest.raises(ValueError):
+        KeywordIndex.load(str(path))
+
+
+def test_load_or_create_shares_file(tmp_path: Path) -> None:
+    """Test that indexes of the same items share the same file, which is only
+    written once.
+    """
+    first_index = KeywordIndex.load_or_create(
+        str(tmp_path), "keywords", SUGGESTIONS.items()
+    )
+    (path,) = tmp_path.glob("keywords-*.idx")
+    modified_at = os.stat(path).st_mtime_ns
+
+    second_index = KeywordIndex.load_or_create(
+        str(tmp_path), "keywords", SUGGESTIONS.items()
+    )
+
+    assert first_index == second_index == SUGGESTIONS
+    assert list(tmp_path.glob("keywords-*.idx")) == [path]
+    assert os.stat(path).st_mtime_ns == modified_at
+
+
+def test_load_or_create_removes_stale_files(tmp_path: Path) -> None:
+    """Test that the files of the previous indexes of the same name are removed,
+    while the indexes mapping them keep working.
+    """
+    previous_index = KeywordIndex.load_or_create(
+        str(tmp_path), "keywords", SUGGESTIONS.items()
+    )
+    other_index = KeywordIndex.load_or_create(
+        str(tmp_path), "other", SUGGESTIONS.items()
+    )
+
+    index = KeywordIndex.load_or_create(
+        str(tmp_path), "keywords", [("firefox", (9, 9))]
+    )
+
+    assert index == {"firefox": (9, 9)}
+    assert len(list(tmp_path.glob("keywords-*.idx"))) == 1
+    assert len(list(tmp_path.glob("other-*.idx"))) == 1
+    assert previous_index == SUGGESTIONS
+    assert other_index == SUGGESTIONS
+
+
+def test_load_or_create_falls_back_to_memory(tmp_path: Path) -> None:
+    """Test that the index is kept in memory if it can't be saved."""
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+
+    index = KeywordIndex.load_or_create(
+        str(not_a_directory), "keywords", SUGGESTIONS.items()
+    )
+
+    assert index == SUGGESTIONS
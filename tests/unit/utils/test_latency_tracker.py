@@ -0,0 +1,73 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the latency_tracker.py utility module."""
+
+import pytest
+
+from merino.utils.latency_tracker import LatencyTracker
+
+
+def test_percentile() -> None:
+    """Test that the nearest-rank percentile of the window is returned once enough
+    durations were recorded.
+    """
+    tracker = LatencyTracker(
+        percentile=0.9, window_size=10, min_samples=5, refresh_interval=1
+    )
+    for duration in [0.5, 0.1, 0.4, 0.2]:
+        tracker.record(duration)
+    assert tracker.percentile_sec() is None
+
+    for duration in [0.3, 0.6, 0.7, 0.8, 0.9, 1.0]:
+        tracker.record(duration)
+    assert tracker.percentile_sec() == 0.9
+
+    # The oldest durations leave the window.
+    for _ in range(10):
+        tracker.record(0.05)
+    assert tracker.percentile_sec() == 0.05
+
+
+def test_percentile_refresh_interval() -> None:
+    """Test that the percentile is only recomputed every `refresh_interval` new
+    durations.
+    """
+    tracker = LatencyTracker(
+        percentile=1.0, window_size=10, min_samples=1, refresh_interval=3
+    )
+    tracker.record(0.1)
+    assert tracker.percentile_sec() == 0.1
+
+    tracker.record(0.5)
+    tracker.record(0.6)
+    assert tracker.percentile_sec() == 0.1
+
+    tracker.record(0.7)
+    assert tracker.percentile_sec() == 0.7
+
+
+@pytest.mark.parametrize(
+    ["percentile", "window_size", "min_samples", "refresh_interval"],
+    [
+        (0, 10, 5, 1),
+        (1.5, 10, 5, 1),
+        (0.99, 10, 0, 1),
+        (0.99, 10, 11, 1),
+        (0.99, 10, 5, 0),
+    ],
+    ids=[
+        "zero_percentile",
+        "percentile_above_one",
+        "zero_min_samples",
+        "min_samples_above_window",
+        "zero_refresh_interval",
+    ],
+)
+def test_invalid_parameters(
+    percentile: float, window_size: int, min_samples: int, refresh_interval: int
+) -> None:
+    """Test that invalid parameters raise `ValueError`."""
+    with pytest.raises(ValueError):
+        LatencyTracker(percentile, window_size, min_samples, refresh_interval)
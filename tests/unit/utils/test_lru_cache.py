@@ -0,0 +1,120 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the lru_cache.py utility module."""
+
+import pytest
+
+from merino.utils.lru_cache import LRUCache
+
+
+class FakeTimer:
+    """A manually advanced clock for testing expiration."""
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def test_get_and_set() -> None:
+    """Test that stored values are returned and missing keys return None."""
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+
+    assert cache.set("a", 1) == 0
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert len(cache) == 1
+
+
+def test_evicts_least_recently_used() -> None:
+    """Test that the least recently used entry is evicted when the cache is full."""
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # Touch "a" so that "b" becomes the least recently used entry.
+    assert cache.get("a") == 1
+    assert cache.set("c", 3) == 1
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_expiration() -> None:
+    """Test that entries expire after the TTL and that the TTL can be overridden."""
+    timer = FakeTimer()
+    cache: LRUCache[str, int] = LRUCache(max_size=10, ttl_sec=10, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_sec=20)
+
+    timer.now = 9.9
+    assert cache.get("a") == 1
+
+    timer.now = 10.0
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_pop_and_clear() -> None:
+    """Test the removal of entries."""
+    cache: LRUCache[str, int] = LRUCache(max_size=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize(
+    ["max_size", "ttl_sec"], [(0, None), (-1, None), (1, -1)], ids=str
+)
+def test_invalid_parameters(max_size: int, ttl_sec: float | None) -> None:
+    """Test that invalid parameters are rejected."""
+    with pytest.raises(ValueError):
+        LRUCache(max_size=max_size, ttl_sec=ttl_sec)
+
+
+def test_max_bytes() -> None:
+    """Test that the least recently used entries are evicted to stay within
+    `max_bytes`, and that oversized values aren't stored.
+    """
+    cache: LRUCache[str, bytes] = LRUCache(
+        max_size=10, max_bytes=10, sizeof=lambda key, value: len(key) + len(value)
+    )
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    assert cache.size_bytes == 10
+
+    # Overwriting an entry accounts for the size of the previous value.
+    assert cache.set("b", b"12") == 0
+    assert cache.size_bytes == 8
+
+    assert cache.set("c", b"12") == 1
+    assert cache.get("a") is None
+    assert cache.size_bytes == 6
+
+    assert cache.set("d", b"12345678910") == 0
+    assert cache.get("d") is None
+    assert cache.size_bytes == 6
+
+    assert cache.pop("b") == b"12"
+    assert cache.size_bytes == 3
+    cache.clear()
+    assert cache.size_bytes == 0
+
+
+def test_max_bytes_requires_sizeof() -> None:
+    """Test that `max_bytes` is rejected without `sizeof` or if not positive."""
+    with pytest.raises(ValueError):
+        LRUCache[str, str](max_size=1, max_bytes=10)
+    with pytest.raises(ValueError):
+        LRUCache[str, str](max_size=1, max_bytes=0, sizeof=lambda key, value: 0)
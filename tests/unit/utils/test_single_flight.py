@@ -0,0 +1,97 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the single_flight.py module."""
+import asyncio
+from functools import partial
+
+import pytest
+
+from merino.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_run_coalesces_concurrent_calls() -> None:
+    """Test that concurrent calls for the same key share a single call."""
+    single_flight: SingleFlight[str, str] = SingleFlight()
+    calls: list[str] = []
+    release = asyncio.Event()
+
+    async def call(key: str) -> str:
+        calls.append(key)
+        await release.wait()
+        return key.upper()
+
+    tasks = [
+        asyncio.create_task(single_flight.run(key, partial(call, key)))
+        for key in ["a", "a", "b", "a"]
+    ]
+    await asyncio.sleep(0)
+    assert len(single_flight) == 2
+    assert "a" in single_flight
+    assert "c" not in single_flight
+    release.set()
+
+    results = await asyncio.gather(*tasks)
+
+    assert calls == ["a", "b"]
+    assert results == [("A", False), ("A", True), ("B", False), ("A", True)]
+    assert len(single_flight) == 0
+    assert "a" not in single_flight
+
+
+@pytest.mark.asyncio
+async def test_run_after_completion() -> None:
+    """Test that a call is made anew once the previous call for the key is done."""
+    single_flight: SingleFlight[str, int] = SingleFlight()
+    calls: list[str] = []
+
+    async def call() -> int:
+        calls.append("a")
+        return len(calls)
+
+    assert await single_flight.run("a", call) == (1, False)
+    assert await single_flight.run("a", call) == (2, False)
+
+
+@pytest.mark.asyncio
+async def test_run_exception() -> None:
+    """Test that the exception of a call is raised to all its callers."""
+    single_flight: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def call() -> int:
+        await release.wait()
+        raise ValueError("failure")
+
+    tasks = [asyncio.create_task(single_flight.run("a", call)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert [str(result) for result in results] == ["failure", "failure"]
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_run_caller_cancelled() -> None:
+    """Test that cancelling the caller that started a call doesn't cancel the call
+    for the other callers.
+    """
+    single_flight: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def call() -> int:
+        await release.wait()
+        return 1
+
+    first = asyncio.create_task(single_flight.run("a", call))
+    second = asyncio.create_task(single_flight.run("a", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == (1, True)
+    assert first.cancelled()
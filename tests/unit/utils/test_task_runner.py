@@ -11,7 +11,7 @@ import pytest_asyncio
 from pytest import LogCaptureFixture
 from pytest_mock import MockerFixture
 
-from merino.utils.task_runner import gather
+from merino.utils.task_runner import gather, gather_with_deadlines
 from tests.types import FilterCaplogFixture
 
 # The duration of the slow coroutine (500 ms).
@@ -183,3 +183,61 @@ async def test_gather_tasks_without_timeout_callback(
         records[1].__dict__["msg"]
         == "Cancelling the task: timedout-task due to timeout"
     )
+
+
+@pytest.mark.asyncio
+async def test_gather_with_deadlines(
+    normal_task,
+    timedout_task,
+    raised_task,
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    filter_caplog: FilterCaplogFixture,
+) -> None:
+    """Test that each task is cancelled upon its own timeout only, and that gathering
+    returns as soon as every task completed or timed out.
+    """
+    stub = mocker.stub(name="timeout_callback")
+
+    async def slow_tolerated_op() -> bool:
+        await asyncio.sleep(SLOW_COROUTINE_DURATION / 5)
+        return True
+
+    tolerated_task = asyncio.create_task(slow_tolerated_op(), name="tolerated-task")
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+
+    done_tasks, timedout_tasks = await gather_with_deadlines(
+        [normal_task, timedout_task, raised_task, tolerated_task],
+        [
+            SLOW_COROUTINE_DURATION / 10,
+            SLOW_COROUTINE_DURATION / 10,
+            SLOW_COROUTINE_DURATION / 10,
+            # Much longer than it takes the task to complete.
+            SLOW_COROUTINE_DURATION * 10,
+        ],
+        timeout_cb=stub,
+    )
+
+    assert loop.time() - started_at < SLOW_COROUTINE_DURATION
+    assert {task.get_name() for task in done_tasks} == {
+        "normal-task",
+        "raised-task",
+        "tolerated-task",
+    }
+    assert timedout_tasks == [timedout_task]
+    assert timedout_task.cancelled()
+    stub.assert_called_once_with([timedout_task])
+
+    records = filter_caplog(caplog.records, "merino.utils.task_runner")
+
+    assert [record.__dict__["msg"] for record in records] == [
+        "Timeout triggered in the task runner",
+        "Cancelling the task: timedout-task due to timeout",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_gather_with_deadlines_without_tasks() -> None:
+    """Test gather_with_deadlines with an empty task list"""
+    assert await gather_with_deadlines([], []) == ([], [])
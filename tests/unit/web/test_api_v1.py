@@ -0,0 +1,70 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the api_v1.py module."""
+
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from merino.providers.base import BaseProvider
+from merino.utils.latency_tracker import LatencyTracker
+from merino.web import api_v1
+
+
+@pytest.fixture(name="provider")
+def fixture_provider(mocker: MockerFixture) -> Any:
+    """Create a provider mock with a 1 second query timeout."""
+    provider = mocker.MagicMock(spec=BaseProvider)
+    provider.name = "wikipedia"
+    provider.query_timeout_sec = 1.0
+    return provider
+
+
+@pytest.fixture(name="latency_tracker")
+def fixture_latency_tracker(mocker: MockerFixture) -> LatencyTracker:
+    """Enable adaptive deadlines and register a latency tracker for the provider."""
+    tracker = LatencyTracker(
+        percentile=1.0, window_size=10, min_samples=2, refresh_interval=1
+    )
+    mocker.patch.object(api_v1, "ADAPTIVE_DEADLINE_ENABLED", True)
+    mocker.patch.object(api_v1, "ADAPTIVE_DEADLINE_MULTIPLIER", 2.0)
+    mocker.patch.object(api_v1, "ADAPTIVE_DEADLINE_MIN_SEC", 0.05)
+    mocker.patch.dict(api_v1.latency_trackers, {"wikipedia": tracker})
+    return tracker
+
+
+def test_query_deadline_without_adaptation(
+    mocker: MockerFixture, provider: Any
+) -> None:
+    """Test that the query timeout of the provider is its deadline by default."""
+    mocker.patch.object(api_v1, "ADAPTIVE_DEADLINE_ENABLED", False)
+
+    assert api_v1.query_deadline(provider) == 1.0
+
+
+@pytest.mark.parametrize(
+    ["durations", "expected_deadline"],
+    [
+        ([0.1], 1.0),
+        ([0.1, 0.2], 0.4),
+        ([0.01, 0.01], 0.05),
+        ([0.1, 0.9], 1.0),
+    ],
+    ids=["too_few_samples", "adapted", "floor", "ceiling"],
+)
+def test_query_deadline_adapted(
+    provider: Any,
+    latency_tracker: LatencyTracker,
+    durations: list[float],
+    expected_deadline: float,
+) -> None:
+    """Test that the deadline is a multiple of the percentile of the recent query
+    durations, between the minimum deadline and the query timeout.
+    """
+    for duration in durations:
+        latency_tracker.record(duration)
+
+    assert api_v1.query_deadline(provider) == pytest.approx(expected_deadline)
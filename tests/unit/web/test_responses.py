@@ -0,0 +1,163 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the responses.py module."""
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from merino.providers.adm.provider import NonsponsoredSuggestion, SponsoredSuggestion
+from merino.providers.amo.provider import AddonSuggestion
+from merino.providers.base import BaseSuggestion
+from merino.providers.custom_details import AmoDetails, CustomDetails
+from merino.providers.top_picks.provider import Suggestion as TopPicksSuggestion
+from merino.providers.weather.backends.protocol import (
+    CurrentConditions,
+    Forecast,
+    Temperature,
+)
+from merino.providers.weather.provider import Suggestion as WeatherSuggestion
+from merino.providers.wikipedia.provider import WikipediaSuggestion
+from merino.web.models_v1 import SuggestResponse
+from merino.web.responses import (
+    SuggestJSONResponse,
+    encode_suggest_response,
+    encode_suggestions,
+)
+
+SUGGESTIONS: list[BaseSuggestion] = [
+    SponsoredSuggestion(
+        block_id=1,
+        full_keyword="firefox",
+        title="Firefox",
+        url="https://example.org/target",
+        impression_url="https://example.org/impression",
+        click_url="https://example.org/click",
+        provider="adm",
+        advertiser="Example.org",
+        is_sponsored=True,
+        icon="https://example.org/icon",
+        score=0.3,
+    ),
+    NonsponsoredSuggestion(
+        block_id=2,
+        full_keyword="mozilla",
+        title="Mozilla – “Firefox” 🦊",
+        url="https://example.org/target?q=a&b=c",
+        provider="adm",
+        advertiser="Example.org",
+        is_sponsored=False,
+        icon=None,
+        score=0.2,
+    ),
+    TopPicksSuggestion(
+        block_id=0,
+        title="Example",
+        url="https://example.com",
+        provider="top_picks",
+        is_top_pick=True,
+        is_sponsored=False,
+        icon="",
+        score=0.25,
+    ),
+    WeatherSuggestion(
+        title="Weather for San Francisco",
+        url="https://www.accuweather.com/current",
+        provider="accuweather",
+        is_sponsored=False,
+        score=0.3,
+        icon=None,
+        city_name="San Francisco",
+        current_conditions=CurrentConditions(
+            url="https://www.accuweather.com/current",
+            summary="Mostly cloudy",
+            icon_id=6,
+            temperature=Temperature(c=15.5),
+        ),
+        forecast=Forecast(
+            url="https://www.accuweather.com/forecast",
+            summary="Pleasant Saturday",
+            high=Temperature(f=70.0),
+            low=Temperature(c=13.9, f=57.0),
+        ),
+    ),
+    AddonSuggestion(
+        title="Addon",
+        description="An addon",
+        url="https://addons.mozilla.org/addon",
+        score=0.3,
+        provider="amo",
+        icon="https://addons.mozilla.org/icon",
+        custom_details=CustomDetails(
+            amo=AmoDetails(rating="4.5", number_of_ratings=100, guid="{addon}")
+        ),
+    ),
+    WikipediaSuggestion(
+        block_id=0,
+        advertiser="dynamic-wikipedia",
+        is_sponsored=False,
+        icon="chrome://activity-stream/wikipedia-org.ico",
+        score=0.23,
+        provider="wikipedia",
+        full_keyword="banana",
+        title="Wikipedia - Banana",
+        url="https://en.wikipedia.org/wiki/Banana",
+    ),
+]
+
+
+def render_with_json_response(response: SuggestResponse) -> bytes:
+    """Render the response the way the suggest endpoint used to."""
+    return JSONResponse(
+        content=jsonable_encoder(response, exclude_unset=True, exclude_none=True)
+    ).body
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        SuggestResponse(suggestions=SUGGESTIONS, request_id="rid"),
+        SuggestResponse(
+            suggestions=SUGGESTIONS[:1], request_id="rid", client_variants=["a", "b"]
+        ),
+        SuggestResponse(
+            suggestions=[], request_id="rid", client_variants=[], server_variants=["c"]
+        ),
+    ],
+    ids=["all-suggestion-types", "client-variants", "no-suggestions"],
+)
+def test_suggest_json_response(response: SuggestResponse) -> None:
+    """Test that the suggest response is rendered byte-for-byte identically to
+    `JSONResponse`.
+    """
+    assert SuggestJSONResponse(response).body == render_with_json_response(response)
+
+
+def test_encode_suggest_response_with_encoded_suggestions() -> None:
+    """Test that pre-encoded suggestions are rendered in place of the suggestions of
+    the response.
+    """
+    response = SuggestResponse.construct(
+        suggestions=[], request_id="rid", client_variants=["a"]
+    )
+    expected = render_with_json_response(
+        SuggestResponse(
+            suggestions=SUGGESTIONS, request_id="rid", client_variants=["a"]
+        )
+    )
+
+    assert (
+        encode_suggest_response(response, suggestions=encode_suggestions(SUGGESTIONS))
+        == expected
+    )
+
+
+def test_suggest_json_response_headers() -> None:
+    """Test the headers of pre-encoded suggest responses."""
+    response = SuggestJSONResponse(b"{}")
+
+    assert response.body == b"{}"
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["content-length"] == "2"